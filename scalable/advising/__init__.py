@@ -3,6 +3,6 @@
 from __future__ import annotations
 
 from .resources import ResourceAdvisor, ResourceRecommendation
+from .stats import HistoryStats, TaskStats
 
-__all__ = ["ResourceAdvisor", "ResourceRecommendation"]
-
+__all__ = ["HistoryStats", "ResourceAdvisor", "ResourceRecommendation", "TaskStats"]
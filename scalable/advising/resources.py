@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -9,6 +10,7 @@ from typing import Any
 import pandas as pd
 from dask.utils import parse_bytes
 
+from scalable.advising.stats import HISTORY_STATS_FILE, HistoryStats, TaskStats
 from scalable.telemetry.collectors import iter_run_dirs, read_jsonl
 
 
@@ -31,6 +33,14 @@ def _bytes_to_gib_string(value: int | None) -> str | None:
     return f"{int(gib)}G"
 
 
+def _observed_cpu_seconds(resources: dict[str, Any]) -> float | None:
+    user = resources.get("observed_cpu_user_s")
+    system = resources.get("observed_cpu_system_s")
+    if user is None and system is None:
+        return None
+    return float(user or 0.0) + float(system or 0.0)
+
+
 def _seconds_to_hhmmss(seconds: float | None) -> str | None:
     if seconds is None or seconds <= 0:
         return None
@@ -41,6 +51,12 @@ def _seconds_to_hhmmss(seconds: float | None) -> str | None:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
+def _confidence_levels(confidence: float | Sequence[float]) -> list[float]:
+    """Clamp one or more confidence levels to the supported ``[0.5, 0.99]``."""
+    levels = [confidence] if isinstance(confidence, (int, float)) else list(confidence)
+    return [min(max(float(c), 0.5), 0.99) for c in levels]
+
+
 @dataclass(frozen=True)
 class ResourceRecommendation:
     """Explainable recommendation payload returned by :class:`ResourceAdvisor`."""
@@ -54,14 +70,32 @@ class ResourceRecommendation:
 
 
 class ResourceAdvisor:
-    """Heuristic advisor using historical quantiles from telemetry."""
+    """Heuristic advisor using historical quantiles from telemetry.
+
+    Per-``(task, target)`` aggregates are computed once into a
+    :class:`~scalable.advising.stats.HistoryStats` table, so recommendations
+    at the precomputed confidence levels do not touch the records.
+    """
 
-    def __init__(self, records: pd.DataFrame) -> None:
+    def __init__(self, records: pd.DataFrame, *, stats: HistoryStats | None = None) -> None:
         self._records = records.copy()
+        self._stats = stats if stats is not None else HistoryStats.from_records(self._records)
+
+    @property
+    def records(self) -> pd.DataFrame:
+        """Telemetry records the advisor was built from (one row per task run)."""
+        return self._records
 
     @classmethod
-    def from_history(cls, runs_dir: str | Path) -> ResourceAdvisor:
-        """Build advisor state from telemetry run directories."""
+    def from_history(
+        cls, runs_dir: str | Path, *, cache_dir: str | Path | None = None
+    ) -> ResourceAdvisor:
+        """Build advisor state from telemetry run directories.
+
+        The history statistics table is cached as ``history_stats.json`` in
+        ``cache_dir`` (default ``<runs_dir>/../models``) and only updated for
+        tasks with new records on later loads.
+        """
         rows: list[dict[str, Any]] = []
 
         for run_dir in iter_run_dirs(runs_dir):
@@ -82,7 +116,10 @@ class ResourceAdvisor:
                 entity = str(r.get("entity_id", ""))
                 if not entity:
                     continue
-                resources_by_task[entity] = r
+                # Request-side and observed-usage events share the entity id;
+                # merge their non-null fields into one record.
+                merged = resources_by_task.setdefault(entity, {})
+                merged.update({k: v for k, v in r.items() if v is not None})
 
             for t in task_rows:
                 if t.get("state") not in {"succeeded", "failed", "cancelled"}:
@@ -101,16 +138,23 @@ class ResourceAdvisor:
                         "component": t.get("component"),
                         "state": t.get("state"),
                         "duration_s": t.get("duration_s"),
+                        "queue_wait_s": t.get("queue_wait_s"),
+                        "sample_weight": t.get("sample_weight", 1.0),
                         "requested_workers": resources.get("requested_workers"),
                         "requested_cpus": resources.get("requested_cpus"),
                         "requested_memory": resources.get("requested_memory"),
                         "requested_memory_bytes": _memory_to_bytes(resources.get("requested_memory")),
                         "requested_walltime": resources.get("requested_walltime"),
+                        "observed_peak_rss_bytes": resources.get("observed_peak_rss_bytes"),
+                        "observed_cpu_s": _observed_cpu_seconds(resources),
                     }
                 )
 
         frame = pd.DataFrame(rows)
-        return cls(frame)
+        if cache_dir is None:
+            cache_dir = Path(runs_dir).parent / "models"
+        stats = HistoryStats.cached(frame, Path(cache_dir) / HISTORY_STATS_FILE)
+        return cls(frame, stats=stats)
 
     def recommend(
         self,
@@ -122,10 +166,43 @@ class ResourceAdvisor:
     ) -> ResourceRecommendation:
         """Recommend workers/resources using confidence-indexed quantiles."""
         _ = input_features  # reserved for Phase 5 learned models
+        return self.recommend_many(tasks=[task], targets=[target], confidence=confidence)[0]
 
-        q = min(max(float(confidence), 0.5), 0.99)
-        frame = self._records
-        if frame.empty:
+    def recommend_many(
+        self,
+        *,
+        tasks: Sequence[str],
+        targets: Sequence[str | None] | None = None,
+        confidence: float | Sequence[float] = 0.95,
+        input_features: dict[str, dict[str, Any]] | None = None,
+    ) -> list[ResourceRecommendation]:
+        """Recommend for every combination of ``tasks``, ``targets`` and ``confidence``.
+
+        Aggregates come from the precomputed history table; only confidence
+        levels outside it are computed from the records. Results are ordered
+        task-major, then by target, then by confidence, and equal what
+        :meth:`recommend` returns for each combination.
+        """
+        _ = input_features  # reserved for Phase 5 learned models
+        quantiles = _confidence_levels(confidence)
+        target_list = [None] if targets is None else list(targets)
+        stats = self._stats.resolve(self._records, tasks, target_list, quantiles)
+
+        results: list[ResourceRecommendation] = []
+        for task in tasks:
+            for target in target_list:
+                for q in quantiles:
+                    results.append(self._recommend_stats(task, target, q, stats[(task, target)]))
+        return results
+
+    def _recommend_stats(
+        self,
+        task: str,
+        target: str | None,
+        q: float,
+        stats: TaskStats | None,
+    ) -> ResourceRecommendation:
+        if self._records.empty:
             return ResourceRecommendation(
                 task=task,
                 target=target,
@@ -135,13 +212,7 @@ class ResourceAdvisor:
                 evidence={"records": 0, "reason": "no history"},
             )
 
-        scoped = frame[frame["task_name"] == task]
-        if target is not None and not scoped.empty:
-            scoped_target = scoped[scoped["target"] == target]
-            if not scoped_target.empty:
-                scoped = scoped_target
-
-        if scoped.empty:
+        if stats is None:
             return ResourceRecommendation(
                 task=task,
                 target=target,
@@ -151,30 +222,29 @@ class ResourceAdvisor:
                 evidence={"records": 0, "reason": "task not found in history"},
             )
 
-        component = scoped["component"].dropna().iloc[-1] if scoped["component"].notna().any() else task
-        component = str(component)
-
-        workers_series = pd.to_numeric(scoped["requested_workers"], errors="coerce").dropna()
-        cpus_series = pd.to_numeric(scoped["requested_cpus"], errors="coerce").dropna()
-        duration_series = pd.to_numeric(scoped["duration_s"], errors="coerce").dropna()
-        mem_series = pd.to_numeric(scoped["requested_memory_bytes"], errors="coerce").dropna()
+        component = stats.component or task
+        workers_q = stats.quantile("workers", q)
+        cpus_q = stats.quantile("cpus", q)
+        duration_q = stats.quantile("duration", q)
+        memory_q = stats.quantile("memory", q)
 
-        workers = int(max(1, round(float(workers_series.quantile(q))))) if not workers_series.empty else 1
-        cpus = int(max(1, round(float(cpus_series.quantile(q))))) if not cpus_series.empty else 1
+        workers = int(max(1, round(workers_q))) if workers_q is not None else 1
+        cpus = int(max(1, round(cpus_q))) if cpus_q is not None else 1
 
-        memory_bytes = int(mem_series.quantile(q)) if not mem_series.empty else None
+        memory_bytes = int(memory_q) if memory_q is not None else None
         if memory_bytes is not None:
             memory_bytes = int(memory_bytes * 1.10)
-        walltime_seconds = float(duration_series.quantile(q) * 1.20) if not duration_series.empty else None
+        walltime_seconds = duration_q * 1.20 if duration_q is not None else None
 
         memory = _bytes_to_gib_string(memory_bytes)
         walltime = _seconds_to_hhmmss(walltime_seconds)
 
         evidence = {
-            "records": int(len(scoped.index)),
+            "records": stats.records,
             "quantile": q,
             "component": component,
-            "state_counts": scoped["state"].value_counts().to_dict(),
+            "memory_source": stats.memory_source,
+            "state_counts": dict(stats.state_counts),
         }
 
         return ResourceRecommendation(
@@ -0,0 +1,396 @@
+"""Precomputed per-(task, target) aggregates of run telemetry.
+
+Advisors recommend from quantiles of the history of one task on one target.
+:class:`HistoryStats` computes those aggregates once per history load and
+keys them by ``(task, target)``, so a recommendation is a dict lookup rather
+than a scan of every record. The table is persisted as JSON next to the
+model cache together with the history watermark it was built from; when the
+history grows, only the tasks with new rows are recomputed.
+
+Rows written under a telemetry sampling policy stand for ``sample_weight``
+tasks each, so quantiles, means and state counts are weighted by it. Weight
+0 marks a diagnostic row of a sampled-out failure, which the weighted sample
+already accounts for.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+#: Quantile levels precomputed for every ``(task, target)`` pair.
+HISTORY_QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+#: File name of the persisted table inside the model cache directory.
+HISTORY_STATS_FILE = "history_stats.json"
+
+#: Aggregated columns, each stored at every quantile level.
+_QUANTILE_FIELDS = ("workers", "cpus", "duration", "memory")
+
+_FORMAT_VERSION = 2
+
+
+def history_watermark(records: pd.DataFrame) -> dict[str, int]:
+    """Number of task rows per run, identifying the history a model saw."""
+    if records.empty or "run_id" not in records.columns:
+        return {}
+    counts = records.groupby("run_id", sort=True).size()
+    return {str(run): int(n) for run, n in counts.items()}
+
+
+def unseen_rows(records: pd.DataFrame, watermark: dict[str, int] | None) -> np.ndarray | None:
+    """Boolean mask of rows newer than ``watermark``.
+
+    Runs only ever gain rows, in order, so the first ``watermark[run]`` rows
+    of each run are the ones already seen. Returns ``None`` if the history
+    is not an extension of ``watermark`` (a run was removed or shrank).
+    """
+    if watermark is None:
+        return None
+    current = history_watermark(records)
+    if any(current.get(run, 0) < count for run, count in watermark.items()):
+        return None
+    if records.empty:
+        return np.zeros(0, dtype=bool)
+    position = records.groupby("run_id", sort=False).cumcount().to_numpy()
+    seen = records["run_id"].astype(str).map(watermark).fillna(0).to_numpy()
+    return position >= seen
+
+
+def sample_weights(frame: pd.DataFrame) -> pd.Series:
+    """Telemetry ``sample_weight`` of every row; rows without one count once."""
+    if "sample_weight" not in frame.columns:
+        return pd.Series(1.0, index=frame.index)
+    weights = pd.to_numeric(frame["sample_weight"], errors="coerce").fillna(1.0)
+    return weights.clip(lower=0.0)
+
+
+def weighted_quantiles(
+    values: np.ndarray, weights: np.ndarray, levels: Sequence[float]
+) -> np.ndarray:
+    """Quantiles of ``values`` where each value counts ``weights`` times.
+
+    Equal weights give NumPy's default (linear) quantiles; otherwise the
+    weighted inverse CDF is used. ``NaN`` for every level if no weight is
+    positive.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    keep = weights > 0
+    values, weights = values[keep], weights[keep]
+    if values.size == 0:
+        return np.full(len(levels), np.nan)
+    if np.all(weights == weights[0]):
+        return np.quantile(values, list(levels))
+    order = np.argsort(values, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    index = np.searchsorted(cumulative, np.asarray(levels) * cumulative[-1], side="left")
+    return values[order][np.minimum(index, values.size - 1)]
+
+
+def _numeric(scoped: pd.DataFrame, column: str) -> pd.Series:
+    if column not in scoped.columns:
+        return pd.Series(dtype=float)
+    return pd.to_numeric(scoped[column], errors="coerce").dropna()
+
+
+def _memory_series(scoped: pd.DataFrame) -> tuple[pd.Series, str]:
+    """Return per-task memory samples, preferring observed peak RSS over requests."""
+    observed = _numeric(scoped, "observed_peak_rss_bytes")
+    if not observed.empty:
+        return observed, "observed_peak_rss"
+    return _numeric(scoped, "requested_memory_bytes"), "requested"
+
+
+def _scoped_history(
+    frame: pd.DataFrame,
+    tasks: Sequence[str],
+    targets: Sequence[str | None],
+) -> dict[tuple[str, str | None], pd.DataFrame]:
+    """History rows for every ``(task, target)`` pair, grouped in one pass.
+
+    A target with no rows for a task falls back to the task's rows on all
+    targets, as in :meth:`ResourceAdvisor.recommend`.
+    """
+    empty = frame.iloc[0:0]
+    if frame.empty or "task_name" not in frame.columns:
+        return {(task, target): empty for task in tasks for target in targets}
+
+    wanted = frame[frame["task_name"].isin(set(tasks))]
+    by_task = dict(iter(wanted.groupby("task_name", sort=False)))
+    scoped_targets = any(target is not None for target in targets) and "target" in frame.columns
+    scopes: dict[tuple[str, str | None], pd.DataFrame] = {}
+    for task in dict.fromkeys(tasks):
+        task_frame = by_task.get(task, empty)
+        by_target = (
+            dict(iter(task_frame.groupby("target", sort=False)))
+            if scoped_targets and not task_frame.empty
+            else {}
+        )
+        for target in targets:
+            scoped = by_target.get(target) if target is not None else None
+            scopes[(task, target)] = scoped if scoped is not None else task_frame
+    return scopes
+
+
+def _quantiles(
+    series: pd.Series, weights: pd.Series, levels: tuple[float, ...]
+) -> tuple[float | None, ...]:
+    values = weighted_quantiles(series.to_numpy(), weights.loc[series.index].to_numpy(), levels)
+    return tuple(None if np.isnan(v) else float(v) for v in values)
+
+
+def _mean(series: pd.Series, weights: pd.Series) -> float | None:
+    w = weights.loc[series.index].to_numpy()
+    if series.empty or w.sum() <= 0:
+        return None
+    return float(np.average(series.to_numpy(dtype=float), weights=w))
+
+
+@dataclass(frozen=True)
+class TaskStats:
+    """Aggregates of the history rows of one task (on one target).
+
+    ``workers``, ``cpus``, ``duration`` and ``memory`` hold one value per
+    level in ``quantiles``, or ``None`` when the task has no such samples.
+    ``memory`` is observed peak RSS when any was recorded, else the request.
+    ``records`` counts rows with a positive sample weight; ``state_counts``
+    are weighted estimates of the task counts.
+    """
+
+    records: int
+    component: str | None
+    state_counts: dict[str, int]
+    memory_source: str
+    mean_duration: float | None
+    mean_requested_memory: float | None
+    quantiles: tuple[float, ...] = HISTORY_QUANTILES
+    workers: tuple[float | None, ...] = field(default=())
+    cpus: tuple[float | None, ...] = field(default=())
+    duration: tuple[float | None, ...] = field(default=())
+    memory: tuple[float | None, ...] = field(default=())
+
+    @classmethod
+    def from_frame(
+        cls, scoped: pd.DataFrame, quantiles: Iterable[float] = HISTORY_QUANTILES
+    ) -> TaskStats:
+        """Aggregate already-scoped history rows (one task, one target)."""
+        levels = tuple(quantiles)
+        weights = sample_weights(scoped)
+        components = scoped["component"].dropna() if "component" in scoped.columns else ()
+        states = weights.groupby(scoped["state"], sort=False).sum() if "state" in scoped.columns else {}
+        memory, memory_source = _memory_series(scoped[weights > 0])
+        duration = _numeric(scoped, "duration_s")
+        return cls(
+            records=int((weights > 0).sum()),
+            component=str(components.iloc[-1]) if len(components) else None,
+            state_counts={str(k): int(round(v)) for k, v in dict(states).items() if v > 0},
+            memory_source=memory_source,
+            mean_duration=_mean(duration, weights),
+            mean_requested_memory=_mean(_numeric(scoped, "requested_memory_bytes"), weights),
+            quantiles=levels,
+            workers=_quantiles(_numeric(scoped, "requested_workers"), weights, levels),
+            cpus=_quantiles(_numeric(scoped, "requested_cpus"), weights, levels),
+            duration=_quantiles(duration, weights, levels),
+            memory=_quantiles(memory, weights, levels),
+        )
+
+    def covers(self, levels: Iterable[float]) -> bool:
+        """Whether every level in ``levels`` was precomputed."""
+        return all(q in self.quantiles for q in levels)
+
+    def quantile(self, name: str, q: float) -> float | None:
+        """Precomputed ``q`` quantile of ``workers``/``cpus``/``duration``/``memory``."""
+        return getattr(self, name)[self.quantiles.index(q)]
+
+    def history_stats(self) -> dict[str, Any]:
+        """The ``history_stats`` features of :meth:`FeatureExtractor.extract_from_task`."""
+        p95 = self.quantile("duration", 0.95) if 0.95 in self.quantiles else None
+        return {
+            "mean_duration": self.mean_duration or 0,
+            "p95_duration": p95 or 0,
+            "mean_memory": self.mean_requested_memory or 0,
+            "count": self.records,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TaskStats:
+        values = dict(data)
+        for name in ("quantiles", *_QUANTILE_FIELDS):
+            values[name] = tuple(values.get(name) or ())
+        return cls(**values)
+
+
+class HistoryStats:
+    """Table of :class:`TaskStats` keyed by ``(task, target)``.
+
+    Every task has a ``(task, None)`` row over all its history, plus one row
+    per target it ran on. :meth:`get` falls back from a target without
+    history to the task's row, like the advisors always have.
+    """
+
+    def __init__(
+        self,
+        rows: dict[tuple[str, str | None], TaskStats] | None = None,
+        *,
+        watermark: dict[str, int] | None = None,
+        quantiles: Sequence[float] = HISTORY_QUANTILES,
+    ) -> None:
+        self.rows = dict(rows or {})
+        self.watermark = dict(watermark or {})
+        self.quantiles = tuple(quantiles)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_records(
+        cls, records: pd.DataFrame, *, quantiles: Sequence[float] = HISTORY_QUANTILES
+    ) -> HistoryStats:
+        """Aggregate every task in ``records``."""
+        stats = cls(watermark=history_watermark(records), quantiles=quantiles)
+        stats._aggregate(records)
+        return stats
+
+    def _aggregate(self, records: pd.DataFrame) -> None:
+        if records.empty or "task_name" not in records.columns:
+            return
+        by_target = "target" in records.columns
+        for task, task_frame in records.groupby("task_name", sort=False):
+            self.rows[(task, None)] = TaskStats.from_frame(task_frame, self.quantiles)
+            if by_target:
+                for target, scoped in task_frame.groupby("target", sort=False):
+                    self.rows[(task, target)] = TaskStats.from_frame(scoped, self.quantiles)
+
+    def update(self, records: pd.DataFrame) -> HistoryStats:
+        """Bring the table up to date with ``records``.
+
+        Only tasks with rows newer than :attr:`watermark` are recomputed. If
+        ``records`` is not an extension of the watermarked history, the
+        whole table is rebuilt. Returns the up-to-date table.
+        """
+        unseen = unseen_rows(records, self.watermark)
+        if unseen is None:
+            return self.from_records(records, quantiles=self.quantiles)
+        if unseen.any() and "task_name" in records.columns:
+            touched = set(records.loc[unseen, "task_name"].dropna())
+            self.rows = {key: row for key, row in self.rows.items() if key[0] not in touched}
+            self._aggregate(records[records["task_name"].isin(touched)])
+        self.watermark = history_watermark(records)
+        return self
+
+    def get(self, task: str, target: str | None = None) -> TaskStats | None:
+        """Stats of ``task`` on ``target``, or over all targets; ``None`` if unseen."""
+        if target is not None:
+            row = self.rows.get((task, target))
+            if row is not None:
+                return row
+        return self.rows.get((task, None))
+
+    def resolve(
+        self,
+        records: pd.DataFrame,
+        tasks: Sequence[str],
+        targets: Sequence[str | None],
+        quantiles: Sequence[float],
+    ) -> dict[tuple[str, str | None], TaskStats | None]:
+        """Stats of every ``(task, target)`` pair covering ``quantiles``.
+
+        Pairs are looked up in the table; only pairs asked for a quantile
+        level that was not precomputed are aggregated from ``records``.
+        """
+        found = {(task, target): self.get(task, target) for task in tasks for target in targets}
+        missing = [pair for pair, row in found.items() if row is not None and not row.covers(quantiles)]
+        if missing:
+            levels = tuple(sorted({*self.quantiles, *quantiles}))
+            scopes = _scoped_history(records, [t for t, _ in missing], [g for _, g in missing])
+            for pair in missing:
+                found[pair] = TaskStats.from_frame(scopes[pair], levels)
+        return found
+
+    def save(self, path: str | Path) -> None:
+        """Write the table and its watermark as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": _FORMAT_VERSION,
+            "quantiles": list(self.quantiles),
+            "watermark": self.watermark,
+            "rows": [
+                {"task": task, "target": target, **row.to_dict()}
+                for (task, target), row in self.rows.items()
+            ],
+        }
+        path.write_text(json.dumps(payload, default=_json_default), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> HistoryStats | None:
+        """Read a table written by :meth:`save`; ``None`` if absent or unreadable."""
+        try:
+            payload = json.loads(Path(path).read_text(encoding="utf-8"))
+            if payload.get("version") != _FORMAT_VERSION:
+                return None
+            rows = {}
+            for entry in payload["rows"]:
+                entry = dict(entry)
+                key = (entry.pop("task"), entry.pop("target"))
+                rows[key] = TaskStats.from_dict(entry)
+            return cls(rows, watermark=payload["watermark"], quantiles=payload["quantiles"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def cached(
+        cls,
+        records: pd.DataFrame,
+        path: str | Path,
+        *,
+        quantiles: Sequence[float] = HISTORY_QUANTILES,
+    ) -> HistoryStats:
+        """Load the table at ``path``, update it for ``records`` and save it back.
+
+        The file is rewritten only when the history changed since it was
+        saved. A missing or unreadable file, or one with other quantile
+        levels, is rebuilt from scratch.
+        """
+        stats = cls.load(path)
+        if stats is not None and stats.quantiles != tuple(quantiles):
+            stats = None
+        if stats is None:
+            stats = cls.from_records(records, quantiles=quantiles)
+        elif stats.watermark == history_watermark(records):
+            return stats
+        else:
+            stats = stats.update(records)
+        try:
+            stats.save(path)
+        except OSError:
+            pass
+        return stats
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+__all__ = [
+    "HISTORY_QUANTILES",
+    "HISTORY_STATS_FILE",
+    "HistoryStats",
+    "TaskStats",
+    "history_watermark",
+    "sample_weights",
+    "unseen_rows",
+    "weighted_quantiles",
+]
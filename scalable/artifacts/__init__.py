@@ -6,14 +6,24 @@ artifacts (outputs, intermediate files) across local and remote backends.
 
 from __future__ import annotations
 
-from .base import ArtifactKind, ArtifactRef, ArtifactStore
+from .base import (
+    ArtifactKind,
+    ArtifactPage,
+    ArtifactRef,
+    ArtifactStore,
+    AsyncArtifactStore,
+    PaginatedArtifactStore,
+)
 from .factory import build_artifact_store
 from .local import LocalArtifactStore
 
 __all__ = [
     "ArtifactKind",
+    "ArtifactPage",
     "ArtifactRef",
     "ArtifactStore",
+    "AsyncArtifactStore",
     "LocalArtifactStore",
+    "PaginatedArtifactStore",
     "build_artifact_store",
 ]
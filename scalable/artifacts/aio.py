@@ -0,0 +1,81 @@
+"""Shared implementation of the :class:`~scalable.artifacts.base.AsyncArtifactStore` API.
+
+:class:`AsyncArtifactMixin` derives the awaitable methods from a store's
+synchronous ``put``/``get``/``exists``/``list_artifacts`` by running them in
+worker threads, and builds the batch variants on top with bounded
+concurrency. Backends with native async I/O override individual methods.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from .base import ArtifactKind, ArtifactRef
+
+#: Default number of concurrent transfers in ``aput_many``/``aget_many``.
+DEFAULT_ASYNC_CONCURRENCY: int = 8
+
+_T = TypeVar("_T")
+
+
+async def _bounded(
+    items: Iterable[tuple[str, str]],
+    func: Callable[[str, str], Awaitable[_T]],
+    concurrency: int | None,
+) -> list[_T]:
+    limit = asyncio.Semaphore(max(int(concurrency or DEFAULT_ASYNC_CONCURRENCY), 1))
+
+    async def _one(first: str, second: str) -> _T:
+        async with limit:
+            return await func(first, second)
+
+    return list(await asyncio.gather(*(_one(a, b) for a, b in items)))
+
+
+class AsyncArtifactMixin:
+    """Awaitable artifact store methods on top of the synchronous ones."""
+
+    put: Callable[..., ArtifactRef]
+    get: Callable[..., str]
+    exists: Callable[..., bool]
+    list_artifacts: Callable[..., list[str]]
+
+    async def aput(
+        self, local_path: str, remote_key: str, *, kind: ArtifactKind | None = None
+    ) -> ArtifactRef:
+        return await asyncio.to_thread(self.put, local_path, remote_key, kind=kind)
+
+    async def aget(self, remote_key: str, local_path: str) -> str:
+        return await asyncio.to_thread(self.get, remote_key, local_path)
+
+    async def aexists(self, remote_key: str) -> bool:
+        return await asyncio.to_thread(self.exists, remote_key)
+
+    async def alist(self, prefix: str = "") -> list[str]:
+        return await asyncio.to_thread(self.list_artifacts, prefix)
+
+    async def aput_many(
+        self, items: Iterable[tuple[str, str]], *, concurrency: int | None = None
+    ) -> list[ArtifactRef]:
+        return await _bounded(items, self.aput, concurrency)
+
+    async def aget_many(
+        self, items: Iterable[tuple[str, str]], *, concurrency: int | None = None
+    ) -> list[str]:
+        return await _bounded(items, self.aget, concurrency)
+
+
+def run_on_loop(loop: Any, coro: Awaitable[_T]) -> Awaitable[_T]:
+    """Await ``coro`` on ``loop`` (e.g. fsspec's I/O thread loop).
+
+    Filesystems created with ``asynchronous=True`` have no loop of their own
+    and run directly on the caller's loop.
+    """
+    if loop is None or loop is asyncio.get_running_loop():
+        return coro
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))  # type: ignore[arg-type]
+
+
+__all__ = ["DEFAULT_ASYNC_CONCURRENCY", "AsyncArtifactMixin", "run_on_loop"]
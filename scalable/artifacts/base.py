@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import enum
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
@@ -40,6 +41,23 @@ class ArtifactRef:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class ArtifactPage:
+    """One page of a paginated artifact listing.
+
+    Attributes
+    ----------
+    keys : list[str]
+        Keys in lexicographic order. With a delimiter, entries ending in the
+        delimiter are common prefixes.
+    next_token : str | None
+        Opaque continuation token for the next page; ``None`` on the last page.
+    """
+
+    keys: list[str] = field(default_factory=list)
+    next_token: str | None = None
+
+
 @runtime_checkable
 class ArtifactStore(Protocol):
     """Protocol for artifact storage backends.
@@ -54,7 +72,14 @@ class ArtifactStore(Protocol):
         """URI scheme this store handles (e.g. ``"file"``, ``"s3"``)."""
         ...
 
-    def put(self, local_path: str, remote_key: str, *, kind: ArtifactKind | None = None) -> ArtifactRef:
+    def put(
+        self,
+        local_path: str,
+        remote_key: str,
+        *,
+        kind: ArtifactKind | None = None,
+        pack: bool | str = False,
+    ) -> ArtifactRef:
         """Upload/copy a local file or directory to the store.
 
         Parameters
@@ -65,6 +90,10 @@ class ArtifactStore(Protocol):
             Logical key (relative path) under the store root.
         kind : ArtifactKind | None
             Override artifact kind detection.
+        pack : bool | str
+            Store a directory as one seekable archive of compressed members
+            instead of one object per file. ``True`` picks the codec
+            (zstd if installed, else gzip); a codec name selects it.
 
         Returns
         -------
@@ -73,10 +102,12 @@ class ArtifactStore(Protocol):
         """
         ...
 
-    def get(self, remote_key: str, local_path: str) -> str:
+    def get(self, remote_key: str, local_path: str, *, member: str | None = None) -> str:
         """Download/copy a stored artifact to a local path.
 
-        Returns the local filesystem path where the artifact was placed.
+        ``member`` selects a single file (relative path) of a directory
+        artifact. Returns the local filesystem path where the artifact was
+        placed.
         """
         ...
 
@@ -89,4 +120,85 @@ class ArtifactStore(Protocol):
         ...
 
 
-__all__ = ["ArtifactKind", "ArtifactRef", "ArtifactStore"]
+@runtime_checkable
+class AsyncArtifactStore(Protocol):
+    """Awaitable counterpart of :class:`ArtifactStore`.
+
+    Lets a workflow overlap transfers with computation, e.g. prefetch the next
+    scenario's inputs while the current one runs. The batch variants run
+    transfers concurrently and return results in input order.
+    """
+
+    async def aput(
+        self, local_path: str, remote_key: str, *, kind: ArtifactKind | None = None
+    ) -> ArtifactRef:
+        """Awaitable :meth:`ArtifactStore.put`."""
+        ...
+
+    async def aget(self, remote_key: str, local_path: str) -> str:
+        """Awaitable :meth:`ArtifactStore.get`."""
+        ...
+
+    async def aexists(self, remote_key: str) -> bool:
+        """Awaitable :meth:`ArtifactStore.exists`."""
+        ...
+
+    async def alist(self, prefix: str = "") -> list[str]:
+        """Awaitable :meth:`ArtifactStore.list_artifacts`."""
+        ...
+
+    async def aput_many(
+        self, items: Iterable[tuple[str, str]], *, concurrency: int | None = None
+    ) -> list[ArtifactRef]:
+        """Upload ``(local_path, remote_key)`` pairs concurrently."""
+        ...
+
+    async def aget_many(
+        self, items: Iterable[tuple[str, str]], *, concurrency: int | None = None
+    ) -> list[str]:
+        """Download ``(remote_key, local_path)`` pairs concurrently."""
+        ...
+
+
+@runtime_checkable
+class PaginatedArtifactStore(Protocol):
+    """Streaming, paginated listing for stores with very many keys.
+
+    Prefixes are plain string prefixes, as on S3. With ``delimiter="/"``
+    keys are rolled up into common prefixes at the next ``/``.
+    """
+
+    def iter_artifacts(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        start_after: str | None = None,
+    ) -> Iterator[str]:
+        """Yield keys after ``start_after`` in lexicographic order."""
+        ...
+
+    def list_page(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        page_size: int = 1000,
+        token: str | None = None,
+    ) -> ArtifactPage:
+        """Return one page of keys and the token for the next one."""
+        ...
+
+    def exists_many(self, remote_keys: Iterable[str]) -> list[bool]:
+        """Check many keys at once, in input order."""
+        ...
+
+
+__all__ = [
+    "ArtifactKind",
+    "ArtifactPage",
+    "ArtifactRef",
+    "ArtifactStore",
+    "AsyncArtifactStore",
+    "PaginatedArtifactStore",
+]
@@ -6,17 +6,68 @@ storage (S3, GCS) via the artifact store abstraction.
 
 The remote cache is opt-in, controlled by the ``SCALABLE_CACHE_REMOTE``
 environment variable or ``settings.cache_remote_uri``.
+
+Values are streamed: ``put`` pickles straight into the remote object through
+an optional zstd/lz4 compressor, and ``get`` is a single GET whose
+``FileNotFoundError`` is the cache miss. No local temporary files are used.
+Objects start with a small header naming the codec; entries written by older
+versions (bare pickles) remain readable.
 """
 
 from __future__ import annotations
 
+import io
 import os
 import pickle
-import tempfile
 from typing import Any
 
 from scalable.common import logger
 
+#: Key prefix of remote cache entries: ``cache/<digest[:2]>/<digest>``.
+CACHE_PREFIX = "cache"
+
+_MAGIC = b"SCB1"
+_CODECS = {"none": 0, "zstd": 1, "lz4": 2}
+_CODEC_NAMES = {v: k for k, v in _CODECS.items()}
+
+
+def _import_codec(name: str) -> Any:
+    """Import the compression module for ``name`` with a clear error message."""
+    try:
+        if name == "zstd":
+            import zstandard
+
+            return zstandard
+        if name == "lz4":
+            import lz4.frame
+
+            return lz4.frame
+    except ImportError as exc:
+        package = "zstandard" if name == "zstd" else "lz4"
+        raise ImportError(
+            f"{package} is required for {name} remote cache compression. "
+            "Install with: pip install scalable[cloud]"
+        ) from exc
+    return None
+
+
+def _compress_writer(codec: str, raw: Any) -> Any:
+    module = _import_codec(codec)
+    if codec == "zstd":
+        return module.ZstdCompressor().stream_writer(raw, closefd=False)
+    if codec == "lz4":
+        return module.LZ4FrameFile(raw, mode="wb")
+    return raw
+
+
+def _decompress_reader(codec: str, raw: Any) -> Any:
+    module = _import_codec(codec)
+    if codec == "zstd":
+        return module.ZstdDecompressor().stream_reader(raw)
+    if codec == "lz4":
+        return module.LZ4FrameFile(raw, mode="rb")
+    return raw
+
 
 class RemoteCacheBackend:
     """Remote cache backend using artifact store for persistence.
@@ -25,46 +76,68 @@ class RemoteCacheBackend:
     ----------
     uri : str
         Remote storage URI (e.g. ``s3://bucket/cache/``).
+    compression : str | None
+        ``"none"``, ``"zstd"`` or ``"lz4"``. Defaults to
+        ``settings.cache_remote_compression``. Reads detect the codec from
+        the object header, so entries written with any codec stay readable.
     """
 
-    def __init__(self, uri: str) -> None:
+    def __init__(self, uri: str, *, compression: str | None = None) -> None:
         from .factory import build_artifact_store
 
+        if compression is None:
+            from scalable.common import settings
+
+            compression = getattr(settings, "cache_remote_compression", "none") or "none"
+        compression = compression.lower()
+        if compression not in _CODECS:
+            raise ValueError(
+                f"unknown remote cache compression {compression!r}; expected one of {sorted(_CODECS)}"
+            )
+        _import_codec(compression)
+
         self._uri = uri
+        self._compression = compression
         self._store = build_artifact_store(uri)
 
     @property
     def uri(self) -> str:
         return self._uri
 
+    @property
+    def compression(self) -> str:
+        return self._compression
+
     def _cache_key(self, digest: str) -> str:
         """Build a remote key from a cache digest."""
-        return f"cache/{digest[:2]}/{digest}"
+        return f"{CACHE_PREFIX}/{digest[:2]}/{digest}"
 
     def get(self, digest: str) -> Any | None:
         """Attempt to retrieve a cached result by digest.
 
-        Returns None if the key doesn't exist remotely.
+        Returns None if the key doesn't exist remotely. The lookup is a
+        single read of the object; a missing object is a miss.
         """
         key = self._cache_key(digest)
-        if not self._store.exists(key):
+        try:
+            data = self._store.read_bytes(key)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.debug("remote cache get failed for %s: %s", digest, exc)
             return None
 
         try:
-            with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as tmp:
-                tmp_path = tmp.name
-
-            self._store.get(key, tmp_path)
-            with open(tmp_path, "rb") as f:
-                return pickle.load(f)
+            raw = io.BytesIO(data)
+            if data[: len(_MAGIC)] != _MAGIC:
+                return pickle.load(raw)  # entry written before codec headers
+            raw.seek(len(_MAGIC))
+            codec = _CODEC_NAMES[raw.read(1)[0]]
+            with _decompress_reader(codec, raw) as stream:
+                return pickle.load(stream)
         except Exception as exc:
-            logger.debug("remote cache get failed for %s: %s", digest, exc)
+            logger.debug("remote cache decode failed for %s: %s", digest, exc)
             return None
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
 
     def put(self, digest: str, value: Any) -> bool:
         """Store a value in the remote cache.
@@ -73,22 +146,24 @@ class RemoteCacheBackend:
         """
         key = self._cache_key(digest)
         try:
-            with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as tmp:
-                tmp_path = tmp.name
-                pickle.dump(value, tmp)
-
-            from .base import ArtifactKind
-
-            self._store.put(tmp_path, key, kind=ArtifactKind.BLOB)
+            raw = self._store.open(key, "wb")
+            try:
+                raw.write(_MAGIC + bytes([_CODECS[self._compression]]))
+                stream = _compress_writer(self._compression, raw)
+                pickle.dump(value, stream, protocol=pickle.HIGHEST_PROTOCOL)
+                if stream is not raw:
+                    stream.close()
+            except BaseException:
+                # Never publish a truncated entry.
+                discard = getattr(raw, "discard", None)
+                if discard is not None:
+                    discard()
+                raise
+            raw.close()
             return True
         except Exception as exc:
             logger.debug("remote cache put failed for %s: %s", digest, exc)
             return False
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
 
     def exists(self, digest: str) -> bool:
         """Check if a digest exists in remote cache."""
@@ -116,4 +191,4 @@ def get_remote_cache_backend() -> RemoteCacheBackend | None:
         return None
 
 
-__all__ = ["RemoteCacheBackend", "get_remote_cache_backend"]
+__all__ = ["CACHE_PREFIX", "RemoteCacheBackend", "get_remote_cache_backend"]
@@ -0,0 +1,209 @@
+"""Content-addressed blob storage used by :class:`LocalArtifactStore` CAS mode.
+
+Layout under the store root::
+
+    .cas/blobs/<aa>/<sha256>      # each unique file content stored once
+    .cas/refs/<key>.json          # artifact manifest: key -> blobs
+    .cas/tmp/                     # staging area for atomic blob writes
+
+Blobs are written read-only and never modified, so the same blob can back
+any number of keys and be materialized by linking instead of copying.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+try:  # POSIX only
+    import fcntl as _fcntl
+except ImportError:  # pragma: no cover - Windows
+    _fcntl = None  # type: ignore[assignment]
+
+#: Linux ``FICLONE`` ioctl (copy-on-write clone on btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+#: Materialization strategies, tried in order for ``"auto"``.
+LINK_MODES = ("auto", "reflink", "hardlink", "symlink", "copy")
+
+_CAS_DIR = ".cas"
+_BLOB_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def file_digest(path: Path) -> str:
+    """Compute the SHA-256 digest of a file."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    if _fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink unsupported on this platform")
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        try:
+            _fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dest.unlink(missing_ok=True)
+            raise
+
+
+class ContentStore:
+    """Deduplicating blob store plus key manifests rooted at ``root/.cas``."""
+
+    def __init__(self, root: Path, *, link_mode: str = "auto") -> None:
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"unknown link_mode {link_mode!r}; expected one of {list(LINK_MODES)}")
+        self.root = root
+        self.link_mode = link_mode
+        self.blobs_dir = root / _CAS_DIR / "blobs"
+        self.refs_dir = root / _CAS_DIR / "refs"
+        self.tmp_dir = root / _CAS_DIR / "tmp"
+        for path in (self.blobs_dir, self.refs_dir, self.tmp_dir):
+            path.mkdir(parents=True, exist_ok=True)
+
+    # -- blobs -------------------------------------------------------------
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    def add_blob(self, src: Path) -> tuple[str, int, bool]:
+        """Store ``src`` as a blob; returns ``(digest, size, newly_stored)``."""
+        digest = file_digest(src)
+        blob = self.blob_path(digest)
+        size = src.stat().st_size
+        if blob.exists():
+            try:
+                # Refresh the mtime so a concurrent sweep's grace period covers
+                # the blob until this writer's manifest references it.
+                os.utime(blob)
+                return digest, size, False
+            except FileNotFoundError:
+                pass  # swept in the meantime: store it again
+            except PermissionError:
+                return digest, size, False  # another user's blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix=f"{digest[:8]}.")
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp_name)
+            os.chmod(tmp_name, _BLOB_MODE)
+            # Concurrent writers of the same content race benignly here.
+            os.replace(tmp_name, blob)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return digest, size, True
+
+    def materialize(self, digest: str, dest: Path, *, mode: int | None = None) -> str:
+        """Place blob ``digest`` at ``dest``; returns the strategy used."""
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            raise FileNotFoundError(f"missing CAS blob {digest}")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+
+        modes = ("reflink", "hardlink", "copy") if self.link_mode == "auto" else (self.link_mode,)
+        for strategy in modes:
+            try:
+                if strategy == "reflink":
+                    _reflink(blob, dest)
+                elif strategy == "hardlink":
+                    os.link(blob, dest)
+                elif strategy == "symlink":
+                    os.symlink(blob.resolve(), dest)
+                else:
+                    shutil.copyfile(blob, dest)
+            except OSError:
+                if strategy == modes[-1]:
+                    raise
+                continue
+            # Hardlinks share the read-only blob inode; copies get the
+            # original file mode back.
+            if strategy in {"reflink", "copy"} and mode is not None:
+                os.chmod(dest, mode)
+            return strategy
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    # -- manifests ---------------------------------------------------------
+
+    def ref_path(self, key: str) -> Path:
+        return self.refs_dir / f"{key.strip('/')}.json"
+
+    def write_manifest(self, key: str, manifest: dict[str, Any]) -> None:
+        path = self.ref_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix="ref.")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        os.replace(tmp_name, path)
+
+    def read_manifest(self, key: str) -> dict[str, Any] | None:
+        path = self.ref_path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def delete(self, key: str) -> bool:
+        """Remove the manifest of ``key``; blobs are reclaimed by :meth:`sweep_blobs`."""
+        path = self.ref_path(key)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def sweep_blobs(
+        self, *, dry_run: bool = False, grace_period_s: float = 0.0, now: float | None = None
+    ) -> tuple[int, int]:
+        """Delete blobs no manifest references; returns ``(count, bytes)``.
+
+        Blobs modified within ``grace_period_s`` of ``now`` are kept: a
+        concurrent ``put`` stores (or refreshes) its blobs before writing the
+        manifest that references them.
+        """
+        now = time.time() if now is None else now
+        live: set[str] = set()
+        for ref in self.refs_dir.rglob("*.json"):
+            manifest = json.loads(ref.read_text(encoding="utf-8"))
+            live.update(entry["digest"] for entry in manifest.get("entries", []))
+        count = size = 0
+        for blob in self.blobs_dir.rglob("*"):
+            if not blob.is_file() or blob.name in live:
+                continue
+            try:
+                info = blob.stat()
+            except FileNotFoundError:
+                continue
+            if now - info.st_mtime < grace_period_s:
+                continue
+            count += 1
+            size += info.st_size
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+        return count, size
+
+    def keys(self, prefix: str = "") -> list[str]:
+        prefix = prefix.strip("/")
+        results: list[str] = []
+        for path in self.refs_dir.rglob("*.json"):
+            key = str(path.relative_to(self.refs_dir))[: -len(".json")]
+            if not prefix or key == prefix or key.startswith(prefix + "/"):
+                results.append(key)
+        return sorted(results)
+
+
+__all__ = ["LINK_MODES", "ContentStore", "file_digest"]
@@ -0,0 +1,302 @@
+"""Delta detection for directory artifacts.
+
+Directory artifacts carry a manifest, ``.scalable-manifest.json`` at the top
+of the stored directory, that records the relative path, size, mtime and
+SHA-256 of every file. Re-publishing a directory compares a fresh scan of the
+source against the stored manifest, rsync style: files whose size and mtime
+match the manifest are not even re-hashed, and only files whose content
+changed are transferred. Files missing from the source are deleted from the
+store.
+
+Downloads keep the same manifest, with the local copy's own mtimes, in a
+hidden sidecar next to the destination directory (never inside it, so the
+copy stays faithful), and fetching a directory again only transfers the
+files that differ from the local copy.
+
+The manifest is also a Merkle tree: every directory gets a digest over its
+children's names and digests, and the root digest identifies the whole
+directory's content. Stores return it as ``ArtifactRef.digest``, so equal
+directories can be recognized without transferring or re-reading them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .cas import file_digest
+
+#: Manifest file name inside a stored (or downloaded) directory artifact.
+MANIFEST_NAME = ".scalable-manifest.json"
+
+_MANIFEST_VERSION = 2
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Identity of one file inside a directory artifact."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"size": self.size, "mtime_ns": self.mtime_ns, "digest": self.digest}
+
+
+@dataclass
+class SyncPlan:
+    """Files to transfer and delete to make a target match a source.
+
+    Attributes
+    ----------
+    transfer:
+        Relative paths whose content is new or changed.
+    delete:
+        Relative paths present in the target but not in the source.
+    unchanged:
+        Relative paths whose content already matches.
+    """
+
+    transfer: list[str] = field(default_factory=list)
+    delete: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "transferred": len(self.transfer),
+            "deleted": len(self.delete),
+            "unchanged": len(self.unchanged),
+        }
+
+
+def _walk(root: Path) -> list[tuple[str, os.stat_result]]:
+    files: list[tuple[str, os.stat_result]] = []
+    for path in root.rglob("*"):
+        if path.name == MANIFEST_NAME or not path.is_file():
+            continue
+        files.append((path.relative_to(root).as_posix(), path.stat()))
+    return sorted(files)
+
+
+def scan_directory(
+    root: str | os.PathLike[str],
+    previous: dict[str, FileEntry] | None = None,
+    *,
+    max_workers: int | None = None,
+) -> dict[str, FileEntry]:
+    """Describe every file under ``root``.
+
+    Digests from ``previous`` are reused for files whose size and mtime are
+    unchanged, so only new or modified files are read. Those are hashed on
+    up to ``max_workers`` threads (hashing releases the GIL).
+    """
+    root = Path(root)
+    previous = previous or {}
+    entries: dict[str, FileEntry] = {}
+    stale: list[tuple[str, os.stat_result]] = []
+    for rel, stat in _walk(root):
+        known = previous.get(rel)
+        if known is not None and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+            entries[rel] = known
+        else:
+            stale.append((rel, stat))
+
+    paths = [root / rel for rel, _ in stale]
+    if len(paths) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            digests = list(pool.map(file_digest, paths))
+    else:
+        digests = [file_digest(path) for path in paths]
+    for (rel, stat), digest in zip(stale, digests, strict=True):
+        entries[rel] = FileEntry(stat.st_size, stat.st_mtime_ns, digest)
+    return dict(sorted(entries.items()))
+
+
+def merkle_tree(entries: dict[str, FileEntry]) -> dict[str, str]:
+    """Digest of every directory in ``entries``; ``""`` is the root.
+
+    A directory's digest is the SHA-256 of its sorted children, each given
+    as type, name and digest, so it changes exactly when some file below it
+    is added, removed, renamed or modified.
+    """
+    children: dict[str, list[str]] = {"": []}
+    for rel, entry in entries.items():
+        parent, _, name = rel.rpartition("/")
+        children.setdefault(parent, []).append(f"f\0{name}\0{entry.digest}")
+        # Register ancestors too; some hold only subdirectories.
+        ancestor = parent
+        while ancestor:
+            ancestor = ancestor.rpartition("/")[0]
+            children.setdefault(ancestor, [])
+
+    tree: dict[str, str] = {}
+    for directory in sorted(children, key=lambda d: d.count("/") + bool(d), reverse=True):
+        h = hashlib.sha256()
+        for line in sorted(children[directory]):
+            h.update(line.encode("utf-8") + b"\n")
+        tree[directory] = h.hexdigest()
+        if directory:
+            parent, _, name = directory.rpartition("/")
+            children[parent].append(f"d\0{name}\0{tree[directory]}")
+    return dict(sorted(tree.items()))
+
+
+def merkle_root(entries: dict[str, FileEntry]) -> str:
+    """Root digest identifying the content of a whole directory."""
+    return merkle_tree(entries)[""]
+
+
+def directory_digest(root: str | os.PathLike[str], *, max_workers: int | None = None) -> str:
+    """Merkle root of a local directory.
+
+    Reuses digests from a manifest left by :func:`sync_download` (or a
+    store) for files whose size and mtime are unchanged.
+    """
+    root = Path(root)
+    known = _read_manifest_file(download_manifest_path(root)) or read_local_manifest(root)
+    return merkle_root(scan_directory(root, known, max_workers=max_workers))
+
+
+def plan_sync(source: dict[str, FileEntry], target: dict[str, FileEntry]) -> SyncPlan:
+    """Compare two manifests by content digest."""
+    plan = SyncPlan()
+    for rel, entry in sorted(source.items()):
+        known = target.get(rel)
+        if known is not None and known.digest == entry.digest:
+            plan.unchanged.append(rel)
+        else:
+            plan.transfer.append(rel)
+    plan.delete = sorted(set(target) - set(source))
+    return plan
+
+
+def dump_manifest(entries: dict[str, FileEntry]) -> bytes:
+    tree = merkle_tree(entries)
+    payload = {
+        "version": _MANIFEST_VERSION,
+        "root": tree[""],
+        "tree": tree,
+        "files": {rel: entry.to_dict() for rel, entry in sorted(entries.items())},
+    }
+    return (json.dumps(payload, indent=2, sort_keys=True) + "\n").encode("utf-8")
+
+
+def load_manifest(data: bytes | str | None) -> dict[str, FileEntry] | None:
+    """Parse a manifest; returns ``None`` for missing or unreadable data."""
+    if not data:
+        return None
+    try:
+        payload = json.loads(data)
+        return {
+            str(rel): FileEntry(int(item["size"]), int(item["mtime_ns"]), str(item["digest"]))
+            for rel, item in payload["files"].items()
+        }
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def read_local_manifest(directory: Path) -> dict[str, FileEntry] | None:
+    return _read_manifest_file(directory / MANIFEST_NAME)
+
+
+def write_local_manifest(directory: Path, entries: dict[str, FileEntry]) -> None:
+    _write_manifest_file(directory / MANIFEST_NAME, entries)
+
+
+def download_manifest_path(dest: Path) -> Path:
+    """Sidecar where :func:`sync_download` keeps the manifest of ``dest``."""
+    return dest.parent / f".{dest.name}{MANIFEST_NAME}"
+
+
+def _read_manifest_file(path: Path) -> dict[str, FileEntry] | None:
+    try:
+        return load_manifest(path.read_bytes())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _write_manifest_file(path: Path, entries: dict[str, FileEntry]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(dump_manifest(entries))
+    os.replace(tmp, path)
+
+
+def restat(directory: Path, rel: str, digest: str) -> FileEntry:
+    """Entry for a file just written to ``directory`` with known content."""
+    stat = (directory / rel).stat()
+    return FileEntry(stat.st_size, stat.st_mtime_ns, digest)
+
+
+def sync_download(
+    dest: Path,
+    remote: dict[str, FileEntry],
+    fetch: Callable[[str, Path], Any],
+    run: Callable[[list[tuple[Any, tuple[Any, ...]]]], Any] | None = None,
+) -> SyncPlan:
+    """Make directory ``dest`` match the stored manifest ``remote``.
+
+    ``fetch(rel, path)`` copies one stored file to ``path``; ``run`` executes
+    the list of ``(fetch, args)`` jobs (sequentially by default). Files in
+    ``dest`` that are not in ``remote`` are removed. The local manifest is
+    kept at :func:`download_manifest_path`.
+    """
+    if dest.exists() and not dest.is_dir():
+        dest.unlink()
+    dest.mkdir(parents=True, exist_ok=True)
+    # Copies fetched before the sidecar existed kept the manifest inside.
+    (dest / MANIFEST_NAME).unlink(missing_ok=True)
+    state_path = download_manifest_path(dest)
+    known = _read_manifest_file(state_path)
+    local = scan_directory(dest, known)
+    if known is not None and local == known and merkle_root(local) == merkle_root(remote):
+        return SyncPlan(unchanged=list(local))  # local copy already matches
+    plan = plan_sync(remote, local)
+    for rel in plan.transfer:
+        (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+    jobs: list[tuple[Any, tuple[Any, ...]]] = [(fetch, (rel, dest / rel)) for rel in plan.transfer]
+    if run is not None:
+        run(jobs)
+    else:
+        for func, args in jobs:
+            func(*args)
+    for rel in plan.delete:
+        (dest / rel).unlink(missing_ok=True)
+    prune_empty_dirs(dest, plan.delete)
+
+    state = {rel: local[rel] for rel in plan.unchanged}
+    state.update({rel: restat(dest, rel, remote[rel].digest) for rel in plan.transfer})
+    _write_manifest_file(state_path, state)
+    return plan
+
+
+def prune_empty_dirs(root: Path, rels: list[str]) -> None:
+    """Remove directories left empty after deleting ``rels`` under ``root``."""
+    parents = {parent for rel in rels for parent in Path(rel).parents if parent != Path(".")}
+    for parent in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+        try:
+            (root / parent).rmdir()
+        except OSError:
+            pass
+
+
+__all__ = [
+    "MANIFEST_NAME",
+    "FileEntry",
+    "SyncPlan",
+    "directory_digest",
+    "download_manifest_path",
+    "dump_manifest",
+    "load_manifest",
+    "merkle_root",
+    "merkle_tree",
+    "plan_sync",
+    "scan_directory",
+    "sync_download",
+]
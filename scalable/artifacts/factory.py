@@ -6,7 +6,7 @@ from .base import ArtifactStore
 from .local import LocalArtifactStore
 
 
-def build_artifact_store(uri: str) -> ArtifactStore:
+def build_artifact_store(uri: str, *, cas: bool = False, index: bool = False) -> ArtifactStore:
     """Build an :class:`ArtifactStore` from a URI string.
 
     Parameters
@@ -17,6 +17,15 @@ def build_artifact_store(uri: str) -> ArtifactStore:
         - ``s3://bucket/prefix`` — :class:`FsspecArtifactStore`
         - ``gs://bucket/prefix`` — :class:`FsspecArtifactStore`
         - ``memory://...`` — :class:`FsspecArtifactStore` (testing)
+    cas : bool
+        Use content-addressed mode for local stores (ignored for remote
+        stores).
+    index : bool
+        Maintain a key index for fast paginated listing of local stores
+        (ignored for remote stores).
+
+    Remote stores read through the node-local cache when
+    ``SCALABLE_ARTIFACT_CACHE_DIR`` is set.
 
     Returns
     -------
@@ -25,15 +34,16 @@ def build_artifact_store(uri: str) -> ArtifactStore:
     """
     if uri.startswith("file://"):
         path = uri[len("file://"):]
-        return LocalArtifactStore(root=path)
+        return LocalArtifactStore(root=path, cas=cas, index=index)
 
     if uri.startswith("/") or uri.startswith("./") or uri.startswith(".."):
-        return LocalArtifactStore(root=uri)
+        return LocalArtifactStore(root=uri, cas=cas, index=index)
 
     # Remote stores require fsspec
     from .fsspec_store import FsspecArtifactStore
+    from .node_cache import get_node_cache
 
-    return FsspecArtifactStore(uri)
+    return FsspecArtifactStore(uri, node_cache=get_node_cache())
 
 
 __all__ = ["build_artifact_store"]
@@ -2,11 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from . import dirsync, packing
+from .aio import AsyncArtifactMixin, run_on_loop
 from .base import ArtifactKind, ArtifactRef
+from .listing import PaginatedListingMixin, walk_keys
+from .node_cache import NodeCache, version_token
+
+#: Default size of one multipart upload part / ranged download read.
+DEFAULT_PART_SIZE: int = 16 * 1024 * 1024
+
+#: Default number of concurrent part or file transfers.
+DEFAULT_MAX_CONCURRENCY: int = 8
+
+#: ``merge`` limits per protocol: minimum size of every source but the last,
+#: and maximum number of sources in one call. S3 stitches parts with
+#: UploadPartCopy (5 MiB minimum, 10,000 parts); GCS compose accepts at most
+#: 32 sources per request.
+_MERGE_LIMITS: dict[str, tuple[int, int | None]] = {
+    "s3": (5 * 1024 * 1024, 10_000),
+    "s3a": (5 * 1024 * 1024, 10_000),
+    "gs": (0, 32),
+    "gcs": (0, 32),
+}
+
+
+def _info_mtime(info: dict[str, Any]) -> float | None:
+    """Modification time (epoch seconds) from an fsspec ``info`` payload."""
+    for name in ("mtime", "LastModified", "last_modified", "updated", "created"):
+        value = info.get(name)
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            continue
+    return None
 
 
 def _import_fsspec():
@@ -22,17 +67,49 @@ def _import_fsspec():
         ) from exc
 
 
-class FsspecArtifactStore:
+class FsspecArtifactStore(PaginatedListingMixin, AsyncArtifactMixin):
     """Artifact store backed by any fsspec-compatible filesystem.
 
     Supports S3 (``s3://``), GCS (``gs://``), and ``memory://`` for tests.
 
+    Files larger than ``part_size`` are transferred in parts, up to
+    ``max_concurrency`` at a time. Uploads read the local file once: each
+    part feeds the SHA-256 digest and is then handed to the upload pool.
+    Parts are stitched with the filesystem's ``merge`` (S3 multipart copy,
+    GCS compose); filesystems without it receive one streamed write. Upload
+    parts are never smaller than the backend allows, and parts beyond the
+    per-call source limit are composed in a tree of intermediate objects.
+    Downloads use concurrent ranged reads. Directories are transferred file
+    by file through a bounded worker pool, and only the files that differ
+    from the directory's stored manifest (see :mod:`scalable.artifacts.dirsync`)
+    are sent or fetched again.
+
+    The awaitable API (:class:`~scalable.artifacts.base.AsyncArtifactStore`)
+    drives async filesystems (``s3fs``, ``gcsfs``, ...) natively on fsspec's
+    I/O loop for single-file transfers, existence checks and listings, and
+    falls back to worker threads otherwise.
+
+    :meth:`iter_artifacts` and :meth:`list_page` list one directory level per
+    request, so memory is bounded by the largest directory rather than the
+    whole store.
+
     Parameters
     ----------
     uri : str
         Base URI for the store (e.g. ``s3://bucket/artifacts/``).
     storage_options : dict[str, Any] | None
         Keyword arguments passed to ``fsspec.filesystem()``.
+    part_size : int
+        Part size in bytes for multipart uploads and ranged downloads. Uploads
+        raise it to the backend minimum (5 MiB on S3) when it is smaller.
+    max_concurrency : int
+        Maximum concurrent part or file transfers.
+    filesystem : Any | None
+        Pre-built fsspec filesystem to use instead of constructing one.
+    node_cache : NodeCache | None
+        Node-local read-through cache for downloads. Each object is validated
+        with one ``info`` call and fetched from the remote only when this node
+        has no copy of that version yet.
     """
 
     def __init__(
@@ -40,13 +117,30 @@ class FsspecArtifactStore:
         uri: str,
         *,
         storage_options: dict[str, Any] | None = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        filesystem: Any | None = None,
+        node_cache: NodeCache | None = None,
     ) -> None:
         fsspec = _import_fsspec()
+        if part_size < 1:
+            raise ValueError("part_size must be a positive number of bytes")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self._uri = uri.rstrip("/")
         self._storage_options = storage_options or {}
         # Parse protocol from URI
         self._protocol = fsspec.utils.get_protocol(uri)
-        self._fs = fsspec.filesystem(self._protocol, **self._storage_options)
+        if filesystem is None:
+            filesystem = fsspec.filesystem(self._protocol, **self._storage_options)
+        self._fs = filesystem
+        self.part_size = int(part_size)
+        self.max_concurrency = int(max_concurrency)
+        self._node_cache = node_cache
+
+    @property
+    def node_cache(self) -> NodeCache | None:
+        return self._node_cache
 
     @property
     def scheme(self) -> str:
@@ -66,45 +160,315 @@ class FsspecArtifactStore:
         remote_key: str,
         *,
         kind: ArtifactKind | None = None,
+        pack: bool | str = False,
     ) -> ArtifactRef:
-        """Upload a local file or directory to the remote store."""
+        """Upload a local file or directory to the remote store.
+
+        ``pack`` uploads a directory as one seekable archive (see
+        :mod:`scalable.artifacts.packing`); pass ``True`` or a codec name.
+        """
         src = Path(local_path)
         remote = self._remote_path(remote_key)
 
         if kind is None:
             kind = ArtifactKind.DIRECTORY if src.is_dir() else ArtifactKind.FILE
 
+        if src.is_dir() and pack:
+            return self._put_packed(src, remote, kind, packing.resolve_codec(pack))
         if src.is_dir():
-            self._fs.put(str(src), remote, recursive=True)
-            size = sum(
-                f.stat().st_size for f in src.rglob("*") if f.is_file()
-            )
-            digest = None
-        else:
-            self._fs.put(str(src), remote)
-            size = src.stat().st_size
-            digest = self._compute_local_digest(src)
+            return self._put_directory(src, remote, kind)
 
+        digest = self._upload_file(src, remote, True)
         return ArtifactRef(
             uri=remote,
             kind=kind,
             digest=digest,
-            size_bytes=size,
+            size_bytes=src.stat().st_size,
+        )
+
+    def _read_manifest(self, remote: str) -> dict[str, dirsync.FileEntry] | None:
+        try:
+            return dirsync.load_manifest(self._fs.cat_file(f"{remote}/{dirsync.MANIFEST_NAME}"))
+        except FileNotFoundError:
+            return None
+
+    def _put_packed(self, src: Path, remote: str, kind: ArtifactKind, codec: str) -> ArtifactRef:
+        """Upload ``src`` as one sequentially written archive plus its index."""
+        entries = dirsync.scan_directory(src)
+        if self._fs.exists(remote):
+            self._fs.rm(remote, recursive=True)
+        pack_remote = f"{remote}/{packing.PACK_NAME}"
+        with self._fs.open(pack_remote, "wb", block_size=self.part_size) as out:
+            index = packing.write_pack(src, out, codec=codec, entries=entries)
+        self._fs.pipe_file(f"{remote}/{packing.INDEX_NAME}", packing.dump_index(index))
+        return ArtifactRef(
+            uri=remote,
+            kind=kind,
+            digest=index["root"],
+            size_bytes=sum(entry.size for entry in entries.values()),
+            metadata={
+                "packed": True,
+                "codec": codec,
+                "members": len(entries),
+                "pack_bytes": self._fs.size(pack_remote),
+            },
         )
 
-    def get(self, remote_key: str, local_path: str) -> str:
-        """Download a stored artifact to a local path."""
+    def _read_pack_index(self, remote: str) -> dict[str, Any] | None:
+        try:
+            return packing.load_index(self._fs.cat_file(f"{remote}/{packing.INDEX_NAME}"))
+        except FileNotFoundError:
+            return None
+
+    def _get_packed(
+        self, remote: str, index: dict[str, Any], dest: Path, member: str | None
+    ) -> None:
+        pack_remote = f"{remote}/{packing.PACK_NAME}"
+        if member is not None:
+            packing.extract_member(
+                index,
+                member,
+                lambda start, end: self._fs.cat_file(pack_remote, start=start, end=end),
+                dest,
+            )
+            return
+        # One large (parallel, node-cached) transfer, then local extraction.
+        tmp = dest.parent / f".{dest.name}.pack-{uuid.uuid4().hex[:12]}"
+        try:
+            self._download_file(pack_remote, tmp, True)
+            packing.extract_all(index, tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _put_directory(self, src: Path, remote: str, kind: ArtifactKind) -> ArtifactRef:
+        """Upload only new or changed files and remove files deleted from ``src``."""
+        stored = self._read_manifest(remote)
+        entries = dirsync.scan_directory(src, stored)
+        plan = dirsync.plan_sync(entries, stored or {})
+        if stored is not None or self._fs.exists(remote):
+            base = self._fs._strip_protocol(remote).rstrip("/") + "/"
+            existing = {path[len(base):] for path in self._fs.find(remote) if path.startswith(base)}
+            if stored is None:
+                # Uploaded before manifests existed: drop files no longer in src.
+                plan.delete = sorted(existing - set(entries))
+            else:
+                # Restore files removed from the store behind the manifest's back.
+                missing = {rel for rel in plan.unchanged if rel not in existing}
+                if missing:
+                    plan.unchanged = [rel for rel in plan.unchanged if rel not in missing]
+                    plan.transfer = sorted([*plan.transfer, *missing])
+
+        self._run_bounded(
+            [(self._upload_file, (src / rel, f"{remote}/{rel}", False)) for rel in plan.transfer]
+        )
+        if plan.delete:
+            try:
+                self._fs.rm([f"{remote}/{rel}" for rel in plan.delete])
+            except FileNotFoundError:
+                pass
+        # Written last: an interrupted sync is redone against the old manifest.
+        self._fs.pipe_file(f"{remote}/{dirsync.MANIFEST_NAME}", dirsync.dump_manifest(entries))
+
+        return ArtifactRef(
+            uri=remote,
+            kind=kind,
+            digest=dirsync.merkle_root(entries),
+            size_bytes=sum(entry.size for entry in entries.values()),
+            metadata=plan.stats(),
+        )
+
+    def get(self, remote_key: str, local_path: str, *, member: str | None = None) -> str:
+        """Download a stored artifact to a local path.
+
+        ``member`` fetches a single file of a directory artifact; for packed
+        artifacts it is one ranged read of the archive.
+        """
         remote = self._remote_path(remote_key)
         dest = Path(local_path)
         dest.parent.mkdir(parents=True, exist_ok=True)
 
-        if self._fs.isdir(remote):
-            self._fs.get(remote, str(dest), recursive=True)
+        is_dir = self._fs.isdir(remote)
+        index = self._read_pack_index(remote) if is_dir else None
+        if index is not None:
+            self._get_packed(remote, index, dest, member)
+            return str(dest)
+        if member is not None:
+            return self.get(f"{remote_key}/{member.strip('/')}", local_path)
+
+        stored = self._read_manifest(remote) if is_dir else None
+        if stored is not None:
+            dirsync.sync_download(
+                dest,
+                stored,
+                lambda rel, target: self._download_file(f"{remote}/{rel}", target, False),
+                self._run_bounded,
+            )
+        elif is_dir:
+            base = self._fs._strip_protocol(remote).rstrip("/") + "/"
+            jobs = []
+            for path, info in sorted(self._fs.find(remote, detail=True).items()):
+                rel = path[len(base):] if path.startswith(base) else path.rsplit("/", 1)[-1]
+                jobs.append((self._download_file, (path, dest / rel, False, info)))
+            dest.mkdir(parents=True, exist_ok=True)
+            self._run_bounded(jobs)
         else:
-            self._fs.get(remote, str(dest))
+            self._download_file(remote, dest, True)
 
         return str(dest)
 
+    # -- transfer engine ---------------------------------------------------
+
+    def _run_bounded(self, jobs: list[tuple[Any, tuple[Any, ...]]]) -> list[Any]:
+        """Run ``(func, args)`` jobs on at most ``max_concurrency`` threads."""
+        if len(jobs) <= 1 or self.max_concurrency == 1:
+            return [func(*args) for func, args in jobs]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = [pool.submit(func, *args) for func, args in jobs]
+            return [future.result() for future in futures]
+
+    def _upload_file(self, src: Path, remote: str, parallel: bool) -> str:
+        """Upload one file, returning its SHA-256 computed while reading it."""
+        size = src.stat().st_size
+        h = hashlib.sha256()
+        min_part, max_sources = _MERGE_LIMITS.get(self._protocol, (0, None))
+        part_size = max(self.part_size, min_part)
+        if parallel and size > part_size and hasattr(self._fs, "merge"):
+            self._upload_multipart(src, remote, h, part_size, max_sources)
+            return h.hexdigest()
+        with open(src, "rb") as fsrc, self._fs.open(remote, "wb", block_size=self.part_size) as fdst:
+            for chunk in iter(lambda: fsrc.read(self.part_size), b""):
+                h.update(chunk)
+                fdst.write(chunk)
+        return h.hexdigest()
+
+    def _upload_multipart(
+        self, src: Path, remote: str, h: Any, part_size: int, max_sources: int | None
+    ) -> None:
+        staging = f"{remote}.parts-{uuid.uuid4().hex[:12]}"
+        slots = threading.BoundedSemaphore(self.max_concurrency)
+        part_paths: list[str] = []
+        futures: list[Future[None]] = []
+
+        def _put_part(path: str, data: bytes) -> None:
+            try:
+                self._fs.pipe_file(path, data)
+            finally:
+                slots.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool, open(src, "rb") as fsrc:
+                for index, chunk in enumerate(iter(lambda: fsrc.read(part_size), b"")):
+                    h.update(chunk)
+                    # Bound buffered parts to max_concurrency * part_size bytes.
+                    slots.acquire()
+                    path = f"{staging}/{index:06d}"
+                    part_paths.append(path)
+                    futures.append(pool.submit(_put_part, path, chunk))
+                for future in futures:
+                    future.result()
+            self._merge(remote, part_paths, staging, max_sources)
+        finally:
+            try:
+                self._fs.rm(staging, recursive=True)
+            except FileNotFoundError:
+                pass
+
+    def _merge(self, remote: str, parts: list[str], staging: str, max_sources: int | None) -> None:
+        """Merge ``parts`` into ``remote`` with at most ``max_sources`` per call."""
+        level = 0
+        while max_sources is not None and len(parts) > max_sources:
+            groups = [parts[i : i + max_sources] for i in range(0, len(parts), max_sources)]
+            merged = [f"{staging}/merge{level}/{index:06d}" for index in range(len(groups))]
+            self._run_bounded(
+                [(self._fs.merge, (path, group)) for path, group in zip(merged, groups, strict=True)]
+            )
+            parts = merged
+            level += 1
+        self._fs.merge(remote, parts)
+
+    def _download_file(
+        self,
+        remote: str,
+        dest: Path,
+        parallel: bool,
+        info: dict[str, Any] | None = None,
+    ) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if self._node_cache is None:
+            size = info.get("size") if info else (self._fs.size(remote) if parallel else None)
+            self._transfer_download(remote, dest, parallel, size)
+            return
+        info = info or self._fs.info(remote)
+        self._node_cache.fetch(
+            remote,
+            version_token(info),
+            dest,
+            lambda path: self._transfer_download(remote, path, parallel, info.get("size")),
+        )
+
+    def _transfer_download(
+        self, remote: str, dest: Path, parallel: bool, size: int | None
+    ) -> None:
+        if not parallel or size is None or size <= self.part_size or self.max_concurrency == 1:
+            self._fs.get(remote, str(dest))
+            return
+
+        with open(dest, "wb") as fh:
+            fh.truncate(size)
+        fd = os.open(dest, os.O_WRONLY)
+        try:
+
+            def _fetch(start: int) -> None:
+                end = min(start + self.part_size, size)
+                os.pwrite(fd, self._fs.cat_file(remote, start=start, end=end), start)
+
+            self._run_bounded([(_fetch, (start,)) for start in range(0, size, self.part_size)])
+        finally:
+            os.close(fd)
+
+    def open(self, remote_key: str, mode: str = "rb") -> Any:
+        """Open a remote object for streaming ``"rb"`` or ``"wb"`` access.
+
+        Writes are uploaded in ``part_size`` blocks as they are produced.
+        """
+        if mode not in {"rb", "wb"}:
+            raise ValueError(f"unsupported mode {mode!r}; expected 'rb' or 'wb'")
+        return self._fs.open(self._remote_path(remote_key), mode, block_size=self.part_size)
+
+    def read_bytes(self, remote_key: str) -> bytes:
+        """Fetch a remote object with a single GET.
+
+        Raises ``FileNotFoundError`` when the object does not exist.
+        """
+        return self._fs.cat_file(self._remote_path(remote_key))
+
+    def stat(self, remote_key: str) -> tuple[int, float | None]:
+        """Return ``(size_bytes, mtime)`` of a remote object from one ``info`` call."""
+        info = self._fs.info(self._remote_path(remote_key))
+        return int(info.get("size") or 0), _info_mtime(info)
+
+    def delete_many(self, remote_keys: Iterable[str], *, batch_size: int = 1000) -> int:
+        """Delete objects in batches (S3 accepts up to 1000 keys per request).
+
+        Batches run concurrently, up to ``max_concurrency`` at a time; returns
+        the number of keys submitted for deletion.
+        """
+        paths = [self._remote_path(key) for key in remote_keys]
+
+        def _rm(batch: list[str]) -> None:
+            try:
+                self._fs.rm(batch)
+            except FileNotFoundError:
+                for path in batch:  # some already gone; delete the rest one by one
+                    try:
+                        self._fs.rm(path)
+                    except FileNotFoundError:
+                        pass
+
+        batches = [paths[i : i + batch_size] for i in range(0, len(paths), max(batch_size, 1))]
+        self._run_bounded([(_rm, (batch,)) for batch in batches])
+        return len(paths)
+
     def exists(self, remote_key: str) -> bool:
         """Check if an artifact exists at the given key."""
         remote = self._remote_path(remote_key)
@@ -117,24 +481,123 @@ class FsspecArtifactStore:
             entries = self._fs.ls(search_path, detail=False)
         except FileNotFoundError:
             return []
-        # Strip base URI prefix to return relative keys
-        base = self._uri + "/"
+        return self._relative_keys(entries)
+
+    def _listdir(self, rel_dir: str) -> Iterator[tuple[str, bool]]:
+        path = self._remote_path(rel_dir) if rel_dir else self._uri
+        for info in self._fs.ls(path, detail=True):
+            name = info["name"].rstrip("/").rsplit("/", 1)[-1]
+            if name == dirsync.MANIFEST_NAME:
+                continue
+            yield name, info.get("type") == "directory"
+
+    def iter_artifacts(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        start_after: str | None = None,
+    ) -> Iterator[str]:
+        """Yield keys starting with ``prefix`` in lexicographic order.
+
+        Directories are listed lazily, one ``ls`` per directory visited;
+        subtrees outside the prefix or before ``start_after`` are skipped.
+        """
+        return walk_keys(self._listdir, prefix, delimiter=delimiter, start_after=start_after)
+
+    def exists_many(self, remote_keys: Iterable[str]) -> list[bool]:
+        """Check many keys with one listing per parent directory."""
+        keys = list(remote_keys)
+        parents: dict[str, set[str]] = {}
+        for key in keys:
+            parent, _, name = key.strip("/").rpartition("/")
+            parents.setdefault(parent, set()).add(name)
+
+        def _present(parent: str) -> tuple[str, set[str]]:
+            try:
+                return parent, {name for name, _ in self._listdir(parent)}
+            except FileNotFoundError:
+                return parent, set()
+
+        found = dict(self._run_bounded([(_present, (parent,)) for parent in parents]))
+        results = []
+        for key in keys:
+            parent, _, name = key.strip("/").rpartition("/")
+            results.append(name in found[parent])
+        return results
+
+    def _relative_keys(self, entries: list[str]) -> list[str]:
+        # Strip base URI prefix to return relative keys; filesystems return
+        # entries with or without the protocol.
+        bases = (self._uri + "/", self._fs._strip_protocol(self._uri).rstrip("/") + "/")
         results: list[str] = []
         for entry in sorted(entries):
-            if entry.startswith(base):
-                results.append(entry[len(base):])
+            for base in bases:
+                if entry.startswith(base):
+                    results.append(entry[len(base):])
+                    break
             else:
                 results.append(entry)
         return results
 
-    @staticmethod
-    def _compute_local_digest(path: Path) -> str:
-        """Compute SHA-256 of a local file."""
-        h = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return h.hexdigest()
+
+    # -- async API -----------------------------------------------------------
+
+    @property
+    def _native_async(self) -> bool:
+        return bool(getattr(self._fs, "async_impl", False))
+
+    async def aput(
+        self,
+        local_path: str,
+        remote_key: str,
+        *,
+        kind: ArtifactKind | None = None,
+    ) -> ArtifactRef:
+        src = Path(local_path)
+        if not self._native_async or src.is_dir() or src.stat().st_size > self.part_size:
+            return await super().aput(local_path, remote_key, kind=kind)
+
+        def _read() -> tuple[bytes, str]:
+            data = src.read_bytes()
+            return data, hashlib.sha256(data).hexdigest()
+
+        data, digest = await asyncio.to_thread(_read)
+        remote = self._remote_path(remote_key)
+        await run_on_loop(self._fs.loop, self._fs._pipe_file(remote, data))
+        return ArtifactRef(
+            uri=remote,
+            kind=kind or ArtifactKind.FILE,
+            digest=digest,
+            size_bytes=len(data),
+        )
+
+    async def aget(self, remote_key: str, local_path: str) -> str:
+        remote = self._remote_path(remote_key)
+        if not self._native_async or self._node_cache is not None:
+            return await super().aget(remote_key, local_path)
+        info = await run_on_loop(self._fs.loop, self._fs._info(remote))
+        if info.get("type") == "directory" or int(info.get("size") or 0) > self.part_size:
+            return await super().aget(remote_key, local_path)
+        dest = Path(local_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        await run_on_loop(self._fs.loop, self._fs._get_file(remote, str(dest)))
+        return str(dest)
+
+    async def aexists(self, remote_key: str) -> bool:
+        if not self._native_async:
+            return await super().aexists(remote_key)
+        return await run_on_loop(self._fs.loop, self._fs._exists(self._remote_path(remote_key)))
+
+    async def alist(self, prefix: str = "") -> list[str]:
+        if not self._native_async:
+            return await super().alist(prefix)
+        search_path = self._remote_path(prefix) if prefix else self._uri
+        try:
+            entries = await run_on_loop(self._fs.loop, self._fs._ls(search_path, detail=False))
+        except FileNotFoundError:
+            return []
+        return self._relative_keys(entries)
 
 
-__all__ = ["FsspecArtifactStore"]
+__all__ = ["DEFAULT_MAX_CONCURRENCY", "DEFAULT_PART_SIZE", "FsspecArtifactStore"]
@@ -0,0 +1,348 @@
+"""Mark-and-sweep garbage collection for artifact stores.
+
+Artifacts recorded with ``record_artifact`` and remote cache entries
+accumulate forever. :func:`collect_garbage` reclaims them:
+
+**Mark.** Live roots are the ``location`` of every artifact listed in
+``artifacts.jsonl`` of the *retained* runs (all run directories under
+``runs_dir``, or only the newest ``keep_last``), plus the remote cache
+entries ``cache/<xx>/<digest>`` whose digest is a key of the local cache.
+A live location keeps everything stored below it (directory artifacts).
+
+**Sweep.** Every other key in the store (or under ``prefix``) is a
+candidate. Candidates younger than ``grace_period_s`` are kept, so artifacts
+uploaded by a running session but not yet recorded survive. The rest are
+sized in parallel and, unless ``dry_run``, deleted in parallel batches.
+A directory artifact whose files are all swept loses its stored sync
+manifest too, or a later ``put`` of the same directory would trust it and
+upload nothing. CAS stores then drop blobs no manifest references, under
+the same grace period.
+
+GC only knows what telemetry recorded: point it at a store (or prefix) that
+holds run outputs and cache entries only.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from scalable.common import logger
+
+from .base import ArtifactStore
+from .cache import CACHE_PREFIX
+from .dirsync import MANIFEST_NAME
+
+#: Default minimum age of an unreferenced object before it is deleted.
+DEFAULT_GRACE_PERIOD_S: float = 3600.0
+
+#: Default number of keys per delete request.
+DEFAULT_BATCH_SIZE: int = 1000
+
+
+@dataclass
+class GCReport:
+    """Outcome of one :func:`collect_garbage` pass."""
+
+    dry_run: bool
+    runs_scanned: int = 0
+    live_roots: int = 0
+    live_cache_keys: int = 0
+    keys_scanned: int = 0
+    keys_live: int = 0
+    keys_recent: int = 0
+    keys_deleted: int = 0
+    bytes_reclaimed: int = 0
+    blobs_deleted: int = 0
+    blob_bytes_reclaimed: int = 0
+    errors: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def retained_run_dirs(runs_dir: str | Path, *, keep_last: int | None = None) -> list[Path]:
+    """Run directories whose artifacts are live, oldest first."""
+    from scalable.telemetry.collectors import iter_run_dirs
+
+    runs = iter_run_dirs(runs_dir)
+    if keep_last is not None:
+        runs = runs[-keep_last:] if keep_last > 0 else []
+    return runs
+
+
+def live_locations(run_dirs: list[Path]) -> set[str]:
+    """Artifact locations recorded by ``run_dirs``."""
+    from scalable.telemetry.collectors import read_jsonl
+
+    locations: set[str] = set()
+    for run_dir in run_dirs:
+        for row in read_jsonl(run_dir / "artifacts.jsonl"):
+            location = row.get("location")
+            if location:
+                locations.add(str(location))
+    return locations
+
+
+def live_cache_digests(cache_dir: str | Path | None) -> set[str]:
+    """Digests of the entries in the local (diskcache) cache."""
+    if cache_dir is None or not Path(cache_dir).exists():
+        return set()
+    from diskcache import Cache
+
+    with Cache(directory=str(cache_dir)) as cache:
+        return {str(key) for key in cache.iterkeys()}
+
+
+def location_key(store: ArtifactStore, location: str) -> str | None:
+    """Map a recorded location (URI, path or key) to a key of ``store``.
+
+    Returns ``None`` for locations outside the store.
+    """
+    root = getattr(store, "root", None)
+    if root is not None:
+        if location.startswith("file://"):
+            location = unquote(urlparse(location).path)
+        elif "://" in location:
+            return None
+        path = Path(location)
+        if not path.is_absolute():
+            return path.as_posix().strip("/")
+        try:
+            return path.resolve().relative_to(Path(root).resolve()).as_posix()
+        except ValueError:
+            return None
+
+    base = getattr(store, "base_uri", None)
+    if base is None:
+        return None
+    if "://" not in location:
+        return location.strip("/")
+    bare = base.split("://", 1)[-1]
+    for candidate in (base, bare):
+        if location.startswith(candidate.rstrip("/") + "/"):
+            return location[len(candidate.rstrip("/")) + 1 :].strip("/")
+    loc_bare = location.split("://", 1)[-1]
+    if loc_bare.startswith(bare.rstrip("/") + "/"):
+        return loc_bare[len(bare.rstrip("/")) + 1 :].strip("/")
+    return None
+
+
+def _is_live(key: str, roots: set[str], cache_digests: set[str]) -> bool:
+    if key in roots or any(parent in roots for parent in _ancestors(key)):
+        return True
+    parts = key.split("/")
+    if len(parts) == 3 and parts[0] == CACHE_PREFIX:
+        return parts[2] in cache_digests
+    return False
+
+
+def _ancestors(key: str) -> Iterator[str]:
+    parent = key
+    while "/" in parent:
+        parent = parent.rsplit("/", 1)[0]
+        yield parent
+
+
+def _iter_keys(store: ArtifactStore, prefix: str) -> Any:
+    iter_artifacts = getattr(store, "iter_artifacts", None)
+    if iter_artifacts is not None:
+        return iter_artifacts(prefix)
+    return iter(store.list_artifacts(prefix))
+
+
+def collect_garbage(
+    store: ArtifactStore,
+    *,
+    runs_dir: str | Path,
+    cache_dir: str | Path | None = None,
+    keep_last: int | None = None,
+    prefix: str = "",
+    grace_period_s: float = DEFAULT_GRACE_PERIOD_S,
+    dry_run: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 8,
+    now: float | None = None,
+) -> GCReport:
+    """Delete objects of ``store`` that no retained run or live cache entry references.
+
+    Parameters
+    ----------
+    store:
+        Store to collect; keys are streamed with ``iter_artifacts`` when the
+        store supports it.
+    runs_dir:
+        Telemetry runs directory providing the live artifact locations.
+    cache_dir:
+        Local cache directory whose keys keep remote cache entries alive.
+    keep_last:
+        Only the newest ``keep_last`` runs are retained; ``None`` keeps all.
+    prefix:
+        Restrict the sweep to keys starting with ``prefix``.
+    grace_period_s:
+        Unreferenced objects modified more recently than this are kept.
+    dry_run:
+        Report what would be deleted without deleting it.
+    batch_size:
+        Keys per delete request.
+    max_workers:
+        Concurrent ``stat``/delete requests.
+    """
+    report = GCReport(dry_run=dry_run)
+    now = time.time() if now is None else now
+
+    runs = retained_run_dirs(runs_dir, keep_last=keep_last)
+    report.runs_scanned = len(runs)
+    roots = {
+        key
+        for key in (location_key(store, loc) for loc in live_locations(runs))
+        if key is not None
+    }
+    report.live_roots = len(roots)
+    cache_digests = live_cache_digests(cache_dir)
+    report.live_cache_keys = len(cache_digests)
+
+    candidates: list[str] = []
+    kept_dirs: set[str] = set()
+    for key in _iter_keys(store, prefix):
+        report.keys_scanned += 1
+        if _is_live(key, roots, cache_digests):
+            report.keys_live += 1
+            kept_dirs.update(_ancestors(key))
+        else:
+            candidates.append(key)
+
+    def _stat(key: str) -> tuple[str, int, float | None, str | None]:
+        try:
+            size, mtime = store.stat(key)  # type: ignore[attr-defined]
+            return key, size, mtime, None
+        except Exception as exc:  # noqa: BLE001 - reported, never fatal
+            return key, 0, None, f"stat {key}: {exc}"
+
+    workers = max(int(max_workers), 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats = list(pool.map(_stat, candidates))
+
+    sweep: list[str] = []
+    for key, size, mtime, error in stats:
+        if error is not None:
+            report.errors.append(error)
+            kept_dirs.update(_ancestors(key))
+            continue
+        # Unknown age counts as recent: never delete what might be in flight.
+        if mtime is None or now - mtime < grace_period_s:
+            report.keys_recent += 1
+            kept_dirs.update(_ancestors(key))
+            continue
+        sweep.append(key)
+        report.bytes_reclaimed += size
+
+    # Sync manifests are hidden from listings: sweep those of emptied directories.
+    emptied = {
+        parent
+        for key in sweep
+        for parent in _ancestors(key)
+        if f"{parent}/".startswith(prefix) and parent not in kept_dirs
+    }
+
+    def _stat_manifest(directory: str) -> tuple[str, int, float | None, str | None] | None:
+        key = f"{directory}/{MANIFEST_NAME}"
+        try:
+            size, mtime = store.stat(key)  # type: ignore[attr-defined]
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # noqa: BLE001 - reported, never fatal
+            return key, 0, None, f"stat {key}: {exc}"
+        return key, size, mtime, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        manifests = [m for m in pool.map(_stat_manifest, sorted(emptied)) if m is not None]
+    for key, size, mtime, error in manifests:
+        if error is not None:
+            report.errors.append(error)
+        elif mtime is not None and now - mtime >= grace_period_s:
+            sweep.append(key)
+            report.bytes_reclaimed += size
+    report.keys_deleted = len(sweep)
+    report.deleted = sweep
+
+    if not dry_run and sweep:
+        batches = [sweep[i : i + batch_size] for i in range(0, len(sweep), max(batch_size, 1))]
+
+        def _delete(batch: list[str]) -> str | None:
+            try:
+                store.delete_many(batch)  # type: ignore[attr-defined]
+            except Exception as exc:  # noqa: BLE001
+                return f"delete {batch[0]}..: {exc}"
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            report.errors.extend(e for e in pool.map(_delete, batches) if e is not None)
+
+    sweep_blobs = getattr(store, "sweep_blobs", None)
+    if sweep_blobs is not None:
+        report.blobs_deleted, report.blob_bytes_reclaimed = sweep_blobs(
+            dry_run=dry_run, grace_period_s=grace_period_s, now=now
+        )
+
+    logger.info(
+        "artifact gc%s: %d keys scanned, %d live, %d %s (%d bytes)",
+        " (dry run)" if dry_run else "",
+        report.keys_scanned,
+        report.keys_live,
+        report.keys_deleted,
+        "to delete" if dry_run else "deleted",
+        report.bytes_reclaimed,
+    )
+    return report
+
+
+def render_text_report(report: GCReport, *, store_uri: str) -> str:
+    verb = "would delete" if report.dry_run else "deleted"
+    lines = [
+        f"store: {store_uri}",
+        f"mode: {'dry run' if report.dry_run else 'delete'}",
+        f"retained runs: {report.runs_scanned} ({report.live_roots} live artifact roots)",
+        f"live cache keys: {report.live_cache_keys}",
+        f"keys scanned: {report.keys_scanned}",
+        f"keys live: {report.keys_live}",
+        f"keys within grace period: {report.keys_recent}",
+        f"{verb}: {report.keys_deleted} keys, {_human_bytes(report.bytes_reclaimed)}",
+    ]
+    if report.blobs_deleted:
+        lines.append(
+            f"{verb} CAS blobs: {report.blobs_deleted}, {_human_bytes(report.blob_bytes_reclaimed)}"
+        )
+    if report.errors:
+        lines.append(f"errors: {len(report.errors)}")
+        lines.extend(f"  - {error}" for error in report.errors[:20])
+    return os.linesep.join(lines)
+
+
+def _human_bytes(value: int) -> str:
+    size = float(value)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{value} B"  # pragma: no cover
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_GRACE_PERIOD_S",
+    "GCReport",
+    "collect_garbage",
+    "live_cache_digests",
+    "live_locations",
+    "location_key",
+    "render_text_report",
+    "retained_run_dirs",
+]
@@ -0,0 +1,240 @@
+"""Paginated, prefix-ordered artifact listing.
+
+Stores with millions of cached entries cannot afford to materialize and sort
+every key for each listing. The helpers here stream keys in lexicographic
+order instead:
+
+- :func:`walk_keys` descends a directory hierarchy one level at a time,
+  sorting only the entries of the current directory and skipping subtrees
+  that cannot match the prefix or lie before the resume point;
+- :class:`KeyIndex` is an optional SQLite index of keys, maintained on
+  ``put``, that answers prefix and delimiter queries with range scans;
+- :class:`~scalable.artifacts.base.ArtifactPage` and opaque continuation
+  tokens give callers S3-style pagination on top of either.
+
+Prefixes are plain string prefixes, as on S3: ``"cache/a"`` matches both
+``cache/a/x`` and ``cache/ab/y``. With ``delimiter="/"``, keys below the
+next ``/`` after the prefix are rolled up into one common prefix ending in
+``/`` (e.g. ``cache/ab/``).
+"""
+
+from __future__ import annotations
+
+import base64
+import sqlite3
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+
+from .base import ArtifactPage
+
+#: Default number of keys per :class:`ArtifactPage`.
+DEFAULT_PAGE_SIZE: int = 1000
+
+_SUPPORTED_DELIMITERS = (None, "/")
+_QUERY_CHUNK = 1000
+
+
+def encode_token(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def decode_token(token: str | None) -> str | None:
+    if not token:
+        return None
+    try:
+        raw = base64.b64decode(token.encode("ascii"), altchars=b"-_", validate=True)
+        return raw.decode("utf-8")
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError(f"invalid listing token {token!r}") from exc
+
+
+def check_delimiter(delimiter: str | None) -> None:
+    if delimiter not in _SUPPORTED_DELIMITERS:
+        raise ValueError(f"unsupported delimiter {delimiter!r}; only '/' is supported")
+
+
+def paginate(keys: Iterable[str], page_size: int) -> ArtifactPage:
+    """Take one page from a key iterator, peeking ahead to detect the end."""
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    items = list(islice(iter(keys), page_size + 1))
+    if len(items) <= page_size:
+        return ArtifactPage(keys=items)
+    page = items[:page_size]
+    return ArtifactPage(keys=page, next_token=encode_token(page[-1]))
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def walk_keys(
+    listdir: Callable[[str], Iterable[tuple[str, bool]]],
+    prefix: str = "",
+    *,
+    delimiter: str | None = None,
+    start_after: str | None = None,
+) -> Iterator[str]:
+    """Yield keys of a directory hierarchy in lexicographic order.
+
+    ``listdir(rel_dir)`` returns ``(name, is_dir)`` pairs for one directory
+    (``""`` is the root) and raises ``FileNotFoundError`` if it is missing.
+    Only keys greater than ``start_after`` are yielded.
+    """
+    check_delimiter(delimiter)
+
+    def _walk(rel_dir: str) -> Iterator[str]:
+        try:
+            entries = list(listdir(rel_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        # Sorting directories as "name/" makes the depth-first walk match the
+        # lexicographic order of the full keys ("a.txt" < "a/x" < "a0").
+        ordered = sorted((name + "/" if is_dir else name, is_dir) for name, is_dir in entries)
+        for sort_name, is_dir in ordered:
+            key = f"{rel_dir}/{sort_name}" if rel_dir else sort_name
+            if not is_dir:
+                if key.startswith(prefix) and (start_after is None or key > start_after):
+                    yield key
+                continue
+            if not key.startswith(prefix):
+                continue
+            if start_after is not None and key <= start_after and not start_after.startswith(key):
+                continue  # the whole subtree sorts before the resume point
+            if delimiter is not None:
+                if start_after is None or key > start_after:
+                    yield key
+                continue
+            yield from _walk(key[:-1])
+
+    base = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+    yield from _walk(base)
+
+
+class PaginatedListingMixin:
+    """``list_page`` on top of a store's ``iter_artifacts``."""
+
+    iter_artifacts: Callable[..., Iterator[str]]
+
+    def list_page(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        token: str | None = None,
+    ) -> ArtifactPage:
+        """Return one page of keys; pass ``next_token`` back to continue."""
+        keys = self.iter_artifacts(prefix, delimiter=delimiter, start_after=decode_token(token))
+        return paginate(keys, page_size)
+
+
+class KeyIndex:
+    """SQLite index of artifact keys supporting ordered prefix scans.
+
+    Each operation opens its own connection, so one index file can be shared
+    by threads and processes.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    def add(self, keys: Iterable[str]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO keys (key) VALUES (?)", ((k,) for k in keys))
+
+    def remove(self, keys: Iterable[str]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM keys WHERE key = ?", ((k,) for k in keys))
+
+    def replace_prefix(self, prefix: str, keys: Iterable[str]) -> None:
+        """Atomically replace every key starting with ``prefix`` by ``keys``."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM keys WHERE key >= ? AND key < ?",
+                (prefix, _prefix_upper_bound(prefix)),
+            )
+            conn.executemany("INSERT OR IGNORE INTO keys (key) VALUES (?)", ((k,) for k in keys))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM keys")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0])
+
+    def contains(self, keys: Iterable[str]) -> set[str]:
+        """Return the subset of ``keys`` present in the index."""
+        keys = list(keys)
+        found: set[str] = set()
+        with closing(self._connect()) as conn:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key FROM keys WHERE key IN ({marks})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def iter_keys(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        start_after: str | None = None,
+    ) -> Iterator[str]:
+        """Yield indexed keys in order, reading ``_QUERY_CHUNK`` rows at a time."""
+        check_delimiter(delimiter)
+        lower = prefix
+        exclusive = False
+        if start_after is not None and start_after >= lower:
+            lower, exclusive = start_after, True
+        while True:
+            op = ">" if exclusive else ">="
+            with closing(self._connect()) as conn:
+                rows = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT key FROM keys WHERE key {op} ? ORDER BY key LIMIT ?",
+                        (lower, _QUERY_CHUNK),
+                    )
+                ]
+            if not rows:
+                return
+            for key in rows:
+                if not key.startswith(prefix):
+                    return
+                if delimiter is not None:
+                    cut = key.find(delimiter, len(prefix))
+                    if cut >= 0:
+                        common = key[: cut + 1]
+                        if start_after is None or common > start_after:
+                            yield common
+                        # Seek past everything under the common prefix.
+                        lower, exclusive = _prefix_upper_bound(common), False
+                        break
+                yield key
+                lower, exclusive = key, True
+            else:
+                if len(rows) < _QUERY_CHUNK:
+                    return
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "KeyIndex",
+    "PaginatedListingMixin",
+    "decode_token",
+    "encode_token",
+    "paginate",
+    "walk_keys",
+]
@@ -2,26 +2,113 @@
 
 from __future__ import annotations
 
-import hashlib
+import io
 import os
 import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import IO, Any
 
+from . import dirsync, packing
+from .aio import AsyncArtifactMixin
 from .base import ArtifactKind, ArtifactRef
+from .cas import ContentStore, file_digest
+from .listing import KeyIndex, PaginatedListingMixin, walk_keys
 
+# Top-level directories holding store internals rather than artifacts.
+_INDEX_DIR = ".scalable-index"
+_INTERNAL_DIRS = frozenset({".cas", _INDEX_DIR})
 
-class LocalArtifactStore:
+
+class _AtomicWriter:
+    """Binary writer that replaces its destination only when closed cleanly."""
+
+    def __init__(self, dest: Path, on_commit: Callable[[], None] | None = None) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+        self._fh = os.fdopen(fd, "wb")
+        self._dest = dest
+        self._on_commit = on_commit
+
+    def write(self, data: bytes) -> int:
+        return self._fh.write(data)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def tell(self) -> int:
+        return self._fh.tell()
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self._fh.close()
+        os.replace(self._tmp_name, self._dest)
+        if self._on_commit is not None:
+            self._on_commit()
+
+    def discard(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+        Path(self._tmp_name).unlink(missing_ok=True)
+
+    def __enter__(self) -> _AtomicWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class LocalArtifactStore(PaginatedListingMixin, AsyncArtifactMixin):
     """Store artifacts on the local filesystem.
 
     Parameters
     ----------
     root : str | Path
         Root directory for artifact storage.
+    cas : bool
+        Content-addressed mode. File contents are stored once under their
+        SHA-256 in ``root/.cas/blobs`` and each key maps to a manifest of
+        blobs, so repeated outputs cost no extra space or copy time.
+    link_mode : str
+        How CAS blobs are materialized by :meth:`get`: ``"auto"`` (reflink,
+        then hardlink, then copy), ``"reflink"``, ``"hardlink"``,
+        ``"symlink"`` or ``"copy"``. Linked files share the read-only blob
+        and must not be modified in place.
+    index : bool
+        Maintain a SQLite index of keys under ``root/.scalable-index`` so
+        :meth:`iter_artifacts`, :meth:`list_page` and :meth:`exists_many`
+        are range scans instead of directory walks. The index is updated by
+        :meth:`put`; call :meth:`rebuild_index` after writing to ``root``
+        by other means.
+
+    The awaitable API (``aput``, ``aget``, ``aexists``, ``alist`` and the
+    ``*_many`` batch variants) runs the filesystem work in worker threads.
     """
 
-    def __init__(self, root: str | os.PathLike[str]) -> None:
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        *,
+        cas: bool = False,
+        link_mode: str = "auto",
+        index: bool = False,
+    ) -> None:
         self._root = Path(root)
         self._root.mkdir(parents=True, exist_ok=True)
+        self._cas = ContentStore(self._root, link_mode=link_mode) if cas else None
+        self._index: KeyIndex | None = None
+        if index:
+            index_dir = self._root / _INDEX_DIR
+            fresh = not index_dir.exists()
+            index_dir.mkdir(exist_ok=True)
+            self._index = KeyIndex(index_dir / "keys.sqlite")
+            if fresh:
+                self.rebuild_index()
 
     @property
     def scheme(self) -> str:
@@ -31,32 +118,54 @@ class LocalArtifactStore:
     def root(self) -> Path:
         return self._root
 
+    @property
+    def cas(self) -> bool:
+        return self._cas is not None
+
+    @property
+    def indexed(self) -> bool:
+        return self._index is not None
+
     def put(
         self,
         local_path: str,
         remote_key: str,
         *,
         kind: ArtifactKind | None = None,
+        pack: bool | str = False,
     ) -> ArtifactRef:
-        """Copy a local file or directory into the store."""
+        """Copy a local file or directory into the store.
+
+        ``pack`` stores a directory as one seekable archive (see
+        :mod:`scalable.artifacts.packing`); pass ``True`` or a codec name.
+        """
         src = Path(local_path)
         dest = self._root / remote_key
 
         if kind is None:
             kind = ArtifactKind.DIRECTORY if src.is_dir() else ArtifactKind.FILE
 
+        if self._cas is not None:
+            if pack:
+                raise ValueError("packing is not supported in CAS mode")
+            return self._put_cas(src, remote_key, kind)
+
         dest.parent.mkdir(parents=True, exist_ok=True)
 
+        if pack and src.is_dir():
+            return self._put_packed(src, dest, remote_key, kind, packing.resolve_codec(pack))
+
         if src.is_dir():
-            if dest.exists():
-                shutil.rmtree(dest)
-            shutil.copytree(src, dest)
-            size = sum(f.stat().st_size for f in dest.rglob("*") if f.is_file())
-        else:
-            shutil.copy2(src, dest)
-            size = dest.stat().st_size
+            return self._put_directory(src, dest, remote_key, kind)
 
-        digest = self._compute_digest(dest) if not src.is_dir() else None
+        if dest.is_dir():
+            shutil.rmtree(dest)
+        shutil.copy2(src, dest)
+        size = dest.stat().st_size
+        if self._index is not None:
+            self._index.replace_prefix(f"{remote_key}/", [remote_key])
+
+        digest = self._compute_digest(dest)
         uri = dest.resolve().as_uri()
 
         return ArtifactRef(
@@ -66,17 +175,185 @@ class LocalArtifactStore:
             size_bytes=size,
         )
 
-    def get(self, remote_key: str, local_path: str) -> str:
-        """Copy a stored artifact to a local destination."""
+    def _put_directory(
+        self, src: Path, dest: Path, remote_key: str, kind: ArtifactKind
+    ) -> ArtifactRef:
+        """Sync ``src`` into ``dest``, copying only new or changed files."""
+        stored = dirsync.read_local_manifest(dest) if dest.is_dir() else None
+        if stored is None and (dest.exists() or dest.is_symlink()):
+            # Stored before manifests existed (or a file): replace wholesale.
+            if dest.is_dir() and not dest.is_symlink():
+                shutil.rmtree(dest)
+            else:
+                dest.unlink()
+        entries = dirsync.scan_directory(src, stored)
+        plan = dirsync.plan_sync(entries, stored or {})
+        # Restore files removed from the store behind the manifest's back.
+        missing = {rel for rel in plan.unchanged if not (dest / rel).is_file()}
+        if missing:
+            plan.unchanged = [rel for rel in plan.unchanged if rel not in missing]
+            plan.transfer = sorted([*plan.transfer, *missing])
+
+        for rel in plan.transfer:
+            target = dest / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src / rel, target)
+        for rel in plan.delete:
+            (dest / rel).unlink(missing_ok=True)
+        dirsync.prune_empty_dirs(dest, plan.delete)
+        dest.mkdir(parents=True, exist_ok=True)
+        dirsync.write_local_manifest(dest, entries)
+        if self._index is not None:
+            self._index.remove([remote_key])
+            self._index.replace_prefix(f"{remote_key}/", (f"{remote_key}/{rel}" for rel in entries))
+
+        return ArtifactRef(
+            uri=dest.resolve().as_uri(),
+            kind=kind,
+            digest=dirsync.merkle_root(entries),
+            size_bytes=sum(entry.size for entry in entries.values()),
+            metadata=plan.stats(),
+        )
+
+    def _put_packed(
+        self, src: Path, dest: Path, remote_key: str, kind: ArtifactKind, codec: str
+    ) -> ArtifactRef:
+        entries = dirsync.scan_directory(src)
+        if dest.is_dir() and not dest.is_symlink():
+            shutil.rmtree(dest)
+        elif dest.exists() or dest.is_symlink():
+            dest.unlink()
+        pack_key = f"{remote_key}/{packing.PACK_NAME}"
+        index_key = f"{remote_key}/{packing.INDEX_NAME}"
+        with self.open(pack_key, "wb") as out:
+            index = packing.write_pack(src, out, codec=codec, entries=entries)
+        with self.open(index_key, "wb") as fh:
+            fh.write(packing.dump_index(index))
+        if self._index is not None:
+            self._index.remove([remote_key])
+            self._index.replace_prefix(f"{remote_key}/", [pack_key, index_key])
+        return ArtifactRef(
+            uri=dest.resolve().as_uri(),
+            kind=kind,
+            digest=index["root"],
+            size_bytes=sum(entry.size for entry in entries.values()),
+            metadata={
+                "packed": True,
+                "codec": codec,
+                "members": len(entries),
+                "pack_bytes": (dest / packing.PACK_NAME).stat().st_size,
+            },
+        )
+
+    def _put_cas(self, src: Path, remote_key: str, kind: ArtifactKind) -> ArtifactRef:
+        assert self._cas is not None
+        files = sorted(f for f in src.rglob("*") if f.is_file()) if src.is_dir() else [src]
+        entries: list[dict[str, object]] = []
+        tree: dict[str, dirsync.FileEntry] = {}
+        new_bytes = 0
+        for path in files:
+            digest, size, stored = self._cas.add_blob(path)
+            new_bytes += size if stored else 0
+            rel = path.relative_to(src).as_posix() if src.is_dir() else ""
+            tree[rel] = dirsync.FileEntry(size, 0, digest)
+            entries.append(
+                {
+                    "path": rel,
+                    "digest": digest,
+                    "size": size,
+                    "mode": path.stat().st_mode & 0o777,
+                }
+            )
+
+        is_dir = src.is_dir()
+        digest = dirsync.merkle_root(tree) if is_dir else tree[""].digest
+        size = sum(int(e["size"]) for e in entries)
+        if self._index is not None:
+            self._index.add([remote_key.strip("/")])
+        self._cas.write_manifest(
+            remote_key,
+            {
+                "kind": str(kind),
+                "directory": is_dir,
+                "digest": digest,
+                "size_bytes": size,
+                "entries": entries,
+            },
+        )
+        return ArtifactRef(
+            uri=(self._root / remote_key).resolve().as_uri(),
+            kind=kind,
+            digest=str(digest),
+            size_bytes=size,
+            metadata={"cas": True, "blobs": len(entries), "new_bytes": new_bytes},
+        )
+
+    @staticmethod
+    def _read_range(path: Path, start: int, end: int) -> bytes:
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            return fh.read(end - start)
+
+    def _get_cas(self, remote_key: str, dest: Path, *, member: str | None = None) -> str:
+        assert self._cas is not None
+        manifest = self._cas.read_manifest(remote_key)
+        if manifest is None:
+            raise FileNotFoundError(f"artifact not found: {remote_key}")
+        if member is not None:
+            for entry in manifest["entries"]:
+                if manifest["directory"] and entry["path"] == member.strip("/"):
+                    self._cas.materialize(entry["digest"], dest, mode=entry.get("mode"))
+                    return str(dest)
+            raise FileNotFoundError(f"member not found in {remote_key}: {member}")
+        if dest.is_dir() and not dest.is_symlink():
+            shutil.rmtree(dest)
+        elif dest.exists() or dest.is_symlink():
+            dest.unlink()
+        for entry in manifest["entries"]:
+            target = dest / entry["path"] if manifest["directory"] else dest
+            self._cas.materialize(entry["digest"], target, mode=entry.get("mode"))
+        if manifest["directory"]:
+            dest.mkdir(parents=True, exist_ok=True)
+        return str(dest)
+
+    def get(self, remote_key: str, local_path: str, *, member: str | None = None) -> str:
+        """Copy a stored artifact to a local destination.
+
+        ``member`` extracts a single file of a directory artifact; for packed
+        artifacts it is read with one seek into the archive.
+        """
         src = self._root / remote_key
         dest = Path(local_path)
 
+        if self._cas is not None:
+            return self._get_cas(remote_key, dest, member=member)
+
         if not src.exists():
             raise FileNotFoundError(f"artifact not found: {remote_key}")
 
         dest.parent.mkdir(parents=True, exist_ok=True)
 
+        index_path = src / packing.INDEX_NAME
+        if src.is_dir() and index_path.is_file():
+            index = packing.load_index(index_path.read_bytes())
+            pack = src / packing.PACK_NAME
+            if member is None:
+                packing.extract_all(index, pack, dest)
+            else:
+                packing.extract_member(
+                    index, member, lambda start, end: self._read_range(pack, start, end), dest
+                )
+            return str(dest)
+        if member is not None:
+            return self.get(f"{remote_key}/{member.strip('/')}", local_path)
+
         if src.is_dir():
+            stored = dirsync.read_local_manifest(src)
+            if stored is not None:
+                dirsync.sync_download(
+                    dest, stored, lambda rel, target: shutil.copy2(src / rel, target)
+                )
+                return str(dest)
             if dest.exists():
                 shutil.rmtree(dest)
             shutil.copytree(src, dest)
@@ -85,29 +362,166 @@ class LocalArtifactStore:
 
         return str(dest)
 
+    def open(self, remote_key: str, mode: str = "rb") -> IO[bytes] | _AtomicWriter:
+        """Open a stored file artifact for streaming ``"rb"`` or ``"wb"`` access.
+
+        Writes become visible atomically when the file is closed without an
+        error. CAS stores only support reading; ``"wb"`` raises
+        :class:`io.UnsupportedOperation`.
+        """
+        if mode not in {"rb", "wb"}:
+            raise ValueError(f"unsupported mode {mode!r}; expected 'rb' or 'wb'")
+        if self._cas is not None:
+            if mode == "wb":
+                raise io.UnsupportedOperation("CAS stores are written with put()")
+            manifest = self._cas.read_manifest(remote_key)
+            if manifest is None or manifest["directory"]:
+                raise FileNotFoundError(f"artifact not found: {remote_key}")
+            return open(self._cas.blob_path(manifest["entries"][0]["digest"]), "rb")
+        path = self._root / remote_key
+        if mode == "wb":
+            index = self._index
+            if index is None:
+                return _AtomicWriter(path)
+            return _AtomicWriter(path, lambda: index.add([remote_key.strip("/")]))
+        return open(path, "rb")
+
+    def read_bytes(self, remote_key: str) -> bytes:
+        """Return the content of a stored file artifact."""
+        with self.open(remote_key, "rb") as fh:
+            return fh.read()
+
+    def stat(self, remote_key: str) -> tuple[int, float | None]:
+        """Return ``(size_bytes, mtime)`` of a stored artifact."""
+        if self._cas is not None:
+            manifest = self._cas.read_manifest(remote_key)
+            if manifest is None:
+                raise FileNotFoundError(f"artifact not found: {remote_key}")
+            return int(manifest["size_bytes"]), self._cas.ref_path(remote_key).stat().st_mtime
+        path = self._root / remote_key
+        stat = path.stat()
+        if path.is_dir():
+            size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+            return size, stat.st_mtime
+        return stat.st_size, stat.st_mtime
+
+    def delete_many(self, remote_keys: Iterable[str]) -> int:
+        """Delete artifacts; returns how many existed.
+
+        In CAS mode only the key manifests are removed; call
+        :meth:`sweep_blobs` to reclaim blobs no key references any more.
+        """
+        keys = list(remote_keys)
+        removed = 0
+        for key in keys:
+            if self._cas is not None:
+                removed += self._cas.delete(key)
+                continue
+            path = self._root / key
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            elif path.exists() or path.is_symlink():
+                path.unlink()
+            else:
+                continue
+            removed += 1
+            dirsync.prune_empty_dirs(self._root, [key])
+        if self._index is not None:
+            self._index.remove(keys)
+            for key in keys:
+                self._index.replace_prefix(f"{key}/", [])
+        return removed
+
+    def sweep_blobs(
+        self, *, dry_run: bool = False, grace_period_s: float = 0.0, now: float | None = None
+    ) -> tuple[int, int]:
+        """Reclaim unreferenced CAS blobs older than ``grace_period_s``; returns ``(count, bytes)``."""
+        if self._cas is None:
+            return 0, 0
+        return self._cas.sweep_blobs(dry_run=dry_run, grace_period_s=grace_period_s, now=now)
+
     def exists(self, remote_key: str) -> bool:
         """Check if an artifact exists."""
+        if self._cas is not None:
+            return self._cas.ref_path(remote_key).exists()
         return (self._root / remote_key).exists()
 
     def list_artifacts(self, prefix: str = "") -> list[str]:
         """List artifact keys under the given prefix."""
+        if self._cas is not None:
+            return self._cas.keys(prefix)
         search_root = self._root / prefix if prefix else self._root
         if not search_root.exists():
             return []
         results: list[str] = []
         for item in sorted(search_root.rglob("*")):
-            if item.is_file():
-                results.append(str(item.relative_to(self._root)))
+            if item.is_file() and item.name != dirsync.MANIFEST_NAME:
+                key = item.relative_to(self._root)
+                if key.parts[0] not in _INTERNAL_DIRS:
+                    results.append(str(key))
         return results
 
+    def _listdir(self, rel_dir: str) -> Iterator[tuple[str, bool]]:
+        if self._cas is not None:
+            with os.scandir(self._cas.refs_dir / rel_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        yield entry.name, True
+                    elif entry.name.endswith(".json"):
+                        yield entry.name[: -len(".json")], False
+            return
+        with os.scandir(self._root / rel_dir) as entries:
+            for entry in entries:
+                if entry.name == dirsync.MANIFEST_NAME:
+                    continue
+                if not rel_dir and entry.name in _INTERNAL_DIRS:
+                    continue
+                yield entry.name, entry.is_dir()
+
+    def iter_artifacts(
+        self,
+        prefix: str = "",
+        *,
+        delimiter: str | None = None,
+        start_after: str | None = None,
+    ) -> Iterator[str]:
+        """Yield keys starting with ``prefix`` in lexicographic order.
+
+        Keys are produced lazily, one directory (or index chunk) at a time,
+        so listing stays cheap for stores with millions of entries.
+        """
+        if self._index is not None:
+            return self._index.iter_keys(prefix, delimiter=delimiter, start_after=start_after)
+        return walk_keys(self._listdir, prefix, delimiter=delimiter, start_after=start_after)
+
+    def exists_many(self, remote_keys: Iterable[str]) -> list[bool]:
+        """Check many keys at once; one query when the key index is enabled."""
+        keys = list(remote_keys)
+        if self._index is not None:
+            found = self._index.contains(keys)
+            return [key in found for key in keys]
+        return [self.exists(key) for key in keys]
+
+    def rebuild_index(self) -> int:
+        """Re-scan the store into the key index; returns the number of keys."""
+        if self._index is None:
+            raise RuntimeError("store was created without index=True")
+        self._index.clear()
+        count = 0
+
+        def _keys() -> Iterator[str]:
+            nonlocal count
+            for key in walk_keys(self._listdir):
+                count += 1
+                yield key
+
+        self._index.add(_keys())
+        return count
+
     @staticmethod
     def _compute_digest(path: Path) -> str:
         """Compute SHA-256 digest of a file."""
-        h = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return h.hexdigest()
+        return file_digest(path)
 
 
 __all__ = ["LocalArtifactStore"]
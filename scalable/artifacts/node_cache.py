@@ -0,0 +1,218 @@
+"""Node-local read-through cache for remote artifact downloads.
+
+Workers on the same node often fetch the same input dataset within minutes
+of each other. :class:`NodeCache` keeps downloaded objects in a size-bounded
+directory (``/tmp`` or node-local NVMe) keyed by the remote path *and* its
+version token (ETag, generation, digest or size/mtime from a cheap ``info``
+call), so a changed object is never served stale.
+
+Concurrent processes coordinate through ``flock`` lock files: the first
+worker downloads, the others wait on the lock and then share the file.
+Entries are evicted least-recently-used once the cache exceeds its budget;
+readers hold a shared lock on their entry so eviction never removes a file
+mid-copy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .cas import _reflink
+
+try:  # POSIX only
+    import fcntl as _fcntl
+except ImportError:  # pragma: no cover - Windows: no cross-process locking
+    _fcntl = None  # type: ignore[assignment]
+
+#: Default cache budget in bytes (10 GiB).
+DEFAULT_MAX_BYTES: int = 10 * 1024**3
+
+# ``info`` fields that identify an object version, across fsspec backends.
+_VERSION_FIELDS = (
+    "ETag",
+    "etag",
+    "md5Hash",
+    "crc32c",
+    "generation",
+    "VersionId",
+    "LastModified",
+    "last_modified",
+    "mtime",
+    "created",
+    "size",
+)
+
+
+def version_token(info: dict[str, Any]) -> str:
+    """Build a stable version token from an fsspec ``info`` payload."""
+    fields = {name: str(info[name]) for name in _VERSION_FIELDS if info.get(name) is not None}
+    return json.dumps(fields, sort_keys=True)
+
+
+@contextmanager
+def _locked(path: Path, *, shared: bool = False, blocking: bool = True) -> Iterator[bool]:
+    """Hold an ``flock`` on ``path``; yield whether it was acquired.
+
+    Only a non-blocking attempt (``blocking=False``) can yield ``False``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if _fcntl is None:
+            yield True
+            return
+        flags = _fcntl.LOCK_SH if shared else _fcntl.LOCK_EX
+        try:
+            _fcntl.flock(fh.fileno(), flags if blocking else flags | _fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            _fcntl.flock(fh.fileno(), _fcntl.LOCK_UN)
+
+
+class NodeCache:
+    """Size-bounded LRU cache directory shared by processes on one node.
+
+    Parameters
+    ----------
+    root:
+        Cache directory; should be on node-local storage.
+    max_bytes:
+        Total size budget; least-recently-used entries are evicted beyond it.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.objects_dir = self.root / "objects"
+        self.locks_dir = self.root / "locks"
+        self.tmp_dir = self.root / "tmp"
+        for path in (self.objects_dir, self.locks_dir, self.tmp_dir):
+            path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_id(self, remote: str, version: str) -> str:
+        return hashlib.sha256(f"{remote}\0{version}".encode()).hexdigest()
+
+    def entry_path(self, remote: str, version: str) -> Path:
+        entry_id = self._entry_id(remote, version)
+        return self.objects_dir / entry_id[:2] / entry_id
+
+    def fetch(
+        self,
+        remote: str,
+        version: str,
+        dest: Path,
+        download: Callable[[Path], None],
+    ) -> bool:
+        """Place ``remote`` at ``dest``, downloading at most once per node.
+
+        ``download(path)`` must write the object to ``path``. Returns ``True``
+        on a cache hit.
+        """
+        entry = self.entry_path(remote, version)
+        lock = self._entry_lock(entry)
+        # Readers share the entry lock so ``evict`` cannot unlink the entry
+        # between the existence check and the copy out of the cache.
+        with _locked(lock, shared=True):
+            hit = entry.exists()
+            if hit:
+                self._use(entry, dest)
+        if not hit:
+            with _locked(lock):
+                if not entry.exists():  # another process may have filled it
+                    self._fill(entry, download)
+                else:
+                    hit = True
+                self._use(entry, dest)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.evict(keep=entry)
+        return hit
+
+    def _entry_lock(self, entry: Path) -> Path:
+        return self.locks_dir / f"{entry.name}.lock"
+
+    def _use(self, entry: Path, dest: Path) -> None:
+        os.utime(entry)  # mark as recently used
+        self._materialize(entry, dest)
+
+    def _fill(self, entry: Path, download: Callable[[Path], None]) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix=f"{entry.name[:8]}.")
+        os.close(fd)
+        try:
+            download(Path(tmp_name))
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _materialize(entry: Path, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            dest.unlink()
+        try:
+            _reflink(entry, dest)
+        except OSError:
+            shutil.copyfile(entry, dest)
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.objects_dir.rglob("*") if p.is_file())
+
+    def evict(self, *, keep: Path | None = None) -> int:
+        """Remove least-recently-used entries beyond ``max_bytes``; return bytes freed.
+
+        Entries another process is currently reading or filling are skipped.
+        """
+        with _locked(self.locks_dir / "evict.lock"):
+            entries = []
+            for path in self.objects_dir.rglob("*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.is_file():
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            freed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and path == keep:
+                    continue
+                with _locked(self._entry_lock(path), blocking=False) as acquired:
+                    if not acquired:
+                        continue
+                    path.unlink(missing_ok=True)
+                total -= size
+                freed += size
+            return freed
+
+
+def get_node_cache() -> NodeCache | None:
+    """Return the node cache configured by ``SCALABLE_ARTIFACT_CACHE_DIR``, if any."""
+    from scalable.common import settings
+
+    root = getattr(settings, "artifact_cache_dir", None)
+    if not root:
+        return None
+    size_gb = float(getattr(settings, "artifact_cache_size_gb", DEFAULT_MAX_BYTES / 1024**3))
+    return NodeCache(root, max_bytes=int(size_gb * 1024**3))
+
+
+__all__ = ["DEFAULT_MAX_BYTES", "NodeCache", "get_node_cache", "version_token"]
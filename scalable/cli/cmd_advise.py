@@ -37,7 +37,12 @@ def register_advise_parser(subparsers: Any) -> None:
     parser.add_argument(
         "--model-type",
         default="gradient_boosting",
-        choices=["gradient_boosting", "random_forest", "quantile_regression"],
+        choices=[
+            "gradient_boosting",
+            "random_forest",
+            "quantile_regression",
+            "hist_gradient_boosting",
+        ],
         help="ML model type for predictions (default: gradient_boosting)",
     )
     parser.add_argument(
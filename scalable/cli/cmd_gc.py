@@ -0,0 +1,61 @@
+"""Implementation for ``scalable gc``."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from scalable.artifacts.factory import build_artifact_store
+from scalable.artifacts.gc import collect_garbage, render_text_report
+
+
+def run_gc(
+    store_uri: str | None,
+    *,
+    runs_dir: str,
+    cache_dir: str | None,
+    keep_last: int | None,
+    prefix: str,
+    grace_hours: float,
+    delete: bool,
+    fmt: str,
+    output: str | None,
+) -> int:
+    """Mark-and-sweep an artifact store; report only unless ``delete``."""
+    if not store_uri:
+        print(
+            "gc failed: no artifact store given and SCALABLE_DEFAULT_STORAGE is not set",
+            file=sys.stderr,
+        )
+        return 1
+    if not Path(runs_dir).is_dir():
+        # Without telemetry every object would look unreferenced.
+        print(f"gc failed: runs directory not found: {runs_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        store = build_artifact_store(store_uri)
+        report = collect_garbage(
+            store,
+            runs_dir=runs_dir,
+            cache_dir=cache_dir,
+            keep_last=keep_last,
+            prefix=prefix,
+            grace_period_s=grace_hours * 3600.0,
+            dry_run=not delete,
+        )
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"gc failed: {exc}", file=sys.stderr)
+        return 1
+
+    if fmt == "json":
+        rendered = json.dumps({"store": store_uri, **report.to_dict()}, indent=2, sort_keys=True)
+    else:
+        rendered = render_text_report(report, store_uri=store_uri)
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered, file=sys.stdout)
+    return 1 if report.errors else 0
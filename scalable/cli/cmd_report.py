@@ -4,9 +4,57 @@ from __future__ import annotations
 
 import json
 import sys
+import time
 from pathlib import Path
+from typing import Any
 
-from scalable.telemetry.collectors import render_text_report, resolve_run_dir, summarize_run
+from scalable.telemetry.collectors import (
+    read_live_summary,
+    render_text_report,
+    resolve_run_dir,
+    summarize_run,
+)
+
+
+def _render(summary: dict[str, Any], fmt: str) -> str:
+    if fmt == "json":
+        return json.dumps(summary, indent=2, sort_keys=True)
+    return render_text_report(summary)
+
+
+def _emit(rendered: str, output: str | None) -> None:
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered, file=sys.stdout, flush=True)
+
+
+def _follow_report(
+    run_dir: Path,
+    *,
+    fmt: str,
+    output: str | None,
+    interval: float,
+) -> int:
+    """Re-emit the live summary whenever it changes until the run finishes."""
+    last: str | None = None
+    try:
+        while True:
+            summary = read_live_summary(run_dir)
+            # The live timestamp changes on every rewrite; only report real changes.
+            stable = {k: v for k, v in summary.items() if k != "live"}
+            rendered = _render(stable, fmt)
+            if rendered != last:
+                if last is not None and fmt == "text":
+                    print("", file=sys.stdout)
+                _emit(rendered, output)
+                last = rendered
+            if summary.get("run", {}).get("status", "running") != "running":
+                return 0
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return 0
 
 
 def run_report(
@@ -16,30 +64,28 @@ def run_report(
     latest: bool,
     fmt: str,
     output: str | None,
+    follow: bool = False,
+    interval: float = 5.0,
 ) -> int:
-    """Load telemetry for one run and emit a report payload."""
+    """Load telemetry for one run and emit a report payload.
+
+    With ``follow=True`` the run's live ``summary.json`` is tailed and the
+    report re-emitted on every change until the run leaves ``running``.
+    """
     try:
         run_dir = resolve_run_dir(runs_dir=runs_dir, run_id=run_id, latest=latest)
     except (FileNotFoundError, ValueError) as exc:
         print(f"report failed: {exc}", file=sys.stderr)
         return 1
 
-    summary = summarize_run(run_dir)
-
-    if fmt == "json":
-        rendered = json.dumps(summary, indent=2, sort_keys=True)
-    elif fmt == "text":
-        rendered = render_text_report(summary)
-    else:
+    if fmt not in {"json", "text"}:
         print(f"report failed: unsupported format {fmt!r}", file=sys.stderr)
         return 2
 
-    if output:
-        output_path = Path(output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(rendered + "\n", encoding="utf-8")
+    if follow:
+        return _follow_report(run_dir, fmt=fmt, output=output, interval=max(interval, 0.1))
 
-    print(rendered, file=sys.stdout)
+    _emit(_render(summarize_run(run_dir), fmt), output)
     return 0
 
 
@@ -12,6 +12,7 @@ Implemented subcommands:
 * ``scalable compose``
 * ``scalable migrate``
 * ``scalable advise``
+* ``scalable gc``
 
 """
 
@@ -25,6 +26,7 @@ from scalable.common import settings
 from .cmd_compose import run_compose
 from .cmd_diagnose import run_diagnose
 from .cmd_explain import run_explain
+from .cmd_gc import run_gc
 from .cmd_init_component import run_init_component
 from .cmd_migrate import run_migrate
 from .cmd_plan import run_plan
@@ -55,6 +57,8 @@ def _handle_report(args: argparse.Namespace) -> int:
         latest=bool(args.latest),
         fmt=args.format,
         output=args.output,
+        follow=bool(args.follow),
+        interval=float(args.interval),
     )
 
 
@@ -118,6 +122,20 @@ def _handle_migrate(args: argparse.Namespace) -> int:
     )
 
 
+def _handle_gc(args: argparse.Namespace) -> int:
+    return run_gc(
+        args.store,
+        runs_dir=args.runs_dir,
+        cache_dir=args.cache_dir,
+        keep_last=args.keep_last,
+        prefix=args.prefix,
+        grace_hours=float(args.grace_hours),
+        delete=bool(args.delete),
+        fmt=args.format,
+        output=args.output,
+    )
+
+
 def _make_stub_handler(command: str, phase: str):
     def _handler(_: argparse.Namespace) -> int:
         print(
@@ -238,6 +256,17 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional output file path",
     )
+    report_parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Tail the live summary of a running session until it finishes",
+    )
+    report_parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Polling interval in seconds for --follow (default: 5)",
+    )
     report_parser.set_defaults(handler=_handle_report)
 
     # --- init-component (Phase 4) ---
@@ -409,6 +438,62 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     migrate_parser.set_defaults(handler=_handle_migrate)
 
+    # --- gc ---
+    gc_parser = subparsers.add_parser(
+        "gc",
+        help="Delete artifacts no retained run or cache entry references",
+    )
+    gc_parser.add_argument(
+        "store",
+        nargs="?",
+        default=settings.default_storage,
+        help="Artifact store URI (default: SCALABLE_DEFAULT_STORAGE)",
+    )
+    gc_parser.add_argument(
+        "--runs-dir",
+        default=settings.runs_dir,
+        help="Runs directory whose artifacts.jsonl mark live artifacts",
+    )
+    gc_parser.add_argument(
+        "--cache-dir",
+        default=settings.cache_dir,
+        help="Local cache directory whose keys keep remote cache entries alive",
+    )
+    gc_parser.add_argument(
+        "--keep-last",
+        type=int,
+        default=None,
+        help="Only retain artifacts of the newest N runs (default: all runs)",
+    )
+    gc_parser.add_argument(
+        "--prefix",
+        default="",
+        help="Only collect keys under this prefix",
+    )
+    gc_parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=1.0,
+        help="Keep unreferenced objects modified within this many hours (default: 1)",
+    )
+    gc_parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Actually delete; without it only a dry-run report is printed",
+    )
+    gc_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format",
+    )
+    gc_parser.add_argument(
+        "--output",
+        default=None,
+        help="Optional output file path",
+    )
+    gc_parser.set_defaults(handler=_handle_gc)
+
     # --- advise (Phase 5) ---
     from .cmd_advise import register_advise_parser
 
@@ -3,17 +3,27 @@
 from __future__ import annotations
 
 import functools
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from collections.abc import Iterable
 from typing import Any
 
+import dask
 from dask.typing import no_default
 from distributed import Client
 from distributed.diagnostics.plugin import SchedulerPlugin
 
+from .common import logger
 from .slurm import SlurmCluster
-from .telemetry.runtime import task_context
+from .telemetry.lifecycle import TASK_LIFECYCLE_TOPIC, TaskLifecyclePlugin
+from .telemetry.runtime import TASK_NAME_ANNOTATION, task_context
+from .telemetry.usage import TASK_USAGE_TOPIC, measure_usage, publish_task_usage
+
+#: Upper bound on buffered telemetry events that arrived before their task
+#: was registered (or that belong to another client on a shared scheduler).
+_EARLY_EVENT_LIMIT = 10_000
 
 
 class SlurmSchedulerPlugin(SchedulerPlugin):
@@ -44,12 +54,114 @@ class ScalableClient(Client):
         """Initialize a client bound to an existing cluster/scheduler."""
         super().__init__(address=cluster, *args, **kwargs)
         self._telemetry_store = None
+        self._telemetry_subscribed = False
+        self._lifecycle_enabled = False
+        self._telemetry_lock = threading.Lock()
+        self._pending_keys: dict[str, dict[str, list[tuple[str, str | None]]]] = {
+            TASK_USAGE_TOPIC: {},
+            TASK_LIFECYCLE_TOPIC: {},
+        }
+        self._early_events: dict[str, OrderedDict[str, dict[str, Any]]] = {
+            TASK_USAGE_TOPIC: OrderedDict(),
+            TASK_LIFECYCLE_TOPIC: OrderedDict(),
+        }
         if isinstance(cluster, SlurmCluster):
             self.register_scheduler_plugin(SlurmSchedulerPlugin(None))
 
     def set_telemetry_store(self, store: Any) -> None:
-        """Attach an active telemetry store for task lifecycle instrumentation."""
+        """Attach an active telemetry store for task lifecycle instrumentation.
+
+        Also installs :class:`~scalable.telemetry.lifecycle.TaskLifecyclePlugin`
+        on the scheduler so task rows carry real queue/compute timings. If the
+        scheduler cannot load the plugin, submit-to-done timing is used.
+        """
         self._telemetry_store = store
+        if store is None or self._telemetry_subscribed:
+            return
+        self.subscribe_topic(TASK_USAGE_TOPIC, self._on_task_usage)
+        self.subscribe_topic(TASK_LIFECYCLE_TOPIC, self._on_task_lifecycle)
+        self._telemetry_subscribed = True
+        try:
+            self.register_plugin(TaskLifecyclePlugin())
+            self._lifecycle_enabled = True
+        except Exception as exc:
+            logger.debug("task lifecycle plugin unavailable: %s", exc)
+            self._lifecycle_enabled = False
+
+    def _expect_event(self, topic: str, key: str, entry: tuple[str, str | None]) -> None:
+        """Register a task for a worker/scheduler event, replaying early arrivals."""
+        with self._telemetry_lock:
+            early = self._early_events[topic].pop(key, None)
+            if early is None:
+                self._pending_keys[topic].setdefault(key, []).append(entry)
+                return
+        self._dispatch_event(topic, [entry], early)
+
+    def _forget_event(self, topic: str, key: str) -> None:
+        with self._telemetry_lock:
+            self._pending_keys[topic].pop(key, None)
+
+    def _match_event(self, topic: str, event: Any) -> None:
+        _, msg = event
+        if not isinstance(msg, dict):
+            return
+        key = str(msg.get("key"))
+        with self._telemetry_lock:
+            entries = self._pending_keys[topic].pop(key, None)
+            if entries is None:
+                # The event can overtake the submitting thread's registration;
+                # keep a bounded backlog for it to pick up.
+                early = self._early_events[topic]
+                early[key] = msg
+                while len(early) > _EARLY_EVENT_LIMIT:
+                    early.popitem(last=False)
+                return
+        self._dispatch_event(topic, entries, msg)
+
+    def _dispatch_event(
+        self, topic: str, entries: list[tuple[str, str | None]], msg: dict[str, Any]
+    ) -> None:
+        store = self._telemetry_store
+        if store is None:
+            return
+        for task_id, component in entries:
+            if topic == TASK_USAGE_TOPIC:
+                store.record_task_usage(task_id=task_id, component=component, usage=msg)
+            else:
+                store.record_task_lifecycle(task_id=task_id, lifecycle=msg)
+
+    def _on_task_usage(self, event: Any) -> None:
+        """Route a worker usage sample to the telemetry row of its task."""
+        self._match_event(TASK_USAGE_TOPIC, event)
+
+    def _on_task_lifecycle(self, event: Any) -> None:
+        """Route a scheduler lifecycle record to the telemetry row of its task."""
+        self._match_event(TASK_LIFECYCLE_TOPIC, event)
+
+    def _wrap_task(self, func: Any, *, task_name: str, tag: str | None) -> tuple[Any, bool]:
+        """Wrap ``func`` to run inside task context and, optionally, usage sampling.
+
+        Returns the wrapper and whether it publishes usage samples.
+        """
+        from .common import settings
+
+        sample_usage = self._telemetry_store is not None and settings.telemetry_usage
+        interval = settings.telemetry_usage_interval
+
+        @functools.wraps(func)
+        def _wrapped(*wrapped_args: Any, **wrapped_kwargs: Any) -> Any:
+            with task_context(task_name=task_name, component=tag, tag=tag):
+                if not sample_usage:
+                    return func(*wrapped_args, **wrapped_kwargs)
+                probe = None
+                try:
+                    with measure_usage(interval=interval) as probe:
+                        return func(*wrapped_args, **wrapped_kwargs)
+                finally:
+                    if probe is not None and probe.usage is not None:
+                        publish_task_usage(probe.usage)
+
+        return _wrapped, sample_usage
 
     def _record_future(
         self,
@@ -62,6 +174,7 @@ class ScalableClient(Client):
         function_name: str,
         requested_workers: int,
         submitted_at: float,
+        sample_usage: bool = False,
     ) -> None:
         store = self._telemetry_store
         if store is None:
@@ -74,11 +187,18 @@ class ScalableClient(Client):
             tag=tag,
             function_name=function_name,
             requested_workers=requested_workers,
+            lifecycle=self._lifecycle_enabled,
+            usage=sample_usage,
         )
+        key = str(future.key)
+        if self._lifecycle_enabled:
+            self._expect_event(TASK_LIFECYCLE_TOPIC, key, (task_id, component))
+        if sample_usage:
+            self._expect_event(TASK_USAGE_TOPIC, key, (task_id, component))
 
         def _on_done(done_future: Any) -> None:
             state = "succeeded"
-            worker = getattr(done_future, "key", None)
+            worker = None
             error_type = None
             error_message = None
 
@@ -96,6 +216,11 @@ class ScalableClient(Client):
                 error_type = type(callback_exc).__name__
                 error_message = str(callback_exc)
 
+            if state == "cancelled":
+                # Cancelled tasks may never run, so no events will arrive.
+                self._forget_event(TASK_USAGE_TOPIC, key)
+                self._forget_event(TASK_LIFECYCLE_TOPIC, key)
+
             _ = submitted_at
             store.record_task_result(
                 task_id=task_id,
@@ -162,13 +287,11 @@ class ScalableClient(Client):
         task_name = str(kwargs.pop("_scalable_task_name", getattr(func, "__name__", "task")))
         function_name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
 
-        @functools.wraps(func)
-        def _wrapped(*wrapped_args: Any, **wrapped_kwargs: Any) -> Any:
-            with task_context(task_name=task_name, component=tag, tag=tag):
-                return func(*wrapped_args, **wrapped_kwargs)
+        _wrapped, sample_usage = self._wrap_task(func, task_name=task_name, tag=tag)
 
         submitted_at = time.monotonic()
-        future = super().submit(_wrapped, resources=resources, *args, **kwargs)
+        with dask.annotate(**{TASK_NAME_ANNOTATION: task_name}):
+            future = super().submit(_wrapped, resources=resources, *args, **kwargs)
 
         self._record_future(
             future=future,
@@ -179,6 +302,7 @@ class ScalableClient(Client):
             function_name=function_name,
             requested_workers=n,
             submitted_at=submitted_at,
+            sample_usage=sample_usage,
         )
         return future
     
@@ -263,13 +387,11 @@ class ScalableClient(Client):
         base_task_name = str(kwargs.pop("_scalable_task_name", getattr(func, "__name__", "task")))
         function_name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
 
-        @functools.wraps(func)
-        def _wrapped(*wrapped_args: Any, **wrapped_kwargs: Any) -> Any:
-            with task_context(task_name=base_task_name, component=tag, tag=tag):
-                return func(*wrapped_args, **wrapped_kwargs)
+        _wrapped, sample_usage = self._wrap_task(func, task_name=base_task_name, tag=tag)
 
         submitted_at = time.monotonic()
-        futures = super().map(_wrapped, *parameters, resources=resources, **kwargs)
+        with dask.annotate(**{TASK_NAME_ANNOTATION: base_task_name}):
+            futures = super().map(_wrapped, *parameters, resources=resources, **kwargs)
 
         for index, future in enumerate(futures):
             self._record_future(
@@ -281,6 +403,7 @@ class ScalableClient(Client):
                 function_name=function_name,
                 requested_workers=n,
                 submitted_at=submitted_at,
+                sample_usage=sample_usage,
             )
         return futures
     
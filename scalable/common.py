@@ -61,12 +61,35 @@ class Settings:
         Remote storage URI for the opt-in remote cache backend (Phase 3).
         Set via ``SCALABLE_CACHE_REMOTE`` env var. When ``None``, only local
         disk caching is used.
+    cache_remote_compression:
+        Codec for values written to the remote cache: ``none``, ``zstd`` or
+        ``lz4`` (the latter two need the ``cloud`` extra).
     default_storage:
         Default artifact/output storage URI override. Takes precedence over
         the ``project.default_storage`` manifest field.
     runs_dir_remote:
         Remote storage URI for persisting run telemetry. When set, telemetry
         is also synced to this remote location.
+    artifact_cache_dir:
+        Node-local directory for the read-through cache of remote artifact
+        downloads. ``None`` disables the cache.
+    artifact_cache_size_gb:
+        Size budget of the node-local artifact cache in GiB.
+    telemetry_sync_interval:
+        Seconds between incremental uploads of the active run to
+        ``runs_dir_remote``. ``0`` uploads only when the run closes.
+    telemetry_usage:
+        Sample actual CPU time, peak RSS and I/O of each task on the worker
+        and record them as observed resource events.
+    telemetry_usage_interval:
+        Peak-RSS polling interval in seconds used by the worker-side sampler.
+    telemetry_live_interval:
+        Seconds between atomic rewrites of a running session's
+        ``summary.json``. ``0`` disables live summaries.
+    telemetry_sampling:
+        Default per-stream task telemetry sampling policy: ``all``,
+        ``every_n:<n>`` or ``reservoir:<n>``. Manifest tasks may override it
+        with ``telemetry_sampling``.
     """
 
     cache_dir: str = field(
@@ -88,16 +111,40 @@ class Settings:
     telemetry_parquet: bool = field(
         default_factory=lambda: bool(int(os.environ.get("SCALABLE_TELEMETRY_PARQUET", "0")))
     )
+    telemetry_usage: bool = field(
+        default_factory=lambda: bool(int(os.environ.get("SCALABLE_TELEMETRY_USAGE", "1")))
+    )
+    telemetry_usage_interval: float = field(
+        default_factory=lambda: float(os.environ.get("SCALABLE_TELEMETRY_USAGE_INTERVAL", "0.5"))
+    )
+    telemetry_live_interval: float = field(
+        default_factory=lambda: float(os.environ.get("SCALABLE_TELEMETRY_LIVE_INTERVAL", "30"))
+    )
+    telemetry_sync_interval: float = field(
+        default_factory=lambda: float(os.environ.get("SCALABLE_TELEMETRY_SYNC_INTERVAL", "60"))
+    )
+    telemetry_sampling: str = field(
+        default_factory=lambda: os.environ.get("SCALABLE_TELEMETRY_SAMPLING", "all")
+    )
     # Phase 3 additions
     cache_remote_uri: str | None = field(
         default_factory=lambda: os.environ.get("SCALABLE_CACHE_REMOTE")
     )
+    cache_remote_compression: str = field(
+        default_factory=lambda: os.environ.get("SCALABLE_CACHE_REMOTE_COMPRESSION", "none")
+    )
     default_storage: str | None = field(
         default_factory=lambda: os.environ.get("SCALABLE_DEFAULT_STORAGE")
     )
     runs_dir_remote: str | None = field(
         default_factory=lambda: os.environ.get("SCALABLE_RUNS_DIR_REMOTE")
     )
+    artifact_cache_dir: str | None = field(
+        default_factory=lambda: os.environ.get("SCALABLE_ARTIFACT_CACHE_DIR")
+    )
+    artifact_cache_size_gb: float = field(
+        default_factory=lambda: float(os.environ.get("SCALABLE_ARTIFACT_CACHE_SIZE_GB", "10"))
+    )
     # Phase 4 AI additions
     # Generic env vars (AI_PROVIDER, LLM_MODEL_NAME, AI_BASE_URL, AI_API_KEY)
     # serve as fallbacks for the SCALABLE_AI_* variants, allowing users to
@@ -142,6 +189,12 @@ class Settings:
     emulation_confidence_threshold: float = field(
         default_factory=lambda: float(os.environ.get("SCALABLE_EMULATION_CONFIDENCE", "0.9"))
     )
+    adaptive_scaling: bool = field(
+        default_factory=lambda: bool(int(os.environ.get("SCALABLE_ADAPTIVE_SCALING", "0")))
+    )
+    adaptive_scaling_interval: float = field(
+        default_factory=lambda: float(os.environ.get("SCALABLE_ADAPTIVE_SCALING_INTERVAL", "30"))
+    )
 
 
 #: Process-wide settings singleton. Mutating attributes on this instance
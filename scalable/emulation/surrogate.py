@@ -7,6 +7,8 @@ from typing import Any, Protocol
 
 import numpy as np
 
+from scalable.ml.models import tree_predictions
+
 
 @dataclass(frozen=True)
 class EmulatorPrediction:
@@ -150,9 +152,7 @@ class GradientBoostingEmulator:
 
             # Estimate uncertainty from staged predictions variance
             if hasattr(model, "estimators_"):
-                staged_preds = np.array(
-                    [est[0].predict(X)[0] for est in model.estimators_]
-                )
+                staged_preds = tree_predictions(model, X)[0]
                 std = float(np.std(staged_preds))
                 lower = pred - 2 * std
                 upper = pred + 2 * std
@@ -245,7 +245,7 @@ class RandomForestEmulator:
 
         for output_name, model in self._models.items():
             # Get individual tree predictions
-            tree_preds = np.array([t.predict(X)[0] for t in model.estimators_])
+            tree_preds = tree_predictions(model, X)[0]
             pred = float(np.mean(tree_preds))
             std = float(np.std(tree_preds))
 
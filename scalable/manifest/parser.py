@@ -61,7 +61,9 @@ _REQUIRED_TOP_LEVEL_KEYS: frozenset[str] = frozenset({"version", "project"})
 _COMPONENT_KEYS: frozenset[str] = frozenset(
     {"image", "runtime", "cpus", "memory", "mounts", "env", "tags", "preload_script"}
 )
-_TASK_KEYS: frozenset[str] = frozenset({"component", "cache", "outputs"})
+_TASK_KEYS: frozenset[str] = frozenset(
+    {"component", "cache", "outputs", "telemetry_sampling"}
+)
 _PROJECT_KEYS: frozenset[str] = frozenset({"name", "default_storage", "local_cache"})
 
 # ${VAR} and ${VAR:-default} expansion. Anchored to require curly braces so
@@ -447,10 +449,26 @@ def _build_tasks(value: Any) -> dict[str, TaskConfig]:
             raise ManifestSchemaError(
                 f"'tasks.{tname}.outputs' must be a mapping when set"
             )
+        sampling = spec_map.get("telemetry_sampling")
+        if sampling is not None:
+            # Imported lazily: the telemetry package imports the manifest schema.
+            from scalable.telemetry.aggregation import SamplingPolicy
+
+            if not isinstance(sampling, str):
+                raise ManifestSchemaError(
+                    f"'tasks.{tname}.telemetry_sampling' must be a string when set"
+                )
+            try:
+                SamplingPolicy.parse(sampling)
+            except ValueError as exc:
+                raise ManifestSchemaError(
+                    f"'tasks.{tname}.telemetry_sampling': {exc}"
+                ) from exc
         out[tname] = TaskConfig(
             name=tname,
             component=component,
             cache=cache,
             outputs={str(k): str(v) for k, v in outputs.items()},
+            telemetry_sampling=sampling,
         )
     return out
@@ -148,12 +148,17 @@ class TaskConfig:
     outputs : Mapping[str, str]
         Declared outputs (``{"database": "dir"}``). Reserved for Phase 3
         artifact tracking.
+    telemetry_sampling : str | None
+        Telemetry sampling policy for this task's stream (``all``,
+        ``every_n:<n>`` or ``reservoir:<n>``). ``None`` uses the
+        ``SCALABLE_TELEMETRY_SAMPLING`` default.
     """
 
     name: str
     component: str
     cache: bool = False
     outputs: dict[str, str] = field(default_factory=dict)
+    telemetry_sampling: str | None = None
 
 
 @dataclass(frozen=True)
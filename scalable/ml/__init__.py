@@ -8,13 +8,14 @@ Key components:
 
 * :class:`LearnedAdvisor` — ML-based resource recommendations
 * :class:`AdaptiveScaler` — real-time adaptive worker scaling
+* :class:`AdaptiveScalingController` — applies scaler decisions to a live cluster
 * :class:`HyperparameterSearch` — Dask-ML distributed tuning
 * :class:`FeatureExtractor` — telemetry feature engineering
 """
 
 from __future__ import annotations
 
-from .adaptive_scaler import AdaptiveScaler, ScaleDecision
+from .adaptive_scaler import AdaptiveScaler, AdaptiveScalingController, ScaleDecision
 from .features import FeatureExtractor
 from .learned_advisor import LearnedAdvisor
 from .models import ModelQuality, PredictionResult
@@ -23,6 +24,7 @@ from .validation import cross_validate_advisor
 
 __all__ = [
     "AdaptiveScaler",
+    "AdaptiveScalingController",
     "FeatureExtractor",
     "HyperparameterSearch",
     "LearnedAdvisor",
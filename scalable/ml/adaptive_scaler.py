@@ -1,11 +1,36 @@
-"""Real-time adaptive worker scaling based on ML predictions."""
+"""Real-time adaptive worker scaling based on ML predictions.
+
+:class:`AdaptiveScaler` is the policy: a function of queue depth and worker
+counts. :class:`AdaptiveScalingController` closes the loop on a live cluster:
+every ``interval`` seconds it reads per-tag queue depth and worker occupancy
+from the Dask scheduler, asks the scaler for a decision, applies it through
+the cluster or provider, and records it in telemetry.
+"""
 
 from __future__ import annotations
 
+import math
+import statistics
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
+from scalable.common import logger
+from scalable.telemetry.aggregation import stream_name
+from scalable.telemetry.runtime import TASK_NAME_ANNOTATION
+
+#: Tag for tasks without resource restrictions and workers without resources.
+DEFAULT_TAG: str = "default"
+
+#: Worker startup observations kept per tag.
+_STARTUP_WINDOW: int = 20
+
+#: Scheduler task states that wait for a worker slot.
+_QUEUED_STATES: frozenset[str] = frozenset({"queued", "no-worker"})
+
 
 @dataclass(frozen=True)
 class ScaleDecision:
@@ -41,6 +66,14 @@ class AdaptiveScaler:
     scaling actions. Respects user-defined min/max bounds and cooldown
     periods to prevent thrashing.
 
+    With ``target_makespan_s`` set, tags whose pending work has known
+    durations are sized by predicted work instead of task counts: enough
+    workers are added that the pending seconds of work finish within the
+    target, given that new workers only start after the tag's startup
+    latency. Durations come from a pending task's ``predicted_duration_s``,
+    the advisor's ``predicted_duration_s`` evidence for its ``task_name``,
+    or the mean of ``recent_completions``.
+
     Parameters
     ----------
     advisor
@@ -57,6 +90,14 @@ class AdaptiveScaler:
         Queue depth ratio that triggers scale-down (0.0–1.0).
     cooldown_seconds
         Minimum time between scaling decisions.
+    target_makespan_s
+        Seconds within which pending work should finish; ``None`` keeps
+        count-based scaling.
+    startup_latency_s
+        Seconds from requesting a worker until it joins, overall or per
+        tag. Observed latencies (:meth:`observe_startup`) take precedence.
+    target
+        Target name passed to the advisor.
     """
 
     def __init__(
@@ -68,6 +109,9 @@ class AdaptiveScaler:
         scale_up_threshold: float = 0.8,
         scale_down_threshold: float = 0.2,
         cooldown_seconds: float = 60.0,
+        target_makespan_s: float | None = None,
+        startup_latency_s: float | dict[str, float] | None = None,
+        target: str | None = None,
     ) -> None:
         self._advisor = advisor
         self._min_workers = min_workers or {}
@@ -75,6 +119,10 @@ class AdaptiveScaler:
         self._scale_up_threshold = scale_up_threshold
         self._scale_down_threshold = scale_down_threshold
         self._cooldown_seconds = cooldown_seconds
+        self._target_makespan_s = target_makespan_s
+        self._startup_latency_s = startup_latency_s
+        self._target = target
+        self._startup_observed: dict[str, deque[float]] = {}
         self._last_decision_time: float = 0.0
         self._decision_history: list[ScaleDecision] = []
 
@@ -83,12 +131,27 @@ class AdaptiveScaler:
         """List of all scaling decisions made."""
         return list(self._decision_history)
 
+    def startup_latency(self, tag: str) -> float:
+        """Expected seconds from requesting a ``tag`` worker until it joins."""
+        observed = self._startup_observed.get(tag)
+        if observed:
+            return float(statistics.median(observed))
+        if isinstance(self._startup_latency_s, dict):
+            return float(self._startup_latency_s.get(tag, 0.0))
+        return float(self._startup_latency_s or 0.0)
+
+    def observe_startup(self, tag: str, seconds: float) -> None:
+        """Record a measured worker startup latency for ``tag``."""
+        window = self._startup_observed.setdefault(tag, deque(maxlen=_STARTUP_WINDOW))
+        window.append(max(float(seconds), 0.0))
+
     def evaluate(
         self,
         *,
         pending_tasks: list[dict[str, Any]],
         active_workers: dict[str, int],
         recent_completions: list[dict[str, Any]] | None = None,
+        idle_workers: dict[str, int] | None = None,
     ) -> ScaleDecision:
         """Evaluate current state and recommend scaling actions.
 
@@ -96,11 +159,15 @@ class AdaptiveScaler:
         ----------
         pending_tasks
             List of pending task metadata dicts. Each should have at least
-            ``tag`` or ``component`` key.
+            ``tag`` or ``component`` key, and may carry ``task_name`` or
+            ``predicted_duration_s``.
         active_workers
             Current worker count per tag/component.
         recent_completions
             Recently completed task metadata for throughput estimation.
+        idle_workers
+            Workers per tag that are not running any task. When given,
+            scale-down never removes more workers than are idle.
 
         Returns
         -------
@@ -122,9 +189,11 @@ class AdaptiveScaler:
         # Group pending tasks by tag/component
         pending_by_tag: dict[str, int] = {}
         for task in pending_tasks:
-            tag = task.get("tag") or task.get("component") or "default"
+            tag = task.get("tag") or task.get("component") or DEFAULT_TAG
             pending_by_tag[tag] = pending_by_tag.get(tag, 0) + 1
 
+        work_by_tag = self._pending_work(pending_tasks, recent_completions)
+
         workers_to_add: dict[str, int] = {}
         workers_to_remove: dict[str, int] = {}
         reasons: list[str] = []
@@ -134,6 +203,24 @@ class AdaptiveScaler:
             max_allowed = self._max_workers.get(tag, current_workers + 10)
             min_allowed = self._min_workers.get(tag, 0)
 
+            if self._target_makespan_s is not None and tag in work_by_tag:
+                to_add, to_remove, reason = self._size_for_makespan(
+                    tag,
+                    work_s=work_by_tag[tag],
+                    pending_count=pending_count,
+                    current_workers=current_workers,
+                    min_allowed=min_allowed,
+                    max_allowed=max_allowed,
+                    idle_workers=idle_workers,
+                )
+                if to_add > 0:
+                    workers_to_add[tag] = to_add
+                if to_remove > 0:
+                    workers_to_remove[tag] = to_remove
+                if reason:
+                    reasons.append(reason)
+                continue
+
             if current_workers == 0:
                 # No workers — always scale up if there's pending work
                 to_add = min(pending_count, max_allowed)
@@ -165,7 +252,9 @@ class AdaptiveScaler:
                     int(pending_count / self._scale_up_threshold) + 1,
                     min_allowed,
                 )
-                to_remove = max(0, current_workers - desired)
+                to_remove = _cap_removal(
+                    max(0, current_workers - desired), tag, idle_workers
+                )
                 if to_remove > 0:
                     workers_to_remove[tag] = to_remove
                     reasons.append(
@@ -176,14 +265,16 @@ class AdaptiveScaler:
         # Check for tags with workers but no pending tasks
         for tag, count in active_workers.items():
             if tag not in pending_by_tag and count > self._min_workers.get(tag, 0):
-                excess = count - self._min_workers.get(tag, 0)
+                excess = _cap_removal(
+                    count - self._min_workers.get(tag, 0), tag, idle_workers
+                )
                 if excess > 0:
                     workers_to_remove[tag] = excess
                     reasons.append(f"{tag}: no pending tasks, removing {excess} idle workers")
 
         # Estimate completion time
         predicted_completion = self._estimate_completion_time(
-            pending_by_tag, active_workers, workers_to_add, recent_completions
+            pending_by_tag, active_workers, workers_to_add, recent_completions, work_by_tag
         )
 
         reasoning = "; ".join(reasons) if reasons else "No scaling changes needed"
@@ -207,11 +298,24 @@ class AdaptiveScaler:
         active_workers: dict[str, int],
         workers_to_add: dict[str, int],
         recent_completions: list[dict[str, Any]] | None,
+        work_by_tag: dict[str, float] | None = None,
     ) -> float | None:
         """Estimate time to complete all pending tasks."""
         if not pending_by_tag:
             return 0.0
 
+        if work_by_tag and set(pending_by_tag) <= set(work_by_tag):
+            # Work-based: the slowest tag, new workers contributing after startup.
+            finish: list[float] = []
+            for tag, work_s in work_by_tag.items():
+                current = active_workers.get(tag, 0)
+                added = workers_to_add.get(tag, 0)
+                if current + added == 0:
+                    return None
+                latency = self.startup_latency(tag) if added else 0.0
+                finish.append((work_s + added * latency) / (current + added))
+            return max(finish)
+
         if not recent_completions:
             return None
 
@@ -235,9 +339,490 @@ class AdaptiveScaler:
         estimated_time = (total_pending / total_workers) * avg_duration
         return estimated_time
 
+    def _size_for_makespan(
+        self,
+        tag: str,
+        *,
+        work_s: float,
+        pending_count: int,
+        current_workers: int,
+        min_allowed: int,
+        max_allowed: int,
+        idle_workers: dict[str, int] | None,
+    ) -> tuple[int, int, str | None]:
+        """Workers to add and remove so ``work_s`` finishes within the makespan.
+
+        Existing workers contribute the full makespan ``T``; a worker added
+        now only contributes ``T - startup``. More workers than pending
+        tasks never help.
+        """
+        makespan = float(self._target_makespan_s or 0.0)
+        startup = self.startup_latency(tag)
+        summary = f"{tag}: {work_s:.0f}s predicted work on {current_workers} workers"
+        needed = math.ceil(work_s / makespan) if makespan > 0 else pending_count
+
+        if needed > current_workers:
+            if makespan > startup:
+                to_add = math.ceil((work_s - current_workers * makespan) / (makespan - startup))
+            elif current_workers == 0:
+                to_add = needed
+            else:
+                return 0, 0, (
+                    f"{summary}; startup {startup:.0f}s leaves no time within the "
+                    f"{makespan:.0f}s makespan, not adding"
+                )
+            to_add = max(0, min(to_add, pending_count, max_allowed - current_workers))
+            if to_add == 0:
+                return 0, 0, None
+            return to_add, 0, (
+                f"{summary} exceeds the {makespan:.0f}s makespan "
+                f"(startup {startup:.0f}s), adding {to_add} workers"
+            )
+
+        desired = max(needed, min_allowed)
+        to_remove = _cap_removal(max(0, current_workers - desired), tag, idle_workers)
+        if to_remove == 0:
+            return 0, 0, None
+        return 0, to_remove, (
+            f"{summary} fits the {makespan:.0f}s makespan with {desired}, "
+            f"removing {to_remove} workers"
+        )
+
+    def _pending_work(
+        self,
+        pending_tasks: list[dict[str, Any]],
+        recent_completions: list[dict[str, Any]] | None,
+    ) -> dict[str, float]:
+        """Predicted seconds of pending work per tag, for tags with any estimate."""
+        names = {
+            str(task["task_name"])
+            for task in pending_tasks
+            if task.get("task_name") and task.get("predicted_duration_s") is None
+        }
+        predicted = self._predict_durations(sorted(names))
+
+        recent: dict[str, list[float]] = {}
+        for completion in recent_completions or []:
+            if completion.get("duration_s") is None:
+                continue
+            tag = completion.get("tag") or completion.get("component") or DEFAULT_TAG
+            recent.setdefault(tag, []).append(float(completion["duration_s"]))
+        recent_all = [d for durations in recent.values() for d in durations]
+
+        known: dict[str, list[float]] = {}
+        unknown: dict[str, int] = {}
+        for task in pending_tasks:
+            tag = task.get("tag") or task.get("component") or DEFAULT_TAG
+            duration = task.get("predicted_duration_s")
+            if duration is None:
+                duration = predicted.get(str(task.get("task_name")))
+            if duration is None:
+                unknown[tag] = unknown.get(tag, 0) + 1
+            else:
+                known.setdefault(tag, []).append(float(duration))
+
+        work: dict[str, float] = {}
+        for tag in set(known) | set(unknown):
+            durations = known.get(tag, [])
+            fallback = durations or recent.get(tag) or recent_all
+            if not fallback:
+                continue
+            mean = sum(fallback) / len(fallback)
+            work[tag] = sum(durations) + unknown.get(tag, 0) * mean
+        return work
+
+    def _predict_durations(self, task_names: list[str]) -> dict[str, float]:
+        """Advisor point predictions of task durations, keyed by task name."""
+        recommend_many = getattr(self._advisor, "recommend_many", None)
+        if not task_names or recommend_many is None:
+            return {}
+        try:
+            recommendations = recommend_many(tasks=task_names, targets=[self._target])
+        except Exception as exc:  # noqa: BLE001 - fall back to observed durations
+            logger.warning("duration prediction for adaptive scaling failed: %s", exc)
+            return {}
+        return {
+            rec.task: float(rec.evidence["predicted_duration_s"])
+            for rec in recommendations
+            if rec.evidence.get("predicted_duration_s") is not None
+        }
+
     def reset_cooldown(self) -> None:
         """Reset the cooldown timer (for testing or manual override)."""
         self._last_decision_time = 0.0
 
 
-__all__ = ["AdaptiveScaler", "ScaleDecision"]
+def _cap_removal(count: int, tag: str, idle_workers: dict[str, int] | None) -> int:
+    if idle_workers is None:
+        return count
+    return min(count, max(idle_workers.get(tag, 0), 0))
+
+
+def worker_startup_latency(runs_dir: str | Path, *, keep_last: int = 20) -> dict[str, float]:
+    """Median worker startup latency per tag from recorded telemetry.
+
+    Reads the ``worker_started`` events that
+    :class:`AdaptiveScalingController` records in ``workers.jsonl`` of the
+    newest ``keep_last`` runs.
+    """
+    from scalable.telemetry.collectors import iter_run_dirs, read_jsonl
+
+    runs = iter_run_dirs(runs_dir)[-keep_last:] if keep_last > 0 else []
+    samples: dict[str, list[float]] = {}
+    for run_dir in runs:
+        for row in read_jsonl(run_dir / "workers.jsonl"):
+            if row.get("state") != "worker_started":
+                continue
+            startup = (row.get("details") or {}).get("startup_s")
+            if startup is not None:
+                samples.setdefault(str(row.get("component") or DEFAULT_TAG), []).append(
+                    float(startup)
+                )
+    return {tag: float(statistics.median(values)) for tag, values in samples.items()}
+
+
+@dataclass(frozen=True)
+class ClusterSnapshot:
+    """Per-tag load of a running cluster, as seen by the scheduler.
+
+    Attributes
+    ----------
+    pending
+        Tasks waiting for a worker slot: queued on the scheduler, without a
+        suitable worker, or assigned beyond a worker's thread count.
+    workers
+        Workers advertising each tag.
+    idle
+        Workers of each tag that are not running any task.
+    occupancy
+        Fraction of each tag's worker threads that are busy.
+    pending_by_task
+        ``pending`` split by task name, as telemetry and the advisors key it.
+    joined
+        Times (epoch seconds) at which the current workers of each tag joined
+        the scheduler.
+    """
+
+    pending: dict[str, int] = field(default_factory=dict)
+    workers: dict[str, int] = field(default_factory=dict)
+    idle: dict[str, int] = field(default_factory=dict)
+    occupancy: dict[str, float] = field(default_factory=dict)
+    pending_by_task: dict[str, dict[str, int]] = field(default_factory=dict)
+    joined: dict[str, list[float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ClusterSnapshot:
+        return cls(
+            pending={str(k): int(v) for k, v in data.get("pending", {}).items()},
+            workers={str(k): int(v) for k, v in data.get("workers", {}).items()},
+            idle={str(k): int(v) for k, v in data.get("idle", {}).items()},
+            occupancy={str(k): float(v) for k, v in data.get("occupancy", {}).items()},
+            pending_by_task={
+                str(tag): {str(name): int(n) for name, n in names.items()}
+                for tag, names in data.get("pending_by_task", {}).items()
+            },
+            joined={
+                str(tag): [float(t) for t in times]
+                for tag, times in data.get("joined", {}).items()
+            },
+        )
+
+    def pending_tasks(self) -> list[dict[str, Any]]:
+        """Pending work in the shape :meth:`AdaptiveScaler.evaluate` expects."""
+        tasks: list[dict[str, Any]] = []
+        for tag, count in self.pending.items():
+            names = self.pending_by_task.get(tag, {})
+            for name, n in names.items():
+                tasks.extend({"tag": tag, "task_name": name} for _ in range(n))
+            tasks.extend({"tag": tag} for _ in range(count - sum(names.values())))
+        return tasks
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pending": dict(self.pending),
+            "workers": dict(self.workers),
+            "idle": dict(self.idle),
+            "occupancy": dict(self.occupancy),
+        }
+
+
+def _task_tag(ts: Any) -> str:
+    restrictions = getattr(ts, "resource_restrictions", None) or {}
+    return next(iter(restrictions), DEFAULT_TAG)
+
+
+def _task_name(ts: Any) -> str | None:
+    """Task name as telemetry records it, without a map index.
+
+    :class:`~scalable.client.ScalableClient` annotates each task with its
+    name; other tasks fall back to the key prefix (the function name).
+    """
+    name = (getattr(ts, "annotations", None) or {}).get(TASK_NAME_ANNOTATION)
+    if name is None:
+        name = getattr(getattr(ts, "prefix", None), "name", None)
+    return stream_name(str(name)) if name is not None else None
+
+
+def _join_time(dask_scheduler: Any, address: str) -> float | None:
+    get_events = getattr(dask_scheduler, "get_events", None)
+    if get_events is None:
+        return None
+    for timestamp, msg in get_events(address):
+        if isinstance(msg, dict) and msg.get("action") == "add-worker":
+            return float(timestamp)
+    return None
+
+
+def scheduler_snapshot(dask_scheduler: Any = None) -> dict[str, Any]:
+    """Summarize per-tag queue depth and occupancy of ``dask_scheduler``.
+
+    Tags are the resource names :meth:`ScalableClient.submit` restricts
+    tasks to and workers advertise. Meant to run on the scheduler through
+    ``client.run_on_scheduler``; returns plain dicts so the result pickles.
+    """
+    pending: dict[str, int] = {}
+    pending_by_task: dict[str, dict[str, int]] = {}
+    workers: dict[str, int] = {}
+    idle: dict[str, int] = {}
+    threads: dict[str, int] = {}
+    busy: dict[str, int] = {}
+    joined: dict[str, list[float]] = {}
+
+    def _count_pending(ts: Any) -> None:
+        tag = _task_tag(ts)
+        pending[tag] = pending.get(tag, 0) + 1
+        name = _task_name(ts)
+        if name is not None:
+            names = pending_by_task.setdefault(tag, {})
+            names[name] = names.get(name, 0) + 1
+
+    for ts in dask_scheduler.tasks.values():
+        if ts.state in _QUEUED_STATES:
+            _count_pending(ts)
+
+    for ws in dask_scheduler.workers.values():
+        nthreads = max(int(ws.nthreads), 1)
+        processing = list(ws.processing)
+        # Tasks assigned beyond the worker's threads are still queued.
+        for ts in processing[nthreads:]:
+            _count_pending(ts)
+        joined_at = _join_time(dask_scheduler, ws.address)
+        for tag in list(ws.resources) or [DEFAULT_TAG]:
+            workers[tag] = workers.get(tag, 0) + 1
+            if joined_at is not None:
+                joined.setdefault(tag, []).append(joined_at)
+            threads[tag] = threads.get(tag, 0) + nthreads
+            busy[tag] = busy.get(tag, 0) + min(len(processing), nthreads)
+            if not processing:
+                idle[tag] = idle.get(tag, 0) + 1
+
+    return {
+        "pending": pending,
+        "workers": workers,
+        "idle": idle,
+        "occupancy": {tag: busy.get(tag, 0) / threads[tag] for tag in threads},
+        "pending_by_task": pending_by_task,
+        "joined": joined,
+    }
+
+
+class AdaptiveScalingController:
+    """Drive an :class:`AdaptiveScaler` from a live cluster.
+
+    Each :meth:`step` reads a :class:`ClusterSnapshot` from the scheduler,
+    evaluates the scaler, and applies decisions that change anything.
+    Clusters with per-tag ``add_workers``/``remove_workers`` (the Slurm
+    :class:`~scalable.core.JobQueueCluster`) are scaled by tag directly;
+    other backends get a :class:`~scalable.providers.base.ScalePlan` of
+    per-tag target counts through ``provider.scale``. Every decision the
+    scaler makes (cooldown no-ops excluded) is recorded as an
+    ``autoscale`` worker event.
+
+    Workers that join after the controller requested them are matched to
+    the oldest outstanding request of their tag. The elapsed time is fed to
+    :meth:`AdaptiveScaler.observe_startup` and recorded as a
+    ``worker_started`` event, with the target's walltime as
+    ``requested_walltime``, which :func:`worker_startup_latency` and
+    :func:`~scalable.planning.walltime.job_queue_waits` read back in later
+    sessions.
+
+    Parameters
+    ----------
+    scaler
+        Scaling policy.
+    client
+        Client connected to the cluster's scheduler.
+    cluster
+        Provider handle of the running cluster.
+    provider
+        Provider that built ``cluster``; needed for backends without
+        ``add_workers``/``remove_workers``.
+    interval
+        Seconds between background steps; ``None`` or ``0`` disables the
+        background thread (call :meth:`step` explicitly).
+    telemetry
+        Store to record decisions in; defaults to the active store.
+    """
+
+    def __init__(
+        self,
+        scaler: AdaptiveScaler,
+        *,
+        client: Any,
+        cluster: Any,
+        provider: Any = None,
+        interval: float | None = 30.0,
+        telemetry: Any = None,
+    ) -> None:
+        self.scaler = scaler
+        self._client = client
+        self._cluster = cluster
+        self._provider = provider
+        self._telemetry = telemetry
+        self._requested: dict[str, deque[float]] = {}
+        self._last_join: dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if interval is not None and interval > 0:
+            self._thread = threading.Thread(
+                target=self._loop,
+                args=(float(interval),),
+                name="scalable-adaptive-scaling",
+                daemon=True,
+            )
+
+    @property
+    def provider_name(self) -> str:
+        metadata = getattr(self._cluster, "metadata", None) or {}
+        return str(metadata.get("provider") or getattr(self._provider, "name", "unknown"))
+
+    def start(self) -> None:
+        if self._thread is not None and not self._thread.is_alive():
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread; workers are left as they are."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+
+    def snapshot(self) -> ClusterSnapshot:
+        return ClusterSnapshot.from_dict(self._client.run_on_scheduler(scheduler_snapshot))
+
+    def step(self) -> ScaleDecision:
+        """Read the scheduler, evaluate the scaler and apply its decision."""
+        snapshot = self.snapshot()
+        self._observe_joins(snapshot)
+        decisions = len(self.scaler.decision_history)
+        decision = self.scaler.evaluate(
+            pending_tasks=snapshot.pending_tasks(),
+            active_workers=snapshot.workers,
+            idle_workers=snapshot.idle,
+        )
+        if len(self.scaler.decision_history) == decisions:
+            return decision  # cooldown: nothing was decided
+
+        error: str | None = None
+        if decision.has_changes:
+            try:
+                self.apply(decision, snapshot)
+            except Exception as exc:  # noqa: BLE001 - recorded, never fatal
+                error = f"{type(exc).__name__}: {exc}"
+                logger.warning("adaptive scaling decision failed to apply: %s", error)
+            else:
+                self._track_requests(decision)
+
+        details = {
+            **decision.to_dict(),
+            **snapshot.to_dict(),
+            "applied": decision.has_changes and error is None,
+        }
+        if error is not None:
+            details["error"] = error
+        self._record("autoscale", details)
+        return decision
+
+    def apply(self, decision: ScaleDecision, snapshot: ClusterSnapshot) -> None:
+        """Apply ``decision`` to the cluster."""
+        backend = getattr(self._cluster, "backend", None)
+        if hasattr(backend, "add_workers") and hasattr(backend, "remove_workers"):
+            for tag, n in decision.workers_to_remove.items():
+                backend.remove_workers(tag=tag, n=int(n))
+            for tag, n in decision.workers_to_add.items():
+                backend.add_workers(tag=tag, n=int(n))
+            return
+
+        if self._provider is None:
+            raise TypeError("cluster backend has no add_workers(); a provider is required")
+        from scalable.providers.base import ScalePlan
+
+        targets = dict(snapshot.workers)
+        for tag, n in decision.workers_to_add.items():
+            targets[tag] = targets.get(tag, 0) + int(n)
+        for tag, n in decision.workers_to_remove.items():
+            targets[tag] = max(targets.get(tag, 0) - int(n), 0)
+        self._provider.scale(self._cluster, ScalePlan(workers_by_tag=targets))
+
+    def _track_requests(self, decision: ScaleDecision) -> None:
+        now = time.time()
+        for tag in decision.workers_to_remove:
+            # Shrinking a tag may cancel workers that never started.
+            self._requested.pop(tag, None)
+        for tag, n in decision.workers_to_add.items():
+            self._requested.setdefault(tag, deque()).extend([now] * int(n))
+
+    def _observe_joins(self, snapshot: ClusterSnapshot) -> None:
+        for tag, times in snapshot.joined.items():
+            last = self._last_join.get(tag, float("-inf"))
+            new = sorted(t for t in times if t > last)
+            if not new:
+                continue
+            self._last_join[tag] = new[-1]
+            requests = self._requested.get(tag)
+            for joined_at in new:
+                if not requests or requests[0] > joined_at:
+                    continue  # not started on this controller's request
+                startup = joined_at - requests.popleft()
+                self.scaler.observe_startup(tag, startup)
+                details: dict[str, Any] = {"startup_s": startup}
+                # The job's walltime, so the planner can fit queue wait against it.
+                walltime = getattr(self._store(), "target_walltime", None)
+                if isinstance(walltime, str):
+                    details["requested_walltime"] = walltime
+                self._record("worker_started", details, component=tag)
+
+    def _store(self) -> Any:
+        if self._telemetry is not None:
+            return self._telemetry
+        from scalable.telemetry.runtime import get_active_store
+
+        return get_active_store()
+
+    def _record(self, state: str, details: dict[str, Any], *, component: str | None = None) -> None:
+        store = self._store()
+        if store is None:
+            return
+        store.record_worker_event(
+            provider=self.provider_name,
+            state=state,
+            component=component,
+            details=details,
+        )
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.step()
+            except Exception as exc:  # keep scaling across transient scheduler errors
+                logger.warning("adaptive scaling step failed: %s", exc)
+
+
+__all__ = [
+    "DEFAULT_TAG",
+    "AdaptiveScaler",
+    "AdaptiveScalingController",
+    "ClusterSnapshot",
+    "ScaleDecision",
+    "scheduler_snapshot",
+    "worker_startup_latency",
+]
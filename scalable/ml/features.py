@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 import pandas as pd
+from xxhash import xxh32_intdigest
+
+#: Number of buckets identity columns are hashed into.
+HASH_BUCKETS: int = 10000
 
 
 @dataclass
@@ -19,6 +24,10 @@ class FeatureExtractor:
     - Temporal features (hour of day, day of week)
     - Historical aggregates (rolling mean/p95 for same task)
     - Input complexity features (from user-provided input_features dict)
+
+    Identity columns are hashed with ``xxh32`` seeded by ``hash_seed``
+    (default ``settings.seed``), so the same task name encodes to the same
+    value in every process and trained models can be cached and reused.
     """
 
     #: Minimum rows per task group for rolling aggregates
@@ -27,6 +36,25 @@ class FeatureExtractor:
     #: Known numeric input feature names (auto-discovered if not set)
     known_input_features: list[str] = field(default_factory=list)
 
+    #: Seed for identity hashing; ``None`` uses ``settings.seed``
+    hash_seed: int | None = None
+
+    @property
+    def seed(self) -> int:
+        if self.hash_seed is not None:
+            return int(self.hash_seed)
+        from scalable.common import settings
+
+        return int(settings.seed)
+
+    @property
+    def feature_encoding(self) -> dict[str, Any]:
+        """Description of the identity encoding, stored with trained models.
+
+        A cached model is only valid for an extractor with an equal encoding.
+        """
+        return {"hash": "xxh32", "buckets": HASH_BUCKETS, "seed": self.seed}
+
     def extract_from_history(self, records: pd.DataFrame) -> pd.DataFrame:
         """Engineer features from historical telemetry records.
 
@@ -46,15 +74,12 @@ class FeatureExtractor:
         if records.empty:
             return pd.DataFrame()
 
-        df = records.copy()
+        df = records.copy().sort_index()
 
         # Task identity features (hashed for model consumption)
-        df["task_name_hash"] = df["task_name"].apply(
-            lambda x: hash(str(x)) % 10000 if pd.notna(x) else 0
-        )
-        df["component_hash"] = df["component"].apply(
-            lambda x: hash(str(x)) % 10000 if pd.notna(x) else 0
-        )
+        seed = self.seed
+        df["task_name_hash"] = _hash_column(df["task_name"], seed)
+        df["component_hash"] = _hash_column(df["component"], seed)
 
         # Numeric resource features
         df["requested_cpus_num"] = pd.to_numeric(
@@ -72,23 +97,19 @@ class FeatureExtractor:
             df.get("duration_s"), errors="coerce"
         )
 
-        # Historical rolling aggregates per task_name
-        df = df.sort_index()
-        grouped = df.groupby("task_name", sort=False)
-        df["hist_mean_duration"] = grouped["duration_num"].transform(
-            lambda s: s.expanding(min_periods=1).mean().shift(1)
-        )
-        df["hist_p95_duration"] = grouped["duration_num"].transform(
-            lambda s: s.expanding(min_periods=1).quantile(0.95).shift(1)
-        )
-        df["hist_mean_memory"] = grouped["requested_memory_num"].transform(
-            lambda s: s.expanding(min_periods=1).mean().shift(1)
-        )
-        df["hist_count"] = grouped["duration_num"].transform(
-            lambda s: s.expanding(min_periods=1).count().shift(1)
-        )
+        # Historical aggregates per task_name over strictly earlier rows,
+        # from cumulative sums/counts shifted by one row within each group.
+        codes = pd.factorize(df["task_name"])[0]
+        duration = df["duration_num"].to_numpy(dtype=float)
+        memory = df["requested_memory_num"].to_numpy(dtype=float)
+        duration_sum, duration_count = _prior_sum_count(codes, duration)
+        memory_sum, memory_count = _prior_sum_count(codes, memory)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            df["hist_mean_duration"] = duration_sum / duration_count
+            df["hist_mean_memory"] = memory_sum / memory_count
+        df["hist_p95_duration"] = _prior_quantile(codes, duration, 0.95)
+        df["hist_count"] = duration_count
 
-        # Fill NaN from rolling aggregates with global means
         for col in ["hist_mean_duration", "hist_p95_duration", "hist_mean_memory", "hist_count"]:
             df[col] = df[col].fillna(0)
 
@@ -106,7 +127,11 @@ class FeatureExtractor:
 
         # Keep targets for training
         target_cols = ["duration_num", "requested_memory_num"]
-        available_targets = [c for c in target_cols if c in df.columns]
+        # requested_memory_num is both a feature and the memory target; a
+        # duplicated column would make ``features[col]`` a DataFrame.
+        available_targets = [
+            c for c in target_cols if c in df.columns and c not in feature_cols
+        ]
 
         return df[feature_cols + available_targets].copy()
 
@@ -139,10 +164,41 @@ class FeatureExtractor:
         pd.DataFrame
             Single-row feature DataFrame for model prediction.
         """
+        return pd.DataFrame(
+            [self._task_row(task_name, input_features, component, history_stats)]
+        )
+
+    def extract_from_tasks(self, requests: list[dict[str, Any]]) -> pd.DataFrame:
+        """Build one feature matrix for many prediction requests.
+
+        Each request is a dict of :meth:`extract_from_task` keyword arguments
+        (``task_name``, ``input_features``, ``component``, ``history_stats``).
+        Input features missing from a request are left as NaN, which models
+        treat as 0 like a column absent from a single-row frame.
+        """
+        return pd.DataFrame(
+            [
+                self._task_row(
+                    req["task_name"],
+                    req.get("input_features"),
+                    req.get("component"),
+                    req.get("history_stats"),
+                )
+                for req in requests
+            ]
+        )
+
+    def _task_row(
+        self,
+        task_name: str,
+        input_features: dict[str, Any] | None,
+        component: str | None,
+        history_stats: dict[str, Any] | None,
+    ) -> dict[str, Any]:
         stats = history_stats or {}
         row: dict[str, Any] = {
-            "task_name_hash": hash(str(task_name)) % 10000,
-            "component_hash": hash(str(component)) % 10000 if component else 0,
+            "task_name_hash": _hash_value(task_name, self.seed),
+            "component_hash": _hash_value(component, self.seed) if component else 0,
             "requested_cpus_num": 1,
             "requested_memory_num": 0,
             "requested_workers_num": 1,
@@ -159,7 +215,7 @@ class FeatureExtractor:
                     col_name = f"input_{key}"
                     row[col_name] = value
 
-        return pd.DataFrame([row])
+        return row
 
     def compute_history_stats(
         self,
@@ -180,6 +236,10 @@ class FeatureExtractor:
             if not scoped_target.empty:
                 scoped = scoped_target
 
+        return self.summarize_history(scoped)
+
+    def summarize_history(self, scoped: pd.DataFrame) -> dict[str, Any]:
+        """Summary statistics of already-scoped history rows (one task/target)."""
         if scoped.empty:
             return {"mean_duration": 0, "p95_duration": 0, "mean_memory": 0, "count": 0}
 
@@ -194,4 +254,93 @@ class FeatureExtractor:
         }
 
 
-__all__ = ["FeatureExtractor"]
+def _hash_value(value: Any, seed: int) -> int:
+    """Process-independent bucket of ``str(value)`` (unlike the salted ``hash``)."""
+    return xxh32_intdigest(str(value).encode("utf-8"), seed=seed) % HASH_BUCKETS
+
+
+def _hash_column(values: pd.Series, seed: int) -> np.ndarray:
+    """Hash each distinct value once and broadcast by category code (NaN -> 0)."""
+    codes, uniques = pd.factorize(values)
+    table = np.fromiter(
+        (_hash_value(u, seed) for u in uniques), dtype=np.int64, count=len(uniques)
+    )
+    return np.where(codes >= 0, table[codes], 0)
+
+
+def _prior_sum_count(codes: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-group sum and non-NaN count of the rows *before* each row.
+
+    Equivalent to ``expanding().sum()/count()`` shifted by one within each
+    group, but computed with cumulative sums in O(n).
+    """
+    valid = ~np.isnan(values)
+    keys = pd.Series(codes)
+    inclusive_sum = pd.Series(np.where(valid, values, 0.0)).groupby(keys).cumsum().to_numpy()
+    inclusive_count = pd.Series(valid.astype(np.int64)).groupby(keys).cumsum().to_numpy()
+    prior_sum = inclusive_sum - np.where(valid, values, 0.0)
+    prior_count = (inclusive_count - valid).astype(float)
+    # Exclude rows with a missing group key, as ``groupby`` does.
+    missing = codes < 0
+    prior_sum[missing] = np.nan
+    prior_count[missing] = np.nan
+    return prior_sum, prior_count
+
+
+class _StreamingQuantile:
+    """Exact running quantile of a growing sample in O(log n) per update.
+
+    The smallest ``floor(q * (n - 1)) + 1`` observations live in a max-heap
+    and the rest in a min-heap; since the target rank only grows with ``n``,
+    each update moves at most a couple of elements between the heaps. The
+    value is linearly interpolated like ``Series.quantile``.
+    """
+
+    __slots__ = ("q", "lower", "upper")
+
+    def __init__(self, q: float) -> None:
+        self.q = q
+        self.lower: list[float] = []  # negated: max-heap
+        self.upper: list[float] = []
+
+    def add(self, value: float) -> None:
+        if self.lower and value < -self.lower[0]:
+            heapq.heappush(self.lower, -value)
+        else:
+            heapq.heappush(self.upper, value)
+        n = len(self.lower) + len(self.upper)
+        target = int(self.q * (n - 1)) + 1
+        while len(self.lower) > target:
+            heapq.heappush(self.upper, -heapq.heappop(self.lower))
+        while len(self.lower) < target:
+            heapq.heappush(self.lower, -heapq.heappop(self.upper))
+
+    def value(self) -> float:
+        n = len(self.lower) + len(self.upper)
+        if n == 0:
+            return np.nan
+        position = self.q * (n - 1)
+        low = -self.lower[0]
+        fraction = position - int(position)
+        if fraction == 0 or not self.upper:
+            return low
+        return low + (self.upper[0] - low) * fraction
+
+
+def _prior_quantile(codes: np.ndarray, values: np.ndarray, q: float) -> np.ndarray:
+    """Per-group ``q`` quantile of the non-NaN values before each row."""
+    out = np.full(len(values), np.nan)
+    sketches: dict[int, _StreamingQuantile] = {}
+    for i, (code, value) in enumerate(zip(codes.tolist(), values.tolist(), strict=True)):
+        if code < 0:
+            continue
+        sketch = sketches.get(code)
+        if sketch is None:
+            sketch = sketches[code] = _StreamingQuantile(q)
+        out[i] = sketch.value()
+        if value == value:  # not NaN
+            sketch.add(value)
+    return out
+
+
+__all__ = ["HASH_BUCKETS", "FeatureExtractor"]
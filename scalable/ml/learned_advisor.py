@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import math
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
@@ -11,12 +14,49 @@ from dask.utils import parse_bytes
 from scalable.advising.resources import (
     ResourceRecommendation,
     _bytes_to_gib_string,
+    _confidence_levels,
+    _observed_cpu_seconds,
     _seconds_to_hhmmss,
 )
+from scalable.advising.stats import (
+    HISTORY_STATS_FILE,
+    HistoryStats,
+    TaskStats,
+    history_watermark,
+    sample_weights,
+    unseen_rows,
+)
+from scalable.common import logger
 from scalable.ml.features import FeatureExtractor
-from scalable.ml.models import ResourceModel
+from scalable.ml.models import PredictionResult, ResourceModel
 from scalable.telemetry.collectors import iter_run_dirs, read_jsonl
 
+#: ``refresh`` modes of :meth:`LearnedAdvisor.from_history`.
+REFRESH_MODES = ("incremental", "background", "full")
+
+#: Cached model name -> target column.
+_MODEL_TARGETS = {"duration": "duration_num", "memory": "requested_memory_num"}
+
+
+def _at_least_one(value: float | None) -> int:
+    """A rounded worker/cpu quantile, at least 1 (1 without history)."""
+    return int(max(1, round(value))) if value is not None else 1
+
+
+def _training_features(extractor: FeatureExtractor, records: pd.DataFrame) -> pd.DataFrame:
+    """Feature rows to train on: diagnostic rows of sampled-out failures are left out."""
+    features = extractor.extract_from_history(records)
+    if features.empty:
+        return features
+    return features[sample_weights(records).reindex(features.index).fillna(1.0) > 0]
+
+
+def _save_model(model: ResourceModel, path: Path) -> None:
+    try:
+        model.save(path)
+    except Exception:
+        pass
+
 
 def _memory_to_bytes(value: str | None) -> int | None:
     if value is None:
@@ -33,12 +73,17 @@ class LearnedAdvisor:
 
     Replaces heuristic quantile-based recommendations with feature-based
     predictions from trained ML models. Falls back to percentile estimation
-    when insufficient data or sklearn unavailable.
+    when insufficient data or sklearn unavailable. Per-task history
+    aggregates, used both as model features and by the fallback, come from a
+    precomputed :class:`~scalable.advising.stats.HistoryStats` table.
     """
 
     #: Minimum number of records for a task before activating ML predictions
     MIN_SAMPLES_FOR_ML: int = 10
 
+    #: Warm-start updates of a cached model before it is fully retrained
+    MAX_INCREMENTAL_UPDATES: int = 5
+
     def __init__(
         self,
         records: pd.DataFrame,
@@ -46,11 +91,19 @@ class LearnedAdvisor:
         duration_model: ResourceModel | None = None,
         memory_model: ResourceModel | None = None,
         extractor: FeatureExtractor | None = None,
+        stats: HistoryStats | None = None,
     ) -> None:
         self._records = records.copy()
+        self._stats = stats if stats is not None else HistoryStats.from_records(self._records)
         self._duration_model = duration_model
         self._memory_model = memory_model
         self._extractor = extractor or FeatureExtractor()
+        self._refresh_thread: threading.Thread | None = None
+
+    @property
+    def records(self) -> pd.DataFrame:
+        """Telemetry records the advisor was built from (one row per task run)."""
+        return self._records
 
     @classmethod
     def from_history(
@@ -60,6 +113,7 @@ class LearnedAdvisor:
         model_type: str = "gradient_boosting",
         retrain: bool = False,
         cache_dir: str | Path | None = None,
+        refresh: str = "incremental",
     ) -> LearnedAdvisor:
         """Build and train advisor from telemetry run directories.
 
@@ -68,86 +122,185 @@ class LearnedAdvisor:
         runs_dir
             Path to ``.scalable/runs/`` directory.
         model_type
-            ML model type: ``gradient_boosting``, ``random_forest``, or
-            ``quantile_regression``.
+            ML model type: ``gradient_boosting``, ``random_forest``,
+            ``quantile_regression``, or ``hist_gradient_boosting``.
         retrain
             Force retraining even if cached model exists.
         cache_dir
-            Directory to cache trained models. Defaults to
+            Directory to cache trained models and the history statistics
+            table (``history_stats.json``). Defaults to
             ``<runs_dir>/../models``.
+        refresh
+            What to do when a cached model's training watermark (rows per
+            run) is behind the history: ``"incremental"`` warm-starts it on
+            the new rows, ``"background"`` keeps serving it while a full
+            retrain runs on a thread (see :meth:`wait_for_refresh`), and
+            ``"full"`` retrains from scratch before returning.
         """
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"unknown refresh mode {refresh!r}; expected one of {REFRESH_MODES}")
         records = cls._load_records(runs_dir)
         extractor = FeatureExtractor()
+        watermark = history_watermark(records)
 
-        # Attempt to load cached models
         if cache_dir is None:
             cache_dir = Path(runs_dir).parent / "models"
         cache_path = Path(cache_dir)
 
-        duration_model: ResourceModel | None = None
-        memory_model: ResourceModel | None = None
-
-        if not retrain and (cache_path / "duration" / "metadata.json").exists():
-            try:
-                duration_model = ResourceModel.load(cache_path / "duration")
-            except Exception:
-                duration_model = None
+        features: pd.DataFrame | None = None
+        models: dict[str, ResourceModel | None] = {}
+        pending: list[str] = []
+        for name, column in _MODEL_TARGETS.items():
+            cached = None
+            if not retrain:
+                cached = cls._load_cached_model(cache_path / name, extractor, model_type)
+            if cached is not None and cached.training_watermark == watermark:
+                models[name] = cached
+                continue
+            if features is None:
+                features = _training_features(extractor, records)
+            if cached is not None and refresh == "incremental":
+                updated = cls._update_model(cached, records, features, column, watermark)
+                if updated is not None:
+                    models[name] = updated
+                    _save_model(updated, cache_path / name)
+                    continue
+            if cached is not None and refresh == "background":
+                models[name] = cached
+                pending.append(name)
+                continue
+            model = cls._train_model(features, column, model_type, extractor, watermark)
+            if model is not None:
+                _save_model(model, cache_path / name)
+            models[name] = model
 
-        if not retrain and (cache_path / "memory" / "metadata.json").exists():
-            try:
-                memory_model = ResourceModel.load(cache_path / "memory")
-            except Exception:
-                memory_model = None
-
-        # Train if needed
-        if duration_model is None or memory_model is None:
-            features = extractor.extract_from_history(records)
-            if not features.empty and len(features) >= cls.MIN_SAMPLES_FOR_ML:
-                if duration_model is None:
-                    valid_duration = features[
-                        features["duration_num"].notna() & (features["duration_num"] > 0)
-                    ]
-                    if len(valid_duration) >= cls.MIN_SAMPLES_FOR_ML:
-                        y_dur = valid_duration["duration_num"]
-                        X_dur = valid_duration.drop(
-                            columns=["duration_num", "requested_memory_num"],
-                            errors="ignore",
-                        )
-                        duration_model = ResourceModel(
-                            model_type=model_type, random_state=42
-                        )
-                        duration_model.fit(X_dur, y_dur)
-                        try:
-                            duration_model.save(cache_path / "duration")
-                        except Exception:
-                            pass
-
-                if memory_model is None:
-                    valid_memory = features[
-                        features["requested_memory_num"].notna()
-                        & (features["requested_memory_num"] > 0)
-                    ]
-                    if len(valid_memory) >= cls.MIN_SAMPLES_FOR_ML:
-                        y_mem = valid_memory["requested_memory_num"]
-                        X_mem = valid_memory.drop(
-                            columns=["duration_num", "requested_memory_num"],
-                            errors="ignore",
-                        )
-                        memory_model = ResourceModel(
-                            model_type=model_type, random_state=42
-                        )
-                        memory_model.fit(X_mem, y_mem)
-                        try:
-                            memory_model.save(cache_path / "memory")
-                        except Exception:
-                            pass
-
-        return cls(
+        advisor = cls(
             records,
-            duration_model=duration_model,
-            memory_model=memory_model,
+            duration_model=models["duration"],
+            memory_model=models["memory"],
             extractor=extractor,
+            stats=HistoryStats.cached(records, cache_path / HISTORY_STATS_FILE),
         )
+        if pending:
+            advisor._start_background_retrain(pending, model_type, cache_path, watermark)
+        return advisor
+
+    @classmethod
+    def _train_model(
+        cls,
+        features: pd.DataFrame,
+        column: str,
+        model_type: str,
+        extractor: FeatureExtractor,
+        watermark: dict[str, int],
+    ) -> ResourceModel | None:
+        """Fit a model for target ``column`` on the full history."""
+        if features.empty or len(features) < cls.MIN_SAMPLES_FOR_ML:
+            return None
+        valid = features[features[column].notna() & (features[column] > 0)]
+        if len(valid) < cls.MIN_SAMPLES_FOR_ML:
+            return None
+        X = valid.drop(columns=list(_MODEL_TARGETS.values()), errors="ignore")
+        model = ResourceModel(model_type=model_type, random_state=42)
+        model.fit(X, valid[column])
+        model.feature_encoding = extractor.feature_encoding
+        model.training_watermark = watermark
+        return model
+
+    @classmethod
+    def _update_model(
+        cls,
+        model: ResourceModel,
+        records: pd.DataFrame,
+        features: pd.DataFrame,
+        column: str,
+        watermark: dict[str, int],
+    ) -> ResourceModel | None:
+        """Warm-start ``model`` on rows newer than its watermark.
+
+        Returns ``None`` when a full retrain is due instead: history was
+        removed or rewritten, the model cannot be warm-started, it has been
+        updated :attr:`MAX_INCREMENTAL_UPDATES` times already, or the new
+        rows outnumber the ones it was trained on.
+        """
+        unseen = unseen_rows(records, model.training_watermark)
+        if unseen is None or not model.can_warm_start:
+            return None
+        if model.incremental_updates >= cls.MAX_INCREMENTAL_UPDATES:
+            return None
+        trained = sum((model.training_watermark or {}).values())
+        new = features[features.index.isin(records.index[unseen])]
+        new = new[new[column].notna() & (new[column] > 0)]
+        if len(new) > trained:
+            return None
+        if len(new) >= 2:
+            # Grow the ensemble in proportion to the new data.
+            base = model.n_estimators or 100
+            extra = min(base, max(5, math.ceil(base * len(new) / max(trained, 1))))
+            X = new.drop(columns=list(_MODEL_TARGETS.values()), errors="ignore")
+            model.update(X, new[column], extra_estimators=extra)
+        model.training_watermark = watermark
+        return model
+
+    def _start_background_retrain(
+        self,
+        names: list[str],
+        model_type: str,
+        cache_path: Path,
+        watermark: dict[str, int],
+    ) -> None:
+        """Retrain ``names`` on a daemon thread, swapping each in when done."""
+        records = self._records
+
+        def _retrain() -> None:
+            try:
+                features = _training_features(self._extractor, records)
+                for name in names:
+                    model = self._train_model(
+                        features, _MODEL_TARGETS[name], model_type, self._extractor, watermark
+                    )
+                    if model is None:
+                        continue
+                    _save_model(model, cache_path / name)
+                    # Attribute assignment is atomic: requests in flight keep
+                    # the model they already read.
+                    setattr(self, f"_{name}_model", model)
+            except Exception as exc:  # noqa: BLE001 - keep serving the old model
+                logger.warning("background model retrain failed: %s", exc)
+
+        self._refresh_thread = threading.Thread(
+            target=_retrain, name="scalable-advisor-retrain", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def wait_for_refresh(self, timeout: float | None = None) -> bool:
+        """Wait for a background retrain; returns ``True`` once none is running."""
+        thread = self._refresh_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    @staticmethod
+    def _load_cached_model(
+        path: Path, extractor: FeatureExtractor, model_type: str
+    ) -> ResourceModel | None:
+        """Load a cached model trained with ``extractor``'s feature encoding.
+
+        Models cached before the encoding was recorded (or with another
+        seed), or of another model type, are retrained.
+        """
+        if not (path / "metadata.json").exists():
+            return None
+        try:
+            model = ResourceModel.load(path)
+        except Exception:
+            return None
+        if model.feature_encoding != extractor.feature_encoding:
+            return None
+        if model.model_type != model_type:
+            return None
+        return model
 
     @classmethod
     def _load_records(cls, runs_dir: str | Path) -> pd.DataFrame:
@@ -170,7 +323,8 @@ class LearnedAdvisor:
                     continue
                 entity = str(r.get("entity_id", ""))
                 if entity:
-                    resources_by_task[entity] = r
+                    merged = resources_by_task.setdefault(entity, {})
+                    merged.update({k: v for k, v in r.items() if v is not None})
 
             for t in task_rows:
                 if t.get("state") not in {"succeeded", "failed", "cancelled"}:
@@ -188,6 +342,8 @@ class LearnedAdvisor:
                         "component": t.get("component"),
                         "state": t.get("state"),
                         "duration_s": t.get("duration_s"),
+                        "queue_wait_s": t.get("queue_wait_s"),
+                        "sample_weight": t.get("sample_weight", 1.0),
                         "requested_workers": resources.get("requested_workers"),
                         "requested_cpus": resources.get("requested_cpus"),
                         "requested_memory": resources.get("requested_memory"),
@@ -195,6 +351,8 @@ class LearnedAdvisor:
                             resources.get("requested_memory")
                         ),
                         "requested_walltime": resources.get("requested_walltime"),
+                        "observed_peak_rss_bytes": resources.get("observed_peak_rss_bytes"),
+                        "observed_cpu_s": _observed_cpu_seconds(resources),
                     }
                 )
 
@@ -213,76 +371,124 @@ class LearnedAdvisor:
         Falls back to quantile heuristics when ML is unavailable or data is
         insufficient for the requested task.
         """
-        q = min(max(float(confidence), 0.5), 0.99)
-
-        # Check if we have enough data for this task
-        scoped = self._records[self._records["task_name"] == task]
-        if target is not None and not scoped.empty:
-            scoped_target = scoped[scoped["target"] == target]
-            if not scoped_target.empty:
-                scoped = scoped_target
-
-        if scoped.empty or len(scoped) < self.MIN_SAMPLES_FOR_ML:
-            # Fall back to heuristic
-            return self._heuristic_recommend(task, target, q, scoped)
-
-        # Compute history stats for feature extraction
-        stats = self._extractor.compute_history_stats(self._records, task, target)
-        X_pred = self._extractor.extract_from_task(
-            task_name=task,
-            input_features=input_features,
-            component=scoped["component"].dropna().iloc[-1] if scoped["component"].notna().any() else None,
-            target=target,
-            history_stats=stats,
+        return self.recommend_many(
+            tasks=[task],
+            targets=[target],
+            confidence=confidence,
+            input_features={task: input_features} if input_features else None,
+        )[0]
+
+    def recommend_many(
+        self,
+        *,
+        tasks: Sequence[str],
+        targets: Sequence[str | None] | None = None,
+        confidence: float | Sequence[float] = 0.95,
+        input_features: dict[str, dict[str, Any]] | None = None,
+    ) -> list[ResourceRecommendation]:
+        """Recommend for every combination of ``tasks``, ``targets`` and ``confidence``.
+
+        History aggregates are looked up in the precomputed table, the
+        feature rows of all ML-eligible ``(task, target)`` pairs form a single
+        matrix, and each model runs
+        one vectorized ``predict``. ``input_features`` maps task names to
+        their input features. Results are ordered task-major, then by target,
+        then by confidence, and equal what :meth:`recommend` returns for each
+        combination.
+        """
+        quantiles = _confidence_levels(confidence)
+        target_list = [None] if targets is None else list(targets)
+        pairs = [(task, target) for task in tasks for target in target_list]
+        stats = self._stats.resolve(self._records, tasks, target_list, quantiles)
+
+        eligible = list(
+            dict.fromkeys(
+                pair
+                for pair in pairs
+                if stats[pair] is not None and stats[pair].records >= self.MIN_SAMPLES_FOR_ML
+            )
         )
+        requests = [
+            {
+                "task_name": task,
+                "input_features": (input_features or {}).get(task),
+                "component": stats[(task, target)].component,
+                "history_stats": stats[(task, target)].history_stats(),
+            }
+            for task, target in eligible
+        ]
+        X_pred = self._extractor.extract_from_tasks(requests) if requests else None
+        duration_preds = self._predict(self._duration_model, X_pred)
+        memory_preds = self._predict(self._memory_model, X_pred)
+        predictions = {
+            pair: (
+                duration_preds[i] if duration_preds else None,
+                memory_preds[i] if memory_preds else None,
+            )
+            for i, pair in enumerate(eligible)
+        }
 
+        results: list[ResourceRecommendation] = []
+        for pair in pairs:
+            task, target = pair
+            for q in quantiles:
+                if pair not in predictions:
+                    results.append(self._heuristic_recommend(task, target, q, stats[pair]))
+                else:
+                    results.append(
+                        self._ml_recommend(task, target, q, stats[pair], *predictions[pair])
+                    )
+        return results
+
+    @staticmethod
+    def _predict(model: ResourceModel | None, X: pd.DataFrame | None) -> list[PredictionResult]:
+        if X is None or model is None or not model.is_fitted:
+            return []
+        return model.predict(X)
+
+    def _ml_recommend(
+        self,
+        task: str,
+        target: str | None,
+        q: float,
+        stats: TaskStats,
+        dur_pred: PredictionResult | None,
+        mem_pred: PredictionResult | None,
+    ) -> ResourceRecommendation:
         # Predict duration
         predicted_walltime: str | None = None
         duration_evidence: dict[str, Any] = {}
-        if self._duration_model is not None and self._duration_model.is_fitted:
-            dur_preds = self._duration_model.predict(X_pred)
-            if dur_preds:
-                dur_pred = dur_preds[0]
-                # Use upper bound for safety
-                walltime_s = dur_pred.upper if dur_pred.upper else dur_pred.point * 1.2
-                predicted_walltime = _seconds_to_hhmmss(walltime_s)
-                duration_evidence = {
-                    "predicted_duration_s": dur_pred.point,
-                    "duration_lower": dur_pred.lower,
-                    "duration_upper": dur_pred.upper,
-                    "feature_importances": self._duration_model.feature_importances(),
-                }
+        if dur_pred is not None:
+            # Use upper bound for safety
+            walltime_s = dur_pred.upper if dur_pred.upper else dur_pred.point * 1.2
+            predicted_walltime = _seconds_to_hhmmss(walltime_s)
+            duration_evidence = {
+                "predicted_duration_s": dur_pred.point,
+                "duration_lower": dur_pred.lower,
+                "duration_upper": dur_pred.upper,
+                "feature_importances": self._duration_model.feature_importances(),
+            }
 
         # Predict memory
         predicted_memory: str | None = None
         memory_evidence: dict[str, Any] = {}
-        if self._memory_model is not None and self._memory_model.is_fitted:
-            mem_preds = self._memory_model.predict(X_pred)
-            if mem_preds:
-                mem_pred = mem_preds[0]
-                # Use upper bound for safety with 10% margin
-                memory_bytes = int((mem_pred.upper or mem_pred.point * 1.3) * 1.1)
-                predicted_memory = _bytes_to_gib_string(memory_bytes)
-                memory_evidence = {
-                    "predicted_memory_bytes": mem_pred.point,
-                    "memory_lower": mem_pred.lower,
-                    "memory_upper": mem_pred.upper,
-                }
+        if mem_pred is not None:
+            # Use upper bound for safety with 10% margin
+            memory_bytes = int((mem_pred.upper or mem_pred.point * 1.3) * 1.1)
+            predicted_memory = _bytes_to_gib_string(memory_bytes)
+            memory_evidence = {
+                "predicted_memory_bytes": mem_pred.point,
+                "memory_lower": mem_pred.lower,
+                "memory_upper": mem_pred.upper,
+            }
 
         # Component and workers from history
-        component = str(
-            scoped["component"].dropna().iloc[-1]
-            if scoped["component"].notna().any()
-            else task
-        )
-        workers_series = pd.to_numeric(scoped["requested_workers"], errors="coerce").dropna()
-        workers = int(max(1, round(float(workers_series.quantile(q))))) if not workers_series.empty else 1
-
-        cpus_series = pd.to_numeric(scoped["requested_cpus"], errors="coerce").dropna()
-        cpus = int(max(1, round(float(cpus_series.quantile(q))))) if not cpus_series.empty else 1
+        component = stats.component or task
+        workers = _at_least_one(stats.quantile("workers", q))
+        cpus = _at_least_one(stats.quantile("cpus", q))
 
         evidence: dict[str, Any] = {
-            "records": int(len(scoped)),
+            "records": stats.records,
             "method": "ml",
             "model_type": self._duration_model.model_type if self._duration_model else "none",
             "confidence": q,
@@ -311,10 +517,10 @@ class LearnedAdvisor:
         task: str,
         target: str | None,
         q: float,
-        scoped: pd.DataFrame,
+        stats: TaskStats | None,
     ) -> ResourceRecommendation:
         """Fallback to simple quantile heuristics (Phase 2 behavior)."""
-        if scoped.empty:
+        if stats is None:
             return ResourceRecommendation(
                 task=task,
                 target=target,
@@ -324,22 +530,14 @@ class LearnedAdvisor:
                 evidence={"records": 0, "method": "heuristic", "reason": "no history"},
             )
 
-        component = str(
-            scoped["component"].dropna().iloc[-1]
-            if scoped["component"].notna().any()
-            else task
-        )
-
-        workers_series = pd.to_numeric(scoped["requested_workers"], errors="coerce").dropna()
-        cpus_series = pd.to_numeric(scoped["requested_cpus"], errors="coerce").dropna()
-        duration_series = pd.to_numeric(scoped["duration_s"], errors="coerce").dropna()
-        mem_series = pd.to_numeric(scoped["requested_memory_bytes"], errors="coerce").dropna()
-
-        workers = int(max(1, round(float(workers_series.quantile(q))))) if not workers_series.empty else 1
-        cpus = int(max(1, round(float(cpus_series.quantile(q))))) if not cpus_series.empty else 1
+        component = stats.component or task
+        workers = _at_least_one(stats.quantile("workers", q))
+        cpus = _at_least_one(stats.quantile("cpus", q))
 
-        memory_bytes = int(mem_series.quantile(q) * 1.10) if not mem_series.empty else None
-        walltime_s = float(duration_series.quantile(q) * 1.20) if not duration_series.empty else None
+        memory_q = stats.quantile("memory", q)
+        duration_q = stats.quantile("duration", q)
+        memory_bytes = int(memory_q * 1.10) if memory_q is not None else None
+        walltime_s = duration_q * 1.20 if duration_q is not None else None
 
         return ResourceRecommendation(
             task=task,
@@ -354,10 +552,11 @@ class LearnedAdvisor:
                 }
             },
             evidence={
-                "records": int(len(scoped)),
+                "records": stats.records,
                 "method": "heuristic",
                 "reason": f"insufficient data (need {self.MIN_SAMPLES_FOR_ML})",
                 "component": component,
+                "memory_source": stats.memory_source,
             },
         )
 
@@ -412,4 +611,4 @@ class LearnedAdvisor:
         }
 
 
-__all__ = ["LearnedAdvisor"]
+__all__ = ["REFRESH_MODES", "LearnedAdvisor", "history_watermark", "unseen_rows"]
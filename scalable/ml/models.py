@@ -8,6 +8,7 @@ so the module loads without ``scalable[ml]`` installed.
 from __future__ import annotations
 
 import json
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -58,10 +59,64 @@ class ModelQuality:
         }
 
 
+#: Model types accepted by :class:`ResourceModel`.
+MODEL_TYPES = (
+    "gradient_boosting",
+    "random_forest",
+    "quantile_regression",
+    "hist_gradient_boosting",
+)
+
+# estimator -> (tree count, leaf value table); rebuilt when warm starts add trees.
+_LEAF_TABLES: weakref.WeakKeyDictionary[Any, tuple[int, np.ndarray]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _leaf_value_table(estimator: Any) -> np.ndarray:
+    """Per-tree node values, padded to ``(n_trees, max_node_count)``."""
+    trees = np.ravel(estimator.estimators_)
+    cached = _LEAF_TABLES.get(estimator)
+    if cached is not None and cached[0] == len(trees):
+        return cached[1]
+    table = np.zeros((len(trees), max(t.tree_.node_count for t in trees)))
+    for i, tree in enumerate(trees):
+        values = tree.tree_.value[:, 0, 0]
+        table[i, : len(values)] = values
+    _LEAF_TABLES[estimator] = (len(trees), table)
+    return table
+
+
+def tree_predictions(estimator: Any, X: Any) -> np.ndarray:
+    """Raw prediction of every tree of a fitted sklearn ensemble.
+
+    Works for ``RandomForestRegressor`` (tree means) and
+    ``GradientBoostingRegressor`` (unscaled stage outputs). Each tree only
+    looks up the leaf of every sample (the compiled ``tree_.apply``, without
+    per-call input validation), and the leaf values are gathered from a
+    precomputed table in one indexing operation, instead of calling
+    ``predict`` on every tree.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(n_samples, n_trees)``.
+    """
+    X_arr = np.ascontiguousarray(X, dtype=np.float32)
+    trees = np.ravel(estimator.estimators_)
+    leaves = np.empty((len(X_arr), len(trees)), dtype=np.intp)
+    for i, tree in enumerate(trees):
+        leaves[:, i] = tree.tree_.apply(X_arr)
+    table = _leaf_value_table(estimator)
+    return table[np.arange(len(trees)), leaves]
+
+
 class ResourceModel:
     """Unified wrapper around sklearn estimators for resource prediction.
 
-    Supports gradient boosting, random forest, and quantile regression.
+    Supports gradient boosting, random forest, quantile regression, and
+    histogram gradient boosting (``hist_gradient_boosting``: native quantile
+    loss for the interval bounds, much faster to train on large histories).
     Falls back to simple percentile estimator if sklearn is unavailable.
     """
 
@@ -83,6 +138,13 @@ class ResourceModel:
         self._feature_names: list[str] = []
         self._is_fitted = False
         self._fallback_percentiles: dict[str, float] | None = None
+        #: Identity encoding of the training features
+        #: (:attr:`FeatureExtractor.feature_encoding`), persisted by :meth:`save`.
+        self.feature_encoding: dict[str, Any] | None = None
+        #: Rows per run the model was trained on (``run_id -> count``)
+        self.training_watermark: dict[str, int] | None = None
+        #: Warm-start updates applied since the last full fit
+        self.incremental_updates = 0
 
     @property
     def is_fitted(self) -> bool:
@@ -92,6 +154,18 @@ class ResourceModel:
     def feature_names(self) -> list[str]:
         return list(self._feature_names)
 
+    @property
+    def n_estimators(self) -> int | None:
+        """Trees (boosting iterations) of the point estimator, if fitted."""
+        if self._model is None:
+            return None
+        return getattr(self._model, "n_estimators", getattr(self._model, "max_iter", None))
+
+    @property
+    def can_warm_start(self) -> bool:
+        """Whether :meth:`update` can add trees to the fitted estimators."""
+        return self._is_fitted and self._fallback_percentiles is None and self._model is not None
+
     def fit(self, X: pd.DataFrame, y: pd.Series) -> ResourceModel:
         """Train the model on feature matrix X and target y.
 
@@ -129,12 +203,48 @@ class ResourceModel:
             }
 
         self._is_fitted = True
+        self.incremental_updates = 0
+        return self
+
+    def update(
+        self, X: pd.DataFrame, y: pd.Series, *, extra_estimators: int = 10
+    ) -> ResourceModel:
+        """Incrementally train on new rows by warm-starting the ensembles.
+
+        Each estimator keeps its existing trees and grows ``extra_estimators``
+        more, fitted on ``X``/``y`` only: boosting stages correct the current
+        model's residuals on the new rows, and random-forest trees are trained
+        on them. This is much cheaper than :meth:`fit` over the full history.
+        """
+        if not self.can_warm_start:
+            raise RuntimeError("Model cannot be warm-started; call .fit() on the full history.")
+        aligned = X.reindex(columns=self._feature_names, fill_value=0)
+        X_arr = aligned.values.astype(np.float64)
+        y_arr = y.values.astype(np.float64)
+        mask = ~(np.isnan(X_arr).any(axis=1) | np.isnan(y_arr))
+        X_arr = X_arr[mask]
+        y_arr = y_arr[mask]
+        if len(y_arr) < 2:
+            return self
+
+        for estimator in (self._model, self._model_lower, self._model_upper):
+            if estimator is None:
+                continue
+            size = "max_iter" if hasattr(estimator, "max_iter") else "n_estimators"
+            estimator.set_params(
+                warm_start=True,
+                **{size: getattr(estimator, size) + max(int(extra_estimators), 1)},
+            )
+            estimator.fit(X_arr, y_arr)
+            estimator.set_params(warm_start=False)
+        self.incremental_updates += 1
         return self
 
     def _fit_sklearn(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Fit using sklearn estimators."""
         from sklearn.ensemble import (
             GradientBoostingRegressor,
+            HistGradientBoostingRegressor,
             RandomForestRegressor,
         )
 
@@ -190,6 +300,21 @@ class ResourceModel:
                 random_state=self.random_state,
             )
             self._model_upper.fit(X_arr, y_arr)
+        elif self.model_type == "hist_gradient_boosting":
+            # Binned histogram boosting with native quantile loss for bounds.
+            def _hist(loss: str, quantile: float | None = None) -> Any:
+                return HistGradientBoostingRegressor(
+                    loss=loss,
+                    quantile=quantile,
+                    max_iter=100,
+                    max_depth=5,
+                    early_stopping=False,
+                    random_state=self.random_state,
+                ).fit(X_arr, y_arr)
+
+            self._model = _hist("squared_error")
+            self._model_lower = _hist("quantile", self.quantile_lower)
+            self._model_upper = _hist("quantile", self.quantile_upper)
         else:
             # Default: gradient_boosting
             self._model = GradientBoostingRegressor(
@@ -247,9 +372,9 @@ class ResourceModel:
             uppers = self._model_upper.predict(X_arr)
         elif self.model_type == "random_forest":
             # Use individual tree predictions for intervals
-            tree_preds = np.array([t.predict(X_arr) for t in self._model.estimators_])
-            lowers = np.percentile(tree_preds, self.quantile_lower * 100, axis=0)
-            uppers = np.percentile(tree_preds, self.quantile_upper * 100, axis=0)
+            tree_preds = tree_predictions(self._model, X_arr)
+            lowers = np.percentile(tree_preds, self.quantile_lower * 100, axis=1)
+            uppers = np.percentile(tree_preds, self.quantile_upper * 100, axis=1)
         else:
             # Heuristic interval: ±30% of point prediction
             lowers = points * 0.7
@@ -286,6 +411,9 @@ class ResourceModel:
             "feature_names": self._feature_names,
             "is_fitted": self._is_fitted,
             "fallback_percentiles": self._fallback_percentiles,
+            "feature_encoding": self.feature_encoding,
+            "training_watermark": self.training_watermark,
+            "incremental_updates": self.incremental_updates,
         }
         (path / "metadata.json").write_text(json.dumps(meta, indent=2))
 
@@ -316,6 +444,9 @@ class ResourceModel:
         instance._feature_names = meta.get("feature_names", [])
         instance._is_fitted = meta.get("is_fitted", False)
         instance._fallback_percentiles = meta.get("fallback_percentiles")
+        instance.feature_encoding = meta.get("feature_encoding")
+        instance.training_watermark = meta.get("training_watermark")
+        instance.incremental_updates = int(meta.get("incremental_updates", 0))
 
         model_path = path / "model.joblib"
         if model_path.exists():
@@ -335,4 +466,4 @@ class ResourceModel:
         return instance
 
 
-__all__ = ["ModelQuality", "PredictionResult", "ResourceModel"]
+__all__ = ["MODEL_TYPES", "ModelQuality", "PredictionResult", "ResourceModel", "tree_predictions"]
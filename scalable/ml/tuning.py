@@ -3,16 +3,33 @@
 Provides a thin wrapper around Dask-ML search strategies for distributed
 model selection within a Scalable session. Falls back to sequential sklearn
 search when Dask-ML is unavailable.
+
+With a :class:`~scalable.client.ScalableClient` (passed explicitly, or the
+default client of an active Scalable session) the search runs on that
+cluster instead: the training matrix is scattered once, every
+candidate/budget pair is one task, and successive halving drops the weaker
+candidates between rungs. Other Dask clients are only used when passed
+explicitly, through Dask-ML.
 """
 
 from __future__ import annotations
 
+import math
 import time
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from scalable.common import logger
+
+#: Strategies understood by :class:`HyperparameterSearch`.
+STRATEGIES: tuple[str, ...] = ("hyperband", "successive_halving", "random")
+
+#: Telemetry task name of cluster trials.
+TRIAL_TASK_NAME: str = "hyperparameter_trial"
+
 
 @dataclass(frozen=True)
 class TuningResult:
@@ -43,6 +60,14 @@ class HyperparameterSearch:
     Falls back to sklearn's ``RandomizedSearchCV`` when Dask-ML is not
     available.
 
+    When :meth:`fit` has a client, the search fans out over that cluster.
+    The budget of a trial is the number of training rows it sees:
+    ``"random"`` evaluates every candidate on all rows,
+    ``"successive_halving"`` starts all candidates on a small sample and
+    keeps the best ``1 / reduction_factor`` of them at each larger rung,
+    and ``"hyperband"`` runs several halving brackets with different
+    starting samples. Each trial records its fit, score and total time.
+
     Parameters
     ----------
     estimator
@@ -59,6 +84,11 @@ class HyperparameterSearch:
         Scoring metric name (sklearn convention, e.g., ``"neg_mean_absolute_error"``).
     random_state
         Random state for reproducibility.
+    cv
+        Cross-validation folds per trial.
+    reduction_factor
+        Candidates kept per rung (``1 / reduction_factor``) and budget growth
+        between rungs in cluster searches.
     """
 
     def __init__(
@@ -70,13 +100,21 @@ class HyperparameterSearch:
         n_iter: int = 50,
         scoring: str | None = None,
         random_state: int = 42,
+        cv: int = 3,
+        reduction_factor: int = 3,
     ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+        if reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
         self.estimator = estimator
         self.param_space = param_space
         self.strategy = strategy
         self.n_iter = n_iter
         self.scoring = scoring or "neg_mean_absolute_error"
         self.random_state = random_state
+        self.cv = cv
+        self.reduction_factor = reduction_factor
 
     def fit(
         self,
@@ -84,6 +122,7 @@ class HyperparameterSearch:
         y: Any,
         *,
         client: Any | None = None,
+        tag: str | None = None,
     ) -> TuningResult:
         """Run the hyperparameter search.
 
@@ -94,8 +133,14 @@ class HyperparameterSearch:
         y
             Training target.
         client
-            Optional Dask client for distributed execution. If ``None``,
-            falls back to local sequential search.
+            Dask client to search on. A
+            :class:`~scalable.client.ScalableClient` runs one tagged task
+            per trial; other clients go through dask-ml (or, without it, the
+            same per-trial tasks). Defaults to the default client if it is a
+            ``ScalableClient``, i.e. that of an active session; otherwise the
+            search runs through dask-ml or a local sequential sklearn search.
+        tag
+            Worker tag the trials are submitted to (``ScalableClient`` only).
 
         Returns
         -------
@@ -104,10 +149,18 @@ class HyperparameterSearch:
         """
         start_time = time.time()
 
-        try:
-            result = self._fit_dask_ml(X, y, client=client)
-        except ImportError:
-            result = self._fit_sklearn_fallback(X, y)
+        if client is None:
+            client = _active_client()
+        if client is not None and _is_scalable_client(client):
+            result = self._fit_on_client(X, y, client=client, tag=tag)
+        else:
+            try:
+                result = self._fit_dask_ml(X, y, client=client)
+            except ImportError:
+                if client is not None:
+                    result = self._fit_on_client(X, y, client=client, tag=tag)
+                else:
+                    result = self._fit_sklearn_fallback(X, y)
 
         wall_time = time.time() - start_time
         return TuningResult(
@@ -120,6 +173,105 @@ class HyperparameterSearch:
             strategy=self.strategy,
         )
 
+    def _fit_on_client(self, X: Any, y: Any, *, client: Any, tag: str | None) -> dict[str, Any]:
+        """Successive-halving search with one cluster task per trial."""
+        from sklearn.model_selection import ParameterSampler
+
+        n_rows = len(y)
+        # Enough rows that every CV fold trains on at least a couple of samples.
+        min_rows = min(n_rows, max(2 * self.cv, 10))
+        # Unique keys: a content-hashed key could be released by an earlier
+        # search over the same data while this one still needs it.
+        X_future, y_future = client.scatter([X, y], hash=False)
+
+        submit_kwargs: dict[str, Any] = {}
+        if _is_scalable_client(client):
+            submit_kwargs = {"tag": tag, "_scalable_task_name": TRIAL_TASK_NAME}
+
+        def _run_rung(candidates: list[dict[str, Any]], rows: int) -> list[dict[str, Any]]:
+            futures = [
+                client.submit(
+                    _run_trial,
+                    self.estimator,
+                    params,
+                    X_future,
+                    y_future,
+                    n_rows=rows,
+                    cv=self.cv,
+                    scoring=self.scoring,
+                    random_state=self.random_state,
+                    pure=False,
+                    **submit_kwargs,
+                )
+                for params in candidates
+            ]
+            return client.gather(futures)
+
+        factor = self.reduction_factor
+        brackets = self._brackets(n_rows, min_rows)
+        trials: list[dict[str, Any]] = []
+        seed = self.random_state
+        n_sampled = 0
+        for bracket, (n_candidates, n_rungs) in enumerate(brackets):
+            candidates = list(
+                ParameterSampler(self.param_space, n_iter=n_candidates, random_state=seed + bracket)
+            )
+            n_sampled += len(candidates)
+            for rung in range(n_rungs):
+                rows = _rung_rows(n_rows, min_rows, rung, n_rungs, factor)
+                results = _run_rung(candidates, rows)
+                for params, result in zip(candidates, results, strict=True):
+                    trials.append(
+                        {"bracket": bracket, "rung": rung, "params": params, **result}
+                    )
+                if rung == n_rungs - 1:
+                    break
+                keep = max(1, len(candidates) // factor)
+                order = np.argsort([-r["mean_test_score"] for r in results], kind="stable")
+                candidates = [candidates[i] for i in order[:keep]]
+
+        table = pd.DataFrame(trials)
+        # Only full-budget scores are comparable across brackets.
+        final = table[table["n_samples"] == table["n_samples"].max()]
+        best = final.loc[final["mean_test_score"].idxmax()]
+        best_params = dict(best["params"])
+        best_estimator = client.gather(
+            client.submit(
+                _refit, self.estimator, best_params, X_future, y_future, pure=False, **submit_kwargs
+            )
+        )
+        logger.info(
+            "hyperparameter search: %d candidates, %d trials, best score %.4g",
+            n_sampled,
+            len(table),
+            float(best["mean_test_score"]),
+        )
+        return {
+            "best_params": best_params,
+            "best_score": float(best["mean_test_score"]),
+            "best_estimator": best_estimator,
+            "all_results": table,
+            "n_iterations": len(table),
+        }
+
+    def _brackets(self, n_rows: int, min_rows: int) -> list[tuple[int, int]]:
+        """``(candidates, rungs)`` per halving bracket for :attr:`strategy`."""
+        factor = self.reduction_factor
+        # Rungs until the budget, growing by ``factor``, reaches every row.
+        max_rungs = max(1, math.floor(math.log(max(n_rows / min_rows, 1), factor)) + 1)
+        if self.strategy == "random":
+            return [(self.n_iter, 1)]
+        if self.strategy == "successive_halving":
+            rungs = min(max_rungs, max(1, math.floor(math.log(self.n_iter, factor)) + 1))
+            return [(self.n_iter, rungs)]
+        # Hyperband: bracket s starts factor**s times more candidates on
+        # factor**s times fewer rows; ``n_iter`` is shared between brackets.
+        weights = [factor**s for s in range(max_rungs - 1, -1, -1)]
+        return [
+            (max(1, round(self.n_iter * w / sum(weights))), s + 1)
+            for w, s in zip(weights, range(max_rungs - 1, -1, -1), strict=True)
+        ]
+
     def _fit_dask_ml(self, X: Any, y: Any, *, client: Any) -> dict[str, Any]:
         """Fit using Dask-ML search strategies."""
         from dask_ml.model_selection import HyperbandSearchCV, RandomizedSearchCV
@@ -173,7 +325,7 @@ class HyperparameterSearch:
                 self.param_space,
                 n_iter=min(self.n_iter, 20),  # Cap for sequential search
                 scoring=self.scoring,
-                cv=3,
+                cv=self.cv,
                 random_state=self.random_state,
                 n_jobs=-1,
             )
@@ -198,4 +350,75 @@ class HyperparameterSearch:
             }
 
 
-__all__ = ["HyperparameterSearch", "TuningResult"]
+def _rung_rows(n_rows: int, min_rows: int, rung: int, n_rungs: int, factor: int) -> int:
+    """Training rows of ``rung``; the last rung of a bracket uses every row."""
+    return max(min_rows, n_rows // factor ** (n_rungs - 1 - rung))
+
+
+def _take(data: Any, index: np.ndarray) -> Any:
+    if hasattr(data, "iloc"):
+        return data.iloc[index]
+    return np.asarray(data)[index]
+
+
+def _run_trial(
+    estimator: Any,
+    params: dict[str, Any],
+    X: Any,
+    y: Any,
+    *,
+    n_rows: int,
+    cv: int,
+    scoring: str,
+    random_state: int,
+) -> dict[str, Any]:
+    """Cross-validate ``estimator`` with ``params`` on ``n_rows`` sampled rows."""
+    from sklearn.base import clone
+    from sklearn.model_selection import KFold, cross_validate
+
+    start = time.perf_counter()
+    # The same permutation in every trial: larger rungs extend smaller ones.
+    index = np.random.default_rng(random_state).permutation(len(y))[:n_rows]
+    scores = cross_validate(
+        clone(estimator).set_params(**params),
+        _take(X, index),
+        _take(y, index),
+        cv=KFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=scoring,
+    )
+    return {
+        "n_samples": int(len(index)),
+        "mean_test_score": float(np.mean(scores["test_score"])),
+        "std_test_score": float(np.std(scores["test_score"])),
+        "fit_time_s": float(np.sum(scores["fit_time"])),
+        "score_time_s": float(np.sum(scores["score_time"])),
+        "trial_time_s": time.perf_counter() - start,
+    }
+
+
+def _refit(estimator: Any, params: dict[str, Any], X: Any, y: Any) -> Any:
+    from sklearn.base import clone
+
+    return clone(estimator).set_params(**params).fit(X, y)
+
+
+def _active_client() -> Any | None:
+    """The default client if it is a session's ``ScalableClient``, else ``None``."""
+    try:
+        from distributed import default_client
+    except ImportError:
+        return None
+    try:
+        client = default_client()
+    except ValueError:
+        return None
+    return client if _is_scalable_client(client) else None
+
+
+def _is_scalable_client(client: Any) -> bool:
+    from scalable.client import ScalableClient
+
+    return isinstance(client, ScalableClient)
+
+
+__all__ = ["STRATEGIES", "TRIAL_TASK_NAME", "HyperparameterSearch", "TuningResult"]
@@ -14,5 +14,13 @@ test-pinned so Phase 2 telemetry can durably reference manifests.
 from __future__ import annotations
 
 from .dryrun import DryRunPlan, build_dry_run_plan, compute_manifest_lock
+from .walltime import QueueWaitModel, WalltimePlan, plan_walltime
 
-__all__ = ["DryRunPlan", "build_dry_run_plan", "compute_manifest_lock"]
+__all__ = [
+    "DryRunPlan",
+    "QueueWaitModel",
+    "WalltimePlan",
+    "build_dry_run_plan",
+    "compute_manifest_lock",
+    "plan_walltime",
+]
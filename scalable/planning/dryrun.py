@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from scalable.planning.walltime import WalltimePlan
 from scalable.providers.base import DeploymentSpec, ResourceRequest, ScalePlan
 
 __all__ = [
@@ -18,16 +19,22 @@ __all__ = [
 
 @dataclass(frozen=True)
 class DryRunPlan:
-    """Serializable dry-run result for CLI/session APIs."""
+    """Serializable dry-run result for CLI/session APIs.
+
+    ``walltime_plans`` is filled by the ``"minimize expected time"``
+    objective: per worker tag, the chosen workers and walltime and the
+    expected completion time, kill risk and queue wait of the alternatives.
+    """
 
     target_name: str
     provider_name: str
     manifest_lock: str
     scale_plan: ScalePlan
     task_to_component: dict[str, str]
+    walltime_plans: dict[str, WalltimePlan] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        payload = {
             "version": 1,
             "target": self.target_name,
             "provider": self.provider_name,
@@ -46,6 +53,11 @@ class DryRunPlan:
                 },
             },
         }
+        if self.walltime_plans:
+            payload["walltime_tradeoffs"] = {
+                tag: plan.to_dict() for tag, plan in self.walltime_plans.items()
+            }
+        return payload
 
 
 def compute_manifest_lock(raw_manifest: dict[str, Any]) -> str:
@@ -0,0 +1,560 @@
+"""Walltime and worker-count planning under queue-wait and kill risk.
+
+On a batch scheduler such as Slurm, a longer walltime request waits longer
+in the queue, while a shorter one risks the job being killed before its task
+finishes. The killed task is then requeued behind another queue wait.
+:func:`plan_walltime` simulates a component's workload for candidate
+``(workers, walltime)`` pairs and picks the one with the smallest expected
+time to completion:
+
+* each task's duration is drawn from the history;
+* each worker job waits :meth:`QueueWaitModel.wait` for its walltime, then
+  runs tasks back to back until the walltime expires;
+* a task that does not fit in the job's remaining walltime is killed at the
+  walltime and a replacement job is queued. If the task fits in a fresh job
+  it is requeued for the next free worker; if it is longer than the
+  walltime it is resubmitted on its own job with the *safe* walltime (the
+  longest observed duration), behind that job's longer queue wait.
+
+Candidate walltimes are quantiles of the observed durations (and, when a
+worker runs several tasks, multiples of them), rounded up to whole minutes.
+The simulation uses the same random draws for every candidate, so the
+comparison is not blurred by sampling noise.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from scalable.advising.stats import sample_weights, weighted_quantiles
+
+__all__ = [
+    "DEFAULT_QUEUE_WAIT_PER_WALLTIME",
+    "QueueWaitModel",
+    "WalltimeOption",
+    "WalltimePlan",
+    "duration_samples",
+    "interval_samples",
+    "job_queue_waits",
+    "plan_component_walltimes",
+    "plan_walltime",
+    "simulate_completion",
+]
+
+#: Queue-wait seconds per requested walltime second when history has no trend.
+DEFAULT_QUEUE_WAIT_PER_WALLTIME: float = 0.1
+
+#: Duration quantiles tried as walltime candidates.
+WALLTIME_QUANTILES: tuple[float, ...] = (0.5, 0.75, 0.9, 0.95, 0.99, 1.0)
+
+#: Fewest duration samples used directly; below this, advisor intervals are used.
+MIN_DURATION_SAMPLES: int = 5
+
+#: Worker counts up to this are all evaluated; above it, powers of two.
+_EXHAUSTIVE_WORKERS = 16
+
+#: Simulated tasks per candidate in :func:`plan_walltime`; replications are
+#: scaled down to this budget (but not below ``_MIN_REPLICATIONS``) for
+#: components with many tasks, whose makespan varies little between runs.
+_SIMULATED_TASKS = 20_000
+_MIN_REPLICATIONS = 20
+
+
+def _walltime_seconds(value: Any) -> float | None:
+    """Seconds of a Slurm time limit, or ``None`` if it does not parse.
+
+    Accepts ``MM``, ``MM:SS``, ``HH:MM:SS``, ``D-HH``, ``D-HH:MM`` and
+    ``D-HH:MM:SS``, as ``sbatch --time`` does.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    days, _, clock = value.strip().rpartition("-")
+    try:
+        parts = [int(p) for p in clock.split(":")]
+        day_seconds = int(days) * 86400 if days else 0
+    except ValueError:
+        return None
+    if days:
+        units = (3600, 60, 1)
+    else:
+        units = {1: (60,), 2: (60, 1), 3: (3600, 60, 1)}.get(len(parts), ())
+    if not parts or len(parts) > len(units):
+        return None
+    return float(day_seconds + sum(p * u for p, u in zip(parts, units, strict=False)))
+
+
+@dataclass(frozen=True)
+class QueueWaitModel:
+    """Queue wait of a worker job as a linear function of its walltime."""
+
+    base_s: float = 0.0
+    per_walltime_s: float = DEFAULT_QUEUE_WAIT_PER_WALLTIME
+    source: str = "default"
+
+    def wait(self, walltime_s: float) -> float:
+        return self.base_s + self.per_walltime_s * walltime_s
+
+    @classmethod
+    def from_history(cls, records: pd.DataFrame) -> QueueWaitModel:
+        """Fit ``queue_wait_s`` against ``requested_walltime`` of worker jobs.
+
+        ``records`` are job start latencies as returned by
+        :func:`job_queue_waits`. With at least three rows over two or more
+        distinct walltimes the line is fitted by least squares (clamped to
+        non-negative terms). With waits but no walltime spread, the median
+        wait is the base and the slope is
+        :data:`DEFAULT_QUEUE_WAIT_PER_WALLTIME`. Without waits the default
+        model is returned.
+        """
+        if records.empty or "queue_wait_s" not in records.columns:
+            return cls()
+        waits = pd.to_numeric(records["queue_wait_s"], errors="coerce")
+        walltimes = (
+            records["requested_walltime"].map(_walltime_seconds)
+            if "requested_walltime" in records.columns
+            else pd.Series(np.nan, index=records.index)
+        )
+        paired = pd.DataFrame({"wait": waits, "walltime": walltimes}).dropna()
+        if len(paired) >= 3 and paired["walltime"].nunique() >= 2:
+            slope, intercept = np.polyfit(paired["walltime"], paired["wait"], 1)
+            return cls(
+                base_s=max(0.0, float(intercept)),
+                per_walltime_s=max(0.0, float(slope)),
+                source="telemetry",
+            )
+        waits = waits.dropna()
+        if not waits.empty:
+            return cls(base_s=float(waits.median()), source="telemetry median")
+        return cls()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"base_s": self.base_s, "per_walltime_s": self.per_walltime_s, "source": self.source}
+
+
+@dataclass(frozen=True)
+class WalltimeOption:
+    """Simulated outcome of one ``(workers, walltime)`` candidate.
+
+    ``kill_probability`` is the fraction of task attempts killed by the
+    walltime, ``expected_requeues`` the mean number of such kills per run
+    and ``expected_jobs`` the mean number of jobs submitted, including
+    replacements and safe-walltime resubmissions.
+    """
+
+    workers: int
+    walltime_s: float
+    queue_wait_s: float
+    expected_completion_s: float
+    kill_probability: float
+    expected_requeues: float
+    expected_jobs: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "walltime_s": self.walltime_s,
+            "queue_wait_s": self.queue_wait_s,
+            "expected_completion_s": self.expected_completion_s,
+            "kill_probability": self.kill_probability,
+            "expected_requeues": self.expected_requeues,
+            "expected_jobs": self.expected_jobs,
+        }
+
+
+@dataclass(frozen=True)
+class WalltimePlan:
+    """Chosen ``(workers, walltime)`` for one worker tag and its alternatives.
+
+    ``options`` holds the best worker count for every candidate walltime,
+    shortest walltime first, so the queue-wait versus kill-risk trade-off can
+    be read off directly.
+    """
+
+    tag: str
+    tasks: int
+    samples: int
+    duration_source: str
+    queue_model: QueueWaitModel
+    chosen: WalltimeOption
+    options: list[WalltimeOption] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "tasks": self.tasks,
+            "samples": self.samples,
+            "duration_source": self.duration_source,
+            "queue_model": self.queue_model.to_dict(),
+            "chosen": self.chosen.to_dict(),
+            "options": [option.to_dict() for option in self.options],
+        }
+
+
+def duration_samples(
+    records: pd.DataFrame,
+    task_names: Sequence[str],
+    *,
+    target: str | None = None,
+) -> tuple[np.ndarray, int]:
+    """Durations of succeeded ``task_names`` runs and their median count per run.
+
+    Rows on ``target`` are preferred; without any, rows on every target are
+    used, as the advisors do. Both are weighted by the rows' telemetry
+    ``sample_weight``.
+    """
+    if records.empty or "task_name" not in records.columns:
+        return np.zeros(0), 0
+    scoped = records[records["task_name"].isin(set(task_names))]
+    if "state" in scoped.columns:
+        scoped = scoped[scoped["state"] == "succeeded"]
+    if target is not None and "target" in scoped.columns:
+        on_target = scoped[scoped["target"] == target]
+        if not on_target.empty:
+            scoped = on_target
+    durations = pd.to_numeric(scoped.get("duration_s"), errors="coerce")
+    weights = sample_weights(scoped)
+    scoped = scoped[durations.notna() & (durations > 0) & (weights > 0)]
+    if scoped.empty:
+        return np.zeros(0), 0
+    weights = weights.loc[scoped.index]
+    per_run = weights.groupby(scoped["run_id"]).sum() if "run_id" in scoped.columns else None
+    tasks = int(math.ceil(per_run.median())) if per_run is not None else int(weights.sum())
+    values = pd.to_numeric(scoped["duration_s"]).to_numpy(dtype=float)
+    w = weights.to_numpy()
+    if not np.all(w == w[0]):
+        # Rows of sampled streams stand for several tasks: resample so every
+        # returned duration stands for the same number of tasks.
+        values = weighted_quantiles(values, w, (np.arange(values.size) + 0.5) / values.size)
+    return values, max(1, tasks)
+
+
+def interval_samples(
+    point: float, upper: float, *, quantile: float = 0.95, n: int = 200
+) -> np.ndarray:
+    """Lognormal duration samples with median ``point`` and ``quantile`` at ``upper``.
+
+    Used when a task has too little history but a
+    :class:`~scalable.ml.LearnedAdvisor` predicts an interval for it.
+    """
+    sigma = max(0.0, math.log(max(upper, point) / point) / NormalDist().inv_cdf(quantile))
+    probabilities = (np.arange(n) + 0.5) / n
+    z = np.array([NormalDist().inv_cdf(p) for p in probabilities])
+    return point * np.exp(sigma * z)
+
+
+def simulate_completion(
+    durations: np.ndarray,
+    *,
+    tasks: int,
+    workers: int,
+    walltime_s: float,
+    queue_model: QueueWaitModel,
+    safe_walltime_s: float | None = None,
+    replications: int = 200,
+    seed: int = 0,
+) -> WalltimeOption:
+    """Expected time for ``workers`` jobs of ``walltime_s`` to finish ``tasks`` tasks.
+
+    ``safe_walltime_s`` is the walltime tasks longer than ``walltime_s`` are
+    resubmitted with; it defaults to the longest duration, rounded up to a
+    minute.
+    """
+    (option,) = _simulate(
+        np.asarray(durations, dtype=float),
+        tasks=tasks,
+        workers=workers,
+        walltimes=np.array([float(walltime_s)]),
+        queue_model=queue_model,
+        safe_walltime_s=safe_walltime_s,
+        replications=replications,
+        seed=seed,
+    )
+    return option
+
+
+def _simulate(
+    durations: np.ndarray,
+    *,
+    tasks: int,
+    workers: int,
+    walltimes: np.ndarray,
+    queue_model: QueueWaitModel,
+    safe_walltime_s: float | None,
+    replications: int,
+    seed: int,
+) -> list[WalltimeOption]:
+    """:func:`simulate_completion` for several walltimes with one worker count.
+
+    Every ``(walltime, replication)`` pair is a row, and all rows advance
+    together: each step hands the next pending task of every unfinished row
+    to that row's earliest free worker (the earliest job end breaking ties),
+    as a priority queue per row would. All walltimes share the same draws.
+    """
+    if safe_walltime_s is None:
+        safe_walltime_s = _whole_minutes(float(np.max(durations)))
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(durations, size=(replications, tasks))
+    rows = walltimes.size * replications
+    end = np.zeros(rows)
+    kills = np.zeros(rows)
+    attempts = np.zeros(rows)
+    jobs = np.zeros(rows)
+
+    # State of the unfinished rows only; ``row`` maps them back.
+    row = np.arange(rows)
+    replication = row % replications
+    walltime = np.repeat(walltimes, replications)
+    queue_wait = queue_model.wait(walltime)
+    safe_wait = queue_model.wait(np.maximum(safe_walltime_s, walltime))
+    free = np.repeat(queue_wait[:, None], min(workers, tasks), axis=1)
+    job_end = free + walltime[:, None]
+    position = np.zeros(rows, dtype=np.int64)
+    row_end = np.zeros(rows)
+    row_kills = np.zeros(rows)
+    row_jobs = np.full(rows, float(free.shape[1]))
+    steps = 0
+    while row.size:
+        steps += 1
+        index = np.arange(row.size)
+        start = free.min(axis=1)
+        slot = np.where(free == start[:, None], job_end, np.inf).argmin(axis=1)
+        limit = job_end[index, slot]
+        duration = draws[replication, position]
+        finish = start + duration
+
+        # A killed task is requeued if it fits a fresh job, else resubmitted
+        # on its own job with the safe walltime.
+        fits = finish <= limit
+        too_long = ~fits & (duration > walltime)
+        position += fits | too_long
+        more = position < tasks
+        restart = limit + queue_wait
+        row_end = np.maximum(
+            row_end,
+            np.where(fits, finish, np.where(too_long, limit + safe_wait + duration, 0.0)),
+        )
+        row_kills += ~fits
+        row_jobs += too_long + (~fits & more)
+        free[index, slot] = np.where(fits, finish, restart)
+        job_end[index, slot] = np.where(fits, limit, restart + walltime)
+
+        if not more.all():
+            done = row[~more]
+            end[done] = row_end[~more]
+            kills[done] = row_kills[~more]
+            jobs[done] = row_jobs[~more]
+            attempts[done] = steps
+            row, replication, walltime = row[more], replication[more], walltime[more]
+            queue_wait, safe_wait = queue_wait[more], safe_wait[more]
+            free, job_end, position = free[more], job_end[more], position[more]
+            row_end, row_kills, row_jobs = row_end[more], row_kills[more], row_jobs[more]
+
+    options = []
+    for index, walltime_s in enumerate(walltimes.tolist()):
+        rows_of = slice(index * replications, (index + 1) * replications)
+        total_attempts = attempts[rows_of].sum()
+        options.append(
+            WalltimeOption(
+                workers=workers,
+                walltime_s=walltime_s,
+                queue_wait_s=queue_model.wait(walltime_s),
+                expected_completion_s=float(end[rows_of].mean()),
+                kill_probability=float(kills[rows_of].sum() / total_attempts)
+                if total_attempts
+                else 0.0,
+                expected_requeues=float(kills[rows_of].sum() / replications),
+                expected_jobs=float(jobs[rows_of].sum() / replications),
+            )
+        )
+    return options
+
+
+def _whole_minutes(seconds: float) -> float:
+    """Round up to a whole minute, the granularity schedulers take."""
+    return 60.0 * math.ceil(seconds / 60.0)
+
+
+def _worker_candidates(max_workers: int) -> list[int]:
+    if max_workers <= _EXHAUSTIVE_WORKERS:
+        return list(range(1, max_workers + 1))
+    powers = [2**i for i in range(int(math.log2(max_workers)) + 1)]
+    return sorted({*powers, max_workers})
+
+
+def _walltime_candidates(durations: np.ndarray, per_worker: int) -> list[float]:
+    quantiles = np.quantile(durations, WALLTIME_QUANTILES)
+    candidates = set(quantiles.tolist())
+    if per_worker > 1:
+        candidates.update((per_worker * np.quantile(durations, [0.5, 0.95])).tolist())
+    return sorted({_whole_minutes(c) for c in candidates if c > 0})
+
+
+def plan_walltime(
+    durations: Sequence[float] | np.ndarray,
+    *,
+    tasks: int,
+    max_workers: int,
+    queue_model: QueueWaitModel | None = None,
+    tag: str = "",
+    duration_source: str = "telemetry",
+    replications: int = 200,
+    seed: int = 0,
+) -> WalltimePlan:
+    """Choose the workers and walltime minimizing expected time to completion.
+
+    Parameters
+    ----------
+    durations
+        Observed (or sampled) task durations in seconds.
+    tasks
+        Number of tasks the component runs per workflow.
+    max_workers
+        Upper bound on the worker count; never more than ``tasks`` are used.
+    queue_model
+        Queue wait as a function of walltime; defaults to
+        :class:`QueueWaitModel` with no history.
+    replications
+        Simulated workflows per candidate, reduced to fit
+        ``_SIMULATED_TASKS`` task draws when ``tasks`` is large.
+
+    Ties in expected completion go to fewer workers, then the shorter
+    walltime.
+    """
+    samples = np.asarray(durations, dtype=float)
+    samples = samples[np.isfinite(samples) & (samples > 0)]
+    if samples.size == 0:
+        raise ValueError("plan_walltime needs at least one positive duration")
+    if tasks < 1 or max_workers < 1:
+        raise ValueError("tasks and max_workers must be at least 1")
+    queue_model = queue_model or QueueWaitModel()
+    replications = min(replications, max(_SIMULATED_TASKS // tasks, _MIN_REPLICATIONS))
+
+    best_by_walltime: dict[float, WalltimeOption] = {}
+    for workers in _worker_candidates(min(max_workers, tasks)):
+        walltimes = _walltime_candidates(samples, math.ceil(tasks / workers))
+        for option in _simulate(
+            samples,
+            tasks=tasks,
+            workers=workers,
+            walltimes=np.array(walltimes),
+            queue_model=queue_model,
+            safe_walltime_s=None,
+            replications=replications,
+            seed=seed,
+        ):
+            walltime_s = option.walltime_s
+            incumbent = best_by_walltime.get(walltime_s)
+            if incumbent is None or option.expected_completion_s < incumbent.expected_completion_s:
+                best_by_walltime[walltime_s] = option
+
+    options = [best_by_walltime[w] for w in sorted(best_by_walltime)]
+    chosen = min(options, key=lambda o: (o.expected_completion_s, o.workers, o.walltime_s))
+    return WalltimePlan(
+        tag=tag,
+        tasks=tasks,
+        samples=int(samples.size),
+        duration_source=duration_source,
+        queue_model=queue_model,
+        chosen=chosen,
+        options=options,
+    )
+
+
+def job_queue_waits(runs_dir: str | Path, *, keep_last: int = 20) -> pd.DataFrame:
+    """Batch-queue waits of worker jobs recorded by the newest ``keep_last`` runs.
+
+    Reads the ``worker_started`` events that
+    :class:`~scalable.ml.AdaptiveScalingController` writes to
+    ``workers.jsonl``: the time from requesting a worker to it joining the
+    scheduler, with the walltime its job requested. Returns one row per
+    event with columns ``tag``, ``queue_wait_s`` and ``requested_walltime``,
+    ready for :meth:`QueueWaitModel.from_history`.
+    """
+    from scalable.telemetry.collectors import iter_run_dirs, read_jsonl
+
+    runs = iter_run_dirs(runs_dir)[-keep_last:] if keep_last > 0 else []
+    rows = []
+    for run_dir in runs:
+        for row in read_jsonl(run_dir / "workers.jsonl"):
+            details = row.get("details") or {}
+            if row.get("state") != "worker_started" or details.get("startup_s") is None:
+                continue
+            rows.append(
+                {
+                    "tag": row.get("component"),
+                    "queue_wait_s": float(details["startup_s"]),
+                    "requested_walltime": details.get("requested_walltime"),
+                }
+            )
+    return pd.DataFrame(rows, columns=["tag", "queue_wait_s", "requested_walltime"])
+
+
+def plan_component_walltimes(
+    spec: Any,
+    records: pd.DataFrame,
+    *,
+    advisor: Any = None,
+    queue_model: QueueWaitModel | None = None,
+    max_workers: int | None = None,
+    replications: int = 200,
+    seed: int = 0,
+) -> dict[str, WalltimePlan]:
+    """:func:`plan_walltime` for every component referenced by ``spec``'s tasks.
+
+    Durations come from ``records`` (telemetry rows as loaded by the
+    advisors). A component with fewer than :data:`MIN_DURATION_SAMPLES`
+    durations uses the predicted duration intervals of ``advisor`` (a
+    :class:`~scalable.ml.LearnedAdvisor`) when it has them, assuming the
+    interval's upper bound is the 95th percentile. Components with neither
+    are left out. ``max_workers`` defaults to the target's ``max_workers``
+    option, else the number of tasks. ``queue_model`` defaults to
+    :class:`QueueWaitModel` with no history; fit one from
+    :func:`job_queue_waits`.
+    """
+    limit = max_workers or spec.target.options.get("max_workers")
+    queue_model = queue_model or QueueWaitModel()
+    tasks_by_component: dict[str, list[str]] = {}
+    for task_name, task in spec.tasks.items():
+        tasks_by_component.setdefault(task.component, []).append(task_name)
+
+    plans: dict[str, WalltimePlan] = {}
+    for component in sorted(tasks_by_component):
+        names = tasks_by_component[component]
+        samples, tasks = duration_samples(records, names, target=spec.target_name)
+        source = "telemetry"
+        if samples.size < MIN_DURATION_SAMPLES and advisor is not None:
+            predicted = _advisor_samples(advisor, names, spec.target_name)
+            if predicted.size:
+                samples, source = predicted, "advisor intervals"
+                tasks = max(tasks, len(names))
+        if samples.size == 0:
+            continue
+        plans[component] = plan_walltime(
+            samples,
+            tasks=tasks,
+            max_workers=int(limit) if limit else tasks,
+            queue_model=queue_model,
+            tag=component,
+            duration_source=source,
+            replications=replications,
+            seed=seed,
+        )
+    return plans
+
+
+def _advisor_samples(advisor: Any, task_names: list[str], target: str | None) -> np.ndarray:
+    """Interval samples for every task the advisor predicts a duration for."""
+    samples = []
+    for rec in advisor.recommend_many(tasks=task_names, targets=[target]):
+        point = rec.evidence.get("predicted_duration_s")
+        upper = rec.evidence.get("duration_upper")
+        if point and point > 0:
+            samples.append(interval_samples(float(point), float(upper or point)))
+    return np.concatenate(samples) if samples else np.zeros(0)
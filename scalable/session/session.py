@@ -33,6 +33,7 @@ class ScalableSession:
     _client: ScalableClient | None = None
     _telemetry: TelemetryStore | None = None
     _telemetry_token: Any = None
+    _scaling: Any = None
 
     @classmethod
     def from_yaml(
@@ -88,7 +89,22 @@ class ScalableSession:
         dry_run: bool = False,
         objective: str | None = None,
         policy: str | None = None,
+        advisor: Any = None,
     ) -> DryRunPlan:
+        """Build the plan, adjusted for ``objective`` and ``policy`` if given.
+
+        ``objective="minimize expected time"`` sizes each component's
+        workers and walltime from the task durations in telemetry, trading
+        queue wait against walltime kills (see
+        :func:`scalable.planning.walltime.plan_walltime`). It reads history
+        through ``advisor``; by default a
+        :class:`~scalable.advising.ResourceAdvisor` over ``settings.runs_dir``.
+        A :class:`~scalable.ml.LearnedAdvisor` also supplies predicted
+        duration intervals for tasks with little history. Queue wait is
+        fitted from the worker start latencies recorded in
+        ``settings.runs_dir`` (see
+        :func:`scalable.planning.walltime.job_queue_waits`).
+        """
         _ = dry_run  # Currently all planning is non-destructive.
 
         report = self.validate()
@@ -100,11 +116,25 @@ class ScalableSession:
 
         # Phase 4: apply objective/policy-based adjustments
         if objective is not None or policy is not None:
-            return _apply_objective_policy(base_plan, self.spec, objective, policy)
+            return _apply_objective_policy(
+                base_plan, self.spec, objective, policy, advisor=advisor
+            )
 
         return base_plan
 
-    def start(self, plan: DryRunPlan | None = None) -> ScalableClient:
+    def start(
+        self,
+        plan: DryRunPlan | None = None,
+        *,
+        scaler: Any = None,
+    ) -> ScalableClient:
+        """Build the cluster, apply ``plan`` and return a connected client.
+
+        With a ``scaler`` (an :class:`~scalable.ml.AdaptiveScaler`), or with
+        ``settings.adaptive_scaling`` enabled, an
+        :class:`~scalable.ml.AdaptiveScalingController` keeps adjusting the
+        cluster to demand after the initial plan is applied.
+        """
         if self._client is not None:
             return self._client
 
@@ -122,6 +152,11 @@ class ScalableSession:
                 spec=self.spec,
                 plan=plan,
                 telemetry_parquet=settings.telemetry_parquet,
+                live_summary_interval=settings.telemetry_live_interval,
+                sampling=settings.telemetry_sampling,
+                sampling_seed=settings.seed,
+                remote_uri=settings.runs_dir_remote,
+                sync_interval=settings.telemetry_sync_interval,
             )
             self._telemetry_token = set_active_store(self._telemetry)
 
@@ -132,6 +167,8 @@ class ScalableSession:
             self._client = self._cluster.client_factory()
             if self._telemetry is not None:
                 self._client.set_telemetry_store(self._telemetry)
+            if scaler is not None or settings.adaptive_scaling:
+                self._start_adaptive_scaling(scaler)
             return self._client
         except Exception as exc:
             if self._telemetry is not None:
@@ -151,6 +188,10 @@ class ScalableSession:
         close_error: Exception | None = None
         status = "completed"
 
+        if self._scaling is not None:
+            self._scaling.close()
+            self._scaling = None
+
         if self._client is not None:
             try:
                 self._client.close()
@@ -192,6 +233,28 @@ class ScalableSession:
         if close_error is not None:
             raise close_error
 
+    def _start_adaptive_scaling(self, scaler: Any) -> None:
+        from scalable.ml.adaptive_scaler import (
+            AdaptiveScaler,
+            AdaptiveScalingController,
+            worker_startup_latency,
+        )
+
+        if scaler is None:
+            scaler = AdaptiveScaler(
+                startup_latency_s=worker_startup_latency(settings.runs_dir),
+                target=self.target_name,
+            )
+        self._scaling = AdaptiveScalingController(
+            scaler,
+            client=self._client,
+            cluster=self._cluster,
+            provider=self._provider,
+            interval=settings.adaptive_scaling_interval,
+            telemetry=self._telemetry,
+        )
+        self._scaling.start()
+
     def record_artifact(
         self,
         *,
@@ -267,7 +330,7 @@ def _resolve_target_name(manifest: ManifestModel, *, requested: str | None) -> s
 
 
 #: Supported objectives for heuristic planning
-_SUPPORTED_OBJECTIVES = {"minimize cost", "minimize time", "balance"}
+_SUPPORTED_OBJECTIVES = {"minimize cost", "minimize time", "minimize expected time", "balance"}
 
 #: Supported policies
 _SUPPORTED_POLICIES = {"safe", "aggressive", "manual"}
@@ -278,11 +341,13 @@ def _apply_objective_policy(
     spec: DeploymentSpec,
     objective: str | None,
     policy: str | None,
+    *,
+    advisor: Any = None,
 ) -> DryRunPlan:
     """Apply objective/policy-based adjustments to a base plan.
 
-    Phase 4 implementation uses heuristic rules. Phase 5 will add
-    ML-backed optimizations using the same API surface.
+    Phase 4 implementation uses heuristic rules. ``"minimize expected
+    time"`` instead chooses workers and walltime from telemetry durations.
     """
     from scalable.providers.base import ResourceRequest, ScalePlan
 
@@ -303,6 +368,7 @@ def _apply_objective_policy(
     # Start from base plan values
     workers = dict(base_plan.scale_plan.workers_by_tag)
     resources = dict(base_plan.scale_plan.resources_by_tag)
+    walltime_plans: dict[str, Any] = {}
 
     # Apply objective-based adjustments
     if effective_objective == "minimize cost":
@@ -330,6 +396,23 @@ def _apply_objective_policy(
                     gpus=req.gpus,
                 )
 
+    elif effective_objective == "minimize expected time":
+        from scalable.advising.resources import _seconds_to_hhmmss
+
+        walltime_plans = _walltime_risk_plans(spec, advisor)
+        for tag, walltime_plan in walltime_plans.items():
+            if tag not in workers:
+                continue
+            chosen = walltime_plan.chosen
+            req = resources[tag]
+            workers[tag] = chosen.workers
+            resources[tag] = ResourceRequest(
+                cpus=req.cpus,
+                memory=req.memory,
+                walltime=_seconds_to_hhmmss(chosen.walltime_s),
+                gpus=req.gpus,
+            )
+
     elif effective_objective == "balance":
         # Moderate scaling with safety margins
         if effective_policy == "safe":
@@ -342,6 +425,7 @@ def _apply_objective_policy(
     if effective_policy == "manual":
         workers = dict(base_plan.scale_plan.workers_by_tag)
         resources = dict(base_plan.scale_plan.resources_by_tag)
+        walltime_plans = {}
 
     adjusted_plan = ScalePlan(
         workers_by_tag=workers,
@@ -354,4 +438,26 @@ def _apply_objective_policy(
         manifest_lock=base_plan.manifest_lock,
         scale_plan=adjusted_plan,
         task_to_component=base_plan.task_to_component,
+        walltime_plans=walltime_plans,
+    )
+
+
+def _walltime_risk_plans(spec: DeploymentSpec, advisor: Any) -> dict[str, Any]:
+    """Per-component walltime plans from the telemetry history of ``advisor``."""
+    from scalable.planning.walltime import (
+        QueueWaitModel,
+        job_queue_waits,
+        plan_component_walltimes,
+    )
+
+    if advisor is None:
+        from scalable.advising import ResourceAdvisor
+
+        advisor = ResourceAdvisor.from_history(settings.runs_dir)
+    return plan_component_walltimes(
+        spec,
+        advisor.records,
+        advisor=advisor,
+        queue_model=QueueWaitModel.from_history(job_queue_waits(settings.runs_dir)),
+        seed=settings.seed,
     )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .aggregation import SamplingPolicy, StreamAggregate
 from .collectors import (
     iter_run_dirs,
     latest_run_dir,
@@ -19,6 +20,7 @@ from .events import (
     TaskEvent,
     WorkerEvent,
 )
+from .lifecycle import TASK_LIFECYCLE_TOPIC, TaskLifecyclePlugin
 from .runtime import (
     emit_cache_event,
     emit_worker_event,
@@ -29,6 +31,8 @@ from .runtime import (
     task_context,
 )
 from .store import TelemetryStore
+from .sync import TelemetrySyncer, fetch_remote_run
+from .usage import TaskUsage, measure_usage
 
 __all__ = [
     "ArtifactEvent",
@@ -36,15 +40,23 @@ __all__ = [
     "FailureEvent",
     "ResourceEvent",
     "RunMetadata",
+    "SamplingPolicy",
+    "StreamAggregate",
+    "TASK_LIFECYCLE_TOPIC",
     "TaskEvent",
+    "TaskLifecyclePlugin",
+    "TaskUsage",
     "TelemetryStore",
+    "TelemetrySyncer",
     "WorkerEvent",
     "emit_cache_event",
     "emit_worker_event",
+    "fetch_remote_run",
     "get_active_store",
     "get_task_context",
     "iter_run_dirs",
     "latest_run_dir",
+    "measure_usage",
     "read_jsonl",
     "render_text_report",
     "reset_active_store",
@@ -0,0 +1,284 @@
+"""Sampling policies and streaming aggregates for high-rate task telemetry.
+
+A map over millions of tiny tasks should not write millions of full task and
+resource rows. :class:`SamplingPolicy` selects which tasks of a stream (tasks
+sharing a base name, e.g. every element of ``client.map(f, ...)``) get full
+rows, and :class:`StreamAggregate` keeps exact per-(stream, component)
+counts plus log-bucketed histograms for *every* task, sampled or not.
+
+Rows written for sampled tasks carry a ``sample_weight`` (how many tasks each
+row stands for), so weighted summaries remain unbiased estimates and per-task
+quantiles over the rows remain uniform samples of the stream.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import re
+from dataclasses import dataclass
+from typing import Any
+
+_MAP_INDEX_RE = re.compile(r"\[\d+\]$")
+
+#: Histogram resolution: buckets per decade (relative bucket width ~26%).
+_BUCKETS_PER_DECADE = 10
+
+
+def stream_name(task_name: str) -> str:
+    """Return the stream a task belongs to (its name without a map index)."""
+    return _MAP_INDEX_RE.sub("", task_name)
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    """Which tasks of a stream get full telemetry rows.
+
+    Attributes
+    ----------
+    mode:
+        ``"all"`` (every task), ``"every_n"`` (the 1st, (n+1)th, ... task of
+        the stream) or ``"reservoir"`` (a uniform random sample of ``n``
+        finished tasks, written when the run closes).
+    n:
+        Stride for ``every_n`` or reservoir size for ``reservoir``.
+    """
+
+    mode: str = "all"
+    n: int = 1
+
+    _MODES = ("all", "every_n", "reservoir")
+
+    def __post_init__(self) -> None:
+        if self.mode not in self._MODES:
+            raise ValueError(
+                f"unknown telemetry sampling mode {self.mode!r}; expected one of {list(self._MODES)}"
+            )
+        if self.n < 1:
+            raise ValueError("telemetry sampling n must be a positive integer")
+
+    @classmethod
+    def parse(cls, spec: str | None) -> SamplingPolicy:
+        """Parse ``"all"``, ``"every_n:<n>"`` or ``"reservoir:<n>"``."""
+        if spec is None or not str(spec).strip():
+            return cls()
+        text = str(spec).strip().lower()
+        mode, _, count = text.partition(":")
+        if mode == "all":
+            return cls()
+        if not count:
+            raise ValueError(f"telemetry sampling {spec!r} requires a count, e.g. '{mode}:100'")
+        try:
+            n = int(count)
+        except ValueError as exc:
+            raise ValueError(f"invalid telemetry sampling count in {spec!r}") from exc
+        return cls(mode=mode, n=n)
+
+    @property
+    def is_full(self) -> bool:
+        return self.mode == "all" or (self.mode == "every_n" and self.n == 1)
+
+    def __str__(self) -> str:
+        return "all" if self.mode == "all" else f"{self.mode}:{self.n}"
+
+
+class LogHistogram:
+    """Sparse histogram over log-spaced buckets for non-negative values."""
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, float] = {}
+        self.zeros = 0.0
+        self.count = 0.0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    @staticmethod
+    def _index(value: float) -> int:
+        return math.floor(math.log10(value) * _BUCKETS_PER_DECADE)
+
+    @staticmethod
+    def _bounds(index: int) -> tuple[float, float]:
+        return (
+            10 ** (index / _BUCKETS_PER_DECADE),
+            10 ** ((index + 1) / _BUCKETS_PER_DECADE),
+        )
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        if value < 0 or math.isnan(value):
+            return
+        self.count += weight
+        self.total += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value == 0:
+            self.zeros += weight
+            return
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0.0) + weight
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = min(max(q, 0.0), 1.0) * self.count
+        if rank <= self.zeros:
+            return 0.0
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            weight = self.buckets[index]
+            if seen + weight >= rank:
+                lo, hi = self._bounds(index)
+                frac = (rank - seen) / weight if weight else 0.0
+                value = lo * (hi / lo) ** frac
+                return min(max(value, self.min or value), self.max or value)
+            seen += weight
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 6) if self.mean is not None else None,
+            "p50": _round(self.quantile(0.50)),
+            "p95": _round(self.quantile(0.95)),
+            "p99": _round(self.quantile(0.99)),
+            "zeros": self.zeros,
+            "buckets_per_decade": _BUCKETS_PER_DECADE,
+            "buckets": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 6) if value is not None else None
+
+
+class StreamAggregate:
+    """Exact counts and histograms for one (stream, component) pair."""
+
+    def __init__(self, stream: str, component: str | None, *, policy: str = "all") -> None:
+        self.stream = stream
+        self.component = component
+        self.policy = policy
+        self.submitted = 0
+        self.recorded = 0
+        self.states: dict[str, int] = {}
+        self.duration_s = LogHistogram()
+        self.queue_wait_s = LogHistogram()
+        self.peak_rss_bytes = LogHistogram()
+        self.cpu_s = LogHistogram()
+
+    def add_result(self, state: str, duration_s: Any, queue_wait_s: Any) -> None:
+        self.states[state] = self.states.get(state, 0) + 1
+        if isinstance(duration_s, (int, float)):
+            self.duration_s.add(float(duration_s))
+        if isinstance(queue_wait_s, (int, float)):
+            self.queue_wait_s.add(float(queue_wait_s))
+
+    def add_usage(self, usage: dict[str, Any]) -> None:
+        peak = usage.get("peak_rss_bytes")
+        if isinstance(peak, (int, float)):
+            self.peak_rss_bytes.add(float(peak))
+        user = usage.get("cpu_user_s")
+        system = usage.get("cpu_system_s")
+        if user is not None or system is not None:
+            self.cpu_s.add(float(user or 0.0) + float(system or 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stream": self.stream,
+            "component": self.component,
+            "policy": self.policy,
+            "submitted": self.submitted,
+            "recorded": self.recorded,
+            "states": dict(sorted(self.states.items())),
+            "duration_s": self.duration_s.to_dict(),
+            "queue_wait_s": self.queue_wait_s.to_dict(),
+            "peak_rss_bytes": self.peak_rss_bytes.to_dict(),
+            "cpu_s": self.cpu_s.to_dict(),
+        }
+
+
+def summarize_streams(aggregates: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Condense :meth:`StreamAggregate.to_dict` payloads for run summaries."""
+    rows = []
+    for item in aggregates:
+        duration = item.get("duration_s") or {}
+        queue_wait = item.get("queue_wait_s") or {}
+        rows.append(
+            {
+                "stream": item.get("stream"),
+                "component": item.get("component"),
+                "policy": item.get("policy", "all"),
+                "submitted": item.get("submitted", 0),
+                "recorded": item.get("recorded", 0),
+                "states": item.get("states", {}),
+                "duration_mean_s": duration.get("mean"),
+                "duration_p50_s": duration.get("p50"),
+                "duration_p95_s": duration.get("p95"),
+                "queue_wait_p95_s": queue_wait.get("p95"),
+            }
+        )
+    return sorted(rows, key=lambda row: (str(row["stream"]), str(row["component"])))
+
+
+class StreamSampler:
+    """Per-stream sampling state implementing one :class:`SamplingPolicy`."""
+
+    def __init__(self, policy: SamplingPolicy, *, seed: int) -> None:
+        self.policy = policy
+        self.seen = 0
+        self.finished = 0
+        self._rng = random.Random(seed)
+        #: Reservoir of finished task ids (reservoir mode only).
+        self.reservoir: list[str] = []
+
+    def admit(self) -> bool:
+        """Decide at submission whether a task's rows are written as they happen."""
+        index = self.seen
+        self.seen += 1
+        if self.policy.mode == "every_n":
+            return index % self.policy.n == 0
+        return self.policy.mode == "all"
+
+    def offer(self, task_id: str) -> str | None:
+        """Offer a finished task to the reservoir (Algorithm R).
+
+        Returns ``task_id`` if it was rejected, the evicted id if it displaced
+        one, or ``None`` if it filled a free slot.
+        """
+        self.finished += 1
+        if len(self.reservoir) < self.policy.n:
+            self.reservoir.append(task_id)
+            return None
+        slot = self._rng.randrange(self.finished)
+        if slot < self.policy.n:
+            evicted = self.reservoir[slot]
+            self.reservoir[slot] = task_id
+            return evicted
+        return task_id
+
+    @property
+    def weight(self) -> float:
+        """How many tasks each recorded row stands for."""
+        if self.policy.mode == "every_n":
+            return float(self.policy.n)
+        if self.policy.mode == "reservoir" and self.reservoir:
+            return max(self.finished / len(self.reservoir), 1.0)
+        return 1.0
+
+
+__all__ = [
+    "LogHistogram",
+    "SamplingPolicy",
+    "StreamAggregate",
+    "StreamSampler",
+    "stream_name",
+    "summarize_streams",
+]
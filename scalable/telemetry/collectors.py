@@ -7,6 +7,8 @@ from collections import Counter
 from pathlib import Path
 from typing import Any
 
+from .aggregation import summarize_streams
+
 
 def read_jsonl(path: Path) -> list[dict[str, Any]]:
     """Read a newline-delimited JSON file. Missing files return an empty list."""
@@ -55,6 +57,160 @@ def resolve_run_dir(
     raise ValueError("must provide run_id or latest=True")
 
 
+def _weighted_count(value: float) -> int:
+    return int(round(value))
+
+
+class RunSummaryAccumulator:
+    """Incrementally maintained run summary.
+
+    Rows are fed one at a time with :meth:`add`, keyed by the JSONL file they
+    belong to, and :meth:`to_dict` returns the same payload as
+    :func:`summarize_run` would for the rows seen so far. Used by
+    :class:`~scalable.telemetry.store.TelemetryStore` to publish live
+    summaries without re-reading the run directory.
+
+    Task rows written under a telemetry sampling policy carry a
+    ``sample_weight``; task state counts and duration statistics are weighted
+    by it so they estimate the totals over all tasks.
+    """
+
+    _COUNT_KEYS = {
+        "tasks.jsonl": "task_events",
+        "resources.jsonl": "resource_events",
+        "workers.jsonl": "worker_events",
+        "failures.jsonl": "failure_events",
+        "cache.jsonl": "cache_events",
+        "artifacts.jsonl": "artifact_events",
+        "cost.jsonl": "cost_events",
+    }
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._counts: Counter[str] = Counter()
+        self._final_state_by_task: dict[str, tuple[str, float]] = {}
+        self._state_counter: Counter[str] = Counter()
+        # Unweighted: every failure is recorded, sampled out or not.
+        self._recorded_state_counter: Counter[str] = Counter()
+        self._duration_total = 0.0
+        self._duration_count = 0.0
+        self._queue_wait_total = 0.0
+        self._queue_wait_count = 0.0
+        self._queue_wait_max: float | None = None
+        self._failure_counter: Counter[str] = Counter()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cpu_min: int | None = None
+        self._cpu_max: int | None = None
+        self._cpu_total = 0
+        self._cpu_count = 0
+        self._cost_hourly = 0.0
+        self._cost_monthly = 0.0
+
+    def add(self, filename: str, row: dict[str, Any]) -> None:
+        """Fold one telemetry row from ``filename`` into the summary."""
+        key = self._COUNT_KEYS.get(filename)
+        if key is None:
+            return
+        self.version += 1
+        self._counts[key] += 1
+
+        if filename == "tasks.jsonl":
+            self._add_task(row)
+        elif filename == "resources.jsonl":
+            value = row.get("requested_cpus")
+            if isinstance(value, int):
+                self._cpu_min = value if self._cpu_min is None else min(self._cpu_min, value)
+                self._cpu_max = value if self._cpu_max is None else max(self._cpu_max, value)
+                self._cpu_total += value
+                self._cpu_count += 1
+        elif filename == "failures.jsonl":
+            self._failure_counter[str(row.get("failure_class", "unknown"))] += 1
+        elif filename == "cache.jsonl":
+            if bool(row.get("hit")):
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+        elif filename == "cost.jsonl":
+            self._cost_hourly += float(row.get("total_hourly", 0))
+            self._cost_monthly += float(row.get("total_monthly", 0))
+
+    def _add_task(self, row: dict[str, Any]) -> None:
+        task_id = str(row.get("task_id", ""))
+        state = str(row.get("state", "unknown"))
+        weight = row.get("sample_weight")
+        # Weight 0 marks a diagnostic row of a sampled-out failed task.
+        weight = float(weight) if isinstance(weight, (int, float)) and weight >= 0 else 1.0
+        if task_id:
+            previous = self._final_state_by_task.get(task_id)
+            if previous is not None:
+                self._state_counter[previous[0]] -= previous[1]
+                self._recorded_state_counter[previous[0]] -= 1
+            self._final_state_by_task[task_id] = (state, weight)
+            self._state_counter[state] += weight
+            self._recorded_state_counter[state] += 1
+        duration = row.get("duration_s")
+        if isinstance(duration, (int, float)) and duration >= 0:
+            self._duration_total += float(duration) * weight
+            self._duration_count += weight
+        queue_wait = row.get("queue_wait_s")
+        if state != "running" and isinstance(queue_wait, (int, float)) and queue_wait >= 0:
+            self._queue_wait_total += float(queue_wait) * weight
+            self._queue_wait_count += weight
+            if self._queue_wait_max is None or queue_wait > self._queue_wait_max:
+                self._queue_wait_max = float(queue_wait)
+
+    def to_dict(self, run_meta: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Return the summary payload in :func:`summarize_run` form."""
+        counts = self._counts
+        costs = counts["cost_events"]
+        return {
+            "run": dict(run_meta or {}),
+            "counts": {
+                **{name: counts[name] for name in self._COUNT_KEYS.values()},
+                "tasks_succeeded": _weighted_count(self._state_counter.get("succeeded", 0)),
+                "tasks_failed": self._recorded_state_counter.get("failed", 0),
+                "tasks_cancelled": _weighted_count(self._state_counter.get("cancelled", 0)),
+            },
+            "timing": {
+                "task_duration_count": _weighted_count(self._duration_count),
+                "task_duration_total_s": round(self._duration_total, 6),
+                "task_duration_avg_s": round(self._duration_total / self._duration_count, 6)
+                if self._duration_count
+                else None,
+                "queue_wait_count": _weighted_count(self._queue_wait_count),
+                "queue_wait_avg_s": round(self._queue_wait_total / self._queue_wait_count, 6)
+                if self._queue_wait_count
+                else None,
+                "queue_wait_max_s": round(self._queue_wait_max, 6)
+                if self._queue_wait_max is not None
+                else None,
+            },
+            "cache": {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_ratio": round(self._cache_hits / (self._cache_hits + self._cache_misses), 6)
+                if (self._cache_hits + self._cache_misses) > 0
+                else None,
+            },
+            "resources": {
+                "requested_cpu_min": self._cpu_min,
+                "requested_cpu_max": self._cpu_max,
+                "requested_cpu_avg": round(self._cpu_total / self._cpu_count, 6)
+                if self._cpu_count
+                else None,
+            },
+            "cost": {
+                "total_hourly_usd": round(self._cost_hourly, 6) if costs else None,
+                "total_monthly_usd": round(self._cost_monthly, 4) if costs else None,
+                "estimates_count": costs,
+            },
+            "failures": {
+                "classes": dict(sorted(self._failure_counter.items())),
+            },
+        }
+
+
 def summarize_run(run_dir: str | Path) -> dict[str, Any]:
     """Build a deterministic summary payload for one run directory."""
     run_path = Path(run_dir)
@@ -63,84 +219,33 @@ def summarize_run(run_dir: str | Path) -> dict[str, Any]:
     if run_json.exists():
         run_meta = json.loads(run_json.read_text(encoding="utf-8"))
 
-    tasks = read_jsonl(run_path / "tasks.jsonl")
-    resources = read_jsonl(run_path / "resources.jsonl")
-    workers = read_jsonl(run_path / "workers.jsonl")
-    failures = read_jsonl(run_path / "failures.jsonl")
-    caches = read_jsonl(run_path / "cache.jsonl")
-    artifacts = read_jsonl(run_path / "artifacts.jsonl")
-    costs = read_jsonl(run_path / "cost.jsonl")
-
-    final_state_by_task: dict[str, str] = {}
-    duration_values: list[float] = []
-    for row in tasks:
-        task_id = str(row.get("task_id", ""))
-        state = str(row.get("state", "unknown"))
-        if task_id:
-            final_state_by_task[task_id] = state
-        duration = row.get("duration_s")
-        if isinstance(duration, (int, float)) and duration >= 0:
-            duration_values.append(float(duration))
-
-    state_counter = Counter(final_state_by_task.values())
-    failure_counter = Counter(str(f.get("failure_class", "unknown")) for f in failures)
-    cache_hits = sum(1 for c in caches if bool(c.get("hit")))
-    cache_misses = sum(1 for c in caches if not bool(c.get("hit")))
-
-    requested_cpus: list[int] = []
-    for row in resources:
-        value = row.get("requested_cpus")
-        if isinstance(value, int):
-            requested_cpus.append(value)
-
-    # Cost summary
-    cost_total_hourly = sum(float(c.get("total_hourly", 0)) for c in costs)
-    cost_total_monthly = sum(float(c.get("total_monthly", 0)) for c in costs)
-
-    return {
-        "run": run_meta,
-        "counts": {
-            "task_events": len(tasks),
-            "resource_events": len(resources),
-            "worker_events": len(workers),
-            "failure_events": len(failures),
-            "cache_events": len(caches),
-            "artifact_events": len(artifacts),
-            "cost_events": len(costs),
-            "tasks_succeeded": state_counter.get("succeeded", 0),
-            "tasks_failed": state_counter.get("failed", 0),
-            "tasks_cancelled": state_counter.get("cancelled", 0),
-        },
-        "timing": {
-            "task_duration_count": len(duration_values),
-            "task_duration_total_s": round(sum(duration_values), 6),
-            "task_duration_avg_s": round(sum(duration_values) / len(duration_values), 6)
-            if duration_values
-            else None,
-        },
-        "cache": {
-            "hits": cache_hits,
-            "misses": cache_misses,
-            "hit_ratio": round(cache_hits / (cache_hits + cache_misses), 6)
-            if (cache_hits + cache_misses) > 0
-            else None,
-        },
-        "resources": {
-            "requested_cpu_min": min(requested_cpus) if requested_cpus else None,
-            "requested_cpu_max": max(requested_cpus) if requested_cpus else None,
-            "requested_cpu_avg": round(sum(requested_cpus) / len(requested_cpus), 6)
-            if requested_cpus
-            else None,
-        },
-        "cost": {
-            "total_hourly_usd": round(cost_total_hourly, 6) if costs else None,
-            "total_monthly_usd": round(cost_total_monthly, 4) if costs else None,
-            "estimates_count": len(costs),
-        },
-        "failures": {
-            "classes": dict(sorted(failure_counter.items())),
-        },
-    }
+    accumulator = RunSummaryAccumulator()
+    for filename in RunSummaryAccumulator._COUNT_KEYS:
+        for row in read_jsonl(run_path / filename):
+            accumulator.add(filename, row)
+    summary = accumulator.to_dict(run_meta)
+
+    aggregates_json = run_path / "aggregates.json"
+    if aggregates_json.exists():
+        aggregates = json.loads(aggregates_json.read_text(encoding="utf-8"))
+        summary["streams"] = summarize_streams(aggregates.get("streams", []))
+    return summary
+
+
+def read_live_summary(run_dir: str | Path) -> dict[str, Any]:
+    """Return the latest published summary for a run.
+
+    Reads the ``summary.json`` a live or finished
+    :class:`~scalable.telemetry.store.TelemetryStore` keeps up to date, and
+    falls back to :func:`summarize_run` for runs that never wrote one.
+    """
+    summary_path = Path(run_dir) / "summary.json"
+    if summary_path.exists():
+        try:
+            return json.loads(summary_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            pass
+    return summarize_run(run_dir)
 
 
 def render_text_report(summary: dict[str, Any]) -> str:
@@ -166,6 +271,7 @@ def render_text_report(summary: dict[str, Any]) -> str:
         "timing:",
         f"  total_s: {timing.get('task_duration_total_s')}",
         f"  avg_s: {timing.get('task_duration_avg_s')}",
+        f"  queue_wait_avg_s: {timing.get('queue_wait_avg_s')}",
         "",
         "cache:",
         f"  hits: {cache.get('hits', 0)}",
@@ -185,9 +291,11 @@ def render_text_report(summary: dict[str, Any]) -> str:
 
 
 __all__ = [
+    "RunSummaryAccumulator",
     "iter_run_dirs",
     "latest_run_dir",
     "read_jsonl",
+    "read_live_summary",
     "render_text_report",
     "resolve_run_dir",
     "summarize_run",
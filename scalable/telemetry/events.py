@@ -14,6 +14,13 @@ def utcnow_iso() -> str:
     return datetime.now(tz=UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def epoch_to_iso(value: float) -> str:
+    """Convert a POSIX timestamp to the same ISO-8601 form as :func:`utcnow_iso`."""
+    return (
+        datetime.fromtimestamp(value, tz=UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    )
+
+
 @dataclass(frozen=True)
 class RunMetadata:
     """Top-level run metadata persisted to ``run.json``."""
@@ -50,6 +57,12 @@ class TaskEvent:
     worker: str | None = None
     error_type: str | None = None
     error_message: str | None = None
+    queue_wait_s: float | None = None
+    compute_s: float | None = None
+    transfer_s: float | None = None
+    turnaround_s: float | None = None
+    attempts: int | None = None
+    sample_weight: float = 1.0
     event_type: str = "task"
     schema_version: int = SCHEMA_VERSION
 
@@ -73,6 +86,13 @@ class ResourceEvent:
     requested_workers: int | None = None
     observed_cpu: float | None = None
     observed_memory_gb: float | None = None
+    observed_cpu_user_s: float | None = None
+    observed_cpu_system_s: float | None = None
+    observed_peak_rss_bytes: int | None = None
+    observed_read_bytes: int | None = None
+    observed_write_bytes: int | None = None
+    observed_wall_s: float | None = None
+    sample_weight: float = 1.0
     event_type: str = "resource"
     schema_version: int = SCHEMA_VERSION
 
@@ -242,5 +262,6 @@ __all__ = [
     "SCHEMA_VERSION",
     "TaskEvent",
     "WorkerEvent",
+    "epoch_to_iso",
     "utcnow_iso",
 ]
@@ -0,0 +1,123 @@
+"""Scheduler-side task lifecycle timing for telemetry.
+
+:class:`TaskLifecyclePlugin` runs inside the Dask scheduler and watches real
+task state transitions (``waiting`` → ``queued`` → ``processing`` →
+``memory``/``erred``). When a task reaches a terminal state it publishes one
+timing record on :data:`TASK_LIFECYCLE_TOPIC`, which
+:class:`~scalable.client.ScalableClient` forwards to the
+:class:`~scalable.telemetry.store.TelemetryStore`. This separates queueing
+delay and dependency transfer from execution time and records the worker that
+actually ran the task.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from distributed.diagnostics.plugin import SchedulerPlugin
+
+#: Scheduler event topic carrying per-task lifecycle timing records.
+TASK_LIFECYCLE_TOPIC: str = "scalable-task-lifecycle"
+
+_TERMINAL_STATES = frozenset({"memory", "erred"})
+
+
+def _sum_startstops(startstops: Any, action: str) -> float | None:
+    if not isinstance(startstops, (list, tuple)):
+        return None
+    total = 0.0
+    seen = False
+    for item in startstops:
+        if not isinstance(item, dict) or item.get("action") != action:
+            continue
+        try:
+            total += max(float(item["stop"]) - float(item["start"]), 0.0)
+        except (KeyError, TypeError, ValueError):
+            continue
+        seen = True
+    return total if seen else None
+
+
+class TaskLifecyclePlugin(SchedulerPlugin):
+    """Record scheduler transition timestamps and publish them per task."""
+
+    name = "scalable-task-lifecycle"
+
+    def __init__(self) -> None:
+        self.scheduler: Any = None
+        self._marks: dict[Any, dict[str, Any]] = {}
+
+    async def start(self, scheduler: Any) -> None:
+        self.scheduler = scheduler
+
+    def transition(
+        self,
+        key: Any,
+        start: str,
+        finish: str,
+        *args: Any,
+        stimulus_id: str,
+        **kwargs: Any,
+    ) -> None:
+        now = time.time()
+
+        if finish == "forgotten":
+            self._marks.pop(key, None)
+            return
+
+        marks = self._marks.setdefault(key, {"attempts": 0})
+        if finish == "waiting":
+            marks.setdefault("waiting_at", now)
+        elif finish in {"queued", "no-worker"}:
+            marks.setdefault("queued_at", now)
+        elif finish == "processing":
+            marks["processing_at"] = now
+            marks["attempts"] += 1
+            ts = self.scheduler.tasks.get(key) if self.scheduler is not None else None
+            processing_on = getattr(ts, "processing_on", None)
+            marks["worker"] = getattr(processing_on, "address", None)
+        elif finish in _TERMINAL_STATES:
+            self._marks.pop(key, None)
+            self._publish(key, finish, now, marks, kwargs)
+
+    def _publish(
+        self,
+        key: Any,
+        state: str,
+        finished_at: float,
+        marks: dict[str, Any],
+        kwargs: dict[str, Any],
+    ) -> None:
+        if self.scheduler is None:
+            return
+        arrived_at = marks.get("waiting_at", marks.get("queued_at"))
+        processing_at = marks.get("processing_at")
+
+        queue_wait = None
+        if arrived_at is not None and processing_at is not None:
+            queue_wait = max(processing_at - arrived_at, 0.0)
+
+        startstops = kwargs.get("startstops")
+        compute = _sum_startstops(startstops, "compute")
+        if compute is None and processing_at is not None:
+            compute = max(finished_at - processing_at, 0.0)
+
+        self.scheduler.log_event(
+            TASK_LIFECYCLE_TOPIC,
+            {
+                "key": str(key),
+                "state": state,
+                "worker": kwargs.get("worker") or marks.get("worker"),
+                "arrived_at": arrived_at,
+                "processing_at": processing_at,
+                "finished_at": finished_at,
+                "queue_wait_s": queue_wait,
+                "compute_s": compute,
+                "transfer_s": _sum_startstops(startstops, "transfer"),
+                "attempts": marks.get("attempts", 0),
+            },
+        )
+
+
+__all__ = ["TASK_LIFECYCLE_TOPIC", "TaskLifecyclePlugin"]
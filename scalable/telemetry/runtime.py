@@ -18,6 +18,10 @@ _TASK_CONTEXT: ContextVar[dict[str, str | None] | None] = ContextVar(
 )
 _GLOBAL_ACTIVE_STORE: TelemetryStore | None = None
 
+#: Dask task annotation carrying the task name telemetry records, so the
+#: scheduler side (e.g. adaptive scaling) can key work the same way.
+TASK_NAME_ANNOTATION = "scalable_task_name"
+
 
 def set_active_store(store: TelemetryStore | None) -> Token[TelemetryStore | None]:
     """Set process-local active telemetry store and return its token."""
@@ -102,6 +106,7 @@ def emit_worker_event(*, provider: str, state: str, component: str | None = None
 
 
 __all__ = [
+    "TASK_NAME_ANNOTATION",
     "emit_cache_event",
     "emit_worker_event",
     "get_active_store",
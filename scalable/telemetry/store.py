@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import tempfile
 import threading
 import time
 import uuid
@@ -14,11 +16,19 @@ from typing import Any
 import pandas as pd
 import yaml
 
+from scalable.common import logger
 from scalable.manifest.schema import ManifestModel
 from scalable.planning.dryrun import DryRunPlan
 from scalable.providers.base import DeploymentSpec
 
-from .collectors import summarize_run
+from .aggregation import (
+    SamplingPolicy,
+    StreamAggregate,
+    StreamSampler,
+    stream_name,
+    summarize_streams,
+)
+from .collectors import RunSummaryAccumulator
 from .events import (
     ArtifactEvent,
     CacheEvent,
@@ -28,12 +38,26 @@ from .events import (
     RunMetadata,
     TaskEvent,
     WorkerEvent,
+    epoch_to_iso,
     utcnow_iso,
 )
+from .sync import TelemetrySyncer
 
 _PROJECT_RE = re.compile(r"[^a-zA-Z0-9._-]+")
 
 
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` so readers never observe a partial file."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def build_run_id(project_name: str) -> str:
     """Build a deterministic-format run id with UTC timestamp and random suffix."""
     stamp = utcnow_iso().replace("-", "").replace(":", "")
@@ -43,8 +67,52 @@ def build_run_id(project_name: str) -> str:
     return f"run-{stamp}-{safe_project}-{short}"
 
 
+class _TaskTrack:
+    """Sampling bookkeeping for one in-flight task."""
+
+    __slots__ = (
+        "stream",
+        "component",
+        "mode",
+        "weight",
+        "seq",
+        "finished",
+        "awaiting_usage",
+        "diagnostic",
+    )
+
+    def __init__(
+        self,
+        *,
+        stream: str,
+        component: str | None,
+        mode: str,
+        weight: float,
+        seq: int,
+        awaiting_usage: bool,
+    ) -> None:
+        self.stream = stream
+        self.component = component
+        # "write": rows go to disk now; "drop": aggregates only;
+        # "buffer": rows wait for the stream reservoir to decide.
+        self.mode = mode
+        self.weight = weight
+        self.seq = seq
+        self.finished = False
+        self.awaiting_usage = awaiting_usage
+        # A sampled-out task that failed: its rows are also written with
+        # weight 0, for diagnosis only.
+        self.diagnostic = False
+
+
 class TelemetryStore:
-    """Persist run telemetry as JSONL records under one run directory."""
+    """Persist run telemetry as JSONL records under one run directory.
+
+    Task and resource rows may be sampled per task stream (see
+    :mod:`scalable.telemetry.aggregation`); exact per-stream counts and
+    histograms are always kept and written to ``aggregates.json`` when any
+    stream is sampled.
+    """
 
     _TASKS_FILE = "tasks.jsonl"
     _RESOURCES_FILE = "resources.jsonl"
@@ -53,6 +121,8 @@ class TelemetryStore:
     _CACHE_FILE = "cache.jsonl"
     _ARTIFACTS_FILE = "artifacts.jsonl"
     _COST_FILE = "cost.jsonl"
+    _AGGREGATES_FILE = "aggregates.json"
+    _SAMPLED_FILES = frozenset({_TASKS_FILE, _RESOURCES_FILE})
 
     def __init__(
         self,
@@ -63,6 +133,10 @@ class TelemetryStore:
         provider_name: str,
         target_walltime: str | None,
         telemetry_parquet: bool,
+        live_summary_interval: float | None = None,
+        sampling: SamplingPolicy | None = None,
+        stream_sampling: dict[str, SamplingPolicy] | None = None,
+        sampling_seed: int = 0,
     ) -> None:
         self.run_dir = run_dir
         self.metadata = metadata
@@ -74,6 +148,38 @@ class TelemetryStore:
         self._lock = threading.RLock()
         self._closed = False
         self._task_started_at: dict[str, float] = {}
+        # Scheduler lifecycle timings and client-side results arrive on
+        # independent channels; whichever comes first waits here for the other.
+        self._awaiting_lifecycle: set[str] = set()
+        self._lifecycle_by_task: dict[str, dict[str, Any]] = {}
+        self._parked_results: dict[str, dict[str, Any]] = {}
+
+        self._sampling = sampling or SamplingPolicy()
+        self._stream_sampling = dict(stream_sampling or {})
+        self._sampling_seed = sampling_seed
+        self._sampling_active = not self._sampling.is_full or any(
+            not policy.is_full for policy in self._stream_sampling.values()
+        )
+        self._samplers: dict[str, StreamSampler] = {}
+        self._aggregates: dict[tuple[str, str | None], StreamAggregate] = {}
+        self._tracks: dict[str, _TaskTrack] = {}
+        self._buffered_rows: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+        self._task_seq = 0
+        self._aggregate_updates = 0
+
+        self._syncer: TelemetrySyncer | None = None
+
+        self._summary = RunSummaryAccumulator()
+        self._summary_written_version: tuple[int, int, int] | None = None
+        self._live_stop = threading.Event()
+        self._live_thread: threading.Thread | None = None
+        if live_summary_interval is not None and live_summary_interval > 0:
+            self._live_thread = threading.Thread(
+                target=self._live_summary_loop,
+                args=(float(live_summary_interval),),
+                name=f"scalable-live-summary-{metadata.run_id}",
+                daemon=True,
+            )
 
     @property
     def run_id(self) -> str:
@@ -88,8 +194,27 @@ class TelemetryStore:
         spec: DeploymentSpec,
         plan: DryRunPlan,
         telemetry_parquet: bool = False,
+        live_summary_interval: float | None = None,
+        sampling: str | None = None,
+        sampling_seed: int = 0,
+        remote_uri: str | None = None,
+        sync_interval: float | None = None,
     ) -> TelemetryStore:
-        """Create run directory and initialize baseline run metadata files."""
+        """Create run directory and initialize baseline run metadata files.
+
+        With ``live_summary_interval`` set, ``summary.json`` is atomically
+        rewritten from the in-memory summary at most that often (seconds)
+        while the run is active.
+
+        ``sampling`` is the default telemetry sampling policy (``"all"``,
+        ``"every_n:<n>"`` or ``"reservoir:<n>"``); manifest tasks may override
+        it per stream with ``telemetry_sampling``.
+
+        With ``remote_uri`` set, the run directory is shipped there
+        incrementally every ``sync_interval`` seconds by a
+        :class:`~scalable.telemetry.sync.TelemetrySyncer`, and completely on
+        close. Remote errors are logged and never fail the run.
+        """
         runs_root = Path(runs_dir)
         runs_root.mkdir(parents=True, exist_ok=True)
 
@@ -116,6 +241,12 @@ class TelemetryStore:
         walltime = spec.target.options.get("walltime")
         target_walltime = walltime if isinstance(walltime, str) else None
 
+        stream_sampling = {
+            name: SamplingPolicy.parse(task.telemetry_sampling)
+            for name, task in manifest.tasks.items()
+            if task.telemetry_sampling is not None
+        }
+
         store = cls(
             run_dir=run_dir,
             metadata=metadata,
@@ -123,8 +254,22 @@ class TelemetryStore:
             provider_name=spec.provider_name,
             target_walltime=target_walltime,
             telemetry_parquet=telemetry_parquet,
+            live_summary_interval=live_summary_interval,
+            sampling=SamplingPolicy.parse(sampling),
+            stream_sampling=stream_sampling,
+            sampling_seed=sampling_seed,
         )
         store._write_bootstrap_files(manifest=manifest, plan=plan)
+        if store._live_thread is not None:
+            store._write_summary(live=True)
+            store._live_thread.start()
+        if remote_uri:
+            try:
+                store._syncer = TelemetrySyncer(run_dir, remote_uri, interval=sync_interval)
+            except Exception as exc:
+                logger.warning("telemetry sync to %s disabled: %s", remote_uri, exc)
+            else:
+                store._syncer.start()
         return store
 
     def _write_bootstrap_files(self, *, manifest: ManifestModel, plan: DryRunPlan) -> None:
@@ -147,6 +292,94 @@ class TelemetryStore:
         with self._lock:
             with (self.run_dir / filename).open("a", encoding="utf-8") as fh:
                 fh.write(text + "\n")
+            self._summary.add(filename, payload)
+
+    def _aggregate(self, stream: str, component: str | None) -> StreamAggregate:
+        key = (stream, component)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            policy = self._stream_sampling.get(stream, self._sampling)
+            aggregate = StreamAggregate(stream, component, policy=str(policy))
+            self._aggregates[key] = aggregate
+        return aggregate
+
+    def _track_submission(
+        self, task_id: str, task_name: str, component: str | None, usage: bool
+    ) -> None:
+        stream = stream_name(task_name)
+        policy = self._stream_sampling.get(stream, self._sampling)
+        with self._lock:
+            sampler = self._samplers.get(stream)
+            if sampler is None:
+                seed = self._sampling_seed + len(self._samplers)
+                sampler = self._samplers[stream] = StreamSampler(policy, seed=seed)
+            aggregate = self._aggregate(stream, component)
+            aggregate.submitted += 1
+            if policy.mode == "reservoir":
+                mode = "buffer"
+            else:
+                mode = "write" if sampler.admit() else "drop"
+            if mode == "write":
+                aggregate.recorded += 1
+            self._task_seq += 1
+            self._tracks[task_id] = _TaskTrack(
+                stream=stream,
+                component=component,
+                mode=mode,
+                weight=float(policy.n) if policy.mode == "every_n" else 1.0,
+                seq=self._task_seq,
+                awaiting_usage=usage,
+            )
+
+    def _append_task_row(self, task_id: str, filename: str, payload: dict[str, Any]) -> None:
+        """Write, buffer or drop a per-task row according to its sampling mode."""
+        with self._lock:
+            track = self._tracks.get(task_id)
+            sampled = filename in self._SAMPLED_FILES
+            if track is None or track.mode == "write":
+                if track is not None and sampled:
+                    payload["sample_weight"] = track.weight
+                self._append_jsonl(filename, payload)
+                return
+            if track.diagnostic:
+                self._append_diagnostic(filename, payload)
+            if track.mode == "buffer" and (sampled or not track.diagnostic):
+                self._buffered_rows.setdefault(task_id, []).append((filename, payload))
+
+    def _append_diagnostic(self, filename: str, payload: dict[str, Any]) -> None:
+        """Write a row of a sampled-out failed task, with weight 0 in sampled files."""
+        if filename in self._SAMPLED_FILES:
+            payload = {**payload, "sample_weight": 0.0}
+        self._append_jsonl(filename, payload)
+
+    def _release_track(self, task_id: str, track: _TaskTrack) -> None:
+        # Reservoir candidates stay tracked until the run closes.
+        if track.finished and not track.awaiting_usage and track.mode != "buffer":
+            self._tracks.pop(task_id, None)
+
+    def _flush_reservoirs(self) -> None:
+        """Write the rows of tasks kept by reservoir samplers, weighted."""
+        with self._lock:
+            for sampler in self._samplers.values():
+                if sampler.policy.mode != "reservoir":
+                    continue
+                weight = sampler.weight
+                kept = [(self._tracks.get(task_id), task_id) for task_id in sampler.reservoir]
+                kept.sort(key=lambda item: item[0].seq if item[0] is not None else 0)
+                for track, task_id in kept:
+                    if track is not None:
+                        self._aggregate(track.stream, track.component).recorded += 1
+                    for filename, payload in self._buffered_rows.pop(task_id, []):
+                        if filename in self._SAMPLED_FILES:
+                            payload["sample_weight"] = weight
+                        self._append_jsonl(filename, payload)
+                sampler.reservoir.clear()
+            self._buffered_rows.clear()
+            self._tracks.clear()
+
+    def _stream_aggregates(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [aggregate.to_dict() for aggregate in self._aggregates.values()]
 
     def record_task_submission(
         self,
@@ -157,11 +390,25 @@ class TelemetryStore:
         tag: str | None,
         function_name: str,
         requested_workers: int,
+        lifecycle: bool = False,
+        usage: bool = False,
     ) -> None:
-        """Record a task submission and a synthetic running transition."""
+        """Record a task submission.
+
+        With ``lifecycle=True`` the caller promises a scheduler timing record
+        via :meth:`record_task_lifecycle`, and the ``running`` transition is
+        written from it. Otherwise a synthetic ``running`` row is written now.
+        ``usage=True`` promises a :meth:`record_task_usage` call, so sampling
+        state for the task is kept until it arrives.
+        """
         self._task_started_at[task_id] = time.monotonic()
+        self._track_submission(task_id, task_name, component, usage)
+        if lifecycle:
+            with self._lock:
+                self._awaiting_lifecycle.add(task_id)
 
-        self._append_jsonl(
+        self._append_task_row(
+            task_id,
             self._TASKS_FILE,
             TaskEvent(
                 run_id=self.run_id,
@@ -174,19 +421,21 @@ class TelemetryStore:
                 requested_workers=requested_workers,
             ).to_dict(),
         )
-        self._append_jsonl(
-            self._TASKS_FILE,
-            TaskEvent(
-                run_id=self.run_id,
-                task_id=task_id,
-                task_name=task_name,
-                component=component,
-                tag=tag,
-                state="running",
-                function_name=function_name,
-                requested_workers=requested_workers,
-            ).to_dict(),
-        )
+        if not lifecycle:
+            self._append_task_row(
+                task_id,
+                self._TASKS_FILE,
+                TaskEvent(
+                    run_id=self.run_id,
+                    task_id=task_id,
+                    task_name=task_name,
+                    component=component,
+                    tag=tag,
+                    state="running",
+                    function_name=function_name,
+                    requested_workers=requested_workers,
+                ).to_dict(),
+            )
 
         default_cpus = None
         default_memory = None
@@ -194,7 +443,8 @@ class TelemetryStore:
             default_cpus = self.component_defaults[component].get("cpus")
             default_memory = self.component_defaults[component].get("memory")
 
-        self._append_jsonl(
+        self._append_task_row(
+            task_id,
             self._RESOURCES_FILE,
             ResourceEvent(
                 run_id=self.run_id,
@@ -223,42 +473,226 @@ class TelemetryStore:
         error_type: str | None = None,
         error_message: str | None = None,
     ) -> None:
-        """Record terminal task state and optional failure event."""
+        """Record terminal task state and optional failure event.
+
+        ``duration_s`` is execution time on the worker when scheduler
+        lifecycle timings are available, and submit-to-done time otherwise.
+        """
         start = self._task_started_at.pop(task_id, None)
-        duration = None
+        turnaround = None
         if start is not None:
-            duration = max(time.monotonic() - start, 0.0)
+            turnaround = max(time.monotonic() - start, 0.0)
+
+        result = {
+            "task_id": task_id,
+            "task_name": task_name,
+            "component": component,
+            "tag": tag,
+            "function_name": function_name,
+            "requested_workers": requested_workers,
+            "state": state,
+            "worker": worker,
+            "error_type": error_type,
+            "error_message": error_message,
+            "turnaround_s": turnaround,
+        }
+        with self._lock:
+            lifecycle = self._lifecycle_by_task.pop(task_id, None)
+            if lifecycle is None and task_id in self._awaiting_lifecycle and state != "cancelled":
+                self._parked_results[task_id] = result
+                return
+            self._awaiting_lifecycle.discard(task_id)
+        self._write_task_result(result, lifecycle)
 
-        self._append_jsonl(
+    def record_task_lifecycle(self, *, task_id: str, lifecycle: dict[str, Any]) -> None:
+        """Attach scheduler transition timings to a task.
+
+        ``lifecycle`` is a :class:`~scalable.telemetry.lifecycle.TaskLifecyclePlugin`
+        record. It is joined with the client-side result for the same task,
+        whichever of the two arrives last triggers the write.
+        """
+        with self._lock:
+            result = self._parked_results.pop(task_id, None)
+            if result is None:
+                if task_id in self._awaiting_lifecycle:
+                    self._lifecycle_by_task[task_id] = lifecycle
+                return
+            self._awaiting_lifecycle.discard(task_id)
+        self._write_task_result(result, lifecycle)
+
+    def _write_task_result(
+        self, result: dict[str, Any], lifecycle: dict[str, Any] | None
+    ) -> None:
+        task_id = result["task_id"]
+        with self._lock:
+            track = self._tracks.get(task_id)
+            if track is not None and result["state"] == "failed" and track.mode != "write":
+                # Failures are rare and what diagnosis needs most, so the rows
+                # of a sampled-out failed task are written too, with weight 0:
+                # the weighted sample already accounts for it. A reservoir
+                # candidate keeps competing for a weighted slot.
+                track.diagnostic = True
+                for filename, payload in self._buffered_rows.get(task_id, []):
+                    self._append_diagnostic(filename, payload)
+            self._write_task_rows(result, lifecycle)
+            if track is None:
+                return
+            track.finished = True
+            if track.mode == "buffer" and result["state"] != "cancelled":
+                displaced = self._samplers[track.stream].offer(task_id)
+                if displaced is not None:
+                    self._buffered_rows.pop(displaced, None)
+                    displaced_track = self._tracks.get(displaced)
+                    if displaced_track is not None:
+                        displaced_track.mode = "drop"
+                        self._release_track(displaced, displaced_track)
+            elif track.mode == "buffer":
+                track.mode = "drop"
+                self._buffered_rows.pop(task_id, None)
+            self._release_track(task_id, track)
+
+    def _write_task_rows(
+        self, result: dict[str, Any], lifecycle: dict[str, Any] | None
+    ) -> None:
+        task_id = result["task_id"]
+        identity = {
+            "run_id": self.run_id,
+            "task_id": result["task_id"],
+            "task_name": result["task_name"],
+            "component": result["component"],
+            "tag": result["tag"],
+            "function_name": result["function_name"],
+            "requested_workers": result["requested_workers"],
+        }
+        worker = result["worker"]
+        duration = result["turnaround_s"]
+        timings: dict[str, Any] = {}
+
+        if lifecycle is not None:
+            worker = lifecycle.get("worker") or worker
+            compute = lifecycle.get("compute_s")
+            if compute is not None:
+                duration = compute
+            timings = {
+                "queue_wait_s": lifecycle.get("queue_wait_s"),
+                "compute_s": compute,
+                "transfer_s": lifecycle.get("transfer_s"),
+                "attempts": lifecycle.get("attempts"),
+            }
+            processing_at = lifecycle.get("processing_at")
+            if isinstance(processing_at, (int, float)):
+                self._append_task_row(
+                    task_id,
+                    self._TASKS_FILE,
+                    TaskEvent(
+                        **identity,
+                        state="running",
+                        timestamp=epoch_to_iso(processing_at),
+                        worker=worker,
+                        queue_wait_s=timings["queue_wait_s"],
+                    ).to_dict(),
+                )
+
+        track = self._tracks.get(task_id)
+        if track is not None:
+            self._aggregate(track.stream, track.component).add_result(
+                result["state"], duration, timings.get("queue_wait_s")
+            )
+            self._aggregate_updates += 1
+
+        self._append_task_row(
+            task_id,
             self._TASKS_FILE,
             TaskEvent(
-                run_id=self.run_id,
-                task_id=task_id,
-                task_name=task_name,
-                component=component,
-                tag=tag,
-                state=state,
-                function_name=function_name,
-                requested_workers=requested_workers,
+                **identity,
+                state=result["state"],
                 duration_s=duration,
                 worker=worker,
-                error_type=error_type,
-                error_message=error_message,
+                error_type=result["error_type"],
+                error_message=result["error_message"],
+                turnaround_s=result["turnaround_s"],
+                **timings,
             ).to_dict(),
         )
 
-        if state == "failed":
-            self._append_jsonl(
+        if result["state"] == "failed":
+            self._append_task_row(
+                task_id,
                 self._FAILURES_FILE,
                 FailureEvent(
                     run_id=self.run_id,
-                    failure_class=error_type or "TaskError",
-                    message=error_message or "task failed",
+                    failure_class=result["error_type"] or "TaskError",
+                    message=result["error_message"] or "task failed",
                     provider=self.provider_name,
-                    task_id=task_id,
+                    task_id=result["task_id"],
                 ).to_dict(),
             )
 
+    def _flush_parked_results(self) -> None:
+        with self._lock:
+            parked = list(self._parked_results.values())
+            self._parked_results.clear()
+            self._lifecycle_by_task.clear()
+            self._awaiting_lifecycle.clear()
+        for result in parked:
+            self._write_task_result(result, None)
+
+    def record_task_usage(
+        self,
+        *,
+        task_id: str,
+        component: str | None,
+        usage: dict[str, Any],
+    ) -> None:
+        """Record resources a task actually consumed on its worker.
+
+        ``usage`` is a :class:`~scalable.telemetry.usage.TaskUsage` payload.
+        The event carries only ``observed_*`` fields so readers can merge it
+        with the request-side resource event for the same task.
+        """
+        wall = usage.get("wall_s")
+        user = usage.get("cpu_user_s")
+        system = usage.get("cpu_system_s")
+        peak = usage.get("peak_rss_bytes")
+
+        cpu_total = None
+        if user is not None or system is not None:
+            cpu_total = float(user or 0.0) + float(system or 0.0)
+        # observed_cpu is average cores busy over the task's wall time.
+        observed_cpu = None
+        if cpu_total is not None and isinstance(wall, (int, float)) and wall > 0:
+            observed_cpu = round(cpu_total / float(wall), 6)
+
+        with self._lock:
+            track = self._tracks.get(task_id)
+            if track is not None:
+                self._aggregate(track.stream, track.component).add_usage(usage)
+                self._aggregate_updates += 1
+                track.awaiting_usage = False
+
+        self._append_task_row(
+            task_id,
+            self._RESOURCES_FILE,
+            ResourceEvent(
+                run_id=self.run_id,
+                entity_type="task",
+                entity_id=task_id,
+                component=component,
+                provider=self.provider_name,
+                observed_cpu=observed_cpu,
+                observed_memory_gb=round(peak / 1024**3, 6) if isinstance(peak, int) else None,
+                observed_cpu_user_s=user,
+                observed_cpu_system_s=system,
+                observed_peak_rss_bytes=peak,
+                observed_read_bytes=usage.get("read_bytes"),
+                observed_write_bytes=usage.get("write_bytes"),
+                observed_wall_s=wall,
+            ).to_dict(),
+        )
+        if track is not None:
+            with self._lock:
+                self._release_track(task_id, track)
+
     def record_cache_event(
         self,
         *,
@@ -378,13 +812,55 @@ class TelemetryStore:
             ).to_dict(),
         )
 
-    def _write_summary(self) -> None:
-        summary = summarize_run(self.run_dir)
-        (self.run_dir / "summary.json").write_text(
+    def live_summary(self) -> dict[str, Any]:
+        """Return the current run summary, maintained incrementally in memory."""
+        with self._lock:
+            summary = self._summary.to_dict(self.metadata.to_dict())
+            if self._sampling_active:
+                summary["streams"] = summarize_streams(self._stream_aggregates())
+            return summary
+
+    def _write_summary(self, *, live: bool = False) -> None:
+        with self._lock:
+            version = (self._summary.version, self._task_seq, self._aggregate_updates)
+            if live and version == self._summary_written_version:
+                return
+            summary = self._summary.to_dict(self.metadata.to_dict())
+            if self._sampling_active:
+                summary["streams"] = summarize_streams(self._stream_aggregates())
+            self._summary_written_version = version
+        if live:
+            summary["live"] = {"updated_at": utcnow_iso()}
+        _atomic_write_text(
+            self.run_dir / "summary.json",
             json.dumps(summary, indent=2, sort_keys=True) + "\n",
-            encoding="utf-8",
         )
 
+    def _write_aggregates(self) -> None:
+        if not self._sampling_active:
+            return
+        payload = {
+            "default_policy": str(self._sampling),
+            "stream_policies": {
+                name: str(policy) for name, policy in sorted(self._stream_sampling.items())
+            },
+            "streams": sorted(
+                self._stream_aggregates(),
+                key=lambda item: (str(item["stream"]), str(item["component"])),
+            ),
+        }
+        _atomic_write_text(
+            self.run_dir / self._AGGREGATES_FILE,
+            json.dumps(payload, indent=2, sort_keys=True) + "\n",
+        )
+
+    def _live_summary_loop(self, interval: float) -> None:
+        while not self._live_stop.wait(interval):
+            try:
+                self._write_summary(live=True)
+            except OSError:  # pragma: no cover - transient filesystem errors
+                continue
+
     def _write_parquet_snapshots(self) -> None:
         if not self.telemetry_parquet:
             return
@@ -412,6 +888,15 @@ class TelemetryStore:
                 return
             self._closed = True
 
+        # Stop the live writer outside the lock; it takes the lock to snapshot.
+        self._live_stop.set()
+        if self._live_thread is not None and self._live_thread.is_alive():
+            self._live_thread.join()
+
+        with self._lock:
+            self._flush_parked_results()
+            self._flush_reservoirs()
+            self._write_aggregates()
             self.metadata = replace(self.metadata, status=status, finished_at=utcnow_iso())
             (self.run_dir / "run.json").write_text(
                 json.dumps(self.metadata.to_dict(), indent=2, sort_keys=True) + "\n",
@@ -420,5 +905,13 @@ class TelemetryStore:
             self._write_summary()
             self._write_parquet_snapshots()
 
+        if self._syncer is not None:
+            try:
+                self._syncer.close()
+            except Exception as exc:
+                logger.warning(
+                    "final telemetry sync to %s failed: %s", self._syncer.remote_uri, exc
+                )
+
 
 __all__ = ["TelemetryStore", "build_run_id"]
@@ -0,0 +1,271 @@
+"""Incremental upload of run telemetry to a remote runs directory.
+
+Telemetry written on an ephemeral driver (a cloud VM or Kubernetes pod) is
+lost with it unless it is copied off. :class:`TelemetrySyncer` ships a run
+directory to ``settings.runs_dir_remote`` through the artifact store layer
+while the run is active, so the end of the run only has to send the tail.
+
+Remote layout for run ``<run_id>`` under the remote root::
+
+    <run_id>/sync.json                           # offsets of shipped data
+    <run_id>/tasks.jsonl.segments/<start>.jsonl  # complete lines [start, end)
+    <run_id>/summary.json                        # whole small files
+    ...
+
+Append-only JSONL files are shipped as segments of complete lines starting
+at the last acknowledged byte offset. Offsets are persisted locally in
+``.sync-state.json`` and remotely in ``sync.json``, so an interrupted upload
+resumes where it stopped. Other files (``run.json``, ``summary.json``,
+Parquet snapshots, ...) are re-uploaded whole when they change.
+:func:`fetch_remote_run` reassembles a synced run into a local directory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from scalable.artifacts import ArtifactKind, ArtifactStore, build_artifact_store
+from scalable.common import logger
+
+#: Default maximum size of one uploaded JSONL segment.
+DEFAULT_CHUNK_BYTES: int = 8 * 1024 * 1024
+
+_STATE_FILE = ".sync-state.json"
+_REMOTE_STATE = "sync.json"
+_SEGMENTS_SUFFIX = ".segments"
+_OFFSET_WIDTH = 16
+
+
+def _segment_key(run_id: str, filename: str, start: int) -> str:
+    return f"{run_id}/{filename}{_SEGMENTS_SUFFIX}/{start:0{_OFFSET_WIDTH}d}.jsonl"
+
+
+def _complete_lines(path: Path, start: int, limit: int) -> bytes:
+    """Read complete lines from ``start``, about ``limit`` bytes at most.
+
+    A single line longer than ``limit`` is returned whole so progress is
+    always possible once the line is terminated.
+    """
+    with path.open("rb") as fh:
+        fh.seek(start)
+        data = fh.read(limit)
+        cut = data.rfind(b"\n")
+        if cut >= 0:
+            return data[: cut + 1]
+        if len(data) < limit:
+            return b""  # only a partially written line so far
+        while True:
+            more = fh.read(limit)
+            if not more:
+                return b""
+            cut = more.find(b"\n")
+            if cut >= 0:
+                return data + more[: cut + 1]
+            data += more
+
+
+class TelemetrySyncer:
+    """Ship one run directory to a remote artifact store incrementally.
+
+    Parameters
+    ----------
+    run_dir:
+        Local run directory written by
+        :class:`~scalable.telemetry.store.TelemetryStore`.
+    remote_uri:
+        Remote runs root, e.g. ``s3://bucket/runs``. The run is stored under
+        ``<remote_uri>/<run_dir.name>/``.
+    interval:
+        Seconds between background sync passes; ``None`` or ``0`` disables
+        the background thread (call :meth:`sync` explicitly).
+    chunk_bytes:
+        Maximum size of one JSONL segment upload.
+    store:
+        Pre-built artifact store for ``remote_uri`` (mainly for tests).
+    """
+
+    def __init__(
+        self,
+        run_dir: str | Path,
+        remote_uri: str,
+        *,
+        interval: float | None = None,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        store: ArtifactStore | None = None,
+    ) -> None:
+        self.run_dir = Path(run_dir)
+        self.run_id = self.run_dir.name
+        self.remote_uri = remote_uri
+        self.chunk_bytes = max(int(chunk_bytes), 1)
+        self._store = store if store is not None else build_artifact_store(remote_uri)
+        self._lock = threading.Lock()
+        self._offsets: dict[str, int] = {}
+        self._files: dict[str, list[int]] = {}
+        self._load_state()
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if interval is not None and interval > 0:
+            self._thread = threading.Thread(
+                target=self._loop,
+                args=(float(interval),),
+                name=f"scalable-telemetry-sync-{self.run_id}",
+                daemon=True,
+            )
+
+    @property
+    def offsets(self) -> dict[str, int]:
+        """Bytes of each JSONL file acknowledged by the remote store."""
+        with self._lock:
+            return dict(self._offsets)
+
+    def start(self) -> None:
+        if self._thread is not None and not self._thread.is_alive():
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and ship everything that is left."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        self.sync()
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as exc:  # keep syncing on transient remote errors
+                logger.warning("telemetry sync to %s failed: %s", self.remote_uri, exc)
+
+    def _load_state(self) -> None:
+        state: dict[str, Any] = {}
+        local = self.run_dir / _STATE_FILE
+        if local.exists():
+            try:
+                state = json.loads(local.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                state = {}
+        if not state:
+            state = self._read_remote_state()
+        self._offsets = {str(k): int(v) for k, v in state.get("offsets", {}).items()}
+        self._files = {str(k): list(v) for k, v in state.get("files", {}).items()}
+        for filename, offset in list(self._offsets.items()):
+            path = self.run_dir / filename
+            if not path.exists() or path.stat().st_size < offset:
+                self._offsets[filename] = 0
+
+    def _read_remote_state(self) -> dict[str, Any]:
+        key = f"{self.run_id}/{_REMOTE_STATE}"
+        try:
+            if not self._store.exists(key):
+                return {}
+            with tempfile.TemporaryDirectory() as tmp:
+                path = self._store.get(key, str(Path(tmp) / _REMOTE_STATE))
+                return json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.debug("could not read remote sync state for %s: %s", self.run_id, exc)
+            return {}
+
+    def _put_bytes(self, data: bytes, key: str) -> None:
+        fd, tmp_name = tempfile.mkstemp(prefix=".scalable-sync-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            self._store.put(tmp_name, key, kind=ArtifactKind.BLOB)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def _save_state(self) -> None:
+        payload = json.dumps(
+            {"run_id": self.run_id, "offsets": self._offsets, "files": self._files},
+            indent=2,
+            sort_keys=True,
+        )
+        local = self.run_dir / _STATE_FILE
+        tmp = local.with_name(local.name + ".tmp")
+        tmp.write_text(payload + "\n", encoding="utf-8")
+        os.replace(tmp, local)
+        self._put_bytes(payload.encode("utf-8") + b"\n", f"{self.run_id}/{_REMOTE_STATE}")
+
+    def sync(self) -> int:
+        """Upload new JSONL segments and changed files; return bytes shipped."""
+        with self._lock:
+            if not self.run_dir.exists():
+                return 0
+            shipped = 0
+            for path in sorted(self.run_dir.iterdir()):
+                if not path.is_file() or path.name.startswith("."):
+                    continue
+                if path.suffix == ".jsonl":
+                    shipped += self._sync_segments(path)
+                else:
+                    shipped += self._sync_whole(path)
+            if shipped:
+                self._save_state()
+            return shipped
+
+    def _sync_segments(self, path: Path) -> int:
+        shipped = 0
+        offset = self._offsets.get(path.name, 0)
+        while True:
+            data = _complete_lines(path, offset, self.chunk_bytes)
+            if not data:
+                break
+            self._put_bytes(data, _segment_key(self.run_id, path.name, offset))
+            offset += len(data)
+            shipped += len(data)
+            # Record progress per segment so a failure mid-file resumes here.
+            self._offsets[path.name] = offset
+        return shipped
+
+    def _sync_whole(self, path: Path) -> int:
+        stat = path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        if self._files.get(path.name) == signature:
+            return 0
+        self._store.put(str(path), f"{self.run_id}/{path.name}", kind=ArtifactKind.FILE)
+        self._files[path.name] = signature
+        return stat.st_size
+
+
+def fetch_remote_run(remote_uri: str, run_id: str, runs_dir: str | Path) -> Path:
+    """Reassemble a run synced by :class:`TelemetrySyncer` into ``runs_dir``.
+
+    Returns the local run directory, which can then be used with
+    ``scalable report``/``advise`` like any locally recorded run.
+    """
+    store = build_artifact_store(remote_uri)
+    dest = Path(runs_dir) / run_id
+    dest.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = Path(store.get(f"{run_id}/{_REMOTE_STATE}", str(Path(tmp) / _REMOTE_STATE)))
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+
+        for filename in sorted(state.get("files", {})):
+            store.get(f"{run_id}/{filename}", str(dest / filename))
+
+        for filename, offset in sorted(state.get("offsets", {}).items()):
+            prefix = f"{run_id}/{filename}{_SEGMENTS_SUFFIX}"
+            segments = sorted(
+                key.rsplit("/", 1)[-1] for key in store.list_artifacts(prefix)
+            )
+            expected = 0
+            with (dest / filename).open("wb") as out:
+                for name in segments:
+                    start = int(name.split(".", 1)[0])
+                    if start != expected or start >= offset:
+                        continue  # stale segment from an earlier, reset upload
+                    part = Path(store.get(f"{prefix}/{name}", str(Path(tmp) / name)))
+                    data = part.read_bytes()
+                    out.write(data)
+                    expected += len(data)
+    return dest
+
+
+__all__ = ["DEFAULT_CHUNK_BYTES", "TelemetrySyncer", "fetch_remote_run"]
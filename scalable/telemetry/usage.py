@@ -0,0 +1,265 @@
+"""Worker-side sampling of actual per-task resource usage.
+
+The client-side telemetry only knows what a task *requested*. This module
+measures what it actually *used* while it runs on a worker: CPU user/system
+time, peak resident memory, and bytes read/written, including any container
+or model subprocesses the task spawns.
+
+Measurement strategy (chosen for low per-task overhead):
+
+* CPU time is the delta of ``getrusage(RUSAGE_THREAD)`` for the executing
+  thread plus the delta of ``getrusage(RUSAGE_CHILDREN)`` for reaped
+  subprocesses. No polling is involved.
+* Peak RSS is tracked by one shared, lazily started sampler thread per worker
+  process that polls the process (and live children) RSS while at least one
+  task is active. Short tasks only pay for a start/stop snapshot.
+* I/O bytes are deltas of the process-level counters, which on Linux include
+  reaped children.
+
+RSS and I/O are process-level quantities; with several task threads per
+worker process they are attributed to every task that overlapped the sample.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+try:  # POSIX only
+    import resource as _resource
+except ImportError:  # pragma: no cover - Windows
+    _resource = None  # type: ignore[assignment]
+
+try:  # psutil ships with distributed, but keep the probe usable without it
+    import psutil as _psutil
+except ImportError:  # pragma: no cover - optional
+    _psutil = None  # type: ignore[assignment]
+
+
+#: Worker event topic used to ship usage samples back to the client.
+TASK_USAGE_TOPIC: str = "scalable-task-usage"
+
+#: Default RSS polling interval in seconds for the shared sampler thread.
+DEFAULT_SAMPLE_INTERVAL_S: float = 0.5
+
+
+@dataclass(frozen=True)
+class TaskUsage:
+    """Resources actually consumed by one task execution."""
+
+    wall_s: float
+    cpu_user_s: float | None = None
+    cpu_system_s: float | None = None
+    peak_rss_bytes: int | None = None
+    read_bytes: int | None = None
+    write_bytes: int | None = None
+
+    @property
+    def cpu_s(self) -> float | None:
+        if self.cpu_user_s is None and self.cpu_system_s is None:
+            return None
+        return (self.cpu_user_s or 0.0) + (self.cpu_system_s or 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _thread_rusage() -> tuple[float, float] | None:
+    if _resource is None:
+        return None
+    who = getattr(_resource, "RUSAGE_THREAD", None)
+    if who is None:  # pragma: no cover - macOS has no per-thread rusage
+        who = _resource.RUSAGE_SELF
+    usage = _resource.getrusage(who)
+    return usage.ru_utime, usage.ru_stime
+
+
+def _children_rusage() -> tuple[float, float, int] | None:
+    if _resource is None:
+        return None
+    usage = _resource.getrusage(_resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_utime, usage.ru_stime, int(usage.ru_maxrss) * scale
+
+
+def _process() -> Any:
+    if _psutil is None:
+        return None
+    try:
+        return _psutil.Process()
+    except Exception:  # pragma: no cover - defensive
+        return None
+
+
+def _io_bytes(proc: Any) -> tuple[int, int] | None:
+    if proc is None:
+        return None
+    try:
+        counters = proc.io_counters()
+    except Exception:  # platform without I/O accounting
+        return None
+    return int(counters.read_bytes), int(counters.write_bytes)
+
+
+def _tree_rss(proc: Any) -> int | None:
+    if proc is None:
+        return None
+    try:
+        total = int(proc.memory_info().rss)
+    except Exception:
+        return None
+    try:
+        children = proc.children(recursive=True)
+    except Exception:  # pragma: no cover - defensive
+        children = []
+    for child in children:
+        try:
+            total += int(child.memory_info().rss)
+        except Exception:  # child exited between listing and sampling
+            continue
+    return total
+
+
+class _PeakRssSampler:
+    """Process-wide RSS poller shared by all active task probes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active: dict[int, list[int]] = {}
+        self._thread: threading.Thread | None = None
+        self._proc = _process()
+        self.interval = DEFAULT_SAMPLE_INTERVAL_S
+
+    def register(self, probe_id: int, initial: int) -> None:
+        with self._lock:
+            self._active[probe_id] = [initial]
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="scalable-usage-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, probe_id: int, final: int | None) -> int | None:
+        with self._lock:
+            slot = self._active.pop(probe_id, None)
+        if slot is None:
+            return final
+        if final is not None:
+            slot[0] = max(slot[0], final)
+        return slot[0]
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            rss = _tree_rss(self._proc)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                if rss is None:
+                    continue
+                for slot in self._active.values():
+                    if rss > slot[0]:
+                        slot[0] = rss
+
+
+_SAMPLER = _PeakRssSampler()
+
+
+class UsageProbe:
+    """Mutable handle yielded by :func:`measure_usage`; holds the final sample."""
+
+    def __init__(self) -> None:
+        self.usage: TaskUsage | None = None
+
+
+@contextmanager
+def measure_usage(*, interval: float | None = None):
+    """Measure resources consumed by the enclosed block on this thread.
+
+    Yields a :class:`UsageProbe` whose ``usage`` attribute is populated on
+    exit, whether or not the block raised.
+    """
+    probe = UsageProbe()
+    if interval is not None and interval > 0:
+        _SAMPLER.interval = float(interval)
+
+    proc = _SAMPLER._proc
+    wall_start = time.perf_counter()
+    thread_start = _thread_rusage()
+    children_start = _children_rusage()
+    io_start = _io_bytes(proc)
+    rss_start = _tree_rss(proc)
+
+    probe_id = id(probe)
+    if rss_start is not None:
+        _SAMPLER.register(probe_id, rss_start)
+    try:
+        yield probe
+    finally:
+        rss_end = _tree_rss(proc)
+        peak = _SAMPLER.unregister(probe_id, rss_end) if rss_start is not None else None
+        wall = max(time.perf_counter() - wall_start, 0.0)
+
+        cpu_user = cpu_system = None
+        thread_end = _thread_rusage()
+        if thread_start is not None and thread_end is not None:
+            cpu_user = max(thread_end[0] - thread_start[0], 0.0)
+            cpu_system = max(thread_end[1] - thread_start[1], 0.0)
+
+        children_end = _children_rusage()
+        if children_start is not None and children_end is not None:
+            cpu_user = (cpu_user or 0.0) + max(children_end[0] - children_start[0], 0.0)
+            cpu_system = (cpu_system or 0.0) + max(children_end[1] - children_start[1], 0.0)
+            # A new children high-water mark means a subprocess of this task
+            # peaked after the last poll; fold it into the peak.
+            if children_end[2] > children_start[2]:
+                peak = max(peak or 0, (rss_start or 0) + children_end[2])
+
+        read_bytes = write_bytes = None
+        io_end = _io_bytes(proc)
+        if io_start is not None and io_end is not None:
+            read_bytes = max(io_end[0] - io_start[0], 0)
+            write_bytes = max(io_end[1] - io_start[1], 0)
+
+        probe.usage = TaskUsage(
+            wall_s=wall,
+            cpu_user_s=cpu_user,
+            cpu_system_s=cpu_system,
+            peak_rss_bytes=peak,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+        )
+
+
+def publish_task_usage(usage: TaskUsage) -> bool:
+    """Ship a usage sample from a worker to subscribed clients.
+
+    Returns ``False`` when not running inside a Dask worker task.
+    """
+    try:
+        from distributed import get_worker
+
+        worker = get_worker()
+        key = worker.get_current_task()
+    except (ImportError, ValueError):
+        return False
+    if key is None:
+        return False
+    worker.log_event(TASK_USAGE_TOPIC, {"key": str(key), **usage.to_dict()})
+    return True
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_INTERVAL_S",
+    "TASK_USAGE_TOPIC",
+    "TaskUsage",
+    "UsageProbe",
+    "measure_usage",
+    "publish_task_usage",
+]
@@ -32,6 +32,16 @@ def _isolate_scalable_env(tmp_path, monkeypatch):
     monkeypatch.delenv("SCALABLE_RUNS_DIR", raising=False)
     monkeypatch.delenv("SCALABLE_TELEMETRY", raising=False)
     monkeypatch.delenv("SCALABLE_TELEMETRY_PARQUET", raising=False)
+    monkeypatch.delenv("SCALABLE_TELEMETRY_USAGE", raising=False)
+    monkeypatch.delenv("SCALABLE_TELEMETRY_USAGE_INTERVAL", raising=False)
+    monkeypatch.delenv("SCALABLE_TELEMETRY_LIVE_INTERVAL", raising=False)
+    monkeypatch.delenv("SCALABLE_TELEMETRY_SAMPLING", raising=False)
+    monkeypatch.delenv("SCALABLE_TELEMETRY_SYNC_INTERVAL", raising=False)
+    monkeypatch.delenv("SCALABLE_RUNS_DIR_REMOTE", raising=False)
+    monkeypatch.delenv("SCALABLE_ARTIFACT_CACHE_DIR", raising=False)
+    monkeypatch.delenv("SCALABLE_CACHE_REMOTE", raising=False)
+    monkeypatch.delenv("SCALABLE_CACHE_REMOTE_COMPRESSION", raising=False)
+    monkeypatch.delenv("SCALABLE_ARTIFACT_CACHE_SIZE_GB", raising=False)
     monkeypatch.delenv("COMM_PORT", raising=False)
     # Generic AI provider env vars (loaded from .env via dotenv)
     monkeypatch.delenv("AI_PROVIDER", raising=False)
@@ -69,3 +69,61 @@ def test_session_writes_run_telemetry_and_summary(tmp_path: Path) -> None:
     summary_payload = json.loads((run_dir / "summary.json").read_text(encoding="utf-8"))
     assert summary_payload["counts"]["task_events"] >= 2
 
+
+
+def _allocate(n_bytes: int) -> int:
+    blob = bytearray(n_bytes)
+    blob[-1] = 1
+    return len(blob)
+
+
+def test_session_records_observed_task_usage(tmp_path: Path) -> None:
+    import time
+
+    manifest_path = tmp_path / "scalable.yaml"
+    _write_manifest(manifest_path)
+
+    session = ScalableSession.from_yaml(manifest_path, target="local")
+    client = session.start()
+    run_dir = session._telemetry.run_dir
+    try:
+        assert client.submit(_allocate, 8 * 1024 * 1024, tag="gcam").result(timeout=10) > 0
+        deadline = time.monotonic() + 10
+        observed: list[dict] = []
+        while time.monotonic() < deadline and not observed:
+            rows = [
+                json.loads(line)
+                for line in (run_dir / "resources.jsonl").read_text(encoding="utf-8").splitlines()
+            ]
+            observed = [r for r in rows if r.get("observed_wall_s") is not None]
+            time.sleep(0.05)
+    finally:
+        session.close()
+
+    assert len(observed) == 1
+    assert observed[0]["observed_peak_rss_bytes"] > 0
+    assert observed[0]["observed_cpu_user_s"] is not None
+
+
+def test_session_records_scheduler_lifecycle_timings(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "scalable.yaml"
+    _write_manifest(manifest_path)
+
+    session = ScalableSession.from_yaml(manifest_path, target="local")
+    client = session.start()
+    run_dir = session._telemetry.run_dir
+    try:
+        assert client.submit(_allocate, 1024, tag="gcam").result(timeout=10) == 1024
+    finally:
+        session.close()
+
+    rows = [
+        json.loads(line)
+        for line in (run_dir / "tasks.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert [r["state"] for r in rows] == ["submitted", "running", "succeeded"]
+    done = rows[-1]
+    assert done["worker"] is not None and done["worker"].startswith(("tcp://", "inproc://"))
+    assert done["queue_wait_s"] is not None and done["queue_wait_s"] >= 0
+    assert done["compute_s"] is not None
+    assert done["turnaround_s"] >= done["duration_s"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 import os
 import tempfile
 from pathlib import Path
@@ -138,3 +139,72 @@ class TestBuildArtifactStore:
         import shutil
 
         shutil.rmtree("./test_artifacts", ignore_errors=True)
+
+
+class TestLocalArtifactStoreCAS:
+    def _make_tree(self, root: Path) -> Path:
+        src = root / "gcam_out"
+        (src / "db").mkdir(parents=True)
+        (src / "db" / "basex.dat").write_bytes(b"x" * 4096)
+        (src / "summary.csv").write_text("a,b\n1,2\n")
+        return src
+
+    def test_put_deduplicates_identical_content(self, tmp_path):
+        store = LocalArtifactStore(root=tmp_path / "store", cas=True)
+        src = self._make_tree(tmp_path)
+
+        first = store.put(str(src), "scenario1/out")
+        second = store.put(str(src), "scenario2/out")
+
+        assert first.kind == ArtifactKind.DIRECTORY
+        assert first.digest == second.digest
+        assert first.metadata["new_bytes"] == first.size_bytes
+        assert second.metadata["new_bytes"] == 0
+        blobs = [p for p in (tmp_path / "store" / ".cas" / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 2
+
+    def test_get_materializes_directory_and_file(self, tmp_path):
+        store = LocalArtifactStore(root=tmp_path / "store", cas=True)
+        src = self._make_tree(tmp_path)
+        store.put(str(src), "out")
+        store.put(str(src / "summary.csv"), "single.csv")
+
+        dest = Path(store.get("out", str(tmp_path / "got")))
+        assert (dest / "db" / "basex.dat").read_bytes() == b"x" * 4096
+        assert (dest / "summary.csv").read_text() == "a,b\n1,2\n"
+        assert Path(store.get("single.csv", str(tmp_path / "s.csv"))).read_text() == "a,b\n1,2\n"
+
+    def test_hardlink_mode_shares_blob_inode(self, tmp_path):
+        store = LocalArtifactStore(root=tmp_path / "store", cas=True, link_mode="hardlink")
+        src = self._make_tree(tmp_path)
+        store.put(str(src), "out")
+
+        dest = Path(store.get("out", str(tmp_path / "got")))
+        assert (dest / "summary.csv").stat().st_nlink >= 2
+
+    def test_exists_and_list_use_keys(self, tmp_path):
+        store = LocalArtifactStore(root=tmp_path / "store", cas=True)
+        src = self._make_tree(tmp_path)
+        store.put(str(src), "a/out")
+        store.put(str(src / "summary.csv"), "a/one.csv")
+        store.put(str(src / "summary.csv"), "b/two.csv")
+
+        assert store.exists("a/out")
+        assert not store.exists("a/missing")
+        assert store.list_artifacts() == ["a/one.csv", "a/out", "b/two.csv"]
+        assert store.list_artifacts("a") == ["a/one.csv", "a/out"]
+        with pytest.raises(FileNotFoundError):
+            store.get("a/missing", str(tmp_path / "nope"))
+
+    def test_open_streams_reads_but_not_writes(self, tmp_path):
+        store = LocalArtifactStore(root=tmp_path / "store", cas=True)
+        store.put(str(self._make_tree(tmp_path) / "summary.csv"), "one.csv")
+
+        with store.open("one.csv") as fh:
+            assert fh.read() == b"a,b\n1,2\n"
+        with pytest.raises(io.UnsupportedOperation, match="put"):
+            store.open("two.csv", "wb")
+
+    def test_invalid_link_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="link_mode"):
+            LocalArtifactStore(root=tmp_path, cas=True, link_mode="teleport")
@@ -0,0 +1,89 @@
+"""Unit tests for the awaitable artifact store API."""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts import AsyncArtifactStore, LocalArtifactStore
+
+fsspec = pytest.importorskip("fsspec")
+from fsspec.implementations.asyn_wrapper import AsyncFileSystemWrapper  # noqa: E402
+from fsspec.implementations.memory import MemoryFileSystem  # noqa: E402
+
+from scalable.artifacts.fsspec_store import FsspecArtifactStore  # noqa: E402
+
+
+def _sources(tmp_path: Path, count: int) -> list[Path]:
+    paths = []
+    for index in range(count):
+        path = tmp_path / "src" / f"input{index}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"scenario,{index}\n")
+        paths.append(path)
+    return paths
+
+
+def _stores(tmp_path: Path) -> list[object]:
+    uri = f"memory://scalable-async-{uuid.uuid4().hex}"
+    return [
+        LocalArtifactStore(root=tmp_path / "store"),
+        FsspecArtifactStore(f"memory://scalable-async-{uuid.uuid4().hex}"),
+        FsspecArtifactStore(uri, filesystem=AsyncFileSystemWrapper(MemoryFileSystem())),
+    ]
+
+
+def test_stores_conform_to_async_protocol(tmp_path):
+    for store in _stores(tmp_path):
+        assert isinstance(store, AsyncArtifactStore)
+
+
+@pytest.mark.asyncio
+async def test_async_round_trip(tmp_path):
+    for index, store in enumerate(_stores(tmp_path)):
+        (src,) = _sources(tmp_path, 1)
+        ref = await store.aput(str(src), "inputs/a.csv")
+        assert ref.digest == hashlib.sha256(src.read_bytes()).hexdigest()
+        assert await store.aexists("inputs/a.csv")
+        assert not await store.aexists("inputs/missing.csv")
+        assert await store.alist("inputs") == ["inputs/a.csv"]
+
+        dest = tmp_path / f"dest{index}" / "a.csv"
+        assert await store.aget("inputs/a.csv", str(dest)) == str(dest)
+        assert dest.read_text() == src.read_text()
+
+
+@pytest.mark.asyncio
+async def test_batch_transfers_preserve_order(tmp_path):
+    for index, store in enumerate(_stores(tmp_path)):
+        sources = _sources(tmp_path, 6)
+        refs = await store.aput_many(
+            [(str(src), f"batch/{src.name}") for src in sources], concurrency=2
+        )
+        assert [ref.size_bytes for ref in refs] == [src.stat().st_size for src in sources]
+
+        targets = [tmp_path / f"out{index}" / src.name for src in sources]
+        paths = await store.aget_many(
+            [(f"batch/{src.name}", str(target)) for src, target in zip(sources, targets, strict=True)]
+        )
+        assert paths == [str(target) for target in targets]
+        assert [t.read_text() for t in targets] == [s.read_text() for s in sources]
+
+
+def test_async_filesystem_created_outside_event_loop(tmp_path):
+    import asyncio
+
+    # Built synchronously, the filesystem runs on fsspec's own I/O loop.
+    fs = AsyncFileSystemWrapper(MemoryFileSystem())
+    assert fs.loop is not None
+    store = FsspecArtifactStore(f"memory://scalable-async-{uuid.uuid4().hex}", filesystem=fs)
+    (src,) = _sources(tmp_path, 1)
+
+    async def _round_trip() -> str:
+        await store.aput(str(src), "x.csv")
+        return await store.aget("x.csv", str(tmp_path / "x.csv"))
+
+    assert Path(asyncio.run(_round_trip())).read_text() == src.read_text()
@@ -0,0 +1,251 @@
+"""Unit tests for incremental directory sync of artifacts."""
+
+from __future__ import annotations
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts import dirsync
+from scalable.artifacts.local import LocalArtifactStore
+
+
+def _tree(root: Path, files: dict[str, str]) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def _files(root: Path) -> dict[str, str]:
+    return {
+        p.relative_to(root).as_posix(): p.read_text()
+        for p in root.rglob("*")
+        if p.is_file() and p.name != dirsync.MANIFEST_NAME
+    }
+
+
+class TestScanAndPlan:
+    def test_scan_reuses_digest_when_stat_matches(self, tmp_path, monkeypatch):
+        src = _tree(tmp_path / "src", {"a.txt": "a", "d/b.txt": "b"})
+        first = dirsync.scan_directory(src)
+        assert sorted(first) == ["a.txt", "d/b.txt"]
+
+        calls = []
+        real = dirsync.file_digest
+        monkeypatch.setattr(dirsync, "file_digest", lambda p: calls.append(p) or real(p))
+        second = dirsync.scan_directory(src, first)
+        assert second == first
+        assert calls == []
+
+    def test_plan_detects_changes_and_deletions(self):
+        e = dirsync.FileEntry
+        source = {"a": e(1, 1, "x"), "b": e(1, 2, "y2"), "new": e(1, 1, "z")}
+        target = {"a": e(1, 9, "x"), "b": e(1, 2, "y"), "gone": e(1, 1, "w")}
+        plan = dirsync.plan_sync(source, target)
+        assert plan.transfer == ["b", "new"]
+        assert plan.unchanged == ["a"]
+        assert plan.delete == ["gone"]
+
+    def test_manifest_round_trip(self):
+        entries = {"a/b": dirsync.FileEntry(3, 123, "abc")}
+        assert dirsync.load_manifest(dirsync.dump_manifest(entries)) == entries
+        assert dirsync.load_manifest(b"not json") is None
+        assert dirsync.load_manifest(None) is None
+
+
+class TestLocalDirectorySync:
+    def test_republish_copies_only_changed_files(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        src = _tree(tmp_path / "src", {f"f{i}.txt": str(i) for i in range(10)})
+        ref = store.put(str(src), "out")
+        assert ref.metadata == {"transferred": 10, "deleted": 0, "unchanged": 0}
+
+        (src / "f3.txt").write_text("changed")
+        (src / "f7.txt").unlink()
+        (src / "sub").mkdir()
+        (src / "sub" / "new.txt").write_text("new")
+        ref = store.put(str(src), "out")
+        assert ref.metadata == {"transferred": 2, "deleted": 1, "unchanged": 8}
+        assert _files(tmp_path / "store" / "out") == _files(src)
+
+    def test_touched_but_identical_file_is_not_copied(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        src = _tree(tmp_path / "src", {"a.txt": "same"})
+        store.put(str(src), "out")
+        os.utime(src / "a.txt", ns=(1, 1))
+        ref = store.put(str(src), "out")
+        assert ref.metadata["transferred"] == 0
+
+    def test_manifest_is_not_listed(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        store.put(str(_tree(tmp_path / "src", {"a.txt": "a"})), "out")
+        assert store.list_artifacts() == ["out/a.txt"]
+
+    def test_get_transfers_only_differences(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        src = _tree(tmp_path / "src", {"a.txt": "a", "b.txt": "b", "c/d.txt": "d"})
+        store.put(str(src), "out")
+        dest = tmp_path / "dest"
+        assert Path(store.get("out", str(dest))) == dest
+        assert _files(dest) == _files(src)
+        # The download state lives beside the copy, which stays faithful.
+        assert not (dest / dirsync.MANIFEST_NAME).exists()
+        state = dirsync.download_manifest_path(dest)
+        assert state == tmp_path / f".dest{dirsync.MANIFEST_NAME}"
+
+        (dest / "b.txt").write_text("locally modified")
+        (dest / "stray.txt").write_text("extra")
+        known = dirsync.load_manifest(state.read_bytes())
+        local = dirsync.scan_directory(dest, known)
+        plan = dirsync.plan_sync(dirsync.read_local_manifest(tmp_path / "store" / "out"), local)
+        assert plan.transfer == ["b.txt"]
+        assert plan.delete == ["stray.txt"]
+
+        store.get("out", str(dest))
+        assert _files(dest) == _files(src)
+
+    def test_get_drops_manifest_left_inside_older_downloads(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        src = _tree(tmp_path / "src", {"a.txt": "a"})
+        store.put(str(src), "out")
+        dest = _tree(tmp_path / "dest", {"a.txt": "a"})
+        dirsync.write_local_manifest(dest, dirsync.scan_directory(dest))
+
+        store.get("out", str(dest))
+        assert sorted(p.name for p in dest.iterdir()) == ["a.txt"]
+
+    def test_legacy_directory_without_manifest_is_replaced(self, tmp_path):
+        store = LocalArtifactStore(tmp_path / "store")
+        _tree(tmp_path / "store" / "out", {"old.txt": "old"})
+        src = _tree(tmp_path / "src", {"a.txt": "a"})
+        store.put(str(src), "out")
+        assert _files(tmp_path / "store" / "out") == {"a.txt": "a"}
+
+
+class TestFsspecDirectorySync:
+    @pytest.fixture
+    def fs(self):
+        pytest.importorskip("fsspec")
+        from fsspec.implementations.memory import MemoryFileSystem
+
+        class CountingMemoryFileSystem(MemoryFileSystem):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.uploads: list[str] = []
+                self.downloads: list[str] = []
+
+            def open(self, path, mode="rb", **kwargs):
+                if "w" in mode and dirsync.MANIFEST_NAME not in path:
+                    self.uploads.append(path)
+                return super().open(path, mode, **kwargs)
+
+            def get_file(self, rpath, lpath, **kwargs):
+                self.downloads.append(rpath)
+                return super().get_file(rpath, lpath, **kwargs)
+
+        return CountingMemoryFileSystem(skip_instance_cache=True)
+
+    def test_put_and_get_are_incremental(self, tmp_path, fs):
+        from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+        store = FsspecArtifactStore(f"memory://sync-{uuid.uuid4().hex}", filesystem=fs)
+        src = _tree(tmp_path / "src", {f"f{i}.txt": str(i) for i in range(5)})
+        store.put(str(src), "out")
+        assert len(fs.uploads) == 5
+
+        (src / "f1.txt").write_text("changed")
+        (src / "f4.txt").unlink()
+        fs.uploads.clear()
+        ref = store.put(str(src), "out")
+        assert ref.metadata == {"transferred": 1, "deleted": 1, "unchanged": 3}
+        assert [p.rsplit("/", 1)[-1] for p in fs.uploads] == ["f1.txt"]
+        assert sorted(k.rsplit("/", 1)[-1] for k in fs.find(store.base_uri + "/out")) == sorted(
+            [dirsync.MANIFEST_NAME, "f0.txt", "f1.txt", "f2.txt", "f3.txt"]
+        )
+
+        dest = tmp_path / "dest"
+        store.get("out", str(dest))
+        assert _files(dest) == _files(src)
+        fs.downloads.clear()
+        store.get("out", str(dest))
+        assert fs.downloads == []
+
+    def test_put_restores_files_removed_behind_the_manifest(self, tmp_path, fs):
+        from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+        store = FsspecArtifactStore(f"memory://sync-{uuid.uuid4().hex}", filesystem=fs)
+        src = _tree(tmp_path / "src", {"a.txt": "a", "b.txt": "b"})
+        store.put(str(src), "out")
+        fs.rm(f"{store.base_uri}/out/a.txt")
+
+        ref = store.put(str(src), "out")
+        assert ref.metadata == {"transferred": 1, "deleted": 0, "unchanged": 1}
+        store.get("out", str(tmp_path / "dest"))
+        assert _files(tmp_path / "dest") == _files(src)
+
+
+class TestMerkleDigests:
+    def test_root_depends_on_content_and_names_only(self, tmp_path):
+        one = _tree(tmp_path / "one", {"a.txt": "a", "d/b.txt": "b", "d/e/c.txt": "c"})
+        two = _tree(tmp_path / "two", {"d/e/c.txt": "c", "a.txt": "a", "d/b.txt": "b"})
+        os.utime(two / "a.txt", ns=(5, 5))
+        assert dirsync.directory_digest(one) == dirsync.directory_digest(two)
+
+        (two / "d" / "e" / "c.txt").write_text("C")
+        assert dirsync.directory_digest(one) != dirsync.directory_digest(two)
+        (two / "d" / "e" / "c.txt").write_text("c")
+        (two / "d" / "e" / "c.txt").rename(two / "d" / "e" / "renamed.txt")
+        assert dirsync.directory_digest(one) != dirsync.directory_digest(two)
+
+    def test_subtree_digests_are_isolated(self, tmp_path):
+        src = _tree(tmp_path / "src", {"x/1": "1", "y/2": "2"})
+        before = dirsync.merkle_tree(dirsync.scan_directory(src))
+        (src / "y" / "2").write_text("changed")
+        after = dirsync.merkle_tree(dirsync.scan_directory(src))
+        assert before["x"] == after["x"]
+        assert before["y"] != after["y"]
+        assert before[""] != after[""]
+
+    def test_parallel_scan_matches_serial(self, tmp_path):
+        src = _tree(tmp_path / "src", {f"d{i % 3}/f{i}": str(i) * 1000 for i in range(30)})
+        assert dirsync.scan_directory(src, max_workers=4) == dirsync.scan_directory(src, max_workers=1)
+
+    def test_stores_agree_on_directory_digest(self, tmp_path):
+        src = _tree(tmp_path / "src", {"a.txt": "a", "sub/b.txt": "b"})
+        expected = dirsync.directory_digest(src)
+        plain = LocalArtifactStore(tmp_path / "plain").put(str(src), "out")
+        cas = LocalArtifactStore(tmp_path / "cas", cas=True).put(str(src), "out")
+        assert plain.digest == cas.digest == expected
+        stored = dirsync.read_local_manifest(tmp_path / "plain" / "out")
+        payload = (tmp_path / "plain" / "out" / dirsync.MANIFEST_NAME).read_text()
+        assert f'"root": "{expected}"' in payload
+        assert dirsync.merkle_root(stored) == expected
+
+        pytest.importorskip("fsspec")
+        from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+        remote = FsspecArtifactStore(f"memory://merkle-{uuid.uuid4().hex}")
+        assert remote.put(str(src), "out").digest == expected
+
+    def test_matching_local_copy_is_not_rescanned_or_rewritten(self, tmp_path, monkeypatch):
+        store = LocalArtifactStore(tmp_path / "store")
+        store.put(str(_tree(tmp_path / "src", {"a": "1", "b/c": "2"})), "out")
+        dest = tmp_path / "dest"
+        store.get("out", str(dest))
+        state = dirsync.download_manifest_path(dest)
+        mtime = state.stat().st_mtime_ns
+
+        monkeypatch.setattr(dirsync, "file_digest", lambda path: pytest.fail("re-hashed"))
+        fetched = []
+        plan = dirsync.sync_download(
+            dest,
+            dirsync.read_local_manifest(tmp_path / "store" / "out"),
+            lambda rel, target: fetched.append(rel),
+        )
+        assert fetched == [] and plan.transfer == []
+        assert state.stat().st_mtime_ns == mtime
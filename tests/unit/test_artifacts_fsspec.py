@@ -0,0 +1,129 @@
+"""Unit tests for FsspecArtifactStore transfers against in-memory filesystems."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+fsspec = pytest.importorskip("fsspec")
+from fsspec.implementations.memory import MemoryFileSystem  # noqa: E402
+
+from scalable.artifacts import fsspec_store  # noqa: E402
+from scalable.artifacts.base import ArtifactKind, ArtifactStore  # noqa: E402
+from scalable.artifacts.fsspec_store import FsspecArtifactStore  # noqa: E402
+
+
+class MultipartMemoryFileSystem(MemoryFileSystem):
+    """Memory filesystem with an object-store style ``merge`` (like S3/GCS)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.merged: list[tuple[str, list[str]]] = []
+        self.part_writes = 0
+
+    def pipe_file(self, path, value, **kwargs):
+        if ".parts-" in path:
+            self.part_writes += 1
+        return super().pipe_file(path, value, **kwargs)
+
+    def merge(self, path, paths, **kwargs):
+        self.merged.append((path, list(paths)))
+        self.pipe_file(path, b"".join(self.cat_file(p) for p in paths))
+
+
+def _uri() -> str:
+    return f"memory://scalable-test-{uuid.uuid4().hex}"
+
+
+def _payload(tmp_path: Path, size: int) -> Path:
+    path = tmp_path / "big.bin"
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_protocol_conformance():
+    assert isinstance(FsspecArtifactStore(_uri()), ArtifactStore)
+
+
+def test_streamed_put_and_get_file(tmp_path):
+    store = FsspecArtifactStore(_uri(), part_size=1024)
+    src = _payload(tmp_path, 10_000)
+
+    ref = store.put(str(src), "data/big.bin")
+    assert ref.kind == ArtifactKind.FILE
+    assert ref.size_bytes == 10_000
+    assert ref.digest == hashlib.sha256(src.read_bytes()).hexdigest()
+    assert store.exists("data/big.bin")
+
+    dest = Path(store.get("data/big.bin", str(tmp_path / "out" / "big.bin")))
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_multipart_upload_uses_merge_and_cleans_parts(tmp_path):
+    fs = MultipartMemoryFileSystem(skip_instance_cache=True)
+    store = FsspecArtifactStore(_uri(), part_size=1000, max_concurrency=3, filesystem=fs)
+    src = _payload(tmp_path, 4500)
+
+    ref = store.put(str(src), "big.bin")
+    assert ref.digest == hashlib.sha256(src.read_bytes()).hexdigest()
+    assert fs.part_writes == 5
+    assert len(fs.merged) == 1 and len(fs.merged[0][1]) == 5
+    assert store.list_artifacts() == ["big.bin"]
+
+    dest = Path(store.get("big.bin", str(tmp_path / "copy.bin")))
+    assert dest.read_bytes() == src.read_bytes()
+
+
+class ComposeMemoryFileSystem(MultipartMemoryFileSystem):
+    """Multipart filesystem enforcing object-store ``merge`` limits."""
+
+    max_sources = 32
+    min_part = 1000
+
+    def merge(self, path, paths, **kwargs):
+        assert len(paths) <= self.max_sources
+        assert all(self.size(p) >= self.min_part for p in paths[:-1])
+        super().merge(path, paths, **kwargs)
+
+
+def test_multipart_upload_respects_backend_merge_limits(tmp_path, monkeypatch):
+    monkeypatch.setitem(fsspec_store._MERGE_LIMITS, "memory", (1000, 32))
+    fs = ComposeMemoryFileSystem(skip_instance_cache=True)
+    store = FsspecArtifactStore(_uri(), part_size=100, max_concurrency=4, filesystem=fs)
+    src = _payload(tmp_path, 70_500)
+
+    ref = store.put(str(src), "big.bin")
+    assert ref.digest == hashlib.sha256(src.read_bytes()).hexdigest()
+    # part_size is raised to the 1000-byte minimum: 71 parts, composed as
+    # 32 + 32 + 7 into three intermediates and then into the final object.
+    assert [len(paths) for _, paths in fs.merged] == [32, 32, 7, 3]
+    assert store.list_artifacts() == ["big.bin"]
+    assert Path(store.get("big.bin", str(tmp_path / "copy.bin"))).read_bytes() == src.read_bytes()
+
+
+def test_directory_transfer_with_worker_pool(tmp_path):
+    store = FsspecArtifactStore(_uri(), part_size=64, max_concurrency=4)
+    src = tmp_path / "outputs"
+    for index in range(12):
+        sub = src / f"group{index % 3}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"f{index}.txt").write_text(f"value {index}\n" * (index + 1))
+
+    ref = store.put(str(src), "runs/out")
+    assert ref.kind == ArtifactKind.DIRECTORY
+    assert ref.size_bytes == sum(f.stat().st_size for f in src.rglob("*") if f.is_file())
+
+    dest = Path(store.get("runs/out", str(tmp_path / "restored")))
+    for original in src.rglob("*.txt"):
+        assert (dest / original.relative_to(src)).read_text() == original.read_text()
+
+
+def test_rejects_invalid_transfer_settings():
+    with pytest.raises(ValueError, match="part_size"):
+        FsspecArtifactStore(_uri(), part_size=0)
+    with pytest.raises(ValueError, match="max_concurrency"):
+        FsspecArtifactStore(_uri(), max_concurrency=0)
@@ -0,0 +1,246 @@
+"""Unit tests for mark-and-sweep artifact garbage collection."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts.cas import ContentStore
+from scalable.artifacts.dirsync import MANIFEST_NAME
+from scalable.artifacts.gc import collect_garbage, location_key
+from scalable.artifacts.local import LocalArtifactStore
+from scalable.cli.main import main
+
+LATER = time.time() + 7 * 24 * 3600
+
+
+def _seed_run(runs_dir: Path, name: str, locations: list[str]) -> None:
+    run_dir = runs_dir / name
+    run_dir.mkdir(parents=True)
+    rows = [
+        {"task_name": "t", "component": "c", "artifact_name": "a", "location": loc}
+        for loc in locations
+    ]
+    (run_dir / "artifacts.jsonl").write_text(
+        "".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8"
+    )
+
+
+def _populate(store, tmp_path: Path) -> None:
+    payload = tmp_path / "payload.bin"
+    payload.write_bytes(b"x" * 100)
+    outdir = tmp_path / "outdir"
+    (outdir / "sub").mkdir(parents=True)
+    (outdir / "a.txt").write_text("a")
+    (outdir / "sub" / "b.txt").write_text("b")
+    store.put(str(payload), "runs/old/result.bin")
+    store.put(str(payload), "runs/new/result.bin")
+    store.put(str(outdir), "runs/new/outdir")
+    store.put(str(payload), "cache/12/1234")
+    store.put(str(payload), "cache/99/9999")
+
+
+def _local_cache(tmp_path: Path, keys: list[int]) -> Path:
+    from diskcache import Cache
+
+    cache_dir = tmp_path / "cache"
+    with Cache(directory=str(cache_dir)) as cache:
+        for key in keys:
+            cache[key] = "value"
+    return cache_dir
+
+
+@pytest.fixture(params=["local", "cas", "fsspec"])
+def store(request, tmp_path):
+    if request.param == "fsspec":
+        pytest.importorskip("fsspec")
+        from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+        store = FsspecArtifactStore(f"memory://gc-{uuid.uuid4().hex}")
+    else:
+        store = LocalArtifactStore(tmp_path / "store", cas=request.param == "cas")
+    _populate(store, tmp_path)
+    return store
+
+
+def _locations(store, keys: list[str]) -> list[str]:
+    root = getattr(store, "root", None)
+    if root is not None:
+        return [(root / key).resolve().as_uri() for key in keys]
+    return [f"{store.base_uri}/{key}" for key in keys]
+
+
+def test_dry_run_reports_without_deleting(store, tmp_path):
+    runs_dir = tmp_path / "runs"
+    _seed_run(runs_dir, "run-1", _locations(store, ["runs/new/result.bin", "runs/new/outdir"]))
+    cache_dir = _local_cache(tmp_path, [1234])
+    before = sorted(store.iter_artifacts())
+
+    report = collect_garbage(store, runs_dir=runs_dir, cache_dir=cache_dir, now=LATER)
+
+    assert report.dry_run
+    assert sorted(report.deleted) == ["cache/99/9999", "runs/old/result.bin"]
+    assert report.bytes_reclaimed == 200
+    assert report.live_cache_keys == 1
+    assert sorted(store.iter_artifacts()) == before
+
+
+def test_delete_keeps_referenced_directories_and_cache_entries(store, tmp_path):
+    runs_dir = tmp_path / "runs"
+    _seed_run(runs_dir, "run-1", _locations(store, ["runs/new/result.bin", "runs/new/outdir"]))
+    cache_dir = _local_cache(tmp_path, [1234])
+
+    report = collect_garbage(
+        store, runs_dir=runs_dir, cache_dir=cache_dir, dry_run=False, batch_size=1, now=LATER
+    )
+
+    assert report.keys_deleted == 2 and not report.errors
+    remaining = set(store.iter_artifacts())
+    assert "runs/old/result.bin" not in remaining
+    assert "cache/99/9999" not in remaining
+    assert {"runs/new/result.bin", "cache/12/1234"} <= remaining
+    out = tmp_path / "restored"
+    store.get("runs/new/outdir", str(out))
+    assert (out / "sub" / "b.txt").read_text() == "b"
+
+
+def test_swept_directory_can_be_published_again(store, tmp_path):
+    src = tmp_path / "stale"
+    src.mkdir()
+    (src / "a.csv").write_text("a")
+    (src / "b.csv").write_text("b")
+    store.put(str(src), "runs/stale")
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+
+    report = collect_garbage(store, runs_dir=runs_dir, dry_run=False, now=LATER)
+
+    assert not report.errors
+    if getattr(store, "_cas", None) is None:
+        assert f"runs/stale/{MANIFEST_NAME}" in report.deleted
+    assert not store.exists("runs/stale")
+    store.put(str(src), "runs/stale")
+    out = tmp_path / "restored"
+    store.get("runs/stale", str(out))
+    assert (out / "a.csv").read_text() == "a"
+    assert (out / "b.csv").read_text() == "b"
+
+
+def test_grace_period_protects_recent_objects(store, tmp_path):
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+
+    report = collect_garbage(store, runs_dir=runs_dir, dry_run=False)
+
+    assert report.keys_deleted == 0
+    assert report.keys_recent == report.keys_scanned
+    assert store.exists("runs/old/result.bin")
+
+
+def test_keep_last_retains_only_newest_runs(tmp_path):
+    store = LocalArtifactStore(tmp_path / "store")
+    _populate(store, tmp_path)
+    runs_dir = tmp_path / "runs"
+    _seed_run(runs_dir, "run-1", _locations(store, ["runs/old/result.bin"]))
+    _seed_run(runs_dir, "run-2", _locations(store, ["runs/new"]))
+
+    report = collect_garbage(store, runs_dir=runs_dir, keep_last=1, prefix="runs/", now=LATER)
+
+    assert report.runs_scanned == 1
+    assert report.deleted == ["runs/old/result.bin"]
+
+
+def test_cas_blobs_are_swept_after_refs(tmp_path):
+    store = LocalArtifactStore(tmp_path / "store", cas=True)
+    unique = tmp_path / "unique.bin"
+    unique.write_bytes(b"only-here" * 10)
+    shared = tmp_path / "shared.bin"
+    shared.write_bytes(b"shared")
+    store.put(str(unique), "runs/old/unique.bin")
+    store.put(str(shared), "runs/old/shared.bin")
+    store.put(str(shared), "runs/new/shared.bin")
+    runs_dir = tmp_path / "runs"
+    _seed_run(runs_dir, "run-1", _locations(store, ["runs/new/shared.bin"]))
+
+    report = collect_garbage(store, runs_dir=runs_dir, dry_run=False, now=LATER)
+
+    assert report.keys_deleted == 2
+    assert report.blobs_deleted == 1
+    assert report.blob_bytes_reclaimed == 90
+    out = tmp_path / "out.bin"
+    store.get("runs/new/shared.bin", str(out))
+    assert out.read_bytes() == b"shared"
+
+
+def test_blob_sweep_spares_blobs_of_an_in_flight_put(tmp_path):
+    store = LocalArtifactStore(tmp_path / "store", cas=True)
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+    # A concurrent put stores its blobs first and writes the manifest last.
+    cas = ContentStore(tmp_path / "store")
+    fresh = tmp_path / "fresh.bin"
+    fresh.write_bytes(b"fresh")
+    fresh_digest, _, _ = cas.add_blob(fresh)
+    # A dedup hit refreshes an old unreferenced blob instead of skipping it.
+    reused = tmp_path / "reused.bin"
+    reused.write_bytes(b"reused")
+    reused_digest, _, _ = cas.add_blob(reused)
+    week_ago = time.time() - 7 * 24 * 3600
+    os.utime(cas.blob_path(reused_digest), (week_ago, week_ago))
+    assert cas.add_blob(reused)[2] is False
+
+    report = collect_garbage(store, runs_dir=runs_dir, dry_run=False)
+
+    assert report.blobs_deleted == 0
+    assert cas.blob_path(fresh_digest).exists()
+    assert cas.blob_path(reused_digest).exists()
+    assert collect_garbage(store, runs_dir=runs_dir, dry_run=False, now=LATER).blobs_deleted == 2
+
+
+def test_location_key_ignores_foreign_locations(tmp_path):
+    store = LocalArtifactStore(tmp_path / "store")
+    assert location_key(store, "s3://bucket/x") is None
+    assert location_key(store, str(tmp_path / "elsewhere" / "x")) is None
+    assert location_key(store, (tmp_path / "store" / "a" / "b").as_uri()) == "a/b"
+    assert location_key(store, "a/b") == "a/b"
+
+
+def test_cli_gc_dry_run_then_delete(tmp_path, capsys):
+    store = LocalArtifactStore(tmp_path / "store")
+    _populate(store, tmp_path)
+    runs_dir = tmp_path / "runs"
+    _seed_run(runs_dir, "run-1", _locations(store, ["runs/new", "cache"]))
+    args = [
+        "gc",
+        str(tmp_path / "store"),
+        "--runs-dir",
+        str(runs_dir),
+        "--cache-dir",
+        str(tmp_path / "no-cache"),
+        "--grace-hours",
+        "0",
+        "--prefix",
+        "runs/",
+    ]
+
+    assert main([*args, "--format", "json"]) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["dry_run"] is True
+    assert payload["deleted"] == ["runs/old/result.bin"]
+    assert store.exists("runs/old/result.bin")
+
+    assert main([*args, "--delete"]) == 0
+    out = capsys.readouterr().out
+    assert "deleted: 1 keys, 100 B" in out
+    assert not store.exists("runs/old/result.bin")
+    assert store.exists("runs/new/result.bin")
+
+
+def test_cli_gc_requires_runs_dir(tmp_path, capsys):
+    assert main(["gc", str(tmp_path / "store"), "--runs-dir", str(tmp_path / "missing")]) == 1
+    assert "runs directory not found" in capsys.readouterr().err
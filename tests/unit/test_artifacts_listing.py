@@ -0,0 +1,166 @@
+"""Unit tests for paginated, prefix-ordered artifact listing."""
+
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts import ArtifactPage, PaginatedArtifactStore
+from scalable.artifacts.listing import KeyIndex, decode_token, walk_keys
+from scalable.artifacts.local import LocalArtifactStore
+
+KEYS = [
+    "a.txt",
+    "a/x",
+    "a0",
+    "cache/ab/1",
+    "cache/ab/2",
+    "cache/ac/1",
+    "cache/b/1",
+    "cache/top",
+    "z/deep/er/file",
+]
+
+
+def _expected(prefix: str = "", delimiter: str | None = None, start_after: str | None = None):
+    out: list[str] = []
+    for key in sorted(KEYS):
+        if not key.startswith(prefix):
+            continue
+        if delimiter is not None:
+            cut = key.find(delimiter, len(prefix))
+            if cut >= 0:
+                key = key[: cut + 1]
+        if (start_after is None or key > start_after) and key not in out:
+            out.append(key)
+    return out
+
+
+def _populate(store, tmp_path: Path) -> None:
+    src = tmp_path / "payload.txt"
+    src.write_text("x")
+    for key in KEYS:
+        store.put(str(src), key)
+
+
+@pytest.fixture(params=["walk", "index", "cas", "fsspec"])
+def store(request, tmp_path):
+    if request.param == "fsspec":
+        pytest.importorskip("fsspec")
+        from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+        store = FsspecArtifactStore(f"memory://listing-{uuid.uuid4().hex}")
+    else:
+        store = LocalArtifactStore(
+            tmp_path / "store",
+            index=request.param == "index",
+            cas=request.param == "cas",
+        )
+    _populate(store, tmp_path)
+    return store
+
+
+@pytest.mark.parametrize("prefix", ["", "a", "cache/", "cache/a", "cache/ab/", "missing/", "z/d"])
+@pytest.mark.parametrize("delimiter", [None, "/"])
+def test_iter_matches_sorted_prefix_scan(store, prefix, delimiter):
+    assert isinstance(store, PaginatedArtifactStore)
+    assert list(store.iter_artifacts(prefix, delimiter=delimiter)) == _expected(prefix, delimiter)
+
+
+@pytest.mark.parametrize("delimiter", [None, "/"])
+def test_pages_cover_listing_exactly_once(store, delimiter):
+    collected: list[str] = []
+    token = None
+    pages = 0
+    while True:
+        page = store.list_page(delimiter=delimiter, page_size=2, token=token)
+        assert isinstance(page, ArtifactPage)
+        assert len(page.keys) <= 2
+        collected.extend(page.keys)
+        pages += 1
+        token = page.next_token
+        if token is None:
+            break
+    assert collected == _expected(delimiter=delimiter)
+    assert pages == -(-len(collected) // 2)
+
+
+def test_start_after_skips_subtrees(store):
+    assert list(store.iter_artifacts(start_after="cache/ab/1")) == _expected(start_after="cache/ab/1")
+    assert list(store.iter_artifacts("cache/", delimiter="/", start_after="cache/ab/")) == [
+        "cache/ac/",
+        "cache/b/",
+        "cache/top",
+    ]
+
+
+def test_exists_many(store):
+    assert store.exists_many(["a0", "cache/ab/2", "nope", "cache/zz/1"]) == [True, True, False, False]
+
+
+def test_walk_prunes_directories_outside_prefix():
+    tree = {"": [("a", True), ("b", True)], "a": [("1", False)], "b": [("2", False)]}
+    visited: list[str] = []
+
+    def listdir(rel_dir):
+        visited.append(rel_dir)
+        return tree[rel_dir]
+
+    assert list(walk_keys(listdir, "b")) == ["b/2"]
+    assert visited == ["", "b"]
+
+
+def test_invalid_delimiter_and_token(tmp_path):
+    store = LocalArtifactStore(tmp_path)
+    with pytest.raises(ValueError, match="delimiter"):
+        list(store.iter_artifacts(delimiter=":"))
+    with pytest.raises(ValueError, match="token"):
+        decode_token("@@@")
+
+
+def test_index_is_maintained_and_rebuilt(tmp_path):
+    src = tmp_path / "payload.txt"
+    src.write_text("x")
+    plain = LocalArtifactStore(tmp_path / "store")
+    plain.put(str(src), "pre/existing")
+
+    store = LocalArtifactStore(tmp_path / "store", index=True)
+    assert store.indexed
+    assert list(store.iter_artifacts()) == ["pre/existing"]  # built on first use
+
+    outputs = tmp_path / "outputs"
+    (outputs / "sub").mkdir(parents=True)
+    (outputs / "sub" / "f").write_text("1")
+    (outputs / "g").write_text("2")
+    store.put(str(outputs), "run")
+    (outputs / "g").unlink()
+    store.put(str(outputs), "run")
+    assert list(store.iter_artifacts("run")) == ["run/sub/f"]
+
+    (tmp_path / "store" / "manual").write_text("added behind the store's back")
+    assert store.rebuild_index() == 3
+    assert store.exists_many(["manual", "run/g"]) == [True, False]
+    assert store.list_artifacts() == sorted(["manual", "pre/existing", "run/sub/f"])
+
+
+def test_streamed_writes_are_indexed(tmp_path):
+    store = LocalArtifactStore(tmp_path / "store", index=True)
+    with store.open("cache/ab/abcdef", "wb") as fh:
+        fh.write(b"payload")
+    with pytest.raises(RuntimeError), store.open("cache/ab/failed", "wb") as fh:
+        fh.write(b"partial")
+        raise RuntimeError("interrupted")
+
+    assert list(store.iter_artifacts("cache")) == ["cache/ab/abcdef"]
+    assert store.exists_many(["cache/ab/abcdef", "cache/ab/failed"]) == [True, False]
+
+
+def test_key_index_delimiter_seek(tmp_path):
+    index = KeyIndex(tmp_path / "keys.sqlite")
+    index.add([f"cache/{i:02x}/{j}" for i in range(40) for j in range(60)])
+    assert len(index) == 2400
+    prefixes = list(index.iter_keys("cache/", delimiter="/"))
+    assert prefixes == [f"cache/{i:02x}/" for i in range(40)]
+    assert list(index.iter_keys("cache/0a/"))[:2] == ["cache/0a/0", "cache/0a/1"]
@@ -0,0 +1,176 @@
+"""Unit tests for the node-local read-through artifact cache."""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts.node_cache import NodeCache, get_node_cache, version_token
+
+fsspec = pytest.importorskip("fsspec")
+from fsspec.implementations.memory import MemoryFileSystem  # noqa: E402
+
+from scalable.artifacts.fsspec_store import FsspecArtifactStore  # noqa: E402
+
+
+class CountingMemoryFileSystem(MemoryFileSystem):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.downloads = 0
+
+    def get_file(self, rpath, lpath, **kwargs):
+        self.downloads += 1
+        return super().get_file(rpath, lpath, **kwargs)
+
+
+def _store(tmp_path: Path, **kwargs) -> tuple[FsspecArtifactStore, CountingMemoryFileSystem]:
+    fs = CountingMemoryFileSystem(skip_instance_cache=True)
+    cache = NodeCache(tmp_path / "node-cache", **kwargs)
+    store = FsspecArtifactStore(
+        f"memory://scalable-node-{uuid.uuid4().hex}", filesystem=fs, node_cache=cache
+    )
+    return store, fs
+
+
+def test_version_token_ignores_unrelated_fields():
+    token = version_token({"name": "x", "size": 3, "ETag": '"abc"', "type": "file"})
+    assert token == version_token({"size": 3, "ETag": '"abc"', "name": "other"})
+    assert token != version_token({"size": 3, "ETag": '"def"'})
+
+
+def test_repeated_get_downloads_once(tmp_path):
+    store, fs = _store(tmp_path)
+    src = tmp_path / "input.nc"
+    src.write_bytes(b"dataset" * 100)
+    store.put(str(src), "inputs/input.nc")
+
+    for index in range(3):
+        dest = Path(store.get("inputs/input.nc", str(tmp_path / f"w{index}" / "input.nc")))
+        assert dest.read_bytes() == src.read_bytes()
+    assert fs.downloads == 1
+    assert (store.node_cache.hits, store.node_cache.misses) == (2, 1)
+
+
+def test_changed_object_is_refetched(tmp_path):
+    store, fs = _store(tmp_path)
+    src = tmp_path / "input.csv"
+    src.write_text("v1\n")
+    store.put(str(src), "input.csv")
+    store.get("input.csv", str(tmp_path / "a.csv"))
+
+    src.write_text("version 2\n")
+    store.put(str(src), "input.csv")
+    assert Path(store.get("input.csv", str(tmp_path / "b.csv"))).read_text() == "version 2\n"
+    assert fs.downloads == 2
+
+
+def test_directory_get_reads_through_cache(tmp_path):
+    store, fs = _store(tmp_path)
+    src = tmp_path / "db"
+    src.mkdir()
+    for index in range(3):
+        (src / f"part{index}.dat").write_bytes(bytes([index]) * 10)
+    store.put(str(src), "db")
+
+    store.get("db", str(tmp_path / "one"))
+    store.get("db", str(tmp_path / "two"))
+    assert fs.downloads == 3
+    assert (tmp_path / "two" / "part2.dat").read_bytes() == b"\x02" * 10
+
+
+def test_lru_eviction_respects_budget(tmp_path):
+    cache = NodeCache(tmp_path / "cache", max_bytes=250)
+
+    def _writer(payload: bytes):
+        return lambda path: path.write_bytes(payload)
+
+    for index in range(4):
+        cache.fetch(f"remote/{index}", "v1", tmp_path / f"d{index}", _writer(b"x" * 100))
+        time.sleep(0.01)
+    assert cache.size_bytes() <= 250
+    assert not cache.entry_path("remote/0", "v1").exists()
+    assert cache.entry_path("remote/3", "v1").exists()
+
+
+def test_eviction_never_removes_an_entry_mid_fetch(tmp_path):
+    # A zero budget makes every evict() pass try to drop the shared entry.
+    root = tmp_path / "cache"
+    errors: list[BaseException] = []
+    stop = threading.Event()
+
+    def _fetcher(index: int) -> None:
+        cache = NodeCache(root, max_bytes=0)
+        try:
+            for n in range(100):
+                dest = tmp_path / f"fetcher{index}" / f"{n}.dat"
+                cache.fetch("remote/input", "v1", dest, lambda path: path.write_bytes(b"x" * 4096))
+                assert dest.read_bytes() == b"x" * 4096
+        except BaseException as exc:
+            errors.append(exc)
+
+    def _evictor() -> None:
+        cache = NodeCache(root, max_bytes=0)
+        while not stop.is_set():
+            cache.evict()
+
+    evictor = threading.Thread(target=_evictor)
+    fetchers = [threading.Thread(target=_fetcher, args=(index,)) for index in range(2)]
+    evictor.start()
+    for thread in fetchers:
+        thread.start()
+    for thread in fetchers:
+        thread.join(60)
+    stop.set()
+    evictor.join(60)
+    assert errors == []
+
+
+def _concurrent_fetch(root: str, dest: str, marker_dir: str) -> None:
+    cache = NodeCache(root)
+
+    def _download(path: Path) -> None:
+        (Path(marker_dir) / uuid.uuid4().hex).touch()
+        time.sleep(0.2)
+        path.write_bytes(b"shared")
+
+    cache.fetch("s3://bucket/big", "v1", Path(dest), _download)
+
+
+def test_concurrent_processes_download_once(tmp_path):
+    markers = tmp_path / "markers"
+    markers.mkdir()
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    procs = [
+        ctx.Process(
+            target=_concurrent_fetch,
+            args=(str(tmp_path / "cache"), str(tmp_path / f"out{i}"), str(markers)),
+        )
+        for i in range(3)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+        assert proc.exitcode == 0
+    assert len(list(markers.iterdir())) == 1
+    assert all((tmp_path / f"out{i}").read_bytes() == b"shared" for i in range(3))
+
+
+def test_factory_attaches_configured_cache(tmp_path, monkeypatch):
+    from scalable import common
+
+    monkeypatch.setattr(common.settings, "artifact_cache_dir", str(tmp_path / "nc"))
+    monkeypatch.setattr(common.settings, "artifact_cache_size_gb", 1.0)
+    cache = get_node_cache()
+    assert cache is not None and cache.max_bytes == 1024**3
+
+    from scalable.artifacts.factory import build_artifact_store
+
+    store = build_artifact_store(f"memory://scalable-node-{uuid.uuid4().hex}")
+    assert store.node_cache is not None
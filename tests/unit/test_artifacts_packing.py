@@ -0,0 +1,146 @@
+"""Unit tests for packed directory artifacts."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scalable.artifacts import dirsync, packing
+from scalable.artifacts.local import LocalArtifactStore
+
+
+def _outputs(root: Path, count: int = 50) -> Path:
+    for i in range(count):
+        path = root / f"region{i % 5}" / f"out{i}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("year,value\n" + "".join(f"{y},{i * y}\n" for y in range(2000, 2050)))
+    (root / "run.log").write_text("done\n")
+    (root / "run.log").chmod(0o600)
+    return root
+
+
+def _files(root: Path) -> dict[str, bytes]:
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+@pytest.fixture(params=["local", "fsspec"])
+def store(request, tmp_path):
+    if request.param == "local":
+        return LocalArtifactStore(tmp_path / "store")
+    pytest.importorskip("fsspec")
+    from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+    return FsspecArtifactStore(f"memory://pack-{uuid.uuid4().hex}", part_size=4096)
+
+
+@pytest.mark.parametrize("codec", ["gzip", "none"])
+def test_packed_round_trip(store, tmp_path, codec):
+    src = _outputs(tmp_path / "src")
+    ref = store.put(str(src), "runs/1", pack=codec)
+
+    assert ref.metadata["packed"] is True
+    assert ref.metadata["codec"] == codec
+    assert ref.metadata["members"] == 51
+    assert ref.digest == dirsync.directory_digest(src)
+    assert list(store.iter_artifacts("runs/1/")) == ["runs/1/pack-index.json", "runs/1/pack.tar"]
+
+    dest = tmp_path / "dest"
+    store.get("runs/1", str(dest))
+    assert _files(dest) == _files(src)
+    assert (dest / "run.log").stat().st_mode & 0o777 == 0o600
+
+
+def test_member_extraction_uses_one_ranged_read(tmp_path):
+    src = _outputs(tmp_path / "src")
+    store = LocalArtifactStore(tmp_path / "store")
+    store.put(str(src), "runs/1", pack=True)
+
+    reads = []
+    real = LocalArtifactStore._read_range
+
+    def _spy(path, start, end):
+        reads.append((start, end))
+        return real(path, start, end)
+
+    store._read_range = _spy  # type: ignore[method-assign]
+    dest = tmp_path / "one.csv"
+    store.get("runs/1", str(dest), member="region3/out13.csv")
+    assert dest.read_bytes() == (src / "region3" / "out13.csv").read_bytes()
+    assert len(reads) == 1
+    with pytest.raises(FileNotFoundError, match="member not found"):
+        store.get("runs/1", str(tmp_path / "x"), member="missing.csv")
+
+
+def test_fsspec_member_extraction(tmp_path):
+    pytest.importorskip("fsspec")
+    from scalable.artifacts.fsspec_store import FsspecArtifactStore
+
+    store = FsspecArtifactStore(f"memory://pack-{uuid.uuid4().hex}")
+    src = _outputs(tmp_path / "src")
+    store.put(str(src), "runs/1", pack="gzip")
+    dest = tmp_path / "one.csv"
+    store.get("runs/1", str(dest), member="region0/out0.csv")
+    assert dest.read_bytes() == (src / "region0" / "out0.csv").read_bytes()
+
+
+def test_member_of_unpacked_directory(store, tmp_path):
+    src = _outputs(tmp_path / "src", count=3)
+    store.put(str(src), "plain")
+    dest = tmp_path / "one.csv"
+    store.get("plain", str(dest), member="region1/out1.csv")
+    assert dest.read_bytes() == (src / "region1" / "out1.csv").read_bytes()
+
+
+def test_member_of_cas_directory(tmp_path):
+    src = _outputs(tmp_path / "src", count=3)
+    store = LocalArtifactStore(tmp_path / "store", cas=True)
+    store.put(str(src), "out")
+    dest = tmp_path / "one.csv"
+    store.get("out", str(dest), member="region2/out2.csv")
+    assert dest.read_bytes() == (src / "region2" / "out2.csv").read_bytes()
+    with pytest.raises(ValueError, match="CAS"):
+        store.put(str(src), "packed", pack=True)
+
+
+def test_pack_is_a_standard_tar(tmp_path):
+    src = _outputs(tmp_path / "src", count=2)
+    entries = dirsync.scan_directory(src)
+    buf = io.BytesIO()
+    index = packing.write_pack(src, buf, codec="gzip", entries=entries)
+    buf.seek(0)
+    with tarfile.open(fileobj=buf) as tar:
+        names = sorted(tar.getnames())
+    assert names == sorted(f"{rel}.gz" for rel in entries)
+    raw = buf.getvalue()
+    member = index["members"]["run.log"]
+    assert raw[member["offset"] : member["offset"] + 2] == b"\x1f\x8b"  # gzip magic
+
+
+def test_repack_replaces_previous_content(store, tmp_path):
+    src = _outputs(tmp_path / "src", count=4)
+    store.put(str(src), "runs/1")
+    (src / "run.log").unlink()
+    store.put(str(src), "runs/1", pack=True)
+    dest = tmp_path / "dest"
+    store.get("runs/1", str(dest))
+    assert _files(dest) == _files(src)
+
+
+def test_unknown_codec_rejected():
+    with pytest.raises(ValueError, match="unknown pack codec"):
+        packing.resolve_codec("brotli")
+
+
+def test_auto_codec_falls_back_to_gzip():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        assert packing.resolve_codec(True) == "gzip"
+        with pytest.raises(ImportError, match="zstandard"):
+            packing.resolve_codec("zstd")
+    else:
+        assert packing.resolve_codec(True) == "zstd"
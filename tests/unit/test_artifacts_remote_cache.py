@@ -0,0 +1,138 @@
+"""Unit tests for the streaming RemoteCacheBackend."""
+
+from __future__ import annotations
+
+import importlib.util
+import pickle
+import uuid
+
+import pytest
+
+fsspec = pytest.importorskip("fsspec")
+from fsspec.implementations.memory import MemoryFileSystem  # noqa: E402
+
+from scalable.artifacts.cache import RemoteCacheBackend  # noqa: E402
+from scalable.artifacts.fsspec_store import FsspecArtifactStore  # noqa: E402
+
+
+class CountingMemoryFileSystem(MemoryFileSystem):
+    """Memory filesystem that counts metadata and read calls."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls: list[str] = []
+
+    def exists(self, path, **kwargs):
+        self.calls.append("exists")
+        return super().exists(path, **kwargs)
+
+    def info(self, path, **kwargs):
+        self.calls.append("info")
+        return super().info(path, **kwargs)
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        self.calls.append("cat_file")
+        return super().cat_file(path, start=start, end=end, **kwargs)
+
+
+def _uri() -> str:
+    return f"memory://scalable-cache-{uuid.uuid4().hex}"
+
+
+def _counting_backend(**kwargs) -> tuple[RemoteCacheBackend, CountingMemoryFileSystem]:
+    uri = _uri()
+    fs = CountingMemoryFileSystem(skip_instance_cache=True)
+    backend = RemoteCacheBackend(uri, **kwargs)
+    backend._store = FsspecArtifactStore(uri, filesystem=fs)
+    return backend, fs
+
+
+def test_round_trip_memory():
+    backend = RemoteCacheBackend(_uri())
+    value = {"a": list(range(100)), "b": "text"}
+    assert backend.put("abcdef", value) is True
+    assert backend.exists("abcdef")
+    assert backend.get("abcdef") == value
+
+
+def test_round_trip_local(tmp_path):
+    backend = RemoteCacheBackend(str(tmp_path / "cache-root"))
+    assert backend.put("0123ff", [1, 2, 3]) is True
+    assert backend.get("0123ff") == [1, 2, 3]
+    # No stray temporary files are left next to the entry.
+    files = [p.name for p in (tmp_path / "cache-root").rglob("*") if p.is_file()]
+    assert files == ["0123ff"]
+
+
+def test_miss_is_a_single_read():
+    backend, fs = _counting_backend()
+    assert backend.get("deadbeef") is None
+    assert fs.calls == ["cat_file"]
+
+
+def test_hit_is_a_single_read():
+    backend, fs = _counting_backend()
+    backend.put("beefcafe", {"x": 1})
+    fs.calls.clear()
+    assert backend.get("beefcafe") == {"x": 1}
+    assert fs.calls == ["cat_file"]
+
+
+def test_legacy_bare_pickle_entry_is_readable(tmp_path):
+    backend = RemoteCacheBackend(str(tmp_path))
+    entry = tmp_path / "cache" / "aa" / "aabbcc"
+    entry.parent.mkdir(parents=True)
+    entry.write_bytes(pickle.dumps({"legacy": True}))
+    assert backend.get("aabbcc") == {"legacy": True}
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    backend = RemoteCacheBackend(str(tmp_path))
+    entry = tmp_path / "cache" / "ee" / "eeff"
+    entry.parent.mkdir(parents=True)
+    entry.write_bytes(b"SCB1\x00not a pickle")
+    assert backend.get("eeff") is None
+
+
+def test_failed_put_publishes_nothing(tmp_path):
+    backend = RemoteCacheBackend(str(tmp_path))
+
+    class Unpicklable:
+        def __reduce__(self):
+            raise TypeError("nope")
+
+    assert backend.put("abcd", Unpicklable()) is False
+    assert not backend.exists("abcd")
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_compression_defaults_from_settings(monkeypatch):
+    from scalable.common import settings
+
+    monkeypatch.setattr(settings, "cache_remote_compression", "NONE")
+    assert RemoteCacheBackend(_uri()).compression == "none"
+
+
+def test_unknown_compression_rejected():
+    with pytest.raises(ValueError, match="unknown remote cache compression"):
+        RemoteCacheBackend(_uri(), compression="brotli")
+
+
+@pytest.mark.parametrize(("codec", "module"), [("zstd", "zstandard"), ("lz4", "lz4")])
+def test_missing_codec_raises_import_error(codec, module):
+    if importlib.util.find_spec(module) is not None:
+        pytest.skip(f"{module} is installed")
+    with pytest.raises(ImportError, match="scalable\\[cloud\\]"):
+        RemoteCacheBackend(_uri(), compression=codec)
+
+
+@pytest.mark.parametrize(("codec", "module"), [("zstd", "zstandard"), ("lz4", "lz4")])
+def test_compressed_round_trip(codec, module):
+    pytest.importorskip(module)
+    backend = RemoteCacheBackend(_uri(), compression=codec)
+    value = {"payload": b"x" * 100_000}
+    assert backend.put("c0ffee", value) is True
+    assert backend.get("c0ffee") == value
+    # An uncompressed reader detects the codec from the header.
+    reader = RemoteCacheBackend(backend.uri)
+    assert reader.get("c0ffee") == value
@@ -92,3 +92,42 @@ def test_cli_report_missing_selection_returns_error(tmp_path: Path, capsys) -> N
     assert code == 1
     assert "report failed" in captured.err
 
+
+
+def test_cli_report_follow_tails_live_summary_until_finished(tmp_path: Path, capsys) -> None:
+    import threading
+    import time
+
+    runs_dir = tmp_path / "runs"
+    run_dir = runs_dir / "run-20260519T120000Z-demo-aaaa1111"
+    run_dir.mkdir(parents=True)
+    summary_path = run_dir / "summary.json"
+
+    def _summary(status: str, succeeded: int) -> str:
+        return json.dumps(
+            {
+                "run": {"run_id": run_dir.name, "status": status},
+                "counts": {"tasks_succeeded": succeeded},
+                "live": {"updated_at": str(time.time())},
+            }
+        )
+
+    summary_path.write_text(_summary("running", 1), encoding="utf-8")
+
+    def _finish() -> None:
+        time.sleep(0.2)
+        summary_path.write_text(_summary("running", 1), encoding="utf-8")
+        time.sleep(0.2)
+        summary_path.write_text(_summary("completed", 2), encoding="utf-8")
+
+    writer = threading.Thread(target=_finish)
+    writer.start()
+    code = main(
+        ["report", "--runs-dir", str(runs_dir), "--latest", "--follow", "--interval", "0.1"]
+    )
+    writer.join()
+
+    out = capsys.readouterr().out
+    assert code == 0
+    assert out.count("run_id:") == 2
+    assert "status: completed" in out
@@ -319,3 +319,23 @@ def test_parse_manifest_rejects_task_invalid_types() -> None:
                 "tasks": {"run_gcam": {"component": "gcam", "outputs": ["dir"]}},
             }
         )
+
+    with pytest.raises(ManifestSchemaError, match="telemetry_sampling"):
+        parse_manifest(
+            {
+                "version": 1,
+                "project": {"name": "demo"},
+                "tasks": {"run_gcam": {"component": "gcam", "telemetry_sampling": "sometimes"}},
+            }
+        )
+
+
+def test_parse_manifest_accepts_task_telemetry_sampling() -> None:
+    manifest = parse_manifest(
+        {
+            "version": 1,
+            "project": {"name": "demo"},
+            "tasks": {"run_gcam": {"component": "gcam", "telemetry_sampling": "every_n:10"}},
+        }
+    )
+    assert manifest.tasks["run_gcam"].telemetry_sampling == "every_n:10"
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import json
+import time
+from types import SimpleNamespace
+
 import pytest
 
-from scalable.ml.adaptive_scaler import AdaptiveScaler, ScaleDecision
+from scalable.ml.adaptive_scaler import (
+    AdaptiveScaler,
+    AdaptiveScalingController,
+    ScaleDecision,
+    scheduler_snapshot,
+    worker_startup_latency,
+)
+from scalable.providers.base import ClusterHandle
 
 
 class TestScaleDecision:
@@ -145,3 +156,320 @@ class TestAdaptiveScaler:
             active_workers={"a": 0},
         )
         assert len(scaler.decision_history) == 1
+
+    def test_idle_workers_cap_scale_down(self):
+        scaler = AdaptiveScaler(cooldown_seconds=0)
+        decision = scaler.evaluate(
+            pending_tasks=[],
+            active_workers={"gcam": 4},
+            idle_workers={"gcam": 1},
+        )
+        assert decision.workers_to_remove == {"gcam": 1}
+
+
+class _FakeAdvisor:
+    def __init__(self, durations):
+        self.durations = durations
+        self.calls = []
+
+    def recommend_many(self, *, tasks, targets=None):
+        self.calls.append(list(tasks))
+        return [
+            SimpleNamespace(task=task, evidence={"predicted_duration_s": self.durations.get(task)})
+            for task in tasks
+        ]
+
+
+class TestDurationAwareScaling:
+    def test_long_tasks_scale_up_short_tasks_do_not(self):
+        scaler = AdaptiveScaler(
+            cooldown_seconds=0, target_makespan_s=3600, max_workers={"gcam": 20}
+        )
+        long_runs = [{"tag": "gcam", "predicted_duration_s": 5 * 3600}] * 10
+        short_runs = [{"tag": "gcam", "predicted_duration_s": 5}] * 10
+
+        long_decision = scaler.evaluate(pending_tasks=long_runs, active_workers={"gcam": 1})
+        short_decision = scaler.evaluate(pending_tasks=short_runs, active_workers={"gcam": 1})
+
+        assert long_decision.workers_to_add == {"gcam": 10}
+        assert long_decision.predicted_completion_time == pytest.approx(5 * 3600 * 10 / 11)
+        assert not short_decision.has_changes
+        assert short_decision.predicted_completion_time == pytest.approx(50)
+
+    def test_startup_latency_reduces_useful_capacity(self):
+        pending = [{"tag": "gcam", "predicted_duration_s": 1800}] * 8
+        fast = AdaptiveScaler(cooldown_seconds=0, target_makespan_s=3600)
+        slow = AdaptiveScaler(
+            cooldown_seconds=0, target_makespan_s=3600, startup_latency_s={"gcam": 2700}
+        )
+        blocked = AdaptiveScaler(cooldown_seconds=0, target_makespan_s=3600, startup_latency_s=4000)
+
+        # 4h of work, 1h per existing worker: 3 more workers, or 12 that start 45 min late.
+        assert fast.evaluate(pending_tasks=pending, active_workers={"gcam": 1}).workers_to_add == {
+            "gcam": 3
+        }
+        assert slow.evaluate(pending_tasks=pending, active_workers={"gcam": 1}).workers_to_add == {
+            "gcam": 8
+        }
+        decision = blocked.evaluate(pending_tasks=pending, active_workers={"gcam": 1})
+        assert not decision.has_changes
+        assert "startup" in decision.reasoning
+
+    def test_scale_down_when_work_fits_fewer_workers(self):
+        scaler = AdaptiveScaler(cooldown_seconds=0, target_makespan_s=3600)
+        decision = scaler.evaluate(
+            pending_tasks=[{"tag": "gcam", "predicted_duration_s": 600}] * 2,
+            active_workers={"gcam": 4},
+            idle_workers={"gcam": 2},
+        )
+        assert decision.workers_to_remove == {"gcam": 2}
+
+    def test_advisor_predictions_are_batched_per_task_name(self):
+        advisor = _FakeAdvisor({"run_gcam": 7200.0})
+        scaler = AdaptiveScaler(advisor=advisor, cooldown_seconds=0, target_makespan_s=3600)
+        pending = [{"tag": "gcam", "task_name": "run_gcam"}] * 3 + [
+            {"tag": "gcam", "task_name": "unknown"}
+        ]
+
+        decision = scaler.evaluate(pending_tasks=pending, active_workers={"gcam": 1})
+
+        assert advisor.calls == [["run_gcam", "unknown"]]
+        # The unpredicted task is assumed to be as long as the predicted ones: 8h of work.
+        assert decision.workers_to_add == {"gcam": 4}
+
+    def test_recent_completions_fill_in_without_predictions(self):
+        scaler = AdaptiveScaler(cooldown_seconds=0, target_makespan_s=100)
+        decision = scaler.evaluate(
+            pending_tasks=[{"tag": "gcam"}] * 4,
+            active_workers={"gcam": 1},
+            recent_completions=[{"tag": "gcam", "duration_s": 50}],
+        )
+        assert decision.workers_to_add == {"gcam": 1}
+
+    def test_observed_startup_overrides_configured_latency(self):
+        scaler = AdaptiveScaler(startup_latency_s=600)
+        assert scaler.startup_latency("gcam") == 600
+        for seconds in (30, 40, 90):
+            scaler.observe_startup("gcam", seconds)
+        assert scaler.startup_latency("gcam") == 40
+        assert scaler.startup_latency("other") == 600
+
+
+def test_worker_startup_latency_from_history(tmp_path):
+    for i, latencies in enumerate([[10.0, 30.0], [20.0]]):
+        run_dir = tmp_path / f"run-{i}"
+        run_dir.mkdir()
+        rows = [
+            {"state": "worker_started", "component": "gcam", "details": {"startup_s": s}}
+            for s in latencies
+        ] + [{"state": "autoscale", "component": None, "details": {}}]
+        (run_dir / "workers.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+    assert worker_startup_latency(tmp_path) == {"gcam": 20.0}
+    assert worker_startup_latency(tmp_path, keep_last=1) == {"gcam": 20.0}
+    assert worker_startup_latency(tmp_path / "missing") == {}
+
+
+def _task(state, tag=None, name="run_gcam"):
+    return SimpleNamespace(
+        state=state,
+        resource_restrictions={tag: 1} if tag else None,
+        prefix=SimpleNamespace(name=name),
+    )
+
+
+def _scheduler(*, queued=0, running=0, workers=1, tag="gcam", joined=None):
+    busy = [_task("processing", tag) for _ in range(running)]
+    tasks = [_task("queued", tag) for _ in range(queued)] + busy + [_task("memory", tag)]
+    worker_states = [
+        SimpleNamespace(
+            address=f"tcp://w{i}",
+            nthreads=1,
+            resources={tag: 1},
+            processing=busy[i::workers],
+        )
+        for i in range(workers)
+    ]
+    joined = joined or [0.0] * workers
+    events = {
+        ws.address: ((at, {"action": "add-worker"}),)
+        for ws, at in zip(worker_states, joined, strict=True)
+    }
+    return SimpleNamespace(
+        tasks={i: ts for i, ts in enumerate(tasks)},
+        workers={i: ws for i, ws in enumerate(worker_states)},
+        get_events=lambda address: events.get(address, ()),
+    )
+
+
+class _FakeClient:
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def run_on_scheduler(self, function):
+        return function(dask_scheduler=self.scheduler)
+
+
+class _JobQueueBackend:
+    def __init__(self):
+        self.calls = []
+
+    def add_workers(self, tag=None, n=0):
+        self.calls.append(("add", tag, n))
+
+    def remove_workers(self, tag=None, n=0):
+        self.calls.append(("remove", tag, n))
+
+
+class _RecordingTelemetry:
+    def __init__(self):
+        self.events = []
+
+    def record_worker_event(self, **kwargs):
+        self.events.append(kwargs)
+
+
+class TestSchedulerSnapshot:
+    def test_counts_queue_depth_and_occupancy_per_tag(self):
+        snapshot = scheduler_snapshot(_scheduler(queued=2, running=3, workers=2))
+        # Three tasks on two single-threaded workers: one waits in a worker queue.
+        assert snapshot["pending"] == {"gcam": 3}
+        assert snapshot["workers"] == {"gcam": 2}
+        assert snapshot["occupancy"] == {"gcam": 1.0}
+        assert snapshot["idle"] == {}
+
+    def test_untagged_work_uses_default_tag(self):
+        scheduler = _scheduler(queued=1, workers=1, tag=None)
+        scheduler.workers[0].resources = {}
+        snapshot = scheduler_snapshot(scheduler)
+        assert snapshot["pending"] == {"default": 1}
+        assert snapshot["idle"] == {"default": 1}
+
+
+    def test_pending_work_is_keyed_by_scalable_task_name(self):
+        distributed = pytest.importorskip("distributed")
+        from scalable.client import ScalableClient
+
+        def run_model(x):
+            return x
+
+        # No worker advertises "gcam", so the tagged tasks stay pending.
+        with distributed.LocalCluster(
+            n_workers=1, processes=False, dashboard_address=None, resources={"other": 1}
+        ) as cluster, ScalableClient(cluster) as client:
+            futures = client.map(run_model, [1, 2, 3], tag="gcam", _scalable_task_name="run_gcam")
+            futures.append(client.submit(run_model, 4, tag="gcam"))
+            deadline = time.monotonic() + 10
+            while True:
+                snapshot = client.run_on_scheduler(scheduler_snapshot)
+                if snapshot["pending"].get("gcam") == 4 or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+            client.cancel(futures)
+
+        assert snapshot["pending_by_task"]["gcam"] == {"run_gcam": 3, "run_model": 1}
+
+
+class TestAdaptiveScalingController:
+    def test_scales_tagged_cluster_and_records_decision(self):
+        client = _FakeClient(_scheduler(queued=4, running=1))
+        backend = _JobQueueBackend()
+        telemetry = _RecordingTelemetry()
+        controller = AdaptiveScalingController(
+            AdaptiveScaler(cooldown_seconds=0, max_workers={"gcam": 4}),
+            client=client,
+            cluster=ClusterHandle(backend=backend, client_factory=None, metadata={"provider": "slurm"}),
+            interval=None,
+            telemetry=telemetry,
+        )
+
+        decision = controller.step()
+
+        assert decision.workers_to_add == {"gcam": 3}
+        assert backend.calls == [("add", "gcam", 3)]
+        [event] = telemetry.events
+        assert event["provider"] == "slurm"
+        assert event["state"] == "autoscale"
+        assert event["details"]["applied"] is True
+        assert event["details"]["pending"] == {"gcam": 4}
+
+        client.scheduler = _scheduler(workers=4)
+        decision = controller.step()
+        assert decision.workers_to_remove == {"gcam": 4}
+        assert backend.calls[-1] == ("remove", "gcam", 4)
+
+    def test_other_backends_scale_through_provider(self):
+        plans = []
+        provider = SimpleNamespace(name="local", scale=lambda cluster, plan: plans.append(plan))
+        controller = AdaptiveScalingController(
+            AdaptiveScaler(cooldown_seconds=0),
+            client=_FakeClient(_scheduler(queued=3, running=1)),
+            cluster=ClusterHandle(backend=object(), client_factory=None),
+            provider=provider,
+            interval=None,
+            telemetry=_RecordingTelemetry(),
+        )
+
+        controller.step()
+
+        assert plans[0].workers_by_tag == {"gcam": 3}
+
+    def test_cooldown_decisions_are_not_applied_or_recorded(self):
+        backend = _JobQueueBackend()
+        telemetry = _RecordingTelemetry()
+        controller = AdaptiveScalingController(
+            AdaptiveScaler(cooldown_seconds=3600),
+            client=_FakeClient(_scheduler(queued=4)),
+            cluster=ClusterHandle(backend=backend, client_factory=None),
+            interval=None,
+            telemetry=telemetry,
+        )
+
+        controller.step()
+        decision = controller.step()
+
+        assert "Cooldown" in decision.reasoning
+        assert len(backend.calls) == 1
+        assert len(telemetry.events) == 1
+
+    def test_apply_failures_are_recorded(self):
+        telemetry = _RecordingTelemetry()
+        controller = AdaptiveScalingController(
+            AdaptiveScaler(cooldown_seconds=0),
+            client=_FakeClient(_scheduler(queued=2)),
+            cluster=ClusterHandle(backend=object(), client_factory=None),
+            interval=None,
+            telemetry=telemetry,
+        )
+
+        controller.step()
+
+        details = telemetry.events[0]["details"]
+        assert details["applied"] is False
+        assert "provider is required" in details["error"]
+
+    def test_measures_startup_of_requested_workers(self):
+        client = _FakeClient(_scheduler(queued=4, running=1))
+        telemetry = _RecordingTelemetry()
+        telemetry.target_walltime = "02:00:00"
+        scaler = AdaptiveScaler(cooldown_seconds=0, max_workers={"gcam": 3})
+        controller = AdaptiveScalingController(
+            scaler,
+            client=client,
+            cluster=ClusterHandle(backend=_JobQueueBackend(), client_factory=None),
+            interval=None,
+            telemetry=telemetry,
+        )
+        controller.step()
+        requested_at = time.time()
+
+        client.scheduler = _scheduler(
+            running=3, workers=3, joined=[0.0, requested_at + 5, requested_at + 7]
+        )
+        controller.step()
+
+        started = [e for e in telemetry.events if e["state"] == "worker_started"]
+        assert [e["component"] for e in started] == ["gcam", "gcam"]
+        assert [e["details"]["startup_s"] for e in started] == pytest.approx([5, 7], abs=1)
+        assert {e["details"]["requested_walltime"] for e in started} == {"02:00:00"}
+        assert scaler.startup_latency("gcam") == pytest.approx(6, abs=1)
@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -103,3 +109,92 @@ class TestFeatureExtractor:
         extractor = FeatureExtractor()
         stats = extractor.compute_history_stats(sample_records, "run_stitches", "local")
         assert stats["count"] == 2
+
+
+def _synthetic_history(n: int, *, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    duration = rng.exponential(100.0, n)
+    duration[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "task_name": rng.choice(["a", "b", "c", None], n),
+            "component": rng.choice(["x", "y"], n),
+            "duration_s": duration,
+            "requested_cpus": 2,
+            "requested_memory_bytes": rng.integers(1, 10, n) * 1e9,
+            "requested_workers": 1,
+        },
+        index=rng.permutation(n),
+    )
+
+
+def test_history_aggregates_match_expanding_windows():
+    records = _synthetic_history(2000)
+    result = FeatureExtractor().extract_from_history(records)
+
+    df = records.sort_index()
+    duration = pd.to_numeric(df["duration_s"])
+    grouped = duration.groupby(df["task_name"], sort=False)
+    expected = {
+        "hist_mean_duration": grouped.transform(lambda s: s.expanding().mean().shift(1)),
+        "hist_p95_duration": grouped.transform(lambda s: s.expanding().quantile(0.95).shift(1)),
+        "hist_count": grouped.transform(lambda s: s.expanding().count().shift(1)),
+        "hist_mean_memory": df["requested_memory_bytes"]
+        .groupby(df["task_name"], sort=False)
+        .transform(lambda s: s.expanding().mean().shift(1)),
+    }
+    for column, values in expected.items():
+        np.testing.assert_allclose(
+            result[column].to_numpy(), values.fillna(0).to_numpy(), rtol=1e-9, err_msg=column
+        )
+
+
+@pytest.mark.slow
+def test_extract_from_history_scales_linearly():
+    extractor = FeatureExtractor()
+
+    def best_time(n: int) -> float:
+        records = _synthetic_history(n, seed=n)
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            extractor.extract_from_history(records)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    small, large = best_time(20_000), best_time(80_000)
+    # 4x the rows: linear is ~4x, the old per-group expanding quantile ~16x.
+    assert large / small < 8
+
+
+def test_identity_hashing_is_stable_across_processes():
+    code = (
+        "from scalable.ml.features import FeatureExtractor;"
+        "row = FeatureExtractor().extract_from_task('run_gcam', None, 'gcam', None);"
+        "print(int(row['task_name_hash'].iloc[0]), int(row['component_hash'].iloc[0]))"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+    row = FeatureExtractor().extract_from_task("run_gcam", None, "gcam", None)
+    assert outputs.pop().split() == [str(row["task_name_hash"].iloc[0]), str(row["component_hash"].iloc[0])]
+
+
+def test_identity_hashing_follows_seed():
+    records = _synthetic_history(50)
+    default = FeatureExtractor().extract_from_history(records)
+    reseeded = FeatureExtractor(hash_seed=7).extract_from_history(records)
+    assert not default["task_name_hash"].equals(reseeded["task_name_hash"])
+    assert FeatureExtractor(hash_seed=7).feature_encoding["seed"] == 7
+    # History and single-task encodings agree.
+    row = FeatureExtractor().extract_from_task("a", None, "x", None)
+    first_a = default[records.sort_index()["task_name"].to_numpy() == "a"].iloc[0]
+    assert first_a["task_name_hash"] == row["task_name_hash"].iloc[0]
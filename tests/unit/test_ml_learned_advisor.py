@@ -0,0 +1,225 @@
+"""Unit tests for the ML-backed LearnedAdvisor."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scalable.ml.features import FeatureExtractor
+from scalable.ml.learned_advisor import LearnedAdvisor, history_watermark, unseen_rows
+from scalable.ml.models import ResourceModel
+
+
+def _append_jsonl(path: Path, rows: list[dict]) -> None:
+    with path.open("a", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, sort_keys=True) + "\n")
+
+
+def _seed_runs(runs: Path, *, count: int = 12, start: int = 0, task: str = "run_gcam") -> None:
+    for i in range(start, start + count):
+        run_dir = runs / f"run-20260519T{i:02d}0000Z-demo-{i:08x}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / "run.json").write_text(
+            json.dumps({"run_id": run_dir.name, "target_name": "local"}) + "\n",
+            encoding="utf-8",
+        )
+        _append_jsonl(
+            run_dir / "tasks.jsonl",
+            [
+                {
+                    "task_id": "t1",
+                    "task_name": task,
+                    "component": "gcam",
+                    "state": "succeeded",
+                    "duration_s": 100.0 + 10 * i,
+                }
+            ],
+        )
+        _append_jsonl(
+            run_dir / "resources.jsonl",
+            [
+                {
+                    "entity_type": "task",
+                    "entity_id": "t1",
+                    "requested_workers": 1,
+                    "requested_cpus": 2 + i % 3,
+                    "requested_memory": f"{4 + i % 4}G",
+                }
+            ],
+        )
+
+
+@pytest.fixture
+def runs(tmp_path: Path) -> Path:
+    pytest.importorskip("sklearn")
+    runs = tmp_path / "runs"
+    _seed_runs(runs)
+    return runs
+
+
+def test_cached_models_are_reused_across_instances(runs: Path, tmp_path: Path, monkeypatch) -> None:
+    cache = tmp_path / "models"
+    first = LearnedAdvisor.from_history(runs, cache_dir=cache)
+    expected = first.recommend(task="run_gcam", target="local")
+    meta = json.loads((cache / "duration" / "metadata.json").read_text())
+    assert meta["feature_encoding"] == FeatureExtractor().feature_encoding
+
+    def _no_training(self, X, y):  # pragma: no cover - must not be called
+        raise AssertionError("cached model should have been reused")
+
+    monkeypatch.setattr(ResourceModel, "fit", _no_training)
+    second = LearnedAdvisor.from_history(runs, cache_dir=cache)
+    assert second.recommend(task="run_gcam", target="local") == expected
+
+
+def test_cached_models_with_other_encoding_are_retrained(runs: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "models"
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+    meta_path = cache / "duration" / "metadata.json"
+    meta = json.loads(meta_path.read_text())
+    meta.pop("feature_encoding")  # as written before encodings were recorded
+    meta_path.write_text(json.dumps(meta))
+
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+
+    assert json.loads(meta_path.read_text())["feature_encoding"] is not None
+
+
+def _forbid_full_fit(monkeypatch) -> None:
+    def _no_training(self, X, y):  # pragma: no cover - must not be called
+        raise AssertionError("expected an incremental update, not a full fit")
+
+    monkeypatch.setattr(ResourceModel, "fit", _no_training)
+
+
+def test_new_runs_warm_start_cached_models(runs: Path, tmp_path: Path, monkeypatch) -> None:
+    cache = tmp_path / "models"
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+    _seed_runs(runs, count=3, start=12)
+    _forbid_full_fit(monkeypatch)
+
+    advisor = LearnedAdvisor.from_history(runs, cache_dir=cache)
+
+    model = advisor._duration_model
+    assert model.incremental_updates == 1
+    assert model.n_estimators > 100
+    assert model.training_watermark == history_watermark(advisor._records)
+    assert sum(model.training_watermark.values()) == 15
+    reloaded = ResourceModel.load(cache / "duration")
+    assert reloaded.n_estimators == model.n_estimators
+    assert advisor.recommend(task="run_gcam", target="local").evidence["method"] == "ml"
+
+
+def test_full_refresh_retrains_on_new_runs(runs: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "models"
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+    _seed_runs(runs, count=3, start=12)
+
+    advisor = LearnedAdvisor.from_history(runs, cache_dir=cache, refresh="full")
+
+    assert advisor._duration_model.incremental_updates == 0
+    assert advisor._duration_model.n_estimators == 100
+
+
+def test_removed_runs_force_full_retrain(runs: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "models"
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+    _seed_runs(runs, count=3, start=12)
+    LearnedAdvisor.from_history(runs, cache_dir=cache)
+    oldest = sorted(runs.iterdir())[0]
+    for path in oldest.iterdir():
+        path.unlink()
+    oldest.rmdir()
+
+    advisor = LearnedAdvisor.from_history(runs, cache_dir=cache)
+
+    assert advisor._duration_model.incremental_updates == 0
+    assert sum(advisor._duration_model.training_watermark.values()) == 14
+
+
+def test_background_refresh_serves_old_model_until_swapped(
+    runs: Path, tmp_path: Path, monkeypatch
+) -> None:
+    cache = tmp_path / "models"
+    old = LearnedAdvisor.from_history(runs, cache_dir=cache)._duration_model.training_watermark
+    _seed_runs(runs, count=3, start=12)
+    release = threading.Event()
+    train = LearnedAdvisor._train_model.__func__
+
+    def _gated_train(cls, *args, **kwargs):
+        release.wait(timeout=60)
+        return train(cls, *args, **kwargs)
+
+    monkeypatch.setattr(LearnedAdvisor, "_train_model", classmethod(_gated_train))
+
+    advisor = LearnedAdvisor.from_history(runs, cache_dir=cache, refresh="background")
+    assert advisor._duration_model.training_watermark == old
+    assert advisor.recommend(task="run_gcam", target="local").evidence["method"] == "ml"
+    assert not advisor.wait_for_refresh(timeout=0.01)
+    release.set()
+    assert advisor.wait_for_refresh(timeout=60)
+
+    watermark = history_watermark(advisor._records)
+    assert advisor._duration_model.training_watermark == watermark
+    assert advisor._memory_model.training_watermark == watermark
+    assert ResourceModel.load(cache / "duration").training_watermark == watermark
+
+
+def test_unknown_refresh_mode_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="refresh"):
+        LearnedAdvisor.from_history(tmp_path, refresh="sometimes")
+
+
+def test_unseen_rows_follow_per_run_watermark() -> None:
+    records = pd.DataFrame({"run_id": ["a", "a", "b", "a", "c"]})
+    assert unseen_rows(records, {"a": 2, "b": 1}).tolist() == [False, False, False, True, True]
+    assert unseen_rows(records, {"a": 4}) is None
+    assert unseen_rows(records, {"gone": 1}) is None
+    assert unseen_rows(records, None) is None
+
+
+def test_recommend_many_matches_single_calls_with_one_predict(
+    runs: Path, tmp_path: Path, monkeypatch
+) -> None:
+    _seed_runs(runs, count=3, start=12, task="run_stitches")
+    advisor = LearnedAdvisor.from_history(runs, cache_dir=tmp_path / "models")
+    tasks = ["run_gcam", "run_stitches", "missing"]
+    targets = ["local", "slurm", None]
+    confidences = [0.8, 0.95]
+    features = {"run_gcam": {"scenario_count": 20}}
+    expected = [
+        advisor.recommend(task=task, target=target, confidence=q, input_features=features.get(task))
+        for task in tasks
+        for target in targets
+        for q in confidences
+    ]
+
+    calls: list[int] = []
+    predict = ResourceModel.predict
+
+    def _counting_predict(self, X):
+        calls.append(len(X))
+        return predict(self, X)
+
+    monkeypatch.setattr(ResourceModel, "predict", _counting_predict)
+    batch = advisor.recommend_many(
+        tasks=tasks, targets=targets, confidence=confidences, input_features=features
+    )
+
+    assert batch == expected
+    # One predict per model over the ML-eligible (task, target) pairs.
+    assert calls == [3, 3]
+    assert [r.evidence["method"] for r in batch[:6]] == ["ml"] * 6
+    assert batch[-1].evidence["reason"] == "no history"
+
+
+def test_recommend_many_without_history(tmp_path: Path) -> None:
+    advisor = LearnedAdvisor(pd.DataFrame())
+    [rec] = advisor.recommend_many(tasks=["run_gcam"])
+    assert rec.evidence["method"] == "heuristic"
+    assert rec.workers == {"run_gcam": 1}
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from scalable.ml.models import ModelQuality, PredictionResult, ResourceModel
+from scalable.ml.models import ModelQuality, PredictionResult, ResourceModel, tree_predictions
 
 
 class TestPredictionResult:
@@ -99,3 +100,85 @@ class TestResourceModel:
         loaded = ResourceModel.load(save_path)
         assert loaded.is_fitted
         assert loaded.model_type == model.model_type
+        assert loaded.feature_encoding is None
+
+    def test_update_warm_starts_ensemble(self):
+        pytest.importorskip("sklearn")
+        X = pd.DataFrame({"feat1": [float(i) for i in range(20)]})
+        y = pd.Series([10.0 * i for i in range(20)])
+        model = ResourceModel(model_type="random_forest").fit(X, y)
+        assert model.can_warm_start
+
+        model.update(X.iloc[:5], y.iloc[:5], extra_estimators=7)
+
+        assert model.n_estimators == 57
+        assert model.incremental_updates == 1
+        assert len(model.predict(X)) == 20
+
+    def test_update_requires_fitted_ensemble(self):
+        model = ResourceModel().fit(pd.DataFrame({"f": [1.0]}), pd.Series([1.0]))
+        assert not model.can_warm_start
+        with pytest.raises(RuntimeError):
+            model.update(pd.DataFrame({"f": [1.0, 2.0]}), pd.Series([1.0, 2.0]))
+
+    def test_save_load_feature_encoding(self, tmp_path):
+        model = ResourceModel()
+        model.fit(pd.DataFrame({"feat1": [1.0, 2.0]}), pd.Series([10.0, 20.0]))
+        model.feature_encoding = {"hash": "xxh32", "buckets": 10000, "seed": 1}
+        model.save(tmp_path / "m")
+        assert ResourceModel.load(tmp_path / "m").feature_encoding == model.feature_encoding
+
+
+def _regression_data(n: int = 200) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((n, 3)), columns=["a", "b", "c"])
+    y = pd.Series(100 * X["a"] + 10 * X["b"] + rng.exponential(5.0, n))
+    return X, y
+
+
+@pytest.mark.parametrize("model_type", ["random_forest", "gradient_boosting"])
+def test_tree_predictions_match_per_tree_predict(model_type):
+    pytest.importorskip("sklearn")
+    X, y = _regression_data()
+    model = ResourceModel(model_type=model_type).fit(X, y)
+    ensemble = model._model
+    X_arr = X.to_numpy()
+
+    stacked = tree_predictions(ensemble, X_arr)
+
+    expected = np.column_stack([tree.predict(X_arr) for tree in np.ravel(ensemble.estimators_)])
+    np.testing.assert_array_equal(stacked, expected)
+
+    # Warm-started trees invalidate the cached leaf table.
+    model.update(X, y, extra_estimators=3)
+    assert tree_predictions(ensemble, X_arr).shape == (len(X), len(np.ravel(ensemble.estimators_)))
+
+
+def test_random_forest_intervals_from_stacked_trees():
+    pytest.importorskip("sklearn")
+    X, y = _regression_data()
+    model = ResourceModel(model_type="random_forest").fit(X, y)
+
+    results = model.predict(X.iloc[:5])
+
+    per_tree = np.array([t.predict(X.iloc[:5].to_numpy()) for t in model._model.estimators_])
+    np.testing.assert_allclose(
+        [r.upper for r in results], np.maximum(0, np.percentile(per_tree, 95, axis=0))
+    )
+
+
+def test_hist_gradient_boosting_quantile_backend():
+    pytest.importorskip("sklearn")
+    X, y = _regression_data(400)
+    model = ResourceModel(model_type="hist_gradient_boosting").fit(X, y)
+
+    results = model.predict(X)
+
+    assert model.n_estimators == 100
+    lowers = np.array([r.lower for r in results])
+    uppers = np.array([r.upper for r in results])
+    assert np.all(lowers <= uppers)
+    assert 0.75 <= np.mean((lowers <= y) & (y <= uppers)) <= 1.0
+
+    model.update(X.iloc[:50], y.iloc[:50], extra_estimators=5)
+    assert model.n_estimators == 105
@@ -0,0 +1,124 @@
+"""Unit tests for HyperparameterSearch cluster execution."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scalable.ml.tuning import TRIAL_TASK_NAME, HyperparameterSearch
+
+pytest.importorskip("sklearn")
+
+PARAM_SPACE = {"max_depth": [1, 2, 3, 4, 6, 8], "min_samples_leaf": [1, 5, 20]}
+
+
+def _data(n: int = 540) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((n, 3)), columns=["a", "b", "c"])
+    y = pd.Series(10 * X["a"] + rng.normal(0, 0.5, n))
+    return X, y
+
+
+def _search(strategy: str, n_iter: int = 9) -> HyperparameterSearch:
+    from sklearn.tree import DecisionTreeRegressor
+
+    return HyperparameterSearch(
+        DecisionTreeRegressor(random_state=0), PARAM_SPACE, strategy=strategy, n_iter=n_iter
+    )
+
+
+@pytest.fixture(scope="module")
+def client():
+    distributed = pytest.importorskip("distributed")
+    from scalable.client import ScalableClient
+
+    cluster = distributed.LocalCluster(
+        n_workers=2,
+        threads_per_worker=1,
+        processes=False,
+        dashboard_address=None,
+        resources={"ml": 1},
+    )
+    client = ScalableClient(cluster)
+    yield client
+    client.close()
+    cluster.close()
+
+
+def test_successive_halving_keeps_best_third_per_rung(client, monkeypatch):
+    scattered: list[int] = []
+    scatter = type(client).scatter
+
+    def _counting_scatter(self, data, *args, **kwargs):
+        scattered.append(len(data))
+        return scatter(self, data, *args, **kwargs)
+
+    monkeypatch.setattr(type(client), "scatter", _counting_scatter)
+    X, y = _data()
+
+    result = _search("successive_halving").fit(X, y, client=client, tag="ml")
+
+    trials = result.all_results
+    assert scattered == [2]  # X and y, once
+    assert trials.groupby("rung")["n_samples"].agg(["size", "max"]).values.tolist() == [
+        [9, 60],
+        [3, 180],
+        [1, 540],
+    ]
+    for column in ("fit_time_s", "score_time_s", "trial_time_s"):
+        assert (trials[column] > 0).all()
+    final = trials[trials["rung"] == 2].iloc[0]
+    assert result.best_params == final["params"]
+    assert result.best_score == final["mean_test_score"]
+    assert result.n_iterations == 13
+    assert result.best_estimator.get_params()["max_depth"] == result.best_params["max_depth"]
+    assert TRIAL_TASK_NAME == "hyperparameter_trial"
+
+
+def test_random_and_hyperband_compare_full_budget_scores(client):
+    X, y = _data()
+
+    random = _search("random").fit(X, y, client=client)
+    hyperband = _search("hyperband").fit(X, y, client=client)
+
+    assert set(random.all_results["n_samples"]) == {540}
+    assert len(random.all_results) == 9
+    brackets = hyperband.all_results.groupby("bracket")["n_samples"].min()
+    assert brackets.is_monotonic_increasing and brackets.iloc[0] < 540
+    full = hyperband.all_results[hyperband.all_results["n_samples"] == 540]
+    assert hyperband.best_score == full["mean_test_score"].max()
+
+
+def test_without_client_falls_back_to_local_search(monkeypatch):
+    monkeypatch.setattr("scalable.ml.tuning._active_client", lambda: None)
+    X, y = _data(120)
+    result = _search("random", n_iter=3).fit(X, y)
+    assert result.n_iterations == 3
+    assert "rung" not in result.all_results
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="strategy"):
+        HyperparameterSearch(object(), {}, strategy="grid")
+
+
+def test_only_a_scalable_default_client_is_picked_up(monkeypatch):
+    distributed = pytest.importorskip("distributed")
+    seen: list[object] = []
+
+    def _dask_ml(self, X, y, *, client):
+        seen.append(client)
+        return {"best_params": {}, "best_score": 0.0, "best_estimator": None}
+
+    monkeypatch.setattr(HyperparameterSearch, "_fit_dask_ml", _dask_ml)
+    X, y = _data(120)
+    with (
+        distributed.LocalCluster(n_workers=1, processes=False, dashboard_address=":0") as cluster,
+        distributed.Client(cluster) as plain,
+    ):
+        # An unrelated default client is left alone...
+        _search("random", n_iter=3).fit(X, y)
+        # ...and an explicit one still goes through dask-ml.
+        _search("random", n_iter=3).fit(X, y, client=plain)
+    assert seen == [None, plain]
@@ -0,0 +1,212 @@
+"""Unit tests for walltime-risk-aware planning."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from scalable.advising import ResourceAdvisor
+from scalable.planning.walltime import (
+    QueueWaitModel,
+    _walltime_seconds,
+    duration_samples,
+    job_queue_waits,
+    plan_component_walltimes,
+    plan_walltime,
+    simulate_completion,
+)
+from scalable.session.session import ScalableSession
+
+#: Mostly 10-minute tasks with one rare 100-minute straggler.
+HEAVY_TAIL = np.array([600.0] * 45 + [900.0] * 4 + [6000.0])
+
+
+def test_walltime_strings_follow_slurm_time_formats() -> None:
+    assert _walltime_seconds("30") == 1800
+    assert _walltime_seconds("30:15") == 1815
+    assert _walltime_seconds("02:00:00") == 7200
+    assert _walltime_seconds("1-02:30") == 95400
+    assert _walltime_seconds("soon") is None
+    assert _walltime_seconds(None) is None
+
+
+def test_queue_wait_model_is_fitted_against_requested_walltime() -> None:
+    records = pd.DataFrame(
+        {
+            "queue_wait_s": [70.0, 130.0, 250.0, None],
+            "requested_walltime": ["00:10:00", "00:20:00", "00:40:00", "01:00:00"],
+        }
+    )
+    model = QueueWaitModel.from_history(records)
+    assert model.source == "telemetry"
+    assert model.base_s == pytest.approx(10.0)
+    assert model.per_walltime_s == pytest.approx(0.1)
+
+    flat = QueueWaitModel.from_history(records.assign(requested_walltime="00:10:00"))
+    assert (flat.source, flat.base_s) == ("telemetry median", 130.0)
+    assert QueueWaitModel.from_history(pd.DataFrame()).source == "default"
+
+
+def test_queue_wait_is_fitted_from_recorded_worker_starts(tmp_path) -> None:
+    run_dir = tmp_path / "run-1"
+    run_dir.mkdir()
+    starts = [(70.0, "00:10:00"), (130.0, "00:20:00"), (250.0, "00:40:00"), (30.0, None)]
+    rows = [
+        {
+            "state": "worker_started",
+            "component": "gcam",
+            "details": {"startup_s": wait, "requested_walltime": walltime},
+        }
+        for wait, walltime in starts
+    ] + [{"state": "autoscale", "component": None, "details": {}}]
+    (run_dir / "workers.jsonl").write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+    waits = job_queue_waits(tmp_path)
+    assert waits["queue_wait_s"].tolist() == [70.0, 130.0, 250.0, 30.0]
+    model = QueueWaitModel.from_history(waits)
+    assert (model.base_s, model.per_walltime_s) == pytest.approx((10.0, 0.1))
+    missing = QueueWaitModel.from_history(job_queue_waits(tmp_path / "missing"))
+    assert missing.source == "default"
+
+
+def test_simulation_requeues_tasks_killed_by_the_walltime() -> None:
+    durations = np.array([600.0])
+    fits = simulate_completion(
+        durations, tasks=2, workers=1, walltime_s=1200.0, queue_model=QueueWaitModel(100.0, 0.0)
+    )
+    assert fits.expected_completion_s == 1300.0
+    assert (fits.kill_probability, fits.expected_jobs) == (0.0, 1.0)
+
+    # The second task does not fit in what is left of the first job.
+    short = simulate_completion(
+        durations, tasks=2, workers=1, walltime_s=900.0, queue_model=QueueWaitModel(100.0, 0.0)
+    )
+    assert short.expected_completion_s == 100 + 900 + 100 + 600
+    assert (short.expected_requeues, short.expected_jobs) == (1.0, 2.0)
+
+
+def test_plan_scores_candidates_as_simulate_completion_does() -> None:
+    queue = QueueWaitModel(60.0, 0.5)
+    plan = plan_walltime(HEAVY_TAIL, tasks=12, max_workers=3, queue_model=queue)
+    for option in plan.options:
+        alone = simulate_completion(
+            HEAVY_TAIL,
+            tasks=12,
+            workers=option.workers,
+            walltime_s=option.walltime_s,
+            queue_model=queue,
+        )
+        assert alone == option
+
+
+def test_steeper_queue_wait_trades_walltime_for_kill_risk() -> None:
+    flat = plan_walltime(HEAVY_TAIL, tasks=4, max_workers=4, queue_model=QueueWaitModel(0.0, 0.0))
+    steep = plan_walltime(HEAVY_TAIL, tasks=4, max_workers=4, queue_model=QueueWaitModel(0.0, 1.0))
+
+    assert flat.chosen.walltime_s == 6000.0
+    assert flat.chosen.kill_probability == 0.0
+    assert steep.chosen.walltime_s == 900.0
+    assert 0 < steep.chosen.kill_probability < 0.05
+    walltimes = [option.walltime_s for option in steep.options]
+    assert walltimes == sorted(walltimes)
+    assert steep.chosen.expected_completion_s == min(
+        option.expected_completion_s for option in steep.options
+    )
+
+
+def _records(durations: list[float], *, runs: int = 2) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "run_id": f"run-{run}",
+                "target": "local",
+                "task_name": "run_a",
+                "component": "model_a",
+                "state": "succeeded",
+                "duration_s": duration,
+                "queue_wait_s": None,
+                "requested_walltime": None,
+            }
+            for run in range(runs)
+            for duration in durations
+        ]
+    )
+
+
+def test_duration_samples_are_weighted_by_telemetry_sampling() -> None:
+    records = _records([600.0, 6000.0], runs=1).assign(sample_weight=[9.0, 1.0])
+    failed = _records([9000.0], runs=1).assign(state="failed", sample_weight=0.0)
+
+    samples, tasks = duration_samples(pd.concat([records, failed]), ["run_a"])
+
+    # The 600 s row stands for nine tasks, the failure's diagnostic row for none.
+    assert (tasks, samples.tolist()) == (10, [600.0, 600.0])
+    weighted = _records([600.0, 6000.0, 6000.0], runs=1).assign(sample_weight=[9.0, 1.0, 1.0])
+    samples, tasks = duration_samples(weighted, ["run_a"])
+    assert (tasks, sorted(samples.tolist())) == (11, [600.0, 600.0, 6000.0])
+
+
+def test_components_without_history_use_advisor_intervals_or_are_skipped() -> None:
+    spec = SimpleNamespace(
+        target_name="local",
+        target=SimpleNamespace(options={}),
+        tasks={
+            "run_a": SimpleNamespace(component="model_a"),
+            "run_b": SimpleNamespace(component="model_b"),
+            "run_c": SimpleNamespace(component="model_c"),
+        },
+    )
+    predicted = SimpleNamespace(evidence={"predicted_duration_s": 300.0, "duration_upper": 600.0})
+    missing = SimpleNamespace(evidence={"records": 0})
+    advisor = SimpleNamespace(
+        recommend_many=lambda tasks, targets: [predicted if tasks == ["run_b"] else missing]
+    )
+
+    plans = plan_component_walltimes(
+        spec, _records(list(HEAVY_TAIL[:10])), advisor=advisor, replications=20
+    )
+
+    assert set(plans) == {"model_a", "model_b"}
+    assert (plans["model_a"].duration_source, plans["model_a"].tasks) == ("telemetry", 10)
+    assert plans["model_b"].duration_source == "advisor intervals"
+    assert plans["model_b"].samples == 200
+
+
+def test_session_plan_reports_walltime_tradeoffs(tmp_path) -> None:
+    manifest = {
+        "version": 1,
+        "project": {"name": "test-project"},
+        "targets": {"local": {"provider": "local", "max_workers": 4}},
+        "components": {
+            "model_a": {"cpus": 4, "memory": "16G"},
+            "model_b": {"cpus": 2, "memory": "8G"},
+        },
+        "tasks": {"run_a": {"component": "model_a"}, "run_b": {"component": "model_b"}},
+    }
+    path = tmp_path / "scalable.yaml"
+    path.write_text(yaml.dump(manifest))
+    session = ScalableSession.from_yaml(path, target="local")
+    advisor = ResourceAdvisor(_records([600.0, 660.0, 540.0, 600.0, 720.0, 600.0]))
+
+    plan = session.plan(dry_run=True, objective="minimize expected time", advisor=advisor)
+
+    chosen = plan.walltime_plans["model_a"].chosen
+    assert set(plan.walltime_plans) == {"model_a"}
+    assert plan.scale_plan.workers_by_tag == {"model_a": chosen.workers, "model_b": 1}
+    assert chosen.workers <= 4  # the target's max_workers
+    assert plan.scale_plan.resources_by_tag["model_a"].walltime == "00:24:00"
+    assert plan.scale_plan.resources_by_tag["model_a"].cpus == 4
+    tradeoffs = plan.to_dict()["walltime_tradeoffs"]["model_a"]
+    assert (tradeoffs["tasks"], tradeoffs["chosen"]["walltime_s"]) == (6, 1440.0)
+    assert tradeoffs["queue_model"]["source"] == "default"
+    assert len(tradeoffs["options"]) >= 2
+
+    manual = session.plan(
+        dry_run=True, objective="minimize expected time", policy="manual", advisor=advisor
+    )
+    assert "walltime_tradeoffs" not in manual.to_dict()
@@ -5,7 +5,10 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from scalable.advising import ResourceAdvisor
+import pandas as pd
+import pytest
+
+from scalable.advising import HistoryStats, ResourceAdvisor
 
 
 def _append_jsonl(path: Path, rows: list[dict]) -> None:
@@ -88,3 +91,89 @@ def test_resource_advisor_handles_missing_history(tmp_path: Path) -> None:
     assert recommendation.resources["missing_task"]["cpus"] == 1
     assert recommendation.evidence["records"] == 0
 
+
+
+def test_recommend_many_matches_single_calls(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    _seed_run(runs / "run-20260519T120000Z-demo-aaaa1111", duration_s=120.0, cpus=4, memory="8G", workers=1)
+    _seed_run(runs / "run-20260519T130000Z-demo-bbbb2222", duration_s=300.0, cpus=6, memory="16G", workers=2)
+    advisor = ResourceAdvisor.from_history(runs)
+    tasks = ["run_gcam", "missing"]
+    targets = ["local", "remote", None]
+
+    batch = advisor.recommend_many(tasks=tasks, targets=targets, confidence=[0.5, 0.95])
+
+    expected = [
+        advisor.recommend(task=task, target=target, confidence=q)
+        for task in tasks
+        for target in targets
+        for q in (0.5, 0.95)
+    ]
+    assert batch == expected
+    assert batch[0].resources["gcam"]["cpus"] < batch[1].resources["gcam"]["cpus"]
+    assert batch[-1].evidence["reason"] == "task not found in history"
+
+
+def test_history_stats_table_is_persisted_and_updated_per_task(tmp_path: Path, monkeypatch) -> None:
+    from scalable.advising import stats as stats_module
+
+    runs = tmp_path / "runs"
+    _seed_run(runs / "run-20260519T120000Z-demo-aaaa1111", duration_s=120.0, cpus=4, memory="8G", workers=1)
+    ResourceAdvisor.from_history(runs)
+    table = tmp_path / "models" / "history_stats.json"
+    saved = HistoryStats.load(table)
+    assert set(saved.rows) == {("run_gcam", None), ("run_gcam", "local")}
+    assert saved.get("run_gcam", "remote") == saved.get("run_gcam")
+
+    run = runs / "run-20260519T130000Z-demo-bbbb2222"
+    _seed_run(run, duration_s=300.0, cpus=6, memory="16G", workers=2)
+    (run / "tasks.jsonl").write_text(
+        (run / "tasks.jsonl").read_text(encoding="utf-8").replace("run_gcam", "run_stitches"),
+        encoding="utf-8",
+    )
+    aggregated: list[set] = []
+    aggregate = HistoryStats._aggregate
+    monkeypatch.setattr(
+        HistoryStats,
+        "_aggregate",
+        lambda self, records: aggregated.append(set(records["task_name"])) or aggregate(self, records),
+    )
+    advisor = ResourceAdvisor.from_history(runs)
+    monkeypatch.undo()
+
+    updated = HistoryStats.load(table)
+    assert aggregated == [{"run_stitches"}]
+    assert updated.rows[("run_gcam", None)] == saved.rows[("run_gcam", None)]
+    assert updated.rows[("run_stitches", "local")].duration == (300.0, 300.0, 300.0)
+    assert updated.rows == HistoryStats.from_records(advisor._records).rows
+    assert updated.watermark == {"run-20260519T120000Z-demo-aaaa1111": 1, "run-20260519T130000Z-demo-bbbb2222": 1}
+
+    def _no_scan(*args, **kwargs):
+        raise AssertionError("precomputed levels must not scan the records")
+
+    monkeypatch.setattr(stats_module, "_scoped_history", _no_scan)
+    assert advisor.recommend(task="run_stitches", confidence=0.95).resources["gcam"]["cpus"] == 6
+    with pytest.raises(AssertionError, match="scan"):
+        advisor.recommend(task="run_stitches", confidence=0.8)
+
+
+def test_history_stats_are_weighted_by_telemetry_sampling() -> None:
+    # One sampled row standing for 9 tasks, one unsampled row and a
+    # diagnostic (weight 0) row of a sampled-out failure.
+    records = pd.DataFrame(
+        {
+            "task_name": ["run_gcam"] * 3,
+            "component": ["gcam"] * 3,
+            "state": ["succeeded", "succeeded", "failed"],
+            "duration_s": [100.0, 1000.0, 5000.0],
+            "sample_weight": [9.0, 1.0, 0.0],
+        }
+    )
+    row = HistoryStats.from_records(records).get("run_gcam")
+
+    assert row.records == 2
+    assert row.state_counts == {"succeeded": 10}
+    assert row.duration == (100.0, 1000.0, 1000.0)
+    assert row.mean_duration == pytest.approx(190.0)
+    unsampled = HistoryStats.from_records(records.drop(columns="sample_weight").iloc[:2])
+    assert unsampled.get("run_gcam").duration[0] == pytest.approx(550.0)
@@ -0,0 +1,223 @@
+"""Unit tests for telemetry sampling policies and stream aggregates."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scalable.manifest.parser import load_manifest
+from scalable.planning.dryrun import build_dry_run_plan
+from scalable.providers.base import DeploymentSpec
+from scalable.telemetry.aggregation import (
+    LogHistogram,
+    SamplingPolicy,
+    StreamSampler,
+    stream_name,
+)
+from scalable.telemetry.collectors import read_jsonl, summarize_run
+from scalable.telemetry.store import TelemetryStore
+
+
+def _create_store(tmp_path: Path, *, sampling: str = "all", task_sampling: str | None = None):
+    extra = f"\n    telemetry_sampling: {task_sampling}" if task_sampling else ""
+    manifest_path = tmp_path / "scalable.yaml"
+    manifest_path.write_text(
+        f"""
+version: 1
+project:
+  name: demo
+targets:
+  local:
+    provider: local
+components:
+  gcam:
+    cpus: 2
+    memory: 8G
+tasks:
+  step:
+    component: gcam{extra}
+""".lstrip(),
+        encoding="utf-8",
+    )
+    manifest = load_manifest(manifest_path)
+    spec = DeploymentSpec.from_manifest(manifest, target_name="local")
+    return TelemetryStore.create(
+        runs_dir=tmp_path / "runs",
+        manifest=manifest,
+        spec=spec,
+        plan=build_dry_run_plan(spec),
+        sampling=sampling,
+    )
+
+
+def _run_tasks(store: TelemetryStore, count: int, *, fail_every: int = 0) -> None:
+    common = {"component": "gcam", "tag": "gcam", "function_name": "step", "requested_workers": 1}
+    for index in range(count):
+        task_id = f"t{index}"
+        store.record_task_submission(task_id=task_id, task_name=f"step[{index}]", **common)
+        failed = fail_every and index % fail_every == fail_every - 1
+        store.record_task_result(
+            task_id=task_id,
+            task_name=f"step[{index}]",
+            state="failed" if failed else "succeeded",
+            error_type="ValueError" if failed else None,
+            **common,
+        )
+
+
+def test_sampling_policy_parse() -> None:
+    assert SamplingPolicy.parse(None) == SamplingPolicy()
+    assert SamplingPolicy.parse("every_n:25") == SamplingPolicy(mode="every_n", n=25)
+    assert str(SamplingPolicy.parse(" Reservoir:8 ")) == "reservoir:8"
+    assert SamplingPolicy.parse("every_n:1").is_full
+    for bad in ("sometimes", "every_n", "every_n:x", "reservoir:0"):
+        with pytest.raises(ValueError):
+            SamplingPolicy.parse(bad)
+
+
+def test_stream_name_strips_map_index() -> None:
+    assert stream_name("step[12]") == "step"
+    assert stream_name("run_gcam") == "run_gcam"
+
+
+def test_log_histogram_quantiles_are_within_bucket_resolution() -> None:
+    hist = LogHistogram()
+    for value in range(1, 1001):
+        hist.add(float(value))
+    assert hist.count == 1000
+    assert hist.mean == pytest.approx(500.5)
+    assert hist.quantile(0.5) == pytest.approx(500, rel=0.26)
+    assert hist.quantile(0.95) == pytest.approx(950, rel=0.26)
+    assert hist.quantile(1.0) == 1000
+
+
+def test_reservoir_sampler_keeps_uniform_sample() -> None:
+    sampler = StreamSampler(SamplingPolicy(mode="reservoir", n=10), seed=3)
+    kept: set[str] = set()
+    for index in range(1000):
+        task_id = f"t{index}"
+        kept.add(task_id)
+        displaced = sampler.offer(task_id)
+        if displaced is not None:
+            kept.discard(displaced)
+    assert sorted(kept) == sorted(sampler.reservoir)
+    assert len(sampler.reservoir) == 10
+    assert sampler.weight == pytest.approx(100.0)
+
+
+def test_every_n_sampling_writes_weighted_rows(tmp_path: Path) -> None:
+    store = _create_store(tmp_path, sampling="every_n:10")
+    _run_tasks(store, 100)
+    store.close()
+
+    rows = read_jsonl(store.run_dir / "tasks.jsonl")
+    terminal = [row for row in rows if row["state"] == "succeeded"]
+    assert len(terminal) == 10
+    assert {row["sample_weight"] for row in terminal} == {10.0}
+
+    summary = json.loads((store.run_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["counts"]["tasks_succeeded"] == 100
+    assert summary["streams"][0]["submitted"] == 100
+    assert summary["streams"][0]["recorded"] == 10
+    assert summary["streams"][0]["states"] == {"succeeded": 100}
+    assert summary == summarize_run(store.run_dir)
+
+
+def test_failed_tasks_are_always_recorded(tmp_path: Path) -> None:
+    store = _create_store(tmp_path, sampling="every_n:10")
+    _run_tasks(store, 100, fail_every=7)
+    store.close()
+
+    failures = read_jsonl(store.run_dir / "failures.jsonl")
+    assert len(failures) == 14
+    # Sampled failures keep the sample's weight; the others are diagnostic
+    # rows with weight 0, so nothing is counted twice.
+    failed = [row for row in read_jsonl(store.run_dir / "tasks.jsonl") if row["state"] == "failed"]
+    assert sorted(row["sample_weight"] for row in failed) == [0.0] * 12 + [10.0] * 2
+    summary = summarize_run(store.run_dir)
+    assert summary["counts"]["tasks_failed"] == 14
+    assert summary["streams"][0]["states"] == {"failed": 14, "succeeded": 86}
+
+
+def test_reservoir_failures_still_compete_for_weighted_slots(tmp_path: Path) -> None:
+    store = _create_store(tmp_path, task_sampling="reservoir:5")
+    _run_tasks(store, 50, fail_every=5)
+    store.close()
+
+    rows = [
+        row
+        for row in read_jsonl(store.run_dir / "tasks.jsonl")
+        if row["state"] in {"failed", "succeeded"}
+    ]
+    weighted = [row for row in rows if row["sample_weight"] > 0]
+    assert len({row["task_id"] for row in weighted}) == 5
+    assert {row["sample_weight"] for row in weighted} == {10.0}
+    # Every failure is written once for diagnosis, kept by the reservoir or not.
+    diagnostic = [row for row in rows if row["sample_weight"] == 0]
+    assert len(diagnostic) == 10
+    assert {row["state"] for row in diagnostic} == {"failed"}
+    assert len(read_jsonl(store.run_dir / "failures.jsonl")) == 10
+    summary = summarize_run(store.run_dir)
+    assert summary["counts"]["tasks_failed"] == 10
+
+
+def test_manifest_reservoir_policy_overrides_default(tmp_path: Path) -> None:
+    store = _create_store(tmp_path, task_sampling="reservoir:5")
+    _run_tasks(store, 50)
+    store.close()
+
+    rows = read_jsonl(store.run_dir / "tasks.jsonl")
+    assert len({row["task_id"] for row in rows}) == 5
+    assert {row["sample_weight"] for row in rows} == {10.0}
+    resources = read_jsonl(store.run_dir / "resources.jsonl")
+    assert {row["entity_id"] for row in resources} == {row["task_id"] for row in rows}
+
+    aggregates = json.loads((store.run_dir / "aggregates.json").read_text(encoding="utf-8"))
+    assert aggregates["default_policy"] == "all"
+    assert aggregates["stream_policies"] == {"step": "reservoir:5"}
+    (stream,) = aggregates["streams"]
+    assert stream["submitted"] == 50
+    assert stream["recorded"] == 5
+    assert stream["duration_s"]["count"] == 50
+    assert summarize_run(store.run_dir)["counts"]["tasks_succeeded"] == 50
+
+
+def test_default_policy_writes_no_aggregates(tmp_path: Path) -> None:
+    store = _create_store(tmp_path)
+    _run_tasks(store, 3)
+    store.close()
+
+    assert not (store.run_dir / "aggregates.json").exists()
+    assert "streams" not in summarize_run(store.run_dir)
+
+
+def test_usage_of_unsampled_tasks_feeds_aggregates_only(tmp_path: Path) -> None:
+    store = _create_store(tmp_path, sampling="every_n:2")
+    common = {"component": "gcam", "tag": "gcam", "function_name": "step", "requested_workers": 1}
+    for index in range(4):
+        task_id = f"t{index}"
+        store.record_task_submission(
+            task_id=task_id, task_name=f"step[{index}]", usage=True, **common
+        )
+        store.record_task_result(
+            task_id=task_id, task_name=f"step[{index}]", state="succeeded", **common
+        )
+        store.record_task_usage(
+            task_id=task_id,
+            component="gcam",
+            usage={"wall_s": 1.0, "cpu_user_s": 0.5, "peak_rss_bytes": 1024**2},
+        )
+    store.close()
+
+    observed = [
+        row
+        for row in read_jsonl(store.run_dir / "resources.jsonl")
+        if row["observed_peak_rss_bytes"] is not None
+    ]
+    assert sorted(row["entity_id"] for row in observed) == ["t0", "t2"]
+    assert {row["sample_weight"] for row in observed} == {2.0}
+    aggregates = json.loads((store.run_dir / "aggregates.json").read_text(encoding="utf-8"))
+    assert aggregates["streams"][0]["peak_rss_bytes"]["count"] == 4
+    assert aggregates["streams"][0]["cpu_s"]["count"] == 4
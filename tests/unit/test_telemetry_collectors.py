@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 
 from scalable.telemetry.collectors import (
+    RunSummaryAccumulator,
     latest_run_dir,
     read_jsonl,
     render_text_report,
@@ -115,3 +116,17 @@ def test_resolve_run_dir_latest_and_id(tmp_path: Path) -> None:
     assert resolve_run_dir(runs_dir=runs, latest=True) == run2
     assert resolve_run_dir(runs_dir=runs, run_id=run1.name) == run1
 
+
+
+def test_accumulator_matches_summarize_run(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run-20260519T120000Z-demo-aaaa1111"
+    _seed_run(run_dir)
+
+    accumulator = RunSummaryAccumulator()
+    for name in ("tasks.jsonl", "resources.jsonl", "cache.jsonl", "failures.jsonl"):
+        for row in read_jsonl(run_dir / name):
+            accumulator.add(name, row)
+    run_meta = json.loads((run_dir / "run.json").read_text(encoding="utf-8"))
+
+    assert accumulator.to_dict(run_meta) == summarize_run(run_dir)
+    assert accumulator.version == 8
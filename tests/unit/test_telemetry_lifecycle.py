@@ -0,0 +1,162 @@
+"""Unit tests for scheduler lifecycle timing capture and store joining."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from scalable.manifest.parser import load_manifest
+from scalable.planning.dryrun import build_dry_run_plan
+from scalable.providers.base import DeploymentSpec
+from scalable.telemetry.lifecycle import TASK_LIFECYCLE_TOPIC, TaskLifecyclePlugin
+from scalable.telemetry.store import TelemetryStore
+
+
+class _FakeScheduler:
+    def __init__(self) -> None:
+        self.tasks: dict = {}
+        self.events: list[tuple[str, dict]] = []
+
+    def log_event(self, topic: str, msg: dict) -> None:
+        self.events.append((topic, msg))
+
+
+def _store(tmp_path: Path) -> TelemetryStore:
+    manifest_path = tmp_path / "scalable.yaml"
+    manifest_path.write_text(
+        """
+version: 1
+project:
+  name: demo
+targets:
+  local:
+    provider: local
+components:
+  gcam:
+    cpus: 2
+    memory: 8G
+""".lstrip(),
+        encoding="utf-8",
+    )
+    manifest = load_manifest(manifest_path)
+    spec = DeploymentSpec.from_manifest(manifest, target_name="local")
+    return TelemetryStore.create(
+        runs_dir=tmp_path / "runs", manifest=manifest, spec=spec, plan=build_dry_run_plan(spec)
+    )
+
+
+def _submit(store: TelemetryStore, task_id: str = "t1") -> None:
+    store.record_task_submission(
+        task_id=task_id,
+        task_name="run_gcam",
+        component="gcam",
+        tag="gcam",
+        function_name="run_gcam",
+        requested_workers=1,
+        lifecycle=True,
+    )
+
+
+def _result(store: TelemetryStore, task_id: str = "t1", state: str = "succeeded") -> None:
+    store.record_task_result(
+        task_id=task_id,
+        task_name="run_gcam",
+        component="gcam",
+        tag="gcam",
+        function_name="run_gcam",
+        requested_workers=1,
+        state=state,
+    )
+
+
+def _task_rows(store: TelemetryStore) -> list[dict]:
+    path = store.run_dir / "tasks.jsonl"
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+_LIFECYCLE = {
+    "key": "k",
+    "state": "memory",
+    "worker": "tcp://10.0.0.1:1234",
+    "processing_at": 1_700_000_000.0,
+    "queue_wait_s": 12.5,
+    "compute_s": 3.0,
+    "transfer_s": 0.25,
+    "attempts": 1,
+}
+
+
+@pytest.mark.asyncio
+async def test_plugin_publishes_queue_and_compute_timings() -> None:
+    scheduler = _FakeScheduler()
+    plugin = TaskLifecyclePlugin()
+    await plugin.start(scheduler)
+    worker = SimpleNamespace(address="tcp://w1")
+    scheduler.tasks["k"] = SimpleNamespace(processing_on=worker)
+
+    plugin.transition("k", "released", "waiting", stimulus_id="s")
+    plugin.transition("k", "waiting", "processing", stimulus_id="s")
+    plugin.transition(
+        "k",
+        "processing",
+        "memory",
+        stimulus_id="s",
+        worker="tcp://w1",
+        startstops=[
+            {"action": "transfer", "start": 1.0, "stop": 1.5},
+            {"action": "compute", "start": 2.0, "stop": 4.0},
+        ],
+    )
+
+    assert len(scheduler.events) == 1
+    topic, msg = scheduler.events[0]
+    assert topic == TASK_LIFECYCLE_TOPIC
+    assert msg["key"] == "k"
+    assert msg["worker"] == "tcp://w1"
+    assert msg["compute_s"] == pytest.approx(2.0)
+    assert msg["transfer_s"] == pytest.approx(0.5)
+    assert msg["queue_wait_s"] >= 0
+    assert msg["attempts"] == 1
+    assert plugin._marks == {}
+
+
+def test_store_joins_lifecycle_arriving_after_result(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    _submit(store)
+    _result(store)
+    assert [r["state"] for r in _task_rows(store)] == ["submitted"]
+
+    store.record_task_lifecycle(task_id="t1", lifecycle=_LIFECYCLE)
+    rows = _task_rows(store)
+    assert [r["state"] for r in rows] == ["submitted", "running", "succeeded"]
+    running, done = rows[1], rows[2]
+    assert running["worker"] == "tcp://10.0.0.1:1234"
+    assert running["timestamp"] == "2023-11-14T22:13:20Z"
+    assert done["duration_s"] == 3.0
+    assert done["queue_wait_s"] == 12.5
+    assert done["transfer_s"] == 0.25
+    assert done["turnaround_s"] is not None
+
+
+def test_store_joins_lifecycle_arriving_before_result(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    _submit(store)
+    store.record_task_lifecycle(task_id="t1", lifecycle=_LIFECYCLE)
+    _result(store)
+    assert [r["state"] for r in _task_rows(store)] == ["submitted", "running", "succeeded"]
+
+
+def test_store_flushes_unjoined_results_on_close(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    _submit(store)
+    _result(store, state="failed")
+    store.close()
+
+    rows = _task_rows(store)
+    assert [r["state"] for r in rows] == ["submitted", "failed"]
+    summary = json.loads((store.run_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["counts"]["tasks_failed"] == 1
+    assert (store.run_dir / "failures.jsonl").exists()
@@ -87,3 +87,85 @@ def test_store_writes_bootstrap_and_summary(tmp_path: Path) -> None:
     assert run_payload["status"] == "completed"
     assert summary["counts"]["task_events"] >= 3
 
+
+
+def test_store_records_observed_task_usage(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "scalable.yaml"
+    _write_manifest(manifest_path)
+
+    manifest = load_manifest(manifest_path)
+    spec = DeploymentSpec.from_manifest(manifest, target_name="local")
+    plan = build_dry_run_plan(spec)
+    store = TelemetryStore.create(runs_dir=tmp_path / "runs", manifest=manifest, spec=spec, plan=plan)
+
+    store.record_task_usage(
+        task_id="t1",
+        component="gcam",
+        usage={
+            "wall_s": 4.0,
+            "cpu_user_s": 6.0,
+            "cpu_system_s": 2.0,
+            "peak_rss_bytes": 2 * 1024**3,
+            "read_bytes": 10,
+            "write_bytes": 20,
+        },
+    )
+    store.close()
+
+    rows = [
+        json.loads(line)
+        for line in (store.run_dir / "resources.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["entity_id"] == "t1"
+    assert row["requested_cpus"] is None
+    assert row["observed_cpu"] == 2.0
+    assert row["observed_memory_gb"] == 2.0
+    assert row["observed_peak_rss_bytes"] == 2 * 1024**3
+    assert row["observed_write_bytes"] == 20
+
+
+def test_store_publishes_live_summary_while_running(tmp_path: Path) -> None:
+    import time
+
+    manifest_path = tmp_path / "scalable.yaml"
+    _write_manifest(manifest_path)
+
+    manifest = load_manifest(manifest_path)
+    spec = DeploymentSpec.from_manifest(manifest, target_name="local")
+    plan = build_dry_run_plan(spec)
+    store = TelemetryStore.create(
+        runs_dir=tmp_path / "runs",
+        manifest=manifest,
+        spec=spec,
+        plan=plan,
+        live_summary_interval=0.05,
+    )
+    summary_path = store.run_dir / "summary.json"
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["run"]["status"] == "running"
+
+    store.record_task_submission(
+        task_id="t1",
+        task_name="run_gcam",
+        component="gcam",
+        tag="gcam",
+        function_name="run_gcam",
+        requested_workers=1,
+    )
+    deadline = time.monotonic() + 5
+    live = {}
+    while time.monotonic() < deadline:
+        live = json.loads(summary_path.read_text(encoding="utf-8"))
+        if live["counts"]["task_events"] == 2:
+            break
+        time.sleep(0.02)
+    assert live["counts"]["task_events"] == 2
+    assert "updated_at" in live["live"]
+    assert store.live_summary()["counts"]["resource_events"] == 1
+
+    store.close()
+    final = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert final["run"]["status"] == "completed"
+    assert "live" not in final
+    assert list(store.run_dir.glob(".summary.json.*")) == []
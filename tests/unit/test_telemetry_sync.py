@@ -0,0 +1,106 @@
+"""Unit tests for incremental remote telemetry sync."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+
+from scalable.artifacts import LocalArtifactStore
+from scalable.manifest.parser import load_manifest
+from scalable.planning.dryrun import build_dry_run_plan
+from scalable.providers.base import DeploymentSpec
+from scalable.telemetry.collectors import read_jsonl, summarize_run
+from scalable.telemetry.store import TelemetryStore
+from scalable.telemetry.sync import TelemetrySyncer, fetch_remote_run
+
+
+def _write_lines(path: Path, start: int, count: int) -> None:
+    with path.open("a", encoding="utf-8") as fh:
+        for index in range(start, start + count):
+            fh.write(json.dumps({"task_id": f"t{index}", "state": "succeeded"}) + "\n")
+
+
+def test_syncer_ships_only_new_complete_lines(tmp_path: Path) -> None:
+    run_dir = tmp_path / "runs" / "run-1"
+    run_dir.mkdir(parents=True)
+    remote = LocalArtifactStore(tmp_path / "remote")
+    syncer = TelemetrySyncer(run_dir, str(tmp_path / "remote"), chunk_bytes=64, store=remote)
+
+    tasks = run_dir / "tasks.jsonl"
+    _write_lines(tasks, 0, 5)
+    with tasks.open("a", encoding="utf-8") as fh:
+        fh.write('{"task_id": "partial"')  # a line still being written
+    (run_dir / "run.json").write_text("{}\n", encoding="utf-8")
+
+    first = syncer.sync()
+    complete = tasks.read_bytes().rfind(b"\n") + 1
+    assert syncer.offsets == {"tasks.jsonl": complete}
+    assert first == complete + len("{}\n")
+    segments = remote.list_artifacts("run-1/tasks.jsonl.segments")
+    assert len(segments) > 1  # chunked at 64 bytes
+    assert syncer.sync() == 0  # nothing new
+
+    with tasks.open("a", encoding="utf-8") as fh:
+        fh.write(', "state": "running"}\n')
+    assert syncer.sync() > 0
+    assert syncer.offsets["tasks.jsonl"] == tasks.stat().st_size
+
+
+def test_syncer_resumes_from_persisted_offsets(tmp_path: Path) -> None:
+    run_dir = tmp_path / "runs" / "run-1"
+    run_dir.mkdir(parents=True)
+    remote_root = tmp_path / "remote"
+    _write_lines(run_dir / "tasks.jsonl", 0, 3)
+    TelemetrySyncer(run_dir, str(remote_root)).sync()
+
+    _write_lines(run_dir / "tasks.jsonl", 3, 2)
+    (run_dir / ".sync-state.json").unlink()  # lost local state: resume from remote
+    resumed = TelemetrySyncer(run_dir, str(remote_root))
+    shipped = resumed.sync()
+    assert 0 < shipped < (run_dir / "tasks.jsonl").stat().st_size
+
+    fetched = fetch_remote_run(str(remote_root), "run-1", tmp_path / "copy")
+    assert read_jsonl(fetched / "tasks.jsonl") == read_jsonl(run_dir / "tasks.jsonl")
+
+
+def test_store_syncs_run_to_remote_uri(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "scalable.yaml"
+    manifest_path.write_text(
+        """
+version: 1
+project:
+  name: demo
+targets:
+  local:
+    provider: local
+components:
+  gcam:
+    cpus: 2
+tasks:
+  run_gcam:
+    component: gcam
+""".lstrip(),
+        encoding="utf-8",
+    )
+    manifest = load_manifest(manifest_path)
+    spec = DeploymentSpec.from_manifest(manifest, target_name="local")
+    remote_uri = f"memory://scalable-sync-{uuid.uuid4().hex}"
+
+    store = TelemetryStore.create(
+        runs_dir=tmp_path / "runs",
+        manifest=manifest,
+        spec=spec,
+        plan=build_dry_run_plan(spec),
+        remote_uri=remote_uri,
+    )
+    common = {"component": "gcam", "tag": "gcam", "function_name": "run_gcam", "requested_workers": 1}
+    store.record_task_submission(task_id="t1", task_name="run_gcam", **common)
+    store.record_task_result(task_id="t1", task_name="run_gcam", state="succeeded", **common)
+    store.close()
+
+    fetched = fetch_remote_run(remote_uri, store.run_id, tmp_path / "fetched")
+    assert summarize_run(fetched) == summarize_run(store.run_dir)
+    assert json.loads((fetched / "summary.json").read_text(encoding="utf-8")) == json.loads(
+        (store.run_dir / "summary.json").read_text(encoding="utf-8")
+    )
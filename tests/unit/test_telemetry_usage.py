@@ -0,0 +1,95 @@
+"""Unit tests for worker-side task resource usage sampling."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from scalable.advising import ResourceAdvisor
+from scalable.telemetry.collectors import read_jsonl
+from scalable.telemetry.usage import TaskUsage, measure_usage, publish_task_usage
+
+
+def _burn_cpu(seconds: float) -> int:
+    import time
+
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def test_measure_usage_reports_cpu_wall_and_rss() -> None:
+    with measure_usage(interval=0.01) as probe:
+        _burn_cpu(0.1)
+        blob = bytearray(32 * 1024 * 1024)
+        blob[-1] = 1
+
+    usage = probe.usage
+    assert usage is not None
+    assert usage.wall_s >= 0.1
+    assert usage.cpu_s is not None and usage.cpu_s > 0.05
+    assert usage.peak_rss_bytes is not None and usage.peak_rss_bytes > 32 * 1024 * 1024
+
+
+def test_measure_usage_includes_subprocess_cpu() -> None:
+    with measure_usage() as probe:
+        subprocess.run(
+            [sys.executable, "-c", "import time\nt=time.time()\nwhile time.time()-t<0.2: pass"],
+            check=True,
+        )
+
+    assert probe.usage is not None
+    assert probe.usage.cpu_s is not None and probe.usage.cpu_s >= 0.1
+
+
+def test_measure_usage_populates_probe_when_block_raises() -> None:
+    probe = None
+    try:
+        with measure_usage() as probe:
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert probe is not None and probe.usage is not None
+
+
+def test_publish_task_usage_outside_worker_is_noop() -> None:
+    assert publish_task_usage(TaskUsage(wall_s=1.0)) is False
+
+
+def test_observed_usage_merges_into_advisor_records(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    run_dir = runs / "run-20260519T120000Z-demo-aaaa1111"
+    run_dir.mkdir(parents=True)
+    (run_dir / "run.json").write_text(json.dumps({"run_id": run_dir.name, "target_name": "local"}))
+    (run_dir / "tasks.jsonl").write_text(
+        json.dumps(
+            {"task_id": "t1", "task_name": "run_gcam", "component": "gcam", "state": "succeeded", "duration_s": 10.0}
+        )
+        + "\n"
+    )
+    (run_dir / "resources.jsonl").write_text(
+        json.dumps({"entity_type": "task", "entity_id": "t1", "requested_cpus": 4, "requested_memory": "16G"})
+        + "\n"
+        + json.dumps(
+            {
+                "entity_type": "task",
+                "entity_id": "t1",
+                "requested_cpus": None,
+                "observed_peak_rss_bytes": 2 * 1024**3,
+                "observed_cpu_user_s": 30.0,
+                "observed_cpu_system_s": 2.0,
+            }
+        )
+        + "\n"
+    )
+
+    advisor = ResourceAdvisor.from_history(runs)
+    rec = advisor.recommend(task="run_gcam", target="local")
+
+    assert rec.resources["gcam"]["cpus"] == 4
+    assert rec.resources["gcam"]["memory"] == "3G"
+    assert rec.evidence["memory_source"] == "observed_peak_rss"